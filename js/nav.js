@@ -40,3 +40,14 @@
     });
   });
 }());
+
+/* Service worker (sw.js is generated by tools/build_service_worker.py) */
+(function () {
+  if (!('serviceWorker' in navigator) || location.protocol !== 'https:') return;
+  var script = document.currentScript;
+  if (!script) return;
+  var root = script.src.replace(/js\/nav\.js(\?.*)?$/, '');
+  window.addEventListener('load', function () {
+    navigator.serviceWorker.register(root + 'sw.js').catch(function () {});
+  });
+}());
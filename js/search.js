@@ -0,0 +1,194 @@
+/*  Site search — queries the static index built by tools/build_search_index.py.
+    Nothing is downloaded until the search box is focused; then meta.json for
+    the page's language, and per query only the shard(s) its terms fall in.
+    Folding/stemming rules come from meta.json so queries are processed
+    exactly like the indexed text.
+
+    Markup: <div data-site-search data-placeholder="Search…"
+                 data-empty="No results"></div>
+    API:    window.stvSearch(query) → Promise of [{url, title, desc, score}]  */
+(function () {
+  var script = document.currentScript;
+  var ROOT = script ? script.src.replace(/js\/search\.js(\?.*)?$/, '') : '/';
+  var lang = (document.documentElement.lang || 'en').slice(0, 2);
+  var MAX_RESULTS = 10;
+  var cache = {};
+
+  function getJSON(path) {
+    if (!cache[path]) {
+      cache[path] = fetch(ROOT + 'search/' + path).then(function (r) {
+        if (!r.ok) throw new Error(path + ': ' + r.status);
+        return r.json();
+      });
+    }
+    return cache[path];
+  }
+
+  function loadMeta() {
+    return getJSON(lang + '/meta.json').catch(function () {
+      lang = 'en';  // language without an index — search the English pages
+      return getJSON('en/meta.json');
+    });
+  }
+
+  // ── Mirrors fold() / stem() / terms() in build_search_index.py ──────────
+  function fold(text, rules) {
+    text = text.toLowerCase().normalize('NFKD').replace(/\p{Mn}/gu, '');
+    Object.keys(rules.charmap).forEach(function (src) {
+      text = text.split(src).join(rules.charmap[src]);
+    });
+    return text;
+  }
+
+  function stem(term, rules) {
+    var n = rules.min_stem, i, p, s;
+    for (i = 0; i < rules.prefixes.length; i++) {
+      p = rules.prefixes[i];
+      if (term.indexOf(p) === 0 && term.length - p.length >= n) {
+        term = term.slice(p.length);
+        break;
+      }
+    }
+    for (i = 0; i < rules.suffixes.length; i++) {
+      s = rules.suffixes[i][0];
+      if (term.length - s.length >= n && term.slice(-s.length) === s) {
+        return term.slice(0, -s.length) + rules.suffixes[i][1];
+      }
+    }
+    return term;
+  }
+
+  function queryTerms(query, meta) {
+    var rules = meta.rules;
+    var tokens = fold(query, rules).match(/[\p{L}\p{N}]+/gu) || [];
+    return tokens.filter(function (t) {
+      return t.length >= meta.min_term && rules.stopwords.indexOf(t) === -1;
+    }).map(function (t) { return stem(t, rules); });
+  }
+
+  // Shard holding `term` = longest shard key it starts with. For the prefix
+  // (last, still-being-typed) term, also every finer shard under it.
+  function shardsFor(term, meta, prefix) {
+    var best = '', files = [];
+    Object.keys(meta.shards).forEach(function (key) {
+      if (term.indexOf(key) === 0 && key.length > best.length) best = key;
+      if (prefix && key.length > term.length && key.indexOf(term) === 0) {
+        files.push(meta.shards[key]);
+      }
+    });
+    if (best) files.push(meta.shards[best]);
+    return files;
+  }
+
+  function search(query) {
+    return loadMeta().then(function (meta) {
+      var terms = queryTerms(query, meta);
+      if (!terms.length) return [];
+      var last = terms.length - 1;
+
+      return Promise.all(terms.map(function (term, i) {
+        return Promise.all(shardsFor(term, meta, i === last).map(function (file) {
+          return getJSON(lang + '/' + file);
+        })).then(function (shards) {
+          // {doc: weight} for this query term
+          var hits = {};
+          shards.forEach(function (shard) {
+            Object.keys(shard).forEach(function (t) {
+              var exact = t === term;
+              if (!exact && !(i === last && t.indexOf(term) === 0)) return;
+              var post = shard[t];
+              var df = post.length / 2;
+              var idf = Math.log(1 + meta.docs / df);
+              for (var j = 0; j < post.length; j += 2) {
+                var w = (1 + Math.log(post[j + 1])) * idf * (exact ? 1 : 0.5);
+                hits[post[j]] = Math.max(hits[post[j]] || 0, w);
+              }
+            });
+          });
+          return hits;
+        });
+      })).then(function (perTerm) {
+        // Every term must match; fall back to any term if that finds nothing
+        function combine(requireAll) {
+          var scores = {};
+          perTerm.forEach(function (hits) {
+            Object.keys(hits).forEach(function (doc) { scores[doc] = 0; });
+          });
+          Object.keys(scores).forEach(function (doc) {
+            perTerm.forEach(function (hits) {
+              if (doc in hits) scores[doc] += hits[doc];
+              else if (requireAll) scores[doc] = -Infinity;
+            });
+          });
+          return Object.keys(scores).filter(function (doc) { return scores[doc] > 0; })
+            .sort(function (a, b) { return scores[b] - scores[a]; })
+            .slice(0, MAX_RESULTS)
+            .map(function (doc) { return { doc: +doc, score: scores[doc] }; });
+        }
+        var ranked = combine(true);
+        if (!ranked.length) ranked = combine(false);
+        if (!ranked.length) return [];
+        return getJSON(lang + '/docs.json').then(function (docs) {
+          return ranked.map(function (r) {
+            var d = docs[r.doc];
+            return { url: ROOT + d[0], title: d[1], desc: d[2], score: r.score };
+          });
+        });
+      });
+    });
+  }
+
+  window.stvSearch = search;
+
+  // ── Search box ───────────────────────────────────────────────────────────
+  document.querySelectorAll('[data-site-search]').forEach(function (box) {
+    var form = document.createElement('form');
+    form.className = 'site-search';
+    form.setAttribute('role', 'search');
+    var input = document.createElement('input');
+    input.type = 'search';
+    input.placeholder = box.getAttribute('data-placeholder') || 'Search…';
+    input.setAttribute('aria-label', input.placeholder);
+    input.autocomplete = 'off';
+    var list = document.createElement('ul');
+    list.className = 'site-search-results';
+    list.hidden = true;
+    form.appendChild(input);
+    form.appendChild(list);
+    box.appendChild(form);
+
+    var timer, seq = 0;
+    input.addEventListener('focus', loadMeta, { once: true });
+    form.addEventListener('submit', function (e) { e.preventDefault(); });
+    input.addEventListener('input', function () {
+      clearTimeout(timer);
+      timer = setTimeout(function () {
+        var q = input.value.trim(), mine = ++seq;
+        if (q.length < 2) { list.hidden = true; return; }
+        search(q).then(function (results) {
+          if (mine !== seq) return;  // a newer query is already in flight
+          list.innerHTML = '';
+          if (!results.length) {
+            var none = document.createElement('li');
+            none.textContent = box.getAttribute('data-empty') || 'No results';
+            list.appendChild(none);
+          }
+          results.forEach(function (r) {
+            var li = document.createElement('li');
+            var a = document.createElement('a');
+            a.href = r.url;
+            a.textContent = r.title;
+            li.appendChild(a);
+            if (r.desc) {
+              var p = document.createElement('p');
+              p.textContent = r.desc;
+              li.appendChild(p);
+            }
+            list.appendChild(li);
+          });
+          list.hidden = false;
+        }).catch(function () { list.hidden = true; });
+      }, 150);
+    });
+  });
+}());
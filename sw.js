@@ -0,0 +1,184 @@
+/* Service worker — GENERATED by tools/build_service_worker.py, do not edit.
+   Precache: CSS/JS + home pages at install; each language's shell pages on
+   the first visit in that language. HTML: stale-while-revalidate.
+   Images: cache-first, trimmed to maxImages. */
+var CONFIG = {
+  "version": "c65d59700661",
+  "precache": [
+    "/css/style.css",
+    "/js/analytics.js",
+    "/js/consent.js",
+    "/js/lang-switcher.js",
+    "/js/lightbox.js",
+    "/js/nav.js",
+    "/js/search.js",
+    "/js/theme.js",
+    "/favicon.ico",
+    "/",
+    "/ar/",
+    "/de/",
+    "/es/",
+    "/fr/",
+    "/pt/"
+  ],
+  "homes": {
+    "en": "/",
+    "ar": "/ar/",
+    "de": "/de/",
+    "es": "/es/",
+    "fr": "/fr/",
+    "pt": "/pt/"
+  },
+  "shells": {
+    "ar": [
+      "/ar/an-al-mawqi/",
+      "/ar/jamia-al-fidyuhat/",
+      "/ar/jamia-al-tahdithat/",
+      "/ar/ma-huwa-al-tadawul-al-ijtimai/",
+      "/ar/ma-huwa-naskh-al-tadawul/"
+    ],
+    "de": [
+      "/de/alle-updates/",
+      "/de/alle-videos/",
+      "/de/ueber-uns/",
+      "/de/was-ist-copy-trading/",
+      "/de/was-ist-social-trading/"
+    ],
+    "en": [
+      "/about.html",
+      "/copy-trading.html",
+      "/social-trading.html",
+      "/updates.html",
+      "/videos.html"
+    ],
+    "es": [
+      "/es/que-es-el-copy-trading/",
+      "/es/que-es-el-trading-social/",
+      "/es/sobre-nosotros/",
+      "/es/todas-las-actualizaciones/",
+      "/es/todos-los-videos/"
+    ],
+    "fr": [
+      "/fr/a-propos/",
+      "/fr/quest-ce-que-le-copy-trading/",
+      "/fr/quest-ce-que-le-trading-social/",
+      "/fr/toutes-les-mises-a-jour/",
+      "/fr/toutes-les-videos/"
+    ],
+    "pt": [
+      "/pt/o-que-e-copy-trading/",
+      "/pt/o-que-e-trading-social/",
+      "/pt/sobre/",
+      "/pt/todas-as-atualizacoes/",
+      "/pt/todos-os-videos/"
+    ]
+  },
+  "imageCache": "stv-images-v1",
+  "maxImages": 80
+};
+
+var PRECACHE = 'stv-precache-' + CONFIG.version;
+var PAGES = 'stv-pages-' + CONFIG.version;
+var CURRENT = [PRECACHE, PAGES, CONFIG.imageCache];
+var warmed = {};
+
+self.addEventListener('install', function (event) {
+  event.waitUntil(
+    caches.open(PRECACHE).then(function (cache) {
+      return cache.addAll(CONFIG.precache.map(function (url) {
+        return new Request(url, { cache: 'reload' });
+      }));
+    }).then(function () { return self.skipWaiting(); })
+  );
+});
+
+self.addEventListener('activate', function (event) {
+  event.waitUntil(
+    caches.keys().then(function (keys) {
+      return Promise.all(keys.filter(function (key) {
+        return key.indexOf('stv-') === 0 && CURRENT.indexOf(key) === -1;
+      }).map(function (key) { return caches.delete(key); }));
+    }).then(function () { return self.clients.claim(); })
+  );
+});
+
+function langOf(path) {
+  var first = path.split('/')[1];
+  return CONFIG.homes[first] ? first : 'en';
+}
+
+// First page seen in a language: fetch that language's nav pages behind it.
+function warmShell(lang) {
+  if (warmed[lang] || !CONFIG.shells[lang]) return Promise.resolve();
+  warmed[lang] = true;
+  return caches.open(PAGES).then(function (cache) {
+    return Promise.all(CONFIG.shells[lang].map(function (url) {
+      return cache.match(url).then(function (hit) {
+        return hit || cache.add(url).catch(function () {});
+      });
+    }));
+  });
+}
+
+function trim(cacheName, max) {
+  return caches.open(cacheName).then(function (cache) {
+    return cache.keys().then(function (keys) {
+      if (keys.length <= max) return;
+      // Oldest entries first (insertion order)
+      return Promise.all(keys.slice(0, keys.length - max).map(function (key) {
+        return cache.delete(key);
+      }));
+    });
+  });
+}
+
+function staleWhileRevalidate(event, url) {
+  var request = event.request;
+  var network = fetch(request).then(function (response) {
+    if (response.ok && response.type === 'basic') {
+      var copy = response.clone();
+      caches.open(PAGES).then(function (cache) { cache.put(request, copy); });
+    }
+    return response;
+  });
+  event.waitUntil(network.catch(function () {}).then(function () {
+    return warmShell(langOf(url.pathname));
+  }));
+  return caches.match(request).then(function (hit) {
+    if (hit) return hit;
+    return network.catch(function () {
+      return caches.match(CONFIG.homes[langOf(url.pathname)]);
+    });
+  });
+}
+
+function cacheFirst(request, cacheName, max) {
+  return caches.match(request).then(function (hit) {
+    if (hit) return hit;
+    return fetch(request).then(function (response) {
+      if (response.ok && cacheName) {
+        var copy = response.clone();
+        caches.open(cacheName).then(function (cache) {
+          return cache.put(request, copy);
+        }).then(function () { return trim(cacheName, max); });
+      }
+      return response;
+    });
+  });
+}
+
+self.addEventListener('fetch', function (event) {
+  var request = event.request;
+  if (request.method !== 'GET') return;
+  var url = new URL(request.url);
+  if (url.origin !== self.location.origin) return;
+
+  if (request.mode === 'navigate' ||
+      (request.headers.get('Accept') || '').indexOf('text/html') !== -1) {
+    event.respondWith(staleWhileRevalidate(event, url));
+  } else if (CONFIG.precache.indexOf(url.pathname) !== -1) {
+    event.respondWith(cacheFirst(request, null));
+  } else if (request.destination === 'image') {
+    event.respondWith(cacheFirst(request, CONFIG.imageCache, CONFIG.maxImages));
+  }
+});
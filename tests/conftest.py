@@ -0,0 +1,5 @@
+import sys
+import pathlib
+
+# The tools are scripts, not a package — import them the way they import each other.
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent / "tools"))
@@ -0,0 +1,102 @@
+import sys
+import time
+import threading
+
+import pytest
+
+import _checks as checks
+from _checks import Check
+
+
+def statuses(report):
+    return {r["name"]: r["status"] for r in report["results"]}
+
+
+def test_outcome():
+    assert checks.outcome(None) == (True, "")
+    assert checks.outcome({"ok": False, "detail": "down"}) == (False, "down")
+    assert checks.outcome(["a", "b"]) == (False, "a; b")
+    assert checks.outcome([]) == (True, "")
+    assert checks.outcome(0) == (False, "")
+
+
+def test_deps_skip_and_after_runs():
+    ran = []
+    report = checks.run("t", [
+        Check("base", lambda: ["broken"]),
+        Check("needs base", lambda: ran.append("needs base"), deps=["base"]),
+        Check("after base", lambda: ran.append("after base"), after=["base"]),
+        Check("needs skipped", lambda: ran.append("needs skipped"), deps=["needs base"]),
+    ])
+    assert statuses(report) == {"base": "fail", "needs base": "skipped",
+                                "after base": "pass", "needs skipped": "skipped"}
+    assert ran == ["after base"]
+    assert report["results"][1]["detail"] == "needs base"
+    assert not report["ok"] and report["counts"] == {"fail": 1, "skipped": 2, "pass": 1}
+
+
+def test_deps_wait_for_completion():
+    order = []
+    report = checks.run("t", [
+        Check("slow", lambda: (time.sleep(0.2), order.append("slow"))[1]),
+        Check("then", lambda: order.append("then"), deps=["slow"]),
+    ])
+    assert report["ok"] and order == ["slow", "then"]
+
+
+def test_checks_run_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def meet():
+        barrier.wait()      # only returns once all three are running at once
+
+    report = checks.run("t", [Check(f"c{i}", meet) for i in range(3)], workers=3)
+    assert report["ok"]
+
+
+def test_timeout_cancels_and_restores_streams():
+    seen = {}
+
+    def slow():
+        while not checks.cancelled():
+            time.sleep(0.01)
+        seen["cancelled"] = True
+
+    stdout, stderr = sys.stdout, sys.stderr
+    started = time.monotonic()
+    report = checks.run("t", [Check("slow", slow, timeout=0.2), Check("fast", lambda: None)])
+    assert time.monotonic() - started < 2
+    assert statuses(report) == {"slow": "timeout", "fast": "pass"}
+    assert (sys.stdout, sys.stderr) == (stdout, stderr)
+    for _ in range(100):
+        if seen:
+            break
+        time.sleep(0.01)
+    assert seen == {"cancelled": True}
+
+
+def test_exception_is_an_error():
+    report = checks.run("t", [Check("boom", lambda: 1 / 0)])
+    (result,) = report["results"]
+    assert result["status"] == "error" and result["detail"].startswith("ZeroDivisionError")
+
+
+def test_output_printed_in_declaration_order(capsys):
+    def say(text, delay):
+        def fn():
+            time.sleep(delay)
+            print(text)
+        return fn
+
+    checks.run("t", [Check("first", say("first", 0.2)), Check("second", say("second", 0))])
+    assert capsys.readouterr().out.split() == ["first", "second"]
+
+
+def test_bad_graphs_raise():
+    with pytest.raises(RuntimeError, match="unknown"):
+        checks.run("t", [Check("a", lambda: None, deps=["nope"])])
+    with pytest.raises(RuntimeError, match="duplicate"):
+        checks.run("t", [Check("a", lambda: None), Check("a", lambda: None)])
+    with pytest.raises(RuntimeError, match="cycle"):
+        checks.run("t", [Check("a", lambda: None, deps=["b"]),
+                         Check("b", lambda: None, deps=["a"])])
@@ -0,0 +1,60 @@
+import os
+
+import deploy_release as dr
+
+
+def write(root, rel, text):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def test_diff_manifests():
+    old = {"a.html": ["1", 1, 0o644], "b.css": ["2", 1, 0o644],
+           "run.sh": ["3", 1, 0o644], "gone.js": ["4", 1, 0o644]}
+    new = {"a.html": ["1", 1, 0o644], "b.css": ["9", 1, 0o644],
+           "run.sh": ["3", 1, 0o755], "new.js": ["5", 1, 0o644]}
+    assert dr.diff_manifests(old, new) == (["b.css", "new.js", "run.sh"], ["gone.js"])
+    assert dr.diff_manifests(new, new) == ([], [])
+    assert dr.diff_manifests({}, new) == (sorted(new), [])
+
+
+def test_build_manifest_skips_shared_and_excluded(tmp_path):
+    write(tmp_path, "index.html", "<html></html>")
+    write(tmp_path, "css/site.css", "body{}")
+    write(tmp_path, "data/state.json", "{}")
+    write(tmp_path, ".git/HEAD", "ref")
+    write(tmp_path, "tools/x.pyc", "")
+    os.symlink("index.html", tmp_path / "link.html")
+    manifest = dr.build_manifest(tmp_path)
+    assert sorted(manifest) == ["css/site.css", "index.html"]
+    sha, size, mode = manifest["index.html"]
+    assert size == len("<html></html>") and len(sha) == 64 and mode == 0o644
+
+
+def test_local_deploy_round_trip(tmp_path, capsys):
+    src, dst = tmp_path / "src", tmp_path / "site"
+    write(src, "index.html", "v1")
+    write(src, "css/site.css", "body{}")
+    target = dr.Target(str(dst))
+
+    changed, removed, added = dr.deploy(target, root=src)
+    assert changed == added == ["css/site.css", "index.html"] and removed == []
+    live = dst / "current"
+    assert (live / "index.html").read_text() == "v1"
+    assert os.path.islink(live / "data")            # shared dirs survive releases
+
+    assert dr.deploy(target, root=src) == ([], [], [])
+
+    # An in-place edit on the server is seen as a difference and re-sent.
+    first = os.path.realpath(live)
+    (live / "index.html").write_text("edited on the server")
+    assert dr.deploy(target, root=src)[0] == ["index.html"]
+    assert (live / "index.html").read_text() == "v1"
+    assert os.path.realpath(live) != first
+
+    (src / "css" / "site.css").unlink()
+    changed, removed, _ = dr.deploy(target, root=src)
+    assert (changed, removed) == ([], ["css/site.css"])
+    assert not (live / "css" / "site.css").exists()
@@ -0,0 +1,38 @@
+from _gsc_store import DAILY, GscStore
+
+
+def rows(clicks):
+    """A day's totals row plus two query × page rows."""
+    return [{"clicks": clicks + 1, "impressions": 110, "ctr": 0.07, "position": 4.4},
+            {"query": "etoro review", "page": "https://socialtradingvlog.com/",
+             "clicks": clicks, "impressions": 100, "ctr": clicks / 100, "position": 4.0},
+            {"query": "copy trading", "page": "https://socialtradingvlog.com/copy-trading.html",
+             "clicks": 1, "impressions": 10, "ctr": 0.1, "position": 8.0}]
+
+
+def test_reappending_a_day_replaces_it(tmp_path):
+    store = GscStore(tmp_path / "gsc.sqlite3")
+    assert store.append(DAILY, "2026-01-01", rows(5)) == 3
+    assert store.append(DAILY, "2026-01-01", rows(7)) == 3
+    (day,) = store.series(source=DAILY)
+    assert (day["clicks"], day["impressions"]) == (8, 110)
+
+
+def test_reappending_fewer_rows_drops_the_old_ones(tmp_path):
+    store = GscStore(tmp_path / "gsc.sqlite3")
+    store.append(DAILY, "2026-01-01", rows(5))
+    store.append(DAILY, "2026-01-01", rows(5)[:2])
+    assert store.series(query="etoro review", source=DAILY)[0]["clicks"] == 5
+    assert store.series(query="copy trading", source=DAILY) == []
+    assert store.day_log(DAILY)["2026-01-01"][0] == 2
+
+
+def test_other_days_and_sources_untouched(tmp_path):
+    store = GscStore(tmp_path / "gsc.sqlite3")
+    store.append(DAILY, "2026-01-01", rows(5))
+    store.append(DAILY, "2026-01-02", rows(3))
+    store.append("snapshot", "2026-01-02", rows(9))
+    store.append(DAILY, "2026-01-02", [])
+    assert [d["date"] for d in store.series(source=DAILY)] == ["2026-01-01"]
+    assert store.series(source="snapshot")[0]["clicks"] == 10
+    assert store.dates(DAILY) == {"2026-01-01", "2026-01-02"}   # an empty day still counts
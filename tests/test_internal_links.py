@@ -0,0 +1,49 @@
+from _internal_links import link_injector
+
+LINKS = [
+    (r"copy trading", "copy-trading.html"),
+    (r"popular investors?", "popular-investor.html"),
+    (r"taking profits?", "video/taking-profits/"),
+]
+
+
+def test_first_occurrence_only():
+    inject = link_injector(LINKS)
+    out = inject("copy trading and more copy trading", prefix="../")
+    assert out.count("<a ") == 1
+    assert out.startswith('<a href="../copy-trading.html">copy trading</a>')
+
+
+def test_shared_seen_is_page_wide():
+    inject = link_injector(LINKS)
+    seen = set()
+    first = inject("Copy Trading basics", seen=seen)
+    second = inject("more copy trading, popular investor", seen=seen)
+    assert '<a href="copy-trading.html">Copy Trading</a>' in first
+    assert "copy-trading.html" not in second
+    assert '<a href="popular-investor.html">popular investor</a>' in second
+
+
+def test_no_self_link():
+    inject = link_injector(LINKS)
+    out = inject("taking profits then copy trading", current_slug="taking-profits")
+    assert "taking-profits/" not in out
+    assert "copy-trading.html" in out
+
+
+def test_existing_links_and_tags_untouched():
+    inject = link_injector(LINKS)
+    text = '<a href="/x">copy trading</a> <img alt="copy trading"> copy trading'
+    out = inject(text)
+    assert out.startswith('<a href="/x">copy trading</a> <img alt="copy trading"> ')
+    assert out.endswith('<a href="copy-trading.html">copy trading</a>')
+
+
+def test_unchanged_text_is_returned_as_is():
+    inject = link_injector(LINKS)
+    text = "nothing to link here"
+    assert inject(text) is text
+
+
+def test_injector_is_cached():
+    assert link_injector(LINKS) is link_injector([list(p) for p in LINKS])
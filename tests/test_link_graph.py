@@ -0,0 +1,52 @@
+import pytest
+
+from link_graph import click_depths, pagerank
+
+
+def graph(edges):
+    nodes = sorted({n for edge in edges for n in edge})
+    out_links = {n: [] for n in nodes}
+    for a, b in edges:
+        out_links[a].append(b)
+    return nodes, out_links
+
+
+def test_click_depths_breadth_first():
+    nodes, out = graph([("home", "a"), ("home", "b"), ("a", "c"), ("b", "c"), ("c", "d")])
+    assert click_depths(nodes, out, "home") == {"home": 0, "a": 1, "b": 1, "c": 2, "d": 3}
+
+
+def test_click_depths_unreachable_and_unknown_start():
+    nodes, out = graph([("home", "a"), ("orphan", "a")])
+    depths = click_depths(nodes, out, "home")
+    assert "orphan" not in depths
+    assert click_depths(nodes, out, "missing") == {}
+
+
+def test_pagerank_mean_is_one():
+    nodes, out = graph([("a", "b"), ("b", "c"), ("c", "a"), ("c", "d")])
+    rank = pagerank(nodes, out)
+    assert sum(rank.values()) / len(rank) == pytest.approx(1.0)
+
+
+def test_pagerank_symmetric_cycle_is_uniform():
+    nodes, out = graph([("a", "b"), ("b", "c"), ("c", "a")])
+    assert all(r == pytest.approx(1.0) for r in pagerank(nodes, out).values())
+
+
+def test_pagerank_hub_outranks_leaves():
+    # Every leaf links to the hub; the hub links back to one of them.
+    nodes, out = graph([("x", "hub"), ("y", "hub"), ("z", "hub"), ("hub", "x")])
+    rank = pagerank(nodes, out)
+    assert rank["hub"] > rank["x"] > rank["y"] == pytest.approx(rank["z"])
+
+
+def test_pagerank_dangling_page_does_not_leak_rank():
+    nodes, out = graph([("a", "b"), ("b", "sink")])
+    rank = pagerank(nodes, out)
+    assert sum(rank.values()) == pytest.approx(len(nodes))
+    assert rank["sink"] > rank["a"]
+
+
+def test_pagerank_empty():
+    assert pagerank([], {}) == {}
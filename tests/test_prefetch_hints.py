@@ -0,0 +1,58 @@
+import json
+import re
+
+import prefetch_hints as ph
+
+PAGE = "<html><head>\n  <title>x</title>\n</head><body></body></html>"
+
+
+def test_next_pages_thresholds_and_order():
+    counts = {
+        "index.html": {"a.html": 50, "b.html": 30, "c.html": 15, "d.html": 4, "e.html": 1},
+        "quiet.html": {"a.html": 3},            # below MIN_VIEWS
+    }
+    hints = ph.next_pages(counts)
+    assert list(hints) == ["index.html"]
+    picked = hints["index.html"]
+    assert [t for t, _, _ in picked] == ["a.html", "b.html", "c.html"]
+    assert picked[0][2] == 0.5
+
+
+def test_next_pages_min_share_and_max_hints():
+    targets = {f"p{i}.html": 10 for i in range(5)} | {"rare.html": 5}
+    total = sum(targets.values())
+    picked = ph.next_pages({"s.html": targets})["s.html"]
+    assert len(picked) == ph.MAX_HINTS
+    assert all(v / total >= ph.MIN_SHARE for _, v, _ in picked)
+    assert [t for t, _, _ in picked] == ["p0.html", "p1.html", "p2.html"]   # ties by path
+
+
+def speculation_rules(page):
+    return json.loads(re.search(r'<script type="speculationrules">(.*?)</script>', page).group(1))
+
+
+def test_apply_hints_inserts_before_head_end():
+    out = ph.apply_hints(PAGE, [("video/x/index.html", 40, 0.4), ("about.html", 10, 0.1)])
+    assert out.index("<!-- /prefetch-hints -->") < out.index("</head>")
+    rules = speculation_rules(out)
+    assert rules["prefetch"][0]["urls"] == ["/video/x/", "/about.html"]
+    assert rules["prerender"][0]["urls"] == ["/video/x/"]
+
+
+def test_apply_hints_prerenders_only_above_share():
+    out = ph.apply_hints(PAGE, [("about.html", 10, ph.PRERENDER_SHARE / 2)])
+    assert "prerender" not in speculation_rules(out)
+
+
+def test_apply_hints_replaces_and_removes():
+    once = ph.apply_hints(PAGE, [("about.html", 40, 0.4)])
+    twice = ph.apply_hints(once, [("contact.html", 40, 0.4)])
+    assert twice.count("<!-- prefetch-hints -->") == 1
+    assert "/about.html" not in twice and "/contact.html" in twice
+    assert ph.apply_hints(once, []) == PAGE
+    assert ph.apply_hints(once, [("about.html", 40, 0.4)]) == once
+
+
+def test_apply_hints_without_head():
+    fragment = "<div>no head here</div>"
+    assert ph.apply_hints(fragment, [("about.html", 40, 0.4)]) == fragment
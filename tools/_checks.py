@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+_checks.py — one check runner for the health and security tools.
+
+site_autopilot (daily check), security_selftest, full_system_check,
+system_doctor and security_monitor (full scan) each used to run their checks
+one after another, most of the time waiting on a subprocess, a TLS handshake
+or an HTTP request. They now declare their checks and hand them to run():
+
+    import _checks as checks
+    report = checks.run("security_selftest", [
+        checks.Check("ufw", test_ufw_firewall, timeout=15),
+        checks.Check("ssl", test_ssl_certificate),
+        checks.Check("monitor-ran", test_security_monitor_ran, deps=["ufw"]),
+    ])
+
+    - independent checks run concurrently (up to MAX_WORKERS threads); a
+      check starts once every check in `deps` has finished, and is skipped
+      when one of them did not pass; `after` only orders (e.g. a check that
+      repairs what another one diagnoses)
+    - a check still running after `timeout` seconds is reported as timed
+      out and the run goes on without it; the thread cannot be killed and
+      its result is discarded, but whatever it prints after run() returns
+      goes straight to the real stdout — long checks poll cancelled()
+      between steps and stop
+    - whatever a check prints is held back and printed in declaration
+      order, so a tool's log reads exactly as it did when checks ran in turn
+    - `ttl` reuses a check's result (and its output) from an earlier run
+      within that many seconds instead of running it again
+
+A check function returns what it always did — True/False, a list of issues
+(empty = pass), None (pass) or a dict with "ok" and "detail" — and every
+tool gets the same report back:
+
+    {"tool", "started", "seconds", "ok", "counts": {status: n},
+     "results": [{"name", "status", "ok", "detail", "seconds", "cached", "value"}]}
+
+status is one of pass, fail, error (the check raised), timeout, skipped.
+save_report() keeps the latest report per tool in data/check-reports/.
+
+Probes shared between tools — the site's TLS certificate, the listening
+TCP ports — go through probe(), which caches a value in
+data/check-cache.json for a TTL, so the autopilot, the self-test, the
+threat scanner and the security monitor running within the same window
+do one handshake and one `ss` between them:
+
+    cert = checks.ssl_certificate()     # {"verified", "days_left", "not_after", "protocol", …}
+    ports = checks.listening_ports()    # [{"addr", "port", "line"}] or None without `ss`
+
+Usage:
+    python3 tools/_checks.py                        # latest report of every tool
+    python3 tools/_checks.py --tool security_selftest
+"""
+
+import io
+import sys
+import json
+import time
+import fcntl
+import socket
+import ssl
+import pathlib
+import argparse
+import threading
+import subprocess
+import traceback
+from datetime import datetime
+
+PROJECT_DIR = pathlib.Path(__file__).parent.parent
+DATA_DIR = PROJECT_DIR / "data"
+CACHE_FILE = DATA_DIR / "check-cache.json"
+REPORTS_DIR = DATA_DIR / "check-reports"
+
+MAX_WORKERS = 8
+DEFAULT_TIMEOUT = 60      # seconds per check
+SITE_HOST = "socialtradingvlog.com"
+SSL_TTL = 3600            # the certificate changes every ~60 days
+PORTS_TTL = 120           # listeners can appear at any time — keep it short
+
+PASS, FAIL, ERROR, TIMEOUT, SKIPPED = "pass", "fail", "error", "timeout", "skipped"
+
+
+class Check:
+    """One check: `fn()` run by run() once every check in `deps` has passed
+    and every check in `after` has finished (passed or not)."""
+
+    def __init__(self, name, fn, deps=(), after=(), timeout=DEFAULT_TIMEOUT, ttl=0):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.after = tuple(after)
+        self.timeout = timeout
+        self.ttl = ttl
+
+
+def outcome(value):
+    """(ok, detail) for whatever a check function returned."""
+    if value is None:
+        return True, ""
+    if isinstance(value, dict) and "ok" in value:
+        return bool(value["ok"]), str(value.get("detail", ""))
+    if isinstance(value, (list, tuple, set)):
+        items = [str(v) for v in value]
+        return not items, "; ".join(items[:5]) + (f" (+{len(items) - 5} more)" if len(items) > 5 else "")
+    return bool(value), ""
+
+
+def _jsonable(value):
+    try:
+        json.dumps(value)
+        return value
+    except (TypeError, ValueError):
+        return repr(value)
+
+
+# ── Output capture ────────────────────────────────────────────────────────────
+
+_local = threading.local()
+
+
+class _ThreadOutput(io.TextIOBase):
+    """sys.stdout/stderr stand-in: text written from a check's thread goes
+    to that check's buffer, everything else to the real stream."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        buf = getattr(_local, "buffer", None)
+        if buf is not None:
+            buf.append(text)
+        else:
+            self.stream.write(text)
+        return len(text)
+
+    def flush(self):
+        if getattr(_local, "buffer", None) is None:
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def current():
+    """Name of the check running in this thread, or None."""
+    return getattr(_local, "check", None)
+
+
+def cancelled():
+    """True once the check running in this thread has timed out. A timed-out
+    check is abandoned, not killed: its thread runs on and its result is
+    discarded, so long checks poll this between steps to stop early."""
+    event = getattr(_local, "cancel", None)
+    return event is not None and event.is_set()
+
+
+def _capture():
+    """Swap in the per-thread stdout/stderr; returns the streams to put back
+    (run() restores them when it returns). A nested run() reuses the
+    wrappers already installed."""
+    saved = sys.stdout, sys.stderr
+    if not isinstance(sys.stdout, _ThreadOutput):
+        sys.stdout = _ThreadOutput(sys.stdout)
+    if not isinstance(sys.stderr, _ThreadOutput):
+        sys.stderr = _ThreadOutput(sys.stderr)
+    return saved
+
+
+# ── Shared probes ─────────────────────────────────────────────────────────────
+
+_probe_locks = {}
+_probe_locks_guard = threading.Lock()
+
+
+def _update_cache(key, value=None, read_only=False):
+    """Read (and unless read_only, set) one cache entry under a file lock.
+    Returns the entry that was there before."""
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_FILE, "a+") as f:
+        fcntl.flock(f, fcntl.LOCK_SH if read_only else fcntl.LOCK_EX)
+        f.seek(0)
+        try:
+            cache = json.loads(f.read() or "{}")
+        except ValueError:
+            cache = {}
+        old = cache.get(key)
+        if not read_only:
+            now = time.time()
+            cache = {k: v for k, v in cache.items() if now - v.get("ts", 0) < 86400}
+            cache[key] = {"ts": now, "value": value}
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps(cache, indent=1, default=str))
+        return old
+
+
+def probe(key, fn, ttl):
+    """fn()'s value, shared between threads and tools for `ttl` seconds.
+    Concurrent callers of the same key wait for one fn() call. Exceptions
+    are not cached."""
+    with _probe_locks_guard:
+        lock = _probe_locks.setdefault(key, threading.Lock())
+    with lock:
+        try:
+            entry = _update_cache(key, read_only=True)
+        except OSError:
+            entry = None
+        if entry and time.time() - entry.get("ts", 0) < ttl:
+            return entry["value"]
+        value = fn()
+        try:
+            _update_cache(key, value)
+        except OSError:
+            pass
+        return value
+
+
+def _fetch_certificate(host):
+    out = {"host": host, "verified": False, "error": None, "not_after": None,
+           "days_left": None, "protocol": None}
+    try:
+        ctx = ssl.create_default_context()
+        with socket.create_connection((host, 443), timeout=10) as sock:
+            with ctx.wrap_socket(sock, server_hostname=host) as ssock:
+                cert = ssock.getpeercert()
+                out["protocol"] = ssock.version()
+        expiry = datetime.strptime(cert["notAfter"], "%b %d %H:%M:%S %Y %Z")
+        out.update(verified=True, not_after=cert["notAfter"],
+                   days_left=(expiry - datetime.utcnow()).days)
+    except ssl.SSLCertVerificationError as e:
+        out["error"] = f"verification failed: {e.verify_message or e}"
+    return out
+
+
+def ssl_certificate(host=SITE_HOST, ttl=SSL_TTL):
+    """The site's TLS certificate as seen by a verifying client: {"host",
+    "verified", "error", "not_after", "days_left", "protocol"}. A certificate
+    that fails verification is a result (verified False, cached); not
+    reaching the host raises OSError and is retried by the next caller."""
+    return probe(f"ssl:{host}", lambda: _fetch_certificate(host), ttl)
+
+
+def _fetch_listeners():
+    try:
+        result = subprocess.run(["ss", "-tlnp"], capture_output=True, text=True, timeout=10)
+    except FileNotFoundError:
+        return None   # macOS — callers fall back to lsof
+    listeners = []
+    for line in result.stdout.strip().split("\n")[1:]:  # skip header
+        parts = line.split()
+        if len(parts) >= 4:
+            addr = parts[3]
+            listeners.append({"addr": addr,
+                              "port": addr.rsplit(":", 1)[-1] if ":" in addr else "",
+                              "line": line.strip()})
+    return listeners
+
+
+def listening_ports(ttl=PORTS_TTL):
+    """Listening TCP sockets from `ss -tlnp`: [{"addr", "port", "line"}],
+    or None where `ss` does not exist."""
+    return probe("listening-ports", _fetch_listeners, ttl)
+
+
+# ── Runner ────────────────────────────────────────────────────────────────────
+
+def _execute(check, tool, results, output, cond, cancel):
+    _local.buffer = []
+    _local.check = check.name
+    _local.cancel = cancel
+    started = time.monotonic()
+    cache_key = f"check:{tool}:{check.name}"
+    try:
+        entry = None
+        if check.ttl:
+            try:
+                entry = _update_cache(cache_key, read_only=True)
+            except OSError:
+                pass
+        if entry and time.time() - entry.get("ts", 0) < check.ttl:
+            result = dict(entry["value"], cached=True)
+            _local.buffer.append(result.pop("output", ""))
+        else:
+            value = check.fn()
+            ok, detail = outcome(value)
+            result = {"name": check.name, "status": PASS if ok else FAIL, "ok": ok,
+                      "detail": detail, "value": _jsonable(value), "cached": False}
+    except Exception as e:
+        traceback.print_exc()
+        result = {"name": check.name, "status": ERROR, "ok": False,
+                  "detail": f"{type(e).__name__}: {e}", "value": None, "cached": False}
+    result["seconds"] = round(time.monotonic() - started, 2)
+    text = "".join(_local.buffer)
+    _local.buffer = None
+    _local.check = None
+    _local.cancel = None
+    if check.ttl and not result["cached"] and result["status"] != ERROR:
+        try:
+            _update_cache(cache_key, dict(result, output=text))
+        except OSError:
+            pass
+    with cond:
+        if check.name not in results:   # not already given up on (timeout)
+            results[check.name] = result
+            output[check.name] = text
+        cond.notify_all()
+
+
+def run(tool, checks, workers=MAX_WORKERS):
+    """Run `checks` (a list of Check) concurrently, respecting deps and
+    timeouts. Prints each check's output in declaration order and returns
+    the report."""
+    names = [c.name for c in checks]
+    by_name = {c.name: c for c in checks}
+    if len(by_name) != len(checks):
+        raise RuntimeError(f"{tool}: duplicate check names")
+    for c in checks:
+        missing = [d for d in c.deps + c.after if d not in by_name]
+        if missing:
+            raise RuntimeError(f"{tool}: check {c.name!r} depends on unknown {missing}")
+
+    started_at = datetime.now()
+    started = time.monotonic()
+    results, output = {}, {}
+    running = {}                      # name → deadline (monotonic)
+    cond = threading.Condition()
+    printed = 0
+    cancel = {}                       # name → Event, set when the check times out
+    saved = _capture()
+    real_out = saved[0]
+    try:
+        with cond:
+            while True:
+                progress = False
+                # Checks whose deps are all done: skip or start them
+                for c in checks:
+                    if c.name in results or c.name in running or len(running) >= workers:
+                        continue
+                    if not all(d in results for d in c.deps + c.after):
+                        continue
+                    failed = [d for d in c.deps if not results[d]["ok"]]
+                    if failed:
+                        results[c.name] = {"name": c.name, "status": SKIPPED, "ok": False,
+                                           "detail": f"needs {', '.join(failed)}", "value": None,
+                                           "cached": False, "seconds": 0}
+                        output[c.name] = ""
+                    else:
+                        running[c.name] = time.monotonic() + c.timeout
+                        cancel[c.name] = threading.Event()
+                        threading.Thread(target=_execute,
+                                         args=(c, tool, results, output, cond, cancel[c.name]),
+                                         name=f"check-{c.name}", daemon=True).start()
+                    progress = True
+                now = time.monotonic()
+                for name, deadline in list(running.items()):
+                    if name in results:
+                        del running[name]
+                    elif now >= deadline:
+                        results[name] = {"name": name, "status": TIMEOUT, "ok": False,
+                                         "detail": f"no result after {by_name[name].timeout}s",
+                                         "value": None, "cached": False,
+                                         "seconds": by_name[name].timeout}
+                        output[name] = ""
+                        cancel[name].set()
+                        del running[name]
+                # Print finished output in declaration order
+                while printed < len(names) and names[printed] in results:
+                    real_out.write(output.pop(names[printed], ""))
+                    printed += 1
+                real_out.flush()
+                if len(results) == len(checks):
+                    break
+                if running:
+                    cond.wait(max(0.05, min(running.values()) - now))
+                elif not progress:
+                    raise RuntimeError(f"{tool}: dependency cycle among "
+                                       f"{[n for n in names if n not in results]}")
+    finally:
+        sys.stdout, sys.stderr = saved
+
+    ordered = [results[n] for n in names]
+    counts = {}
+    for r in ordered:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    return {"tool": tool, "started": started_at.isoformat(timespec="seconds"),
+            "seconds": round(time.monotonic() - started, 2), "ok": all(r["ok"] for r in ordered),
+            "counts": counts, "results": ordered}
+
+
+def save_report(report):
+    """Keep the latest report of each tool in data/check-reports/<tool>.json."""
+    try:
+        REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = REPORTS_DIR / f"{report['tool']}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(report, indent=1, default=str))
+        tmp.replace(path)
+    except OSError:
+        pass
+    return report
+
+
+def load_reports():
+    out = {}
+    for path in sorted(REPORTS_DIR.glob("*.json")) if REPORTS_DIR.exists() else ():
+        try:
+            out[path.stem] = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latest check reports of every tool")
+    parser.add_argument("--tool", help="Print one tool's results in full")
+    args = parser.parse_args()
+
+    reports = load_reports()
+    if not reports:
+        sys.exit("No check reports yet")
+    for tool, report in reports.items():
+        counts = ", ".join(f"{n} {s}" for s, n in sorted(report["counts"].items()))
+        print(f"  {tool:<20} {'ok  ' if report['ok'] else 'FAIL'} {report['started']}  "
+              f"{report['seconds']:>6.1f}s  {counts}")
+        if args.tool == tool:
+            for r in report["results"]:
+                print(f"      {r['status']:<8} {r['name']:<32} {r['seconds']:>6.2f}s"
+                      + (" (cached)" if r.get("cached") else "")
+                      + (f"  {r['detail'][:80]}" if r["detail"] else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+_events.py — the shared ops event log (pipeline, autopilot, security).
+
+Progress used to be visible only by tailing transcriptions/pipeline.log over
+SSH or waiting for the Telegram summary. Long-running tools now also append
+structured events to one log:
+
+    logs/events.jsonl      {"ts": ..., "source": "pipeline", "type": "stage", ...}
+
+one JSON object per line, written with a single O_APPEND write so lines from
+concurrent processes never interleave. Writers never fail because of it:
+
+    import _events as events
+    events.emit("pipeline", "stage", video="abc", stage="translate", status="done",
+                seconds=41.2, langs=["es", "de"])
+
+Readers fold the events into a small current-state summary (fold()) — per-
+stage progress, per-language throughput and API quota for the pipeline,
+last check results for autopilot and security — and EventFollower reads
+only the bytes appended since the last poll, so the dashboard's event stream
+(/api/events) never re-reads the file per request.
+
+Event types by source:
+    pipeline   run (status start/finish, total, mode, languages),
+               progress (index, total, ok, errors), stage (video, stage,
+               status, seconds[, langs]), quota (api, used, limit[, exhausted])
+    autopilot  check (name, ok), run (status, failed)
+    security   check (name, issues), run (status, issues)
+    scheduler  job (name, status start/ok/failed/timeout/skipped[, seconds,
+               rc, reason]), run (status start/reload/finish)
+"""
+
+import os
+import json
+import fcntl
+import time
+import pathlib
+import threading
+from datetime import datetime
+
+PROJECT_DIR = pathlib.Path(__file__).parent.parent
+EVENTS_FILE = PROJECT_DIR / "logs" / "events.jsonl"
+MAX_BYTES = 20 * 1024 * 1024   # rotate to events.jsonl.1 beyond this
+ROTATE_LOCK = EVENTS_FILE.with_name(EVENTS_FILE.name + ".lock")
+THROUGHPUT_WINDOW = 3600       # per-language throughput: completions in the last hour
+
+
+def _rotate():
+    """Move a full log to events.jsonl.1. Under an flock, with the size
+    re-checked once held, so two writers that both saw it full rotate once —
+    the second must not replace .1 with the near-empty new log."""
+    with open(ROTATE_LOCK, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            if EVENTS_FILE.stat().st_size > MAX_BYTES:
+                os.replace(EVENTS_FILE, EVENTS_FILE.with_name(EVENTS_FILE.name + ".1"))
+        except FileNotFoundError:
+            pass
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def emit(source, type, **fields):
+    """Append one event. Best effort: logging must never break the caller."""
+    event = {"ts": datetime.now().isoformat(timespec="seconds"), "source": source,
+             "type": type, **fields}
+    line = (json.dumps(event, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+    try:
+        EVENTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if EVENTS_FILE.stat().st_size > MAX_BYTES:
+                _rotate()
+        except FileNotFoundError:
+            pass
+        fd = os.open(EVENTS_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+    return event
+
+
+# ── State ─────────────────────────────────────────────────────────────────────
+
+def new_state():
+    return {
+        "pipeline": {"run": None, "progress": None, "stages": {}, "current": None,
+                     "languages": {}, "quota": {}},
+        "autopilot": {"run": None, "checks": {}},
+        "security": {"run": None, "checks": {}},
+        "scheduler": {"run": None, "jobs": {}},
+        "updated": None,
+    }
+
+
+def _epoch(ts):
+    try:
+        return datetime.fromisoformat(ts).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
+
+
+def fold(state, event):
+    """Apply one event to a new_state() dict (in place)."""
+    source, kind = event.get("source"), event.get("type")
+    state["updated"] = event.get("ts")
+    if source == "pipeline":
+        p = state["pipeline"]
+        if kind == "run":
+            if event.get("status") == "start":
+                p.update(run=event, progress=None, stages={}, current=None)
+            else:
+                p["run"] = {**(p["run"] or {}), **event}
+                p["current"] = None
+        elif kind == "progress":
+            p["progress"] = event
+        elif kind == "stage":
+            stage = p["stages"].setdefault(event["stage"], {"done": 0, "errors": 0, "seconds": 0.0})
+            status = event.get("status")
+            if status == "start":
+                p["current"] = {"video": event.get("video"), "stage": event["stage"], "since": event["ts"]}
+            elif status in ("done", "error"):
+                stage["done" if status == "done" else "errors"] += 1
+                stage["seconds"] = round(stage["seconds"] + float(event.get("seconds", 0)), 1)
+                now = _epoch(event["ts"])
+                for lang in event.get("langs", ()) if status == "done" else ():
+                    lang_state = p["languages"].setdefault(lang, {"total": 0, "recent": []})
+                    lang_state["total"] += 1
+                    lang_state["recent"] = [t for t in lang_state["recent"]
+                                            if now - t < THROUGHPUT_WINDOW] + [now]
+                    lang_state["per_hour"] = len(lang_state["recent"])
+        elif kind == "quota":
+            p["quota"][event.get("api", "api")] = event
+    elif source in ("autopilot", "security"):
+        s = state[source]
+        if kind == "run":
+            s["run"] = event
+            if event.get("status") == "start":
+                s["checks"] = {}
+        elif kind == "check":
+            s["checks"][event.get("name", "?")] = event
+    elif source == "scheduler":
+        s = state["scheduler"]
+        if kind == "run":
+            s["run"] = event
+            if event.get("status") == "start":
+                for job in s["jobs"].values():
+                    job["running"] = None   # a restart ends whatever was running
+        elif kind == "job":
+            job = s["jobs"].setdefault(event.get("name", "?"), {
+                "runs": 0, "failed": 0, "skipped": 0, "seconds": 0.0, "max": 0.0,
+                "last": None, "running": None})
+            status = event.get("status")
+            if status == "start":
+                job["running"] = event["ts"]
+            elif status == "skipped":
+                job["skipped"] += 1
+            else:
+                seconds = float(event.get("seconds", 0))
+                job["runs"] += 1
+                job["failed"] += status != "ok"
+                job["seconds"] = round(job["seconds"] + seconds, 1)
+                job["max"] = max(job["max"], seconds)
+                job["last"] = {"status": status, "seconds": seconds, "ts": event["ts"]}
+                job["running"] = None
+    return state
+
+
+def public_state(state):
+    """The state without internal bookkeeping, for sending to a browser."""
+    out = json.loads(json.dumps(state))
+    for lang in out["pipeline"]["languages"].values():
+        lang.pop("recent", None)
+    return out
+
+
+class EventFollower:
+    """Follows EVENTS_FILE from a background thread: keeps the folded state
+    and the last `keep` events, and wakes waiters when something arrives.
+    Event ids are the byte offset just past the event's line (plus the file
+    generation, so a rotation restarts the ids)."""
+
+    def __init__(self, path=EVENTS_FILE, keep=500, interval=0.5):
+        self.path = path
+        self.keep = keep
+        self.interval = interval
+        self.state = new_state()
+        self.events = []          # [(id, event)]
+        self.generation = 0
+        self.offset = 0
+        self.inode = None
+        self.cond = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._poll()  # load the existing log before the first client connects
+            self._thread = threading.Thread(target=self._run, name="event-follower", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self._poll()
+            except OSError:
+                pass
+
+    def _poll(self):
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            self.inode, self.offset = st.st_ino, 0  # new or rotated file
+            self.generation += 1
+        if st.st_size == self.offset:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            chunk = f.read(st.st_size - self.offset)
+        end = chunk.rfind(b"\n") + 1   # a partly written last line waits for the next poll
+        if not end:
+            return
+        fresh = []
+        pos = self.offset
+        for raw in chunk[:end].splitlines(keepends=True):
+            pos += len(raw)
+            try:
+                event = json.loads(raw)
+            except ValueError:
+                continue
+            fresh.append((f"{self.generation}-{pos}", event))
+        self.offset += end
+        with self.cond:
+            for _id, event in fresh:
+                fold(self.state, event)
+            self.events = (self.events + fresh)[-self.keep:]
+            self.cond.notify_all()
+
+    def since(self, last_id):
+        """Events after `last_id`, or None when it is unknown / too old."""
+        with self.cond:
+            ids = [i for i, _ in self.events]
+            if last_id not in ids:
+                return None
+            return self.events[ids.index(last_id) + 1:]
+
+    def snapshot(self):
+        with self.cond:
+            last = self.events[-1][0] if self.events else None
+            return last, public_state(self.state)
+
+    def wait(self, last_id, timeout):
+        """Block until an event newer than `last_id` exists (or timeout)."""
+        with self.cond:
+            if not self.events or self.events[-1][0] == last_id:
+                self.cond.wait(timeout)
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+_ga_store.py — a local Google Analytics warehouse in one SQLite file.
+
+analytics_monitor.py and ga_report.py used to ask the GA Data API for the
+same days again on every run — one run_report per analysis, a new client
+each time. ga_ingest.py now pulls each completed day once (batchRunReports,
+several reports per call) into data/ga.sqlite3, and every report is
+computed from here:
+
+    (report, date, d0, d1, d2, m0 … m4)
+
+one row per report per day per dimension combination, clustered by
+(report, date). REPORTS fixes which dimensions and metrics each report
+keeps — d0/d1/d2 and m0… follow the order given there. A day is marked in
+`days` with the report's signature in the same transaction as its rows, so
+changing a report's definition makes its days "missing" again and the next
+ingest re-fetches them.
+
+Aggregating over days and dimensions: counts are summed; the ratio metrics
+in WEIGHTED are averaged weighted by sessions (exact — GA computes them per
+session). totalUsers is summed per day, so a user active on several days
+counts once per day.
+
+    import _ga_store as ga
+    ga.store().fetch(["sessions", "screenPageViews"], ["pagePath"], days=7)
+    ga.store().fetch(["eventCount"], ["eventName"], days=28)
+
+fetch() returns rows shaped like analytics_monitor.fetch_ga_data()'s (one
+dict per row, dimension and metric names as keys) and None when no report
+covers the request, the range is not fully ingested, or the warehouse is
+stale — its newest day older than today − DATA_LAG_DAYS − 1, i.e.
+ingestion has stopped — so callers fall back to the API instead of
+quietly serving old data.
+
+Usage:
+    python3 tools/_ga_store.py                              # stored days per report
+    python3 tools/_ga_store.py --report pages --days 7      # one report, locally
+"""
+
+import sys
+import json
+import sqlite3
+import hashlib
+import pathlib
+import argparse
+import threading
+import functools
+from datetime import date, datetime, timedelta
+
+PROJECT_DIR = pathlib.Path(__file__).parent.parent
+STORE_FILE = PROJECT_DIR / "data" / "ga.sqlite3"
+
+DATA_LAG_DAYS = 2       # GA can still revise the last ~48 hours — ga_ingest stops here
+MAX_DIMENSIONS = 3
+MAX_METRICS = 5
+
+# name: (dimensions, metrics) — "date" is added to every request by ga_ingest
+REPORTS = {
+    "overview":    ([], ["sessions", "totalUsers", "screenPageViews",
+                         "averageSessionDuration", "bounceRate"]),
+    "pages":       (["pagePath"], ["sessions", "screenPageViews", "totalUsers",
+                                   "averageSessionDuration"]),
+    "channels":    (["sessionDefaultChannelGroup"], ["sessions", "totalUsers"]),
+    "sources":     (["sessionSource"], ["sessions", "totalUsers"]),
+    "countries":   (["country"], ["sessions", "totalUsers"]),
+    "devices":     (["deviceCategory"], ["sessions", "totalUsers"]),
+    "events":      (["pagePath", "eventName", "customEvent:event_label"], ["eventCount"]),
+    "transitions": (["pageReferrer", "pagePath"], ["screenPageViews"]),
+}
+
+# Per-session ratios: re-aggregated as SUM(value * sessions) / SUM(sessions)
+WEIGHTED = {"averageSessionDuration": "sessions", "bounceRate": "sessions"}
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS rows (
+        report TEXT NOT NULL,
+        date   TEXT NOT NULL,
+        d0     TEXT NOT NULL,
+        d1     TEXT NOT NULL,
+        d2     TEXT NOT NULL,
+        m0 REAL, m1 REAL, m2 REAL, m3 REAL, m4 REAL,
+        PRIMARY KEY (report, date, d0, d1, d2)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS days (
+        report    TEXT NOT NULL,
+        date      TEXT NOT NULL,
+        rows      INTEGER NOT NULL,
+        signature TEXT NOT NULL,
+        stored    TEXT NOT NULL,
+        PRIMARY KEY (report, date)
+    ) WITHOUT ROWID;
+"""
+
+
+def signature(name):
+    dimensions, metrics = REPORTS[name]
+    return hashlib.sha1(json.dumps([dimensions, metrics]).encode()).hexdigest()[:12]
+
+
+def find_report(metrics, dimensions):
+    """The report (fewest dimensions first) holding all of `metrics` and
+    `dimensions`, or None."""
+    for name, (dims, mets) in sorted(REPORTS.items(), key=lambda kv: len(kv[1][0])):
+        if set(dimensions) <= set(dims) and set(metrics) <= set(mets) and all(
+                WEIGHTED.get(m, m) in mets for m in metrics):
+            return name
+    return None
+
+
+def _number(value):
+    return int(value) if float(value).is_integer() else round(value, 4)
+
+
+class GaStore:
+    """The warehouse. One SQLite connection per thread, like GscStore."""
+
+    def __init__(self, path=STORE_FILE):
+        self.path = path
+        self._local = threading.local()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self.db:
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.executescript(SCHEMA)
+
+    @property
+    def db(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=30)
+        return db
+
+    # ── Write side ──
+
+    def replace_day(self, report, day, rows):
+        """Store one report's rows for one day ([dimension values], [metric
+        values]), replacing whatever was stored for it, and mark the day."""
+        dimensions, metrics = REPORTS[report]
+        with self.db:
+            self.db.execute("DELETE FROM rows WHERE report = ? AND date = ?", (report, day))
+            self.db.executemany(
+                "INSERT OR REPLACE INTO rows VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(report, day, *(list(dims) + [""] * MAX_DIMENSIONS)[:MAX_DIMENSIONS],
+                  *([float(v) for v in mets] + [None] * MAX_METRICS)[:MAX_METRICS])
+                 for dims, mets in rows])
+            self.db.execute(
+                "INSERT OR REPLACE INTO days VALUES (?, ?, ?, ?, ?)",
+                (report, day, len(rows), signature(report),
+                 datetime.now().isoformat(timespec="seconds")))
+
+    # ── Read side ──
+
+    def dates(self, report):
+        """Days stored for `report` under its current definition."""
+        return {r[0] for r in self.db.execute(
+            "SELECT date FROM days WHERE report = ? AND signature = ?",
+            (report, signature(report)))}
+
+    def last_date(self, report):
+        return self.db.execute(
+            "SELECT MAX(date) FROM days WHERE report = ? AND signature = ?",
+            (report, signature(report))).fetchone()[0]
+
+    def is_fresh(self, report, today=None):
+        """True when ingestion of `report` is current: its newest day is at
+        most one day older than the newest day ga_ingest would fetch."""
+        last = self.last_date(report)
+        due = (today or date.today()) - timedelta(days=DATA_LAG_DAYS + 1)
+        return last is not None and last >= due.isoformat()
+
+    def window(self, report, days, allow_stale=False):
+        """(start, end) of the last `days` stored days, or None when any of
+        them is missing or the report is stale (unless `allow_stale`)."""
+        end = self.last_date(report)
+        if end is None or not (allow_stale or self.is_fresh(report)):
+            return None
+        start = (date.fromisoformat(end) - timedelta(days=days - 1)).isoformat()
+        stored = self.db.execute(
+            "SELECT COUNT(*) FROM days WHERE report = ? AND signature = ? AND date >= ?",
+            (report, signature(report), start)).fetchone()[0]
+        return (start, end) if stored >= days else None
+
+    def query(self, report, metrics, dimensions, start, end, order=None, limit=None, where=None):
+        """[{dimension: value, metric: number}] for `report` over [start, end],
+        grouped by `dimensions`, ordered by `order` (default: the first
+        metric) descending. `where` is {dimension: value}."""
+        dims, mets = REPORTS[report]
+        dcol = {d: f"d{i}" for i, d in enumerate(dims)}
+        mcol = {m: f"m{i}" for i, m in enumerate(mets)}
+        select = [dcol[d] for d in dimensions]
+        for m in metrics:
+            if m in WEIGHTED:
+                w = mcol[WEIGHTED[m]]
+                select.append(f"SUM({mcol[m]} * {w}) / MAX(SUM({w}), 1)")
+            else:
+                select.append(f"SUM({mcol[m]})")
+        sql, args = ["report = ?", "date >= ?", "date <= ?"], [report, start, end]
+        for d, value in (where or {}).items():
+            sql.append(f"{dcol[d]} = ?")
+            args.append(value)
+        order_col = len(dimensions) + metrics.index(order or metrics[0]) + 1
+        text = (f"SELECT {', '.join(select)} FROM rows WHERE {' AND '.join(sql)}"
+                + (f" GROUP BY {', '.join(select[:len(dimensions)])}" if dimensions else "")
+                + f" ORDER BY {order_col} DESC")
+        if limit:
+            text += f" LIMIT {int(limit)}"
+        out = []
+        for row in self.db.execute(text, args):
+            if not dimensions and row[0] is None:
+                break  # no rows at all in the range
+            entry = dict(zip(dimensions, row))
+            for m, value in zip(metrics, row[len(dimensions):]):
+                entry[m] = _number(value or 0)
+            out.append(entry)
+        return out
+
+    def fetch(self, metrics, dimensions, days=7, order=None, limit=None):
+        """fetch_ga_data()-shaped rows over the last `days` stored days, or
+        None when no report covers the request or a day is missing."""
+        report = find_report(metrics, dimensions)
+        if report is None:
+            return None
+        span = self.window(report, days)
+        if span is None:
+            return None
+        return self.query(report, metrics, dimensions, *span, order=order, limit=limit)
+
+    def summary(self):
+        out = {}
+        for report, days, first, last, rows in self.db.execute(
+                "SELECT report, COUNT(*), MIN(date), MAX(date), SUM(rows) FROM days "
+                "GROUP BY report ORDER BY report"):
+            out[report] = {"days": days, "first": first, "last": last, "rows": rows}
+        return out
+
+
+@functools.lru_cache(maxsize=None)
+def store():
+    """The process-wide warehouse."""
+    return GaStore(STORE_FILE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Google Analytics warehouse")
+    parser.add_argument("--report", choices=sorted(REPORTS), help="Print one report")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    s = store()
+    print(f"GA warehouse — {STORE_FILE.relative_to(PROJECT_DIR)}")
+    for report, info in s.summary().items():
+        print(f"  {report:<12} {info['days']:>5} day(s) {info['first']} → {info['last']}, "
+              f"{info['rows']:,} rows")
+    if args.report:
+        dimensions, metrics = REPORTS[args.report]
+        span = s.window(args.report, args.days, allow_stale=True)
+        if not s.is_fresh(args.report):
+            print(f"\n  WARNING: {args.report} is stale — ingestion has not run since {s.last_date(args.report)}")
+        if span is None:
+            sys.exit(f"\n  {args.report}: the last {args.days} day(s) are not all stored "
+                     "— run tools/ga_ingest.py")
+        print(f"\n  {args.report} {span[0]} → {span[1]}")
+        for row in s.query(args.report, metrics, dimensions, *span, limit=args.limit):
+            print("    " + "  ".join(f"{row[m]:>10}" for m in metrics) + "  "
+                  + " · ".join(str(row[d]) for d in dimensions))
+
+
+if __name__ == "__main__":
+    main()
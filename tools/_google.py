@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+_google.py — shared, authenticated Google API clients.
+
+Every tool used to read the service-account key, build its own credentials
+and exchange them for an access token on each run. Here each credential set
+and discovery service is built once per process and reused:
+
+    import _google
+    service = _google.searchconsole()          # Search Console v1
+    client = _google.analytics_data()          # GA Data API (gRPC)
+
+The scheduler (tools/scheduler.py) calls warm() in its long-running parent
+before forking each job, so jobs start with the libraries imported, the
+discovery documents parsed and a valid access token already in memory —
+the token exchange happens once an hour instead of once per job.
+
+gRPC channels must not cross a fork, so analytics_data() is only ever built
+in the process that uses it (the credentials it wraps are still shared).
+"""
+
+import pathlib
+import functools
+
+KEY_FILE = pathlib.Path.home() / ".config" / "stv-secrets" / "ga-service-account.json"
+
+ANALYTICS_SCOPES = ("https://www.googleapis.com/auth/analytics.readonly",)
+SEARCHCONSOLE_SCOPES = ("https://www.googleapis.com/auth/webmasters",)
+TOKEN_MARGIN = 900   # refresh tokens expiring within 15 minutes
+
+
+@functools.lru_cache(maxsize=None)
+def credentials(scopes):
+    """Service-account credentials for a tuple of scopes."""
+    from google.oauth2 import service_account
+    if not KEY_FILE.exists():
+        raise RuntimeError(f"Google service account not found ({KEY_FILE})")
+    return service_account.Credentials.from_service_account_file(str(KEY_FILE), scopes=list(scopes))
+
+
+def refresh(creds):
+    """Fetch an access token now unless the current one has TOKEN_MARGIN left."""
+    from datetime import datetime, timedelta
+    from google.auth.transport.requests import Request
+    expiry = creds.expiry
+    if creds.token and expiry and expiry - timedelta(seconds=TOKEN_MARGIN) > datetime.utcnow():
+        return creds
+    creds.refresh(Request())
+    return creds
+
+
+@functools.lru_cache(maxsize=None)
+def searchconsole():
+    from googleapiclient.discovery import build
+    return build("searchconsole", "v1", credentials=credentials(SEARCHCONSOLE_SCOPES),
+                 cache_discovery=False)
+
+
+def new_searchconsole():
+    """A Search Console service of its own (its own HTTP connection) for a
+    worker thread — the shared searchconsole() must not be used from
+    several threads at once."""
+    from googleapiclient.discovery import build
+    return build("searchconsole", "v1", credentials=credentials(SEARCHCONSOLE_SCOPES),
+                 cache_discovery=False)
+
+
+@functools.lru_cache(maxsize=None)
+def analytics_data():
+    from google.analytics.data_v1beta import BetaAnalyticsDataClient
+    return BetaAnalyticsDataClient(credentials=credentials(ANALYTICS_SCOPES))
+
+
+def warm():
+    """Import the client libraries, build the discovery services and refresh
+    the tokens. Returns what could not be warmed ({name: error}); nothing
+    here is required — jobs build whatever is missing themselves."""
+    failed = {}
+    for name, scopes in (("analytics", ANALYTICS_SCOPES), ("searchconsole", SEARCHCONSOLE_SCOPES)):
+        try:
+            refresh(credentials(scopes))
+        except Exception as e:
+            failed[name] = str(e)[:200]
+    try:
+        searchconsole()
+        import google.analytics.data_v1beta  # noqa: F401 — import only, no channel
+    except Exception as e:
+        failed["libraries"] = str(e)[:200]
+    return failed
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+_gsc_store.py — Search Console history in one append-only SQLite store.
+
+gsc_snapshot.py writes one reports/gsc-YYYY-MM-DD.json per day, and the
+dashboard's position history and `gsc_snapshot.py --compare` used to re-read
+and re-parse every one of those files on every request / run. This store
+keeps the same numbers as rows
+
+    (source, date, query, page, country, device,
+     clicks, impressions, ctr, position)
+
+in data/gsc.sqlite3, clustered by (source, date) with secondary indexes on
+query and page, so a history or range query reads only the rows it returns.
+Query strings and page URLs are interned in a `dims` table (id 0 = "not a
+dimension of this row"). Two sources share the table:
+
+    snapshot   what save_snapshot() captures: rolling DAYS-day aggregates as
+               of `date` — the overview (no query, no page), top queries
+               (query only) and top pages (page only). Not additive across
+               dates: downsampling keeps the last snapshot of each bucket.
+    daily      one day's data per row (gsc_export.py: query × page × country
+               × device, plus the day's totals with no dimensions). Additive:
+               downsampling sums clicks/impressions and weights position by
+               impressions.
+
+Rows are only ever inserted (INSERT OR IGNORE on the full key), and each
+stored day is marked in `days` in the same transaction, so an interrupted
+import or export is simply repeated. The store is created on first use; the
+one-time import of the existing JSON snapshots also runs lazily (any
+reports/gsc-*.json whose date is not stored yet), so it is always safe to
+call:
+
+    import _gsc_store as gs
+    gs.store().history()                                 # dashboard shape
+    gs.store().series(query="etoro review", bucket="week")
+    gs.store().top("page", source="daily", start="2026-01-01", like="/es/")
+
+Usage:
+    python3 tools/_gsc_store.py                     # import snapshots + summary
+    python3 tools/_gsc_store.py --series "copy trading" --bucket month
+    python3 tools/_gsc_store.py --top query --source daily --like etoro
+"""
+
+import sys
+import json
+import sqlite3
+import pathlib
+import argparse
+import threading
+import functools
+from datetime import datetime
+
+PROJECT_DIR = pathlib.Path(__file__).parent.parent
+STORE_FILE = PROJECT_DIR / "data" / "gsc.sqlite3"
+SNAPSHOT_GLOB = "reports/gsc-*.json"
+
+SNAPSHOT = "snapshot"
+DAILY = "daily"
+BUCKETS = ("day", "week", "month")
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS dims (
+        id    INTEGER PRIMARY KEY,
+        value TEXT NOT NULL UNIQUE
+    );
+    INSERT OR IGNORE INTO dims VALUES (0, '');
+    CREATE TABLE IF NOT EXISTS rows (
+        source      TEXT    NOT NULL,
+        date        TEXT    NOT NULL,
+        query_id    INTEGER NOT NULL,
+        page_id     INTEGER NOT NULL,
+        country     TEXT    NOT NULL,
+        device      TEXT    NOT NULL,
+        clicks      INTEGER NOT NULL,
+        impressions INTEGER NOT NULL,
+        ctr         REAL    NOT NULL,
+        position    REAL    NOT NULL,
+        PRIMARY KEY (source, date, query_id, page_id, country, device)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS rows_by_query ON rows (query_id, source, date);
+    CREATE INDEX IF NOT EXISTS rows_by_page  ON rows (page_id, source, date);
+    CREATE TABLE IF NOT EXISTS days (
+        source TEXT NOT NULL,
+        date   TEXT NOT NULL,
+        rows   INTEGER NOT NULL,
+        stored TEXT NOT NULL,
+        extra  TEXT,
+        PRIMARY KEY (source, date)
+    ) WITHOUT ROWID;
+"""
+
+# Position is averaged weighted by impressions, like Search Console does.
+AGGREGATE = ("SUM(clicks), SUM(impressions), "
+             "SUM(position * impressions) / MAX(SUM(impressions), 1)")
+
+
+def bucket_key(date, bucket):
+    """Bucket label for an ISO date: itself, the Monday of its week, or YYYY-MM."""
+    if bucket == "day":
+        return date
+    if bucket == "month":
+        return date[:7]
+    d = datetime.strptime(date, "%Y-%m-%d").date()
+    return d.fromordinal(d.toordinal() - d.weekday()).isoformat()
+
+
+class GscStore:
+    """The store. One SQLite connection per thread (the dashboard serves
+    requests concurrently)."""
+
+    def __init__(self, path=STORE_FILE):
+        self.path = path
+        self._local = threading.local()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self.db:
+            self.db.execute("PRAGMA journal_mode=WAL")  # readers never block the writer
+            self.db.executescript(SCHEMA)
+
+    @property
+    def db(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=30)
+        return db
+
+    # ── Write side ──
+
+    def _dim(self, value):
+        if not value:
+            return 0
+        self.db.execute("INSERT OR IGNORE INTO dims (value) VALUES (?)", (value,))
+        return self.db.execute("SELECT id FROM dims WHERE value = ?", (value,)).fetchone()[0]
+
+    def _dim_id(self, value):
+        """Id of an existing dimension value, None if never stored."""
+        row = self.db.execute("SELECT id FROM dims WHERE value = ?", (value,)).fetchone()
+        return row[0] if row else None
+
+    def append(self, source, date, rows, extra=None):
+        """Store one day's rows (dicts with any of query/page/country/device +
+        clicks/impressions/ctr/position) and mark the day stored. Whatever was
+        stored for (source, date) before is replaced in the same transaction,
+        so re-running a day never mixes two fetches. Returns the number of
+        rows stored."""
+        with self.db:
+            self.db.execute("DELETE FROM rows WHERE source = ? AND date = ?", (source, date))
+            values = [(source, date, self._dim(r.get("query")), self._dim(r.get("page")),
+                       r.get("country", ""), r.get("device", ""),
+                       int(r.get("clicks", 0)), int(r.get("impressions", 0)),
+                       float(r.get("ctr", 0)), float(r.get("position", 0)))
+                      for r in rows]
+            added = self.db.executemany(
+                "INSERT OR IGNORE INTO rows VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", values).rowcount
+            self.db.execute(
+                "INSERT OR REPLACE INTO days VALUES (?, ?, ?, ?, ?)",
+                (source, date, len(rows), datetime.now().isoformat(timespec="seconds"),
+                 json.dumps(extra) if extra is not None else None))
+        return added
+
+    def append_snapshot(self, snapshot):
+        """Store a save_snapshot() dict (overview, queries, pages)."""
+        rows = []
+        if snapshot.get("overview"):
+            rows.append(dict(snapshot["overview"]))
+        rows += [dict(q) for q in snapshot.get("queries", [])]
+        rows += [dict(p) for p in snapshot.get("pages", [])]
+        extra = {"period": snapshot.get("period"), "sitemaps": snapshot.get("sitemaps", [])}
+        return self.append(SNAPSHOT, snapshot["date"], rows, extra=extra)
+
+    def import_snapshots(self, root=PROJECT_DIR):
+        """Import every reports/gsc-*.json not stored yet (the one-time
+        migration, and any file written by an older save_snapshot()).
+        Returns the number of files imported."""
+        stored = self.dates(SNAPSHOT)
+        imported = 0
+        for path in sorted(root.glob(SNAPSHOT_GLOB)):
+            date = path.stem[len("gsc-"):]
+            if date in stored:
+                continue
+            try:
+                snapshot = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            snapshot.setdefault("date", date)
+            self.append_snapshot(snapshot)
+            imported += 1
+        return imported
+
+    # ── Read side ──
+
+    def dates(self, source):
+        """Stored dates of a source (a day with zero rows still counts)."""
+        return {r[0] for r in self.db.execute("SELECT date FROM days WHERE source = ?", (source,))}
+
+    def day_log(self, source):
+        """{date: (rows, stored at)} for every stored date of a source."""
+        return {d: (n, at) for d, n, at in self.db.execute(
+            "SELECT date, rows, stored FROM days WHERE source = ?", (source,))}
+
+    def _where(self, source, start, end, query, page):
+        """(sql, args) filter, or None when a filter value was never stored."""
+        sql, args = ["source = ?"], [source]
+        if start:
+            sql.append("date >= ?")
+            args.append(start)
+        if end:
+            sql.append("date <= ?")
+            args.append(end)
+        for column, value in (("query_id", query), ("page_id", page)):
+            if value is None:
+                continue
+            dim = self._dim_id(value)
+            if dim is None:
+                return None
+            sql.append(f"{column} = ?")
+            args.append(dim)
+        if query is None and page is None:
+            sql.append("query_id = 0 AND page_id = 0")  # the totals rows
+        return " AND ".join(sql), args
+
+    def series(self, query=None, page=None, source=SNAPSHOT, start=None, end=None, bucket="day"):
+        """[{date, clicks, impressions, ctr, position}] for one query, one
+        page, or (neither) the site totals, downsampled to `bucket`."""
+        where = self._where(source, start, end, query, page)
+        if where is None:
+            return []
+        sql, args = where
+        per_day = self.db.execute(
+            f"SELECT date, {AGGREGATE} FROM rows WHERE {sql} GROUP BY date ORDER BY date",
+            args).fetchall()
+        buckets = {}
+        for date, clicks, impressions, position in per_day:
+            key = bucket_key(date, bucket)
+            if source == SNAPSHOT or key not in buckets:
+                buckets[key] = [clicks, impressions, position * impressions]
+            else:
+                b = buckets[key]
+                b[0] += clicks
+                b[1] += impressions
+                b[2] += position * impressions
+        return [{"date": key, "clicks": c, "impressions": i,
+                 "ctr": round(c / i, 4) if i else 0.0,
+                 "position": round(p / i, 1) if i else 0.0}
+                for key, (c, i, p) in buckets.items()]
+
+    def top(self, dimension, source=SNAPSHOT, start=None, end=None, like=None, limit=50,
+            order="impressions"):
+        """Best `dimension` ("query" or "page") values over a date range,
+        optionally only those containing `like`. For snapshots only the last
+        snapshot in the range is used (rolling windows are not additive)."""
+        column = {"query": "query_id", "page": "page_id"}[dimension]
+        other = "page_id" if column == "query_id" else "query_id"
+        sql, args = ["r.source = ?", f"r.{column} != 0"], [source]
+        if source == SNAPSHOT:
+            last = self.db.execute(
+                "SELECT MAX(date) FROM days WHERE source = ? AND date >= ? AND date <= ?",
+                (source, start or "", end or "9999")).fetchone()[0]
+            if last is None:
+                return []
+            sql.append("r.date = ?")
+            args.append(last)
+            sql.append(f"r.{other} = 0")
+        else:
+            if start:
+                sql.append("r.date >= ?")
+                args.append(start)
+            if end:
+                sql.append("r.date <= ?")
+                args.append(end)
+        if like:
+            sql.append("d.value LIKE ?")
+            args.append(f"%{like}%")
+        order_by = {"impressions": "2 DESC", "clicks": "1 DESC", "position": "3 ASC"}[order]
+        rows = self.db.execute(
+            f"SELECT SUM(r.clicks), SUM(r.impressions), "
+            f"SUM(r.position * r.impressions) / MAX(SUM(r.impressions), 1), d.value "
+            f"FROM rows r JOIN dims d ON d.id = r.{column} WHERE {' AND '.join(sql)} "
+            f"GROUP BY r.{column} ORDER BY {order_by}, d.value LIMIT ?",
+            args + [limit]).fetchall()
+        return [{dimension: value, "clicks": c, "impressions": i,
+                 "ctr": round(c / i, 4) if i else 0.0, "position": round(p, 1)}
+                for c, i, p, value in rows]
+
+    def history(self, start=None, end=None):
+        """{query: [{date, position, clicks, impressions}]} across snapshots —
+        what the dashboard's position-history chart reads."""
+        sql, args = "r.source = ? AND r.query_id != 0 AND r.page_id = 0", [SNAPSHOT]
+        if start:
+            sql += " AND r.date >= ?"
+            args.append(start)
+        if end:
+            sql += " AND r.date <= ?"
+            args.append(end)
+        history = {}
+        for query, date, position, clicks, impressions in self.db.execute(
+                "SELECT d.value, r.date, r.position, r.clicks, r.impressions "
+                f"FROM rows r JOIN dims d ON d.id = r.query_id WHERE {sql} "
+                "ORDER BY r.date", args):
+            history.setdefault(query, []).append(
+                {"date": date, "position": position, "clicks": clicks, "impressions": impressions})
+        return history
+
+    def snapshot(self, date):
+        """The snapshot stored for `date`, in save_snapshot()'s shape (without
+        sitemaps' live counts beyond what was captured), or None."""
+        day = self.db.execute("SELECT extra FROM days WHERE source = ? AND date = ?",
+                              (SNAPSHOT, date)).fetchone()
+        if day is None:
+            return None
+        extra = json.loads(day[0] or "{}")
+        snap = {"date": date, "period": extra.get("period"), "overview": {},
+                "queries": [], "pages": [], "sitemaps": extra.get("sitemaps", [])}
+        for q, p, clicks, impressions, ctr, position in self.db.execute(
+                "SELECT q.value, p.value, r.clicks, r.impressions, r.ctr, r.position FROM rows r "
+                "JOIN dims q ON q.id = r.query_id JOIN dims p ON p.id = r.page_id "
+                "WHERE r.source = ? AND r.date = ? ORDER BY r.impressions DESC",
+                (SNAPSHOT, date)):
+            metrics = {"clicks": clicks, "impressions": impressions, "ctr": ctr, "position": position}
+            if q:
+                snap["queries"].append({"query": q, **metrics})
+            elif p:
+                snap["pages"].append({"page": p, **metrics})
+            else:
+                snap["overview"] = metrics
+        return snap
+
+    def summary(self):
+        out = {}
+        for source, days, first, last in self.db.execute(
+                "SELECT source, COUNT(*), MIN(date), MAX(date) FROM days GROUP BY source"):
+            rows = self.db.execute("SELECT COUNT(*) FROM rows WHERE source = ?", (source,)).fetchone()[0]
+            out[source] = {"days": days, "first": first, "last": last, "rows": rows}
+        return out
+
+
+@functools.lru_cache(maxsize=None)
+def store():
+    """The process-wide store, with any not-yet-imported JSON snapshots imported."""
+    s = GscStore(STORE_FILE)
+    s.import_snapshots()
+    return s
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search Console time-series store")
+    parser.add_argument("--series", metavar="QUERY", help="Time series of one query")
+    parser.add_argument("--page", help="Time series of one page URL")
+    parser.add_argument("--top", choices=["query", "page"], help="Best queries/pages in the range")
+    parser.add_argument("--source", choices=[SNAPSHOT, DAILY], default=SNAPSHOT)
+    parser.add_argument("--start", help="YYYY-MM-DD")
+    parser.add_argument("--end", help="YYYY-MM-DD")
+    parser.add_argument("--bucket", choices=BUCKETS, default="day")
+    parser.add_argument("--like", help="--top: only values containing this")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    s = store()
+    print(f"GSC store — {STORE_FILE.relative_to(PROJECT_DIR)}")
+    for source, info in s.summary().items():
+        print(f"  {source:<9} {info['days']:>5} day(s) {info['first']} → {info['last']}, "
+              f"{info['rows']:,} rows")
+
+    if args.series or args.page or not args.top:
+        points = s.series(query=args.series, page=args.page, source=args.source,
+                          start=args.start, end=args.end, bucket=args.bucket)
+        label = args.series or args.page or "site totals"
+        print(f"\n  {label} ({args.source}, per {args.bucket})")
+        for p in points:
+            print(f"    {p['date']:<10} {p['clicks']:>7} clicks {p['impressions']:>9} impr "
+                  f"pos {p['position']:>5}")
+    if args.top:
+        print(f"\n  Top {args.top} ({args.source})")
+        for r in s.top(args.top, source=args.source, start=args.start, end=args.end,
+                       like=args.like, limit=args.limit):
+            print(f"    {r['impressions']:>8} {r['clicks']:>6} {r['position']:>6}  {r[args.top]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+_hreflang.py — the site-wide hreflang alternates graph, built once per build.
+
+Every translated generator used to carry its own build_hreflang_tags() that
+loaded the translation JSON for every language just to discover a page's
+siblings, and generate_sitemap.py then re-read every output HTML file to
+recover the same graph. Four copies of the URL rules, N×languages JSON loads,
+and nothing checked that the clusters agreed with each other.
+
+Here the graph is derived ONCE from the translation sources (slugs come from
+the compiled translation store, see _translation_store.py):
+
+    cluster id  → {lang: absolute URL}      ("en" is always present)
+
+    video:<video_id>     /video/SLUG/        ↔ /<lang>/video/SLUG/
+    article:<id>         /SLUG/              ↔ /<lang>/SLUG/
+    legacy:<page_id>     /page.html          ↔ /<lang>/SLUG/
+    update:<page_id>     /updates/file.html  ↔ /<lang>/updates/SLUG/
+    faq, contact         /faq.html           ↔ /<lang>/SLUG/
+
+and cached in data/hreflang-graph.json, keyed by a fingerprint (mtime + size)
+of the sources, so later generators and the sitemap in the same build — or
+the next build, if nothing changed — just read it back:
+
+    import _hreflang
+    hreflang_tags = _hreflang.tags(f"video:{video_id}")
+    alternates = _hreflang.alternates_for_url(url)     # sitemap
+
+Because every member of a cluster renders the SAME tag block, the emitted
+annotations are reciprocal by construction. check_graph() guards the other
+half (no URL claimed by two clusters, no language twice) and runs on every
+rebuild; check_pages() compares the graph with the HTML already on disk,
+which matters because generators only write missing pages unless --force:
+
+    python3 tools/_hreflang.py            # rebuild + summary
+    python3 tools/_hreflang.py --check    # also diff against published pages
+"""
+
+import re
+import sys
+import json
+import hashlib
+import pathlib
+import argparse
+import functools
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+import _translation_store as ts
+
+PROJECT_DIR = pathlib.Path(__file__).parent.parent
+TOOLS_DIR = pathlib.Path(__file__).parent
+TRANSLATIONS_DIR = TOOLS_DIR / "translations"
+GRAPH_FILE = PROJECT_DIR / "data" / "hreflang-graph.json"
+BASE_URL = "https://socialtradingvlog.com"
+
+# Files whose contents define the graph. Inline translations and page tables
+# live in the generators themselves, so they are part of the fingerprint.
+SOURCE_MODULES = [
+    "generate_translated_pages.py",
+    "generate_translated_article_pages.py",
+    "generate_translated_legacy_pages.py",
+    "generate_translated_updates_faq_contact.py",
+    "_translation_store.py",
+    "_hreflang.py",
+]
+
+HREFLANG_RE = re.compile(
+    r'<link\s+rel="alternate"\s+hreflang="([^"]+)"\s+href="([^"]+)"')
+
+
+def fingerprint():
+    """Hash of (name, mtime, size) for every source the graph is built from."""
+    sources = [TOOLS_DIR / name for name in SOURCE_MODULES]
+    if TRANSLATIONS_DIR.exists():
+        sources += sorted(TRANSLATIONS_DIR.glob("*.json"))
+    h = hashlib.sha256()
+    for path in sources:
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        h.update(f"{path.name}:{st.st_mtime_ns}:{st.st_size}\n".encode())
+    return h.hexdigest()[:16]
+
+
+# ── Sources ───────────────────────────────────────────────────────────────────
+
+def _slugs(page_id):
+    """{lang: slug} for every translation of a page in the translation store."""
+    store = ts.store()
+    return {lang: store.get(page_id, lang, "slug")
+            for lang in store.langs(page_id) if lang != "en"}
+
+
+def _video_clusters():
+    from generate_translated_pages import TRANSLATIONS
+    clusters = {}
+    for video_id, data in TRANSLATIONS.items():
+        langs = {lang: t["slug"] for lang, t in data["translations"].items()}
+        # JSON translations only add languages the inline table doesn't
+        # already have (same precedence as load_translations_from_json()).
+        for lang, slug in _slugs(f"video:{video_id}").items():
+            langs.setdefault(lang, slug)
+        cluster = {"en": f"{BASE_URL}/video/{data['en_slug']}/"}
+        for lang, slug in langs.items():
+            cluster[lang] = f"{BASE_URL}/{lang}/video/{slug}/"
+        clusters[f"video:{video_id}"] = cluster
+    return clusters
+
+
+def _article_clusters():
+    from generate_translated_article_pages import ARTICLES
+    clusters = {}
+    for article_id, article in ARTICLES.items():
+        cluster = {"en": f"{BASE_URL}/{article['en_slug']}/"}
+        for lang, slug in _slugs(f"article:{article_id}").items():
+            cluster[lang] = f"{BASE_URL}/{lang}/{slug}/"
+        clusters[f"article:{article_id}"] = cluster
+    return clusters
+
+
+def _legacy_clusters():
+    from generate_translated_legacy_pages import LEGACY_PAGES
+    clusters = {}
+    for page_id, page in LEGACY_PAGES.items():
+        cluster = {"en": f"{BASE_URL}/{page['en_file']}"}
+        for lang, slug in _slugs(f"legacy:{page_id}").items():
+            cluster[lang] = f"{BASE_URL}/{lang}/{slug}/"
+        clusters[f"legacy:{page_id}"] = cluster
+    return clusters
+
+
+def _updates_faq_contact_clusters():
+    store = ts.store()
+    clusters = {}
+    for page_type in ("faq", "contact"):
+        cluster = {"en": f"{BASE_URL}/{page_type}.html"}
+        for lang, slug in _slugs(page_type).items():
+            cluster[lang] = f"{BASE_URL}/{lang}/{slug}/"
+        clusters[page_type] = cluster
+
+    for cid in store.page_ids("update"):
+        translated = _slugs(cid)
+        if not translated:
+            continue  # English-only post
+        page_id = cid.split(":", 1)[1]
+        try:
+            en_filename = store.get(cid, "en", "filename")
+        except ts.MissingTranslation:
+            en_filename = f"{page_id}.html"
+        cluster = {"en": f"{BASE_URL}/updates/{en_filename}"}
+        for lang, slug in translated.items():
+            cluster[lang] = f"{BASE_URL}/{lang}/updates/{slug}/"
+        clusters[cid] = cluster
+    return clusters
+
+
+def build_graph():
+    """Derive {cluster_id: {lang: url}} from the translation sources."""
+    clusters = {}
+    clusters.update(_video_clusters())
+    clusters.update(_article_clusters())
+    clusters.update(_legacy_clusters())
+    clusters.update(_updates_faq_contact_clusters())
+    return clusters
+
+
+# ── Consistency ───────────────────────────────────────────────────────────────
+
+def check_graph(clusters):
+    """Structural problems that would make annotations non-reciprocal.
+
+    A URL may belong to only one cluster (otherwise the page would claim two
+    different sets of siblings), and a cluster may not map two languages to
+    the same URL. Returns a list of messages; empty means consistent.
+    """
+    problems = []
+    owner = {}
+    for cid, cluster in sorted(clusters.items()):
+        if "en" not in cluster:
+            problems.append(f"{cid}: no English page")
+        seen = {}
+        for lang, url in sorted(cluster.items()):
+            if url in seen:
+                problems.append(f"{cid}: {url} is both {seen[url]} and {lang}")
+            seen[url] = lang
+            if url in owner and owner[url] != cid:
+                problems.append(f"{url} is in both {owner[url]} and {cid}")
+            owner.setdefault(url, cid)
+    return problems
+
+
+def url_to_path(url, root=PROJECT_DIR):
+    """Published file for an absolute site URL."""
+    rel = url[len(BASE_URL):].lstrip("/")
+    if not rel or rel.endswith("/"):
+        rel += "index.html"
+    return root / rel
+
+
+def check_pages(clusters, root=PROJECT_DIR):
+    """Compare each published member page's hreflang tags with its cluster.
+
+    Pages generated before a sibling existed (generators skip existing files
+    without --force) miss that sibling — the non-reciprocal case search
+    engines ignore. Missing files are reported too.
+    """
+    problems = []
+    for cid, cluster in sorted(clusters.items()):
+        expected = dict(cluster, **{"x-default": cluster.get("en")})
+        for lang, url in sorted(cluster.items()):
+            path = url_to_path(url, root)
+            if not path.exists():
+                problems.append(f"{cid}: {lang} page missing ({path.relative_to(root)})")
+                continue
+            found = dict(HREFLANG_RE.findall(
+                path.read_text(encoding="utf-8", errors="ignore")))
+            if found != expected:
+                missing = sorted(set(expected) - set(found))
+                extra = sorted(set(found) - set(expected))
+                wrong = sorted(k for k in set(found) & set(expected)
+                               if found[k] != expected[k])
+                detail = ", ".join(f"{label} {keys}" for label, keys in
+                                   (("missing", missing), ("extra", extra),
+                                    ("wrong", wrong)) if keys)
+                problems.append(f"{cid}: {path.relative_to(root)}: {detail}")
+    return problems
+
+
+# ── Cached artifact ───────────────────────────────────────────────────────────
+
+@functools.lru_cache(maxsize=None)
+def load_graph():
+    """The alternates graph, from the cached artifact when still fresh.
+
+    Rebuilt (and the artifact rewritten) whenever any source changed. Raises
+    RuntimeError if the rebuilt graph is inconsistent — a generator should
+    not emit annotations that contradict each other.
+    """
+    fp = fingerprint()
+    try:
+        cached = json.loads(GRAPH_FILE.read_text(encoding="utf-8"))
+        if cached.get("fingerprint") == fp:
+            return cached["clusters"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    clusters = build_graph()
+    problems = check_graph(clusters)
+    if problems:
+        raise RuntimeError("hreflang graph is inconsistent:\n  "
+                           + "\n  ".join(problems))
+    try:
+        GRAPH_FILE.parent.mkdir(parents=True, exist_ok=True)
+        GRAPH_FILE.write_text(json.dumps({"fingerprint": fp, "clusters": clusters},
+                                         indent=2, ensure_ascii=False) + "\n",
+                              encoding="utf-8")
+    except OSError:
+        pass  # read-only checkout — the in-process copy is still good
+    return clusters
+
+
+@functools.lru_cache(maxsize=None)
+def _url_index():
+    return {url: cid for cid, cluster in load_graph().items()
+            for url in cluster.values()}
+
+
+def cluster(cluster_id):
+    """{lang: url} for a cluster ({} if unknown)."""
+    return load_graph().get(cluster_id, {})
+
+
+def alternates_for_url(url):
+    """Sitemap alternates for a page URL, incl. x-default; None if the page
+    is not in any generated cluster."""
+    cid = _url_index().get(url)
+    if cid is None:
+        return None
+    members = cluster(cid)
+    return dict(members, **{"x-default": members["en"]})
+
+
+@functools.lru_cache(maxsize=None)
+def tags(cluster_id):
+    """<link rel="alternate"> block shared by every page in a cluster:
+    en, x-default, then the translations in language order."""
+    members = cluster(cluster_id)
+    if "en" not in members:
+        raise RuntimeError(f"no hreflang cluster for {cluster_id!r}")
+    en_url = members["en"]
+    lines = [
+        f'  <link rel="alternate" hreflang="en" href="{en_url}" />',
+        f'  <link rel="alternate" hreflang="x-default" href="{en_url}" />',
+    ]
+    for lang in sorted(members):
+        if lang != "en":
+            lines.append(f'  <link rel="alternate" hreflang="{lang}" href="{members[lang]}" />')
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and check the hreflang alternates graph")
+    parser.add_argument("--check", action="store_true",
+                        help="Also compare the graph with the published HTML pages")
+    args = parser.parse_args()
+
+    clusters = load_graph()
+    pages = sum(len(c) for c in clusters.values())
+    print(f"hreflang graph: {len(clusters)} clusters, {pages} pages → "
+          f"{GRAPH_FILE.relative_to(PROJECT_DIR)}")
+
+    if args.check:
+        problems = check_pages(clusters)
+        for p in problems:
+            print(f"  ✗ {p}")
+        print(f"{len(problems)} problem(s)")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+_internal_links.py — single-pass internal-link injector for generated pages.
+
+The old generate_video_pages.apply_internal_links() ran one case-insensitive
+re.search per INTERNAL_LINKS pattern per paragraph and rebuilt the string on
+every hit, so cost grew with (patterns × text size). Here every term is
+compiled ONCE into a single alternation and each text is scanned ONCE, left
+to right:
+
+  * first occurrence only — a `seen` set (pass the same one for every
+    paragraph of a page to make it page-wide) records which targets are done;
+  * no self-links — targets whose URL ends with the current page's slug are
+    skipped;
+  * never links inside markup — existing <a>…</a> elements and tags are
+    matched by the same automaton and copied through untouched, so it is safe
+    on the raw-HTML paragraphs the translated generators render.
+
+Targets are site-root-relative ("copy-trading.html", "video/slug/"); the
+caller's asset prefix is prepended at injection time, so the same term list
+works from /video/SLUG/ ("../../") and /SLUG/ ("../").
+
+    from _internal_links import link_injector
+    inject = link_injector(INTERNAL_LINKS)          # compiled once, cached
+    seen = set()
+    for para in paragraphs:
+        out.append(inject(html.escape(para), slug, prefix="../../", seen=seen))
+
+Term patterns must not contain capturing groups — use (?:...).
+"""
+
+import re
+import functools
+
+# Markup the scan must step over rather than link into.
+_SKIP = r"<a\b[^>]*>.*?</a>|<[^>]+>"
+
+
+class LinkInjector:
+    """A compiled term → URL table. Call it to inject links into text."""
+
+    def __init__(self, links):
+        self.urls = [url for _pattern, url in links]
+        alternation = "|".join(f"({pattern})" for pattern, _url in links)
+        self.regex = re.compile(f"(?:{_SKIP})|{alternation}",
+                                re.IGNORECASE | re.DOTALL)
+
+    def __call__(self, text, current_slug="", prefix="", seen=None):
+        """Link the first occurrence of each term in `text`.
+
+        `seen` is a set of already-linked term indexes, updated in place;
+        share it across calls for first-occurrence-per-page.
+        """
+        if seen is None:
+            seen = set()
+        out = []
+        pos = 0
+        for m in self.regex.finditer(text):
+            idx = m.lastindex
+            if idx is None:
+                continue  # existing link or tag
+            idx -= 1
+            url = self.urls[idx]
+            if idx in seen:
+                continue
+            if current_slug and url.rstrip("/").endswith(current_slug):
+                continue  # don't self-link
+            seen.add(idx)
+            out.append(text[pos:m.start()])
+            out.append(f'<a href="{prefix}{url}">{m.group(0)}</a>')
+            pos = m.end()
+        if not out:
+            return text
+        out.append(text[pos:])
+        return "".join(out)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile(links):
+    return LinkInjector(links)
+
+
+def link_injector(links):
+    """Cached LinkInjector for a [(pattern, url), ...] table — compiled once
+    per process however many pages call it."""
+    return _compile(tuple(tuple(pair) for pair in links))
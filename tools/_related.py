@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+_related.py — precomputed "Related" links for article, video and update pages.
+
+The sidebars only carry the hand-curated "More guides" list (the same links
+on every page), and check_internal_links.py can only report where such
+sections are missing. This stage works out, per language, which pages are
+actually about the same thing:
+
+    every article / video / update page (JSON-LD Article or VideoObject,
+    not og:type website) + its transcript when one exists locally
+        → tokenised with build_search_index.terms() (same folding/stemming)
+        → sparse TF-IDF vectors, sublinear tf, L2-normalised
+        → cosine top-k neighbours, via an inverted index
+
+and caches the result in data/related-content.json. Pages are re-tokenised
+only when their main content (generate_sitemap.main_content) or transcript
+changed; neighbour lists are recomputed only for languages where some page
+changed, was added or was removed. Generators render from the cache:
+
+    import _related as related
+    sidebar = related.sidebar_block("video/my-slug/", "en", "../../",
+                                    exclude=curated_hrefs)
+
+A page's own related block sits in the <aside>, outside the content that is
+hashed, so rendering it never invalidates the cache. A page generated for the
+first time has no neighbours yet (the block is omitted); it gets them once
+this stage has seen it and the page is regenerated with --force.
+
+Usage:
+    python3 tools/_related.py                  # refresh the cache + summary
+    python3 tools/_related.py --force          # re-tokenise every page
+    python3 tools/_related.py --show video/my-slug/
+"""
+
+import re
+import sys
+import html
+import json
+import math
+import hashlib
+import pathlib
+import argparse
+import functools
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+import generate_sitemap as sitemap
+import build_search_index as search
+
+PROJECT_DIR = pathlib.Path(__file__).parent.parent
+CACHE_FILE = PROJECT_DIR / "data" / "related-content.json"
+
+CACHE_VERSION = 1
+TOP_K = 5
+MIN_SCORE = 0.08     # below this the overlap is boilerplate, not topic
+MAX_DF = 0.6         # terms in more than this share of a language's pages carry no signal
+
+ARTICLE_RE = re.compile(r'"@type":\s*"(?:Article|BlogPosting|NewsArticle|VideoObject)"')
+WEBSITE_RE = re.compile(r'<meta property="og:type" content="website"')
+
+HOME_PAGES = {""} | set(sitemap.LANG_PREFIXES)
+
+HEADINGS = {
+    "en": "Related",
+    "es": "Relacionados",
+    "de": "Ähnliche Inhalte",
+    "fr": "Contenus similaires",
+    "pt": "Relacionados",
+    "ar": "محتوى ذو صلة",
+}
+
+
+# ── Documents ─────────────────────────────────────────────────────────────────
+
+def is_document(text):
+    """Article, video and update pages — not hubs, contact or about pages
+    (home pages are skipped by url in scan())."""
+    return bool(ARTICLE_RE.search(text)) and not WEBSITE_RE.search(text)
+
+
+def vectorise(doc, lang):
+    """Raw term counts for a page (title weighted like the search index)."""
+    rules = search.STEM_RULES.get(lang, search.STEM_RULES["en"])
+    tf = {}
+    for t in search.terms(doc["title"], rules):
+        tf[t] = tf.get(t, 0) + search.TITLE_WEIGHT
+    for t in search.terms(doc["desc"] + " " + doc["body"], rules):
+        tf[t] = tf.get(t, 0) + 1
+    return tf
+
+
+def scan(cached_docs, force=False):
+    """{url: doc entry} for every document page, reusing cached vectors for
+    pages whose content hash is unchanged. Returns (docs, re-tokenised count)."""
+    extra = search.transcripts()
+    docs, fresh = {}, 0
+    for rel_path, path in sorted(sitemap.find_all_pages(PROJECT_DIR)):
+        text = path.read_text(encoding="utf-8", errors="ignore")
+        if not is_document(text):
+            continue
+        transcript = extra.get(sitemap.rel_to_url(rel_path), "")
+        h = hashlib.sha256((sitemap.main_content(text) + transcript).encode("utf-8"))
+        digest = h.hexdigest()[:16]
+        url = sitemap.rel_to_url(rel_path)[len(sitemap.BASE_URL) + 1:]
+        if url.rstrip("/") in HOME_PAGES:
+            continue
+        old = cached_docs.get(url)
+        if old and old["hash"] == digest and not force:
+            docs[url] = old
+            continue
+        doc = search.page_doc(rel_path, path)
+        if transcript:
+            doc["body"] += " " + transcript
+        lang = search.page_lang(rel_path)
+        docs[url] = {"lang": lang, "hash": digest, "title": doc["title"],
+                     "tf": vectorise(doc, lang)}
+        fresh += 1
+    return docs, fresh
+
+
+def corpus_key(docs, lang):
+    """Changes whenever any page of `lang` is added, removed or edited."""
+    h = hashlib.sha256()
+    for url in sorted(u for u, d in docs.items() if d["lang"] == lang):
+        h.update(f"{url}:{docs[url]['hash']}\n".encode())
+    return h.hexdigest()[:16]
+
+
+# ── Similarity ────────────────────────────────────────────────────────────────
+
+def neighbours_for_language(docs, top_k=TOP_K):
+    """{url: [[url, score], ...]} for one language's docs ({url: tf})."""
+    n = len(docs)
+    df = {}
+    for tf in docs.values():
+        for t in tf:
+            df[t] = df.get(t, 0) + 1
+    idf = {t: math.log(n / c) for t, c in df.items() if c <= max(2, MAX_DF * n)}
+
+    vectors = {}
+    postings = {}
+    for url, tf in docs.items():
+        vec = {t: (1 + math.log(c)) * idf[t] for t, c in tf.items() if idf.get(t)}
+        norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+        vectors[url] = {t: w / norm for t, w in vec.items()}
+        for t, w in vectors[url].items():
+            if df[t] > 1:  # a term only this page has can't link it to another
+                postings.setdefault(t, []).append((url, w))
+
+    result = {}
+    for url, vec in vectors.items():
+        scores = {}
+        for t, w in vec.items():
+            for other, ow in postings.get(t, ()):
+                if other != url:
+                    scores[other] = scores.get(other, 0.0) + w * ow
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+        result[url] = [[u, round(s, 4)] for u, s in ranked[:top_k * 2] if s >= MIN_SCORE]
+    return result
+
+
+# ── Cache ─────────────────────────────────────────────────────────────────────
+
+def _read_cache():
+    try:
+        cache = json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+        if cache.get("version") == CACHE_VERSION:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {"version": CACHE_VERSION, "docs": {}, "corpus": {}, "neighbours": {}}
+
+
+def refresh(force=False):
+    """Bring the cache up to date. Returns (cache, stats)."""
+    cache = _read_cache()
+    docs, fresh = scan(cache["docs"], force=force)
+    langs = sorted({d["lang"] for d in docs.values()})
+
+    neighbours, recomputed = {}, []
+    corpus = {}
+    for lang in langs:
+        corpus[lang] = corpus_key(docs, lang)
+        members = [u for u, d in docs.items() if d["lang"] == lang]
+        if corpus[lang] == cache["corpus"].get(lang) and not force:
+            neighbours.update({u: cache["neighbours"].get(u, []) for u in members})
+            continue
+        neighbours.update(neighbours_for_language({u: docs[u]["tf"] for u in members}))
+        recomputed.append(lang)
+
+    changed = fresh or recomputed or set(docs) != set(cache["docs"])
+    cache = {"version": CACHE_VERSION, "docs": docs, "corpus": corpus,
+             "neighbours": neighbours}
+    if changed:
+        try:
+            CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp = CACHE_FILE.with_suffix(".tmp")
+            tmp.write_text(json.dumps(cache, ensure_ascii=False, separators=(",", ":")),
+                           encoding="utf-8")
+            tmp.replace(CACHE_FILE)
+        except OSError:
+            pass  # read-only checkout — the in-process copy is still good
+    return cache, {"docs": len(docs), "retokenised": fresh, "recomputed": recomputed}
+
+
+@functools.lru_cache(maxsize=None)
+def load():
+    """The up-to-date cache, refreshed once per process."""
+    return refresh()[0]
+
+
+def related(url, exclude=(), k=TOP_K):
+    """[(url, title, score)] most similar to the page at site-relative `url`
+    ("video/slug/", "copy-trading.html"), skipping any url in `exclude`."""
+    cache = load()
+    skip = {u.lstrip("/") for u in exclude}
+    out = []
+    for other, score in cache["neighbours"].get(url, []):
+        if other in skip or other not in cache["docs"]:
+            continue
+        out.append((other, cache["docs"][other]["title"], score))
+        if len(out) == k:
+            break
+    return out
+
+
+def sidebar_block(url, lang, prefix, exclude=(), k=TOP_K):
+    """Sidebar "Related" list for a page, or "" when it has no neighbours yet.
+
+    `prefix` is the page's path back to the site root ("../../"); `exclude`
+    takes site-relative urls already linked from the sidebar.
+    """
+    items = related(url, exclude=exclude, k=k)
+    if not items:
+        return ""
+    heading = HEADINGS.get(lang, HEADINGS["en"])
+    lines = [
+        '        <div class="sidebar-nav sidebar-related">',
+        f'          <h4>{html.escape(heading)}</h4>',
+        '          <ul>',
+    ]
+    for other, title, _ in items:
+        lines.append(f'            <li><a href="{prefix}{other}">{html.escape(title)}</a></li>')
+    lines += ['          </ul>', '        </div>']
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the related-content cache")
+    parser.add_argument("--force", action="store_true", help="Re-tokenise every page")
+    parser.add_argument("--show", metavar="URL", help="Print one page's neighbours")
+    args = parser.parse_args()
+
+    cache, stats = refresh(force=args.force)
+    print(f"Related content: {stats['docs']} pages, {stats['retokenised']} re-tokenised, "
+          f"neighbours recomputed for: {', '.join(stats['recomputed']) or 'none'}"
+          f" → {CACHE_FILE.relative_to(PROJECT_DIR)}")
+
+    by_lang = {}
+    for url, d in cache["docs"].items():
+        by_lang.setdefault(d["lang"], []).append(url)
+    for lang in sorted(by_lang):
+        lonely = [u for u in by_lang[lang] if not cache["neighbours"].get(u)]
+        print(f"  {lang:<3} {len(by_lang[lang]):>4} page(s)"
+              + (f", {len(lonely)} without neighbours" if lonely else ""))
+
+    if args.show:
+        url = args.show.lstrip("/")
+        if url not in cache["docs"]:
+            sys.exit(f"{url}: not an indexed page")
+        for other, score in cache["neighbours"].get(url, []):
+            print(f"  {score:.3f}  {other}  {cache['docs'][other]['title']}")
+
+
+if __name__ == "__main__":
+    main()
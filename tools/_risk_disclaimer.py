@@ -59,6 +59,8 @@ weaken it without re-validating.
 
 import re
 import json
+import atexit
+import hashlib
 import pathlib
 import functools
 
@@ -194,3 +196,140 @@ def current_target():
         "is missing/insane AND no sane figure found in live HTML. Run "
         "scrape_etoro_risk.py. Refusing to guess."
     )
+
+
+# ────────────────────────────────────────────────────────────────────────────
+# Occurrence index
+# ────────────────────────────────────────────────────────────────────────────
+# update_risk_warnings.py used to read and regex every .html file on every
+# monthly run, even when the figure had not moved. The index keeps, per file,
+# its size/mtime, content hash and every disclaimer occurrence
+#
+#     [start, end, value, kind]      (str offsets of the number itself)
+#
+# so the updater can answer "is the site already at N%?" without reading a
+# page, and when it is not, rewrite exactly the listed positions — after
+# checking the file still hashes to what was indexed. Files whose size/mtime
+# changed since the last run are re-read; a hash match (touched, not edited)
+# keeps the occurrences. Generators that normalize their output also record
+# the page as they write it (record_page), so a fresh build is already
+# indexed. The index is rebuilt from scratch whenever the patterns above
+# change (INDEX_KEY).
+
+INDEX_FILE = PROJECT_DIR / "data" / "risk-disclaimer-index.json"
+INDEX_KEY = hashlib.sha256(
+    f"{DISCLAIMER_RE.pattern}|{HEDGE_RE.pattern}|{HEDGE_WINDOW}".encode("utf-8")
+).hexdigest()[:16]
+
+
+def occurrences(text):
+    """[[start, end, value, kind]] for every disclaimer match in text."""
+    return [[m.start(1), m.end(1), val, kind] for m, kind, val in analyze(text)]
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _entry(path, text):
+    st = path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+            "sha256": content_hash(text), "occ": occurrences(text)}
+
+
+@functools.lru_cache(maxsize=1)
+def load_index():
+    """The index as last saved ({"key", "files": {rel: entry}}), or empty.
+    Cached: callers mutate it in place and save_index() writes it back."""
+    try:
+        index = json.loads(INDEX_FILE.read_text(encoding="utf-8"))
+        if index.get("key") == INDEX_KEY:
+            return index
+    except (OSError, ValueError):
+        pass
+    return {"key": INDEX_KEY, "files": {}}
+
+
+def save_index():
+    index = load_index()
+    try:
+        INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = INDEX_FILE.with_suffix(".tmp")
+        tmp.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+        tmp.replace(INDEX_FILE)
+    except OSError:
+        pass  # read-only checkout — the next run rescans, nothing is lost
+
+
+def _rel(path):
+    return pathlib.Path(path).resolve().relative_to(PROJECT_DIR.resolve()).as_posix()
+
+
+_recording = []
+
+
+def record_page(path, html):
+    """Index a page a generator has just written with `html` (its exact
+    content). Saved once, when the generator exits."""
+    if not _recording:
+        _recording.append(True)
+        atexit.register(save_index)
+    load_index()["files"][_rel(path)] = _entry(pathlib.Path(path), html)
+
+
+def refresh_index(paths):
+    """Bring the index up to date for exactly `paths` (files gone from the
+    list are dropped). Returns (index, files re-read)."""
+    index = load_index()
+    old = index["files"]
+    files, reread = {}, 0
+    for path in paths:
+        rel = _rel(path)
+        st = path.stat()
+        entry = old.get(rel)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            files[rel] = entry
+            continue
+        try:
+            text = path.read_text(encoding="utf-8")
+        except Exception:
+            continue
+        reread += 1
+        if entry and entry["sha256"] == content_hash(text):
+            entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+            files[rel] = entry
+        else:
+            files[rel] = _entry(path, text)
+    index["files"] = files
+    return index, reread
+
+
+def rewrite_indexed(rel, target):
+    """Rewrite the indexed official occurrences of one file to `target`.
+
+    Returns (new_text, n_changed), or None when the file no longer hashes to
+    its indexed content — the caller must not trust the offsets then.
+    The entry is updated for the rewritten text; the caller writes the file
+    and save_index()es.
+    """
+    index = load_index()
+    entry = index["files"][rel]
+    path = PROJECT_DIR / rel
+    text = path.read_text(encoding="utf-8")
+    if content_hash(text) != entry["sha256"]:
+        return None
+    changed = 0
+    for start, end, value, kind in sorted(entry["occ"], reverse=True):
+        if kind != "official" or value == target:
+            continue
+        text = text[:start] + str(target) + text[end:]
+        changed += 1
+    entry.update(sha256=content_hash(text), occ=occurrences(text))
+    return text, changed
+
+
+def stamp(rel):
+    """Record a just-written file's new size/mtime (content already indexed)."""
+    entry = load_index()["files"][rel]
+    st = (PROJECT_DIR / rel).stat()
+    entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
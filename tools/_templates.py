@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+_templates.py — the shared page chrome every generator renders.
+
+The nav, mobile drawer, risk-warning banner, consent + GA head snippet,
+footer, risk-warning boxes and closing <script> tags used to be pasted as
+big f-strings into each generator's generate_page(). Six copies drifted
+(the translated update footer lost its "Social Trading" link, article pages
+never got lang-switcher.js, consent defaults only ever arrived afterwards via
+batch_add_consent.py).
+
+Each partial here is built ONCE per process per (lang, asset prefix) and
+memoised with functools.lru_cache, so rendering a page is just concatenating
+cached fragments with the page-specific content:
+
+    import _templates as tpl
+    f'''...{tpl.analytics_head()}
+    </head>
+    <body>
+
+    {tpl.site_header(lang, p)}
+    ...page content...
+    {tpl.site_footer(lang, p)}
+
+    {tpl.page_scripts(lang, p)}
+    </body>'''
+
+Labels come from generate_translated_pages.UI_STRINGS for translated pages
+and EN_UI below for English. As everywhere else, the disclaimer figure in
+these strings is a stale placeholder — generators pass their output through
+_risk_disclaimer.normalize_html() before writing (see that module).
+"""
+
+import html
+import functools
+
+GA_ID = "G-PBGDJ951LL"
+
+# English labels, keyed like generate_translated_pages.UI_STRINGS.
+EN_UI = {
+    "social_trading": "Social Trading",
+    "copy_trading": "Copy Trading",
+    "updates": "Updates",
+    "videos": "Videos",
+    "about": "About",
+    "faq": "FAQ",
+    "try_etoro": "Try eToro",
+    "risk_banner_label": "Risk warning",
+    "risk_warning_label": "Risk Warning",
+    "risk_warning_banner": "Risk warning: 51% of retail investor accounts lose money when trading CFDs with eToro. Your capital is at risk.",
+    "risk_warning_full": "eToro is a multi-asset investment platform. The value of your investments may go up or down. 51% of retail investor accounts lose money when trading CFDs with eToro. You should consider whether you can afford to take the high risk of losing your money. This content is for educational and informational purposes only — it is not investment advice.",
+    "risk_warning_footer": "Your capital is at risk. 51% of retail investor accounts lose money when trading CFDs with eToro. This website is for educational and informational purposes only and does not constitute investment advice. Copy Trading does not amount to investment advice.",
+    "risk_warning_sidebar": "51% of retail investor accounts lose money when trading CFDs with eToro. You should consider whether you can afford to take the high risk of losing your money. This is an affiliate link — Tom may earn a commission at no cost to you.",
+    "important_reminder": "Important Reminder",
+    "important_reminder_text": "51% of retail investor accounts lose money when trading CFDs with eToro. You should consider whether you can afford to take the high risk of losing your money. Past performance is not an indication of future results. This content is for educational purposes only and is not investment advice.",
+    "guide_social": "What is Social Trading?",
+    "guide_copy": "What is Copy Trading?",
+    "guide_returns": "How Much Can You Make?",
+    "guide_scam": "Is eToro a Scam?",
+    "footer_brand": "Documenting the copy trading journey since 2017. Independent, honest, and always learning.",
+    "footer_guides": "Guides",
+    "footer_site": "Site",
+    "footer_updates": "Trading Updates",
+    "footer_about": "About",
+    "footer_faq": "FAQ",
+    "footer_contact": "Contact",
+    "footer_privacy": "Privacy Policy",
+    "footer_cookies": "Manage cookies",
+    "search_placeholder": "Search videos and guides…",
+    "search_empty": "No results",
+}
+
+# Translated privacy pages (/<lang>/<slug>/); other languages link the English one.
+PRIVACY_SLUGS = {
+    "es": "politica-de-privacidad",
+    "de": "datenschutz",
+    "fr": "politique-de-confidentialite",
+    "pt": "politica-de-privacidade",
+    "ar": "siyasat-al-khususiyya",
+}
+
+# Consent Mode v2 defaults — must run BEFORE the GA tag. Same snippet
+# batch_add_consent.py retrofits onto hand-written pages.
+CONSENT_SNIPPET = """<script>
+window.dataLayer=window.dataLayer||[];function gtag(){dataLayer.push(arguments);}
+gtag('consent','default',{'analytics_storage':'denied','ad_storage':'denied','ad_personalization':'denied','wait_for_update':500});
+var c;try{c=JSON.parse(localStorage.getItem('stv-consent'))}catch(e){}
+if(c&&c.accepted){gtag('consent','update',{'analytics_storage':'granted'})}
+</script>"""
+
+CTA_CLICK_SCRIPT = """  <script>
+  document.addEventListener('click', function(e) {
+    var link = e.target.closest('a.btn-primary');
+    if (!link) return;
+    if (typeof gtag === 'function') {
+      gtag('event', 'cta_click', {
+        'event_category': 'affiliate',
+        'event_label': link.textContent.trim(),
+        'link_url': link.href || '',
+        'page_path': location.pathname
+      });
+    }
+  });
+  </script>"""
+
+
+# Site search box (js/search.js) — build_search_index.py installs it on each
+# language's video hub.
+SEARCH_CSS = """  <style>
+    .site-search { position: relative; margin: 32px 0 0; max-width: 560px; }
+    .site-search input {
+      width: 100%;
+      padding: 10px 16px;
+      border-radius: 20px;
+      border: 1px solid var(--border);
+      background: var(--bg2);
+      color: var(--text);
+      font-size: 0.95rem;
+    }
+    .site-search-results {
+      list-style: none;
+      margin: 8px 0 0;
+      padding: 0;
+      border: 1px solid var(--border);
+      border-radius: 12px;
+      background: var(--bg2);
+    }
+    .site-search-results li { padding: 10px 16px; border-top: 1px solid var(--border); }
+    .site-search-results li:first-child { border-top: none; }
+    .site-search-results a { font-weight: 600; }
+    .site-search-results p { margin: 4px 0 0; font-size: 0.85rem; color: var(--text-muted); }
+  </style>"""
+
+
+def ui_strings(lang):
+    """Label dict for `lang` ("en" → EN_UI)."""
+    if lang == "en":
+        return EN_UI
+    # Imported lazily: generate_translated_pages itself imports this module.
+    from generate_translated_pages import UI_STRINGS
+    return UI_STRINGS[lang]
+
+
+def _e(ui, key):
+    return html.escape(ui[key])
+
+
+@functools.lru_cache(maxsize=None)
+def analytics_head():
+    """Consent defaults + GA tag, for the end of <head>."""
+    return (
+        f"{CONSENT_SNIPPET}\n"
+        "  <!-- Google tag (gtag.js) -->\n"
+        f'  <script async src="https://www.googletagmanager.com/gtag/js?id={GA_ID}"></script>\n'
+        "  <script>\n"
+        "    window.dataLayer = window.dataLayer || [];\n"
+        "    function gtag(){dataLayer.push(arguments);}\n"
+        "    gtag('js', new Date());\n"
+        f"    gtag('config', '{GA_ID}');\n"
+        "  </script>"
+    )
+
+
+# (root-relative href, UI label key) — the main nav, in order.
+NAV_LINKS = (
+    ("social-trading.html", "social_trading"),
+    ("copy-trading.html", "copy_trading"),
+    ("updates.html", "updates"),
+    ("videos.html", "videos"),
+    ("about.html", "about"),
+    ("faq.html", "faq"),
+)
+
+
+@functools.lru_cache(maxsize=None)
+def site_header(lang, p):
+    """Desktop nav, mobile drawer and the sticky risk-warning banner.
+
+    `p` is the asset prefix back to the site root ("../", "../../" ...).
+    """
+    ui = ui_strings(lang)
+    items = "\n".join(
+        f'{{indent}}<li><a href="{p}{href}">{_e(ui, key)}</a></li>'
+        for href, key in NAV_LINKS
+    ) + f'\n{{indent}}<li><a href="#etoro-cta" class="nav-cta">{_e(ui, "try_etoro")}</a></li>'
+
+    banner = ui["risk_warning_banner"]
+    banner_text = banner.split(": ", 1)[-1] if ": " in banner else banner
+    banner_label = ui.get("risk_banner_label", ui["risk_warning_label"])
+
+    return (
+        "  <nav>\n"
+        '    <div class="container nav-inner">\n'
+        f'      <a href="{p}index.html" class="nav-logo">Social<span>Trading</span>Vlog</a>\n'
+        '      <ul class="nav-links">\n'
+        f"{items.replace('{indent}', '        ')}\n"
+        "      </ul>\n"
+        '      <button class="nav-hamburger" id="nav-hamburger" aria-label="Open navigation" aria-expanded="false" aria-controls="nav-drawer">\n'
+        "        <span></span><span></span><span></span>\n"
+        "      </button>\n"
+        "    </div>\n"
+        "  </nav>\n"
+        '  <div class="nav-drawer" id="nav-drawer" role="navigation" aria-label="Mobile navigation">\n'
+        "    <ul>\n"
+        f"{items.replace('{indent}', '      ')}\n"
+        "    </ul>\n"
+        "  </div>\n"
+        "\n"
+        '  <div class="risk-warning-banner">\n'
+        f"    <span>{html.escape(banner_label)}:</span> {banner_text}\n"
+        "  </div>"
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def search_box(lang):
+    """Search box placeholder; js/search.js fills it in and picks the index
+    from <html lang>."""
+    ui = ui_strings(lang)
+    return (f'<div data-site-search data-placeholder="{_e(ui, "search_placeholder")}" '
+            f'data-empty="{_e(ui, "search_empty")}"></div>')
+
+
+@functools.lru_cache(maxsize=None)
+def site_footer(lang, p):
+    """Footer: brand, guide + site columns, privacy/cookie links, disclaimer."""
+    ui = ui_strings(lang)
+    privacy = f"{p}{lang}/{PRIVACY_SLUGS[lang]}/" if lang in PRIVACY_SLUGS else f"{p}privacy.html"
+    return (
+        "  <footer>\n"
+        '    <div class="container">\n'
+        '      <div class="footer-inner">\n'
+        '        <div class="footer-brand">\n'
+        '          <div class="nav-logo">Social<span style="color:var(--accent)">Trading</span>Vlog</div>\n'
+        f"          <p>{_e(ui, 'footer_brand')}</p>\n"
+        "        </div>\n"
+        '        <div class="footer-col">\n'
+        f"          <h4>{_e(ui, 'footer_guides')}</h4>\n"
+        "          <ul>\n"
+        f'            <li><a href="{p}social-trading.html">{_e(ui, "guide_social")}</a></li>\n'
+        f'            <li><a href="{p}copy-trading.html">{_e(ui, "guide_copy")}</a></li>\n'
+        f'            <li><a href="{p}etoro-scam.html">{_e(ui, "guide_scam")}</a></li>\n'
+        f'            <li><a href="{p}copy-trading-returns.html">{_e(ui, "guide_returns")}</a></li>\n'
+        "          </ul>\n"
+        "        </div>\n"
+        '        <div class="footer-col">\n'
+        f"          <h4>{_e(ui, 'footer_site')}</h4>\n"
+        "          <ul>\n"
+        f'            <li><a href="{p}updates.html">{_e(ui, "footer_updates")}</a></li>\n'
+        f'            <li><a href="{p}about.html">{_e(ui, "footer_about")}</a></li>\n'
+        f'            <li><a href="{p}faq.html">{_e(ui, "footer_faq")}</a></li>\n'
+        f'            <li><a href="{p}contact.html">{_e(ui, "footer_contact")}</a></li>\n'
+        f'            <li><a href="{privacy}">{_e(ui, "footer_privacy")}</a></li>\n'
+        f'            <li><a href="#" id="manage-cookies">{_e(ui, "footer_cookies")}</a></li>\n'
+        "          </ul>\n"
+        "        </div>\n"
+        "      </div>\n"
+        '      <div class="footer-bottom">\n'
+        "        <p>&copy; 2026 SocialTradingVlog.com</p>\n"
+        f'        <p class="footer-disclaimer">{_e(ui, "risk_warning_footer")}</p>\n'
+        "      </div>\n"
+        "    </div>\n"
+        "  </footer>"
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def risk_warning_box(lang):
+    """In-article risk-warning box (top of the article)."""
+    ui = ui_strings(lang)
+    return (
+        '        <div class="risk-warning">\n'
+        f"          <strong>{_e(ui, 'risk_warning_label')}</strong>\n"
+        f"          {_e(ui, 'risk_warning_full')}\n"
+        "        </div>"
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def important_reminder_box(lang):
+    """In-article "Important Reminder" box (end of the article)."""
+    ui = ui_strings(lang)
+    return (
+        '        <div class="risk-warning">\n'
+        f"          <strong>{_e(ui, 'important_reminder')}</strong>\n"
+        f"          {_e(ui, 'important_reminder_text')}\n"
+        "        </div>"
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def sidebar_risk_warning(lang):
+    """Risk warning under the sidebar CTA: first sentence bold, rest plain."""
+    ui = ui_strings(lang)
+    sentences = ui["risk_warning_sidebar"].split(".")
+    return (
+        '          <div class="risk-warning">\n'
+        f"            <strong>{sentences[0]}.</strong>\n"
+        f"            {'.'.join(sentences[1:]).strip()}\n"
+        "          </div>"
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def page_scripts(lang, p, lightbox=True):
+    """Closing scripts: lightbox, nav, language switcher (driven by the
+    page's hreflang tags; a no-op with fewer than two), CTA click tracking,
+    then the consent banner + analytics loaders."""
+    scripts = []
+    if lightbox:
+        scripts.append(f'  <script src="{p}js/lightbox.js"></script>')
+    scripts.append(f'  <script src="{p}js/nav.js"></script>')
+    scripts.append(f'  <script src="{p}js/lang-switcher.js"></script>')
+    scripts.append(CTA_CLICK_SCRIPT)
+    scripts.append("")
+    scripts.append(f'  <script src="{p}js/consent.js"></script>')
+    scripts.append(f'  <script src="{p}js/analytics.js"></script>')
+    return "\n".join(scripts)
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+_transcript_index.py — full-text search over every transcript and subtitle cue.
+
+transcriptions/<id>/ holds transcript.txt and subtitles.<lang>.srt for every
+processed video; finding which videos mention "stop loss" used to mean
+grepping all of them. This keeps them in an SQLite FTS5 index
+
+    data/transcripts.sqlite3
+        files      path, video, lang, mtime_ns, size   (what is indexed)
+        segments   video, lang, start_ms, end_ms, text  (SRT cues grouped
+                   into SEGMENT_SECONDS windows; transcript.txt by paragraph,
+                   without timecodes)
+        search     FTS5 over segments.text (external content, kept in sync
+                   by triggers; unicode61 with diacritics folded)
+
+English is indexed from subtitles.en.srt when it exists (it has timecodes)
+and from transcript.txt otherwise. refresh() re-stats the folder and
+re-indexes only files that were added, changed or removed — cheap enough
+that the dashboard calls it (at most every REFRESH_SECONDS) before a search.
+
+    import _transcript_index as ti
+    ti.index().search("stop loss", lang="en")
+    ti.index().mentions(ti.fts_phrase(r"\\bspread fee[s]?\\b"))   # {video: hits}
+
+Queries are phrases: search("popular investor") matches the two words
+together, in any case, with or without accents. A trailing * makes the
+last word a prefix ("withdraw*").
+
+Usage:
+    python3 tools/_transcript_index.py                      # update the index
+    python3 tools/_transcript_index.py "stop loss"          # search (all languages)
+    python3 tools/_transcript_index.py "stop loss" --lang es --limit 50
+    python3 tools/_transcript_index.py --rebuild
+"""
+
+import re
+import sys
+import time
+import sqlite3
+import pathlib
+import argparse
+import threading
+import functools
+
+PROJECT_DIR = pathlib.Path(__file__).parent.parent
+TRANS_DIR = PROJECT_DIR / "transcriptions"
+INDEX_FILE = PROJECT_DIR / "data" / "transcripts.sqlite3"
+
+SEGMENT_SECONDS = 20     # consecutive cues are grouped into windows this long
+REFRESH_SECONDS = 300
+SNIPPET_TOKENS = 16
+SRT_NAME_RE = re.compile(r"^subtitles\.([a-z]{2}(?:-[A-Za-z]+)?)\.srt$")
+SRT_TIME_RE = re.compile(r"(\d+):(\d+):(\d+)[,.](\d+)\s*-->\s*(\d+):(\d+):(\d+)[,.](\d+)")
+TAG_RE = re.compile(r"<[^>]+>|\{\\[^}]*\}")
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS files (
+        path     TEXT PRIMARY KEY,
+        video    TEXT NOT NULL,
+        lang     TEXT NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        size     INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS segments (
+        id       INTEGER PRIMARY KEY,
+        path     TEXT NOT NULL,
+        video    TEXT NOT NULL,
+        lang     TEXT NOT NULL,
+        start_ms INTEGER,
+        end_ms   INTEGER,
+        text     TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS segments_by_path ON segments (path);
+    CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5(
+        text, content='segments', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    );
+    CREATE TRIGGER IF NOT EXISTS segments_ai AFTER INSERT ON segments BEGIN
+        INSERT INTO search (rowid, text) VALUES (new.id, new.text);
+    END;
+    CREATE TRIGGER IF NOT EXISTS segments_ad AFTER DELETE ON segments BEGIN
+        INSERT INTO search (search, rowid, text) VALUES ('delete', old.id, old.text);
+    END;
+"""
+
+
+# ── Parsing ───────────────────────────────────────────────────────────────────
+
+def _ms(h, m, s, frac):
+    return ((int(h) * 60 + int(m)) * 60 + int(s)) * 1000 + int(frac.ljust(3, "0")[:3])
+
+
+def srt_cues(text):
+    """[(start_ms, end_ms, text)] from SRT content."""
+    cues = []
+    for block in re.split(r"\n\s*\n", text.replace("\r\n", "\n").strip()):
+        lines = block.strip().split("\n")
+        for i, line in enumerate(lines):
+            m = SRT_TIME_RE.search(line)
+            if m:
+                words = " ".join(TAG_RE.sub("", l).strip() for l in lines[i + 1:]).strip()
+                if words:
+                    cues.append((_ms(*m.groups()[:4]), _ms(*m.groups()[4:]), words))
+                break
+    return cues
+
+
+def segments_from_srt(text):
+    """Cues grouped into windows of up to SEGMENT_SECONDS (so a phrase split
+    across two cues is still found)."""
+    out = []
+    for start, end, words in srt_cues(text):
+        if out and start - out[-1][0] < SEGMENT_SECONDS * 1000:
+            out[-1][1] = end
+            out[-1][2] += " " + words
+        else:
+            out.append([start, end, words])
+    return [tuple(s) for s in out]
+
+
+def segments_from_transcript(text):
+    paras = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+    if len(paras) == 1:  # one long line — split it into groups of five sentences
+        sentences = re.split(r"(?<=[.!?])\s+", paras[0])
+        paras = [" ".join(sentences[i:i + 5]) for i in range(0, len(sentences), 5)]
+    return [(None, None, p) for p in paras]
+
+
+def source_files(root=TRANS_DIR):
+    """{path relative to the project: (video, lang, Path)} — what should be indexed."""
+    found = {}
+    if not root.is_dir():
+        return found
+    for folder in root.iterdir():
+        if not folder.is_dir():
+            continue
+        has_en_srt = False
+        for f in folder.iterdir():
+            m = SRT_NAME_RE.match(f.name)
+            if m:
+                found[f.relative_to(root.parent).as_posix()] = (folder.name, m.group(1), f)
+                has_en_srt |= m.group(1) == "en"
+        transcript = folder / "transcript.txt"
+        if not has_en_srt and transcript.is_file():
+            found[transcript.relative_to(root.parent).as_posix()] = (folder.name, "en", transcript)
+    return found
+
+
+# ── Queries ───────────────────────────────────────────────────────────────────
+
+def fts_query(text):
+    """A user's text as an FTS5 phrase ("a b" → "a b"; trailing * → prefix)."""
+    prefix = text.rstrip().endswith("*")
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return '"' + " ".join(words) + '"' + ("*" if prefix else "")
+
+
+def fts_phrase(pattern):
+    """FTS5 query for one of the simple regexes in INTERNAL_LINKS:
+    \\b is dropped, an optional plural becomes a prefix match,
+    and "a.{0,10}b" becomes NEAR("a" "b", 2)."""
+    p = pattern.replace(r"\b", "")
+    parts = re.split(r"\.\{0,\d+\}", p)
+    if len(parts) > 1:
+        words = [fts_query(re.sub(r"\[s\]\?|s\?", "", part)) for part in parts]
+        return None if None in words else f"NEAR({' '.join(words)}, 2)"
+    optional_plural = bool(re.search(r"(\[s\]|s)\?$", p))
+    p = re.sub(r"(\[s\]|s)\?$", "", p)
+    if re.search(r"[\\\[\](){}|+?^$]", p):
+        return None  # not a plain phrase
+    return fts_query(p + ("*" if optional_plural else ""))
+
+
+def timestamp(ms):
+    if ms is None:
+        return None
+    s = ms // 1000
+    return f"{s // 3600}:{s // 60 % 60:02d}:{s % 60:02d}" if s >= 3600 else f"{s // 60}:{s % 60:02d}"
+
+
+class TranscriptIndex:
+    """The index. One connection per thread; writes serialised by a lock."""
+
+    def __init__(self, path=INDEX_FILE, root=TRANS_DIR):
+        self.path = path
+        self.root = root
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._refreshed = 0.0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self.db:
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.executescript(SCHEMA)
+
+    @property
+    def db(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=30)
+        return db
+
+    # ── Write side ──
+
+    def update(self):
+        """Re-index added/changed files and drop removed ones. Returns
+        (files indexed, files removed)."""
+        with self._lock:
+            wanted = source_files(self.root)
+            stored = {path: (mtime, size) for path, mtime, size in
+                      self.db.execute("SELECT path, mtime_ns, size FROM files")}
+            indexed = removed = 0
+            for path in set(stored) - set(wanted):
+                with self.db:
+                    self.db.execute("DELETE FROM segments WHERE path = ?", (path,))
+                    self.db.execute("DELETE FROM files WHERE path = ?", (path,))
+                removed += 1
+            for path, (video, lang, f) in sorted(wanted.items()):
+                try:
+                    st = f.stat()
+                except FileNotFoundError:
+                    continue
+                if stored.get(path) == (st.st_mtime_ns, st.st_size):
+                    continue
+                text = f.read_text(encoding="utf-8", errors="ignore")
+                segs = segments_from_srt(text) if f.suffix == ".srt" else segments_from_transcript(text)
+                with self.db:
+                    self.db.execute("DELETE FROM segments WHERE path = ?", (path,))
+                    self.db.executemany(
+                        "INSERT INTO segments (path, video, lang, start_ms, end_ms, text) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        [(path, video, lang, start, end, words) for start, end, words in segs])
+                    self.db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                                    (path, video, lang, st.st_mtime_ns, st.st_size))
+                indexed += 1
+            self._refreshed = time.monotonic()
+            return indexed, removed
+
+    def refresh(self, max_age=REFRESH_SECONDS):
+        """update() unless the last one was less than `max_age` seconds ago."""
+        if time.monotonic() - self._refreshed >= max_age:
+            self.update()
+
+    def rebuild(self):
+        with self._lock, self.db:
+            self.db.execute("DELETE FROM segments")
+            self.db.execute("DELETE FROM files")
+            self.db.execute("INSERT INTO search (search) VALUES ('rebuild')")
+        return self.update()
+
+    # ── Read side ──
+
+    def search(self, text, lang=None, video=None, limit=50):
+        """[{video, lang, start, end, timestamp, snippet}] best matches first.
+        Snippets mark the hits with <mark>…</mark> (the rest is plain text —
+        escape it before putting it in HTML)."""
+        query = fts_query(text)
+        if not query:
+            return []
+        sql, args = ["search MATCH ?"], [query]
+        if lang:
+            sql.append("s.lang = ?")
+            args.append(lang)
+        if video:
+            sql.append("s.video = ?")
+            args.append(video)
+        rows = self.db.execute(
+            "SELECT s.video, s.lang, s.start_ms, s.end_ms, "
+            f"snippet(search, 0, '\x02', '\x03', '…', {SNIPPET_TOKENS}) "
+            f"FROM search JOIN segments s ON s.id = search.rowid WHERE {' AND '.join(sql)} "
+            "ORDER BY rank LIMIT ?", args + [limit]).fetchall()
+        return [{"video": video_id, "lang": lang_, "start": start // 1000 if start is not None else None,
+                 "end": end // 1000 if end is not None else None, "timestamp": timestamp(start),
+                 "snippet": snippet}
+                for video_id, lang_, start, end, snippet in rows]
+
+    def mentions(self, query, lang="en"):
+        """{video: matching segments} for an FTS5 query (see fts_phrase)."""
+        if not query:
+            return {}
+        return dict(self.db.execute(
+            "SELECT s.video, COUNT(*) FROM search JOIN segments s ON s.id = search.rowid "
+            "WHERE search MATCH ? AND s.lang = ? GROUP BY s.video ORDER BY 2 DESC",
+            (query, lang)))
+
+    def summary(self):
+        files, videos = self.db.execute("SELECT COUNT(*), COUNT(DISTINCT video) FROM files").fetchone()
+        segments = self.db.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        langs = dict(self.db.execute("SELECT lang, COUNT(*) FROM files GROUP BY lang ORDER BY lang"))
+        return {"files": files, "videos": videos, "segments": segments, "languages": langs}
+
+
+def mark(snippet, open_tag="<mark>", close_tag="</mark>", escape=None):
+    """A search() snippet with its hit markers replaced (text escaped first
+    with `escape`, e.g. html.escape)."""
+    text = escape(snippet) if escape else snippet
+    return text.replace("\x02", open_tag).replace("\x03", close_tag)
+
+
+@functools.lru_cache(maxsize=None)
+def index():
+    """The process-wide index, brought up to date."""
+    idx = TranscriptIndex(INDEX_FILE)
+    idx.update()
+    return idx
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcript full-text index")
+    parser.add_argument("query", nargs="?", help="Phrase to search for")
+    parser.add_argument("--lang", help="Only this language")
+    parser.add_argument("--video", help="Only this video id")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--rebuild", action="store_true", help="Drop and rebuild the index")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    idx = TranscriptIndex(INDEX_FILE)
+    indexed, removed = idx.rebuild() if args.rebuild else idx.update()
+    s = idx.summary()
+    print(f"Transcript index — {s['videos']} video(s), {s['files']} file(s), "
+          f"{s['segments']:,} segments; {indexed} (re)indexed, {removed} removed "
+          f"in {time.perf_counter() - started:.2f}s")
+    if s["languages"]:
+        print("  " + "  ".join(f"{lang}:{n}" for lang, n in s["languages"].items()))
+    if not args.query:
+        return
+    started = time.perf_counter()
+    hits = idx.search(args.query, lang=args.lang, video=args.video, limit=args.limit)
+    print(f"\n  {len(hits)} hit(s) for {args.query!r} in {(time.perf_counter() - started) * 1000:.1f} ms")
+    for h in hits:
+        print(f"    {h['video']:<12} {h['lang']:<3} {h['timestamp'] or '-':>8}  "
+              f"{mark(h['snippet'], '[', ']')}")
+
+
+if __name__ == "__main__":
+    main()
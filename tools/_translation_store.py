@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+_translation_store.py — every translated page's content in one indexed store.
+
+Translated content is spread over tools/translations/ in several shapes:
+
+    <video_id>_<lang>.json            one video article          → video:<video_id>
+    <prefix>_<lang>.json              one article (ARTICLES)     → article:<id>
+    backbone_pages_<lang>.json        all legacy pages           → legacy:<page_id>
+    updates_faq_contact_<lang>.json   FAQ, contact, every update → faq, contact,
+                                                                   update:<page_id>
+    update_posts_content.json         English update posts       → update:<page_id> (en)
+
+and the generators used to json.load() whole per-language files (or every
+language's file) to render one page. This module compiles all of them into
+one SQLite table keyed by (page_id, lang, field) — page ids are the same
+cluster ids _hreflang.py uses — so a generator fetches just the page it is
+rendering:
+
+    import _translation_store as ts
+    page = ts.store().page("legacy:about", "de", required=ts.LEGACY_FIELDS)
+    slug = ts.store().get("faq", "es", "slug")
+
+The store (data/translations.sqlite3) is recompiled automatically whenever
+any source file changed (mtime + size), so it is always safe to call. Missing
+pages or fields raise MissingTranslation immediately instead of rendering a
+page with holes; `python3 tools/_translation_store.py` compiles and checks
+every page against the required fields up front.
+
+Not compiled: the _*_part*.json / _part1.json drafts and the build_*.py /
+_build_*.py scripts. Those are the one-off steps that produced the
+updates_faq_contact_<lang>.json files (the scripts write to absolute paths on
+the author's machine); the final files were edited afterwards and are the
+source of truth. check() only warns if a draft holds a page the final file
+is missing.
+"""
+
+import re
+import sys
+import json
+import sqlite3
+import hashlib
+import pathlib
+import argparse
+import functools
+
+PROJECT_DIR = pathlib.Path(__file__).parent.parent
+TOOLS_DIR = pathlib.Path(__file__).parent
+TRANSLATIONS_DIR = TOOLS_DIR / "translations"
+STORE_FILE = PROJECT_DIR / "data" / "translations.sqlite3"
+
+# Fields each page type must have in every language (what the generators
+# index directly; everything else they read with a default).
+VIDEO_FIELDS = ("slug", "h1", "description", "intro", "sections", "faqs")
+ARTICLE_FIELDS = ("slug", "h1", "description", "intro", "sections", "faqs")
+LEGACY_FIELDS = ("slug", "h1", "description")
+UPDATE_FIELDS = ("slug",)
+PAGE_FIELDS = ("slug",)
+
+REQUIRED_FIELDS = {
+    "video": VIDEO_FIELDS,
+    "article": ARTICLE_FIELDS,
+    "legacy": LEGACY_FIELDS,
+    "update": UPDATE_FIELDS,
+    "faq": PAGE_FIELDS,
+    "contact": PAGE_FIELDS,
+}
+
+LANG_FILE_RE = re.compile(r"^(?P<prefix>.+)_(?P<lang>[a-z]{2})$")
+
+
+class MissingTranslation(KeyError):
+    """A page, language or field the build needs is not in the store."""
+
+    def __str__(self):
+        return self.args[0] if self.args else "missing translation"
+
+
+def _load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def source_files():
+    """Compiled sources (drafts excluded), in a stable order."""
+    if not TRANSLATIONS_DIR.exists():
+        return []
+    return [p for p in sorted(TRANSLATIONS_DIR.glob("*.json"))
+            if not p.name.startswith("_")]
+
+
+def fingerprint():
+    h = hashlib.sha256()
+    for path in source_files() + [TOOLS_DIR / "generate_translated_article_pages.py"]:
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        h.update(f"{path.name}:{st.st_mtime_ns}:{st.st_size}\n".encode())
+    return h.hexdigest()[:16]
+
+
+def _article_prefixes():
+    if str(TOOLS_DIR) not in sys.path:
+        sys.path.insert(0, str(TOOLS_DIR))
+    from generate_translated_article_pages import ARTICLES
+    return {a["translation_prefix"]: article_id for article_id, a in ARTICLES.items()}
+
+
+def iter_pages():
+    """Yield (page_id, lang, {field: value}) for every compiled page."""
+    articles = _article_prefixes()
+    for path in source_files():
+        stem = path.stem
+        data = _load_json(path)
+        if stem == "update_posts_content":
+            for page_id, page in data.items():
+                yield f"update:{page_id}", "en", page
+            continue
+        m = LANG_FILE_RE.match(stem)
+        if not m:
+            print(f"  ? {path.name}: unrecognised translation file, skipped")
+            continue
+        prefix, lang = m.group("prefix"), m.group("lang")
+        if prefix == "backbone_pages":
+            for page_id, page in data.items():
+                yield f"legacy:{page_id}", lang, page
+        elif prefix == "updates_faq_contact":
+            for page_type in ("faq", "contact"):
+                if data.get(page_type):
+                    yield page_type, lang, data[page_type]
+            for page_id, page in data.get("updates", {}).items():
+                yield f"update:{page_id}", lang, page
+        elif prefix in articles:
+            yield f"article:{articles[prefix]}", lang, data
+        else:
+            yield f"video:{prefix}", lang, data
+
+
+def compile_store(path=STORE_FILE):
+    """(Re)build the SQLite store from the translation sources."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.unlink(missing_ok=True)
+    db = sqlite3.connect(tmp)
+    db.executescript("""
+        CREATE TABLE entries (
+            page_id TEXT NOT NULL,
+            lang    TEXT NOT NULL,
+            field   TEXT NOT NULL,
+            value   TEXT NOT NULL,
+            PRIMARY KEY (page_id, lang, field)
+        ) WITHOUT ROWID;
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+    """)
+    rows = 0
+    for page_id, lang, page in iter_pages():
+        db.executemany(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+            [(page_id, lang, field, json.dumps(value, ensure_ascii=False))
+             for field, value in page.items()])
+        rows += len(page)
+    db.execute("INSERT INTO meta VALUES ('fingerprint', ?)", (fingerprint(),))
+    db.commit()
+    db.close()
+    tmp.replace(path)  # atomic: a concurrent reader never sees a half-built store
+    return rows
+
+
+class TranslationStore:
+    """Read side of the store. Values are decoded lazily, per page/field."""
+
+    def __init__(self, path=STORE_FILE):
+        self.path = path
+        self.db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+    def get(self, page_id, lang, field):
+        row = self.db.execute(
+            "SELECT value FROM entries WHERE page_id = ? AND lang = ? AND field = ?",
+            (page_id, lang, field)).fetchone()
+        if row is None:
+            raise MissingTranslation(f"{page_id} [{lang}]: no '{field}' in {_where(page_id)}")
+        return json.loads(row[0])
+
+    def page(self, page_id, lang, required=()):
+        """{field: value} for one page in one language.
+
+        Raises MissingTranslation if the page doesn't exist in `lang` or
+        lacks any of the `required` fields.
+        """
+        rows = self.db.execute(
+            "SELECT field, value FROM entries WHERE page_id = ? AND lang = ?",
+            (page_id, lang)).fetchall()
+        if not rows:
+            raise MissingTranslation(f"{page_id} [{lang}]: no such page in {_where(page_id)}")
+        page = {field: json.loads(value) for field, value in rows}
+        missing = [f for f in required if f not in page]
+        if missing:
+            raise MissingTranslation(
+                f"{page_id} [{lang}]: missing {', '.join(missing)} in {_where(page_id)}")
+        return page
+
+    def has(self, page_id, lang):
+        return self.db.execute(
+            "SELECT 1 FROM entries WHERE page_id = ? AND lang = ? LIMIT 1",
+            (page_id, lang)).fetchone() is not None
+
+    def langs(self, page_id):
+        """Languages `page_id` exists in, sorted."""
+        return [r[0] for r in self.db.execute(
+            "SELECT DISTINCT lang FROM entries WHERE page_id = ? ORDER BY lang",
+            (page_id,))]
+
+    def page_ids(self, kind, lang=None):
+        """Page ids of one type ("update", "legacy", ...), optionally only
+        those that exist in `lang`."""
+        sql = "SELECT DISTINCT page_id FROM entries WHERE (page_id = ? OR page_id LIKE ?)"
+        args = [kind, f"{kind}:%"]
+        if lang:
+            sql += " AND lang = ?"
+            args.append(lang)
+        return [r[0] for r in self.db.execute(sql + " ORDER BY page_id", args)]
+
+    def languages(self, kind):
+        """Every translated language (not en) with at least one page of `kind`."""
+        return [r[0] for r in self.db.execute(
+            "SELECT DISTINCT lang FROM entries WHERE (page_id = ? OR page_id LIKE ?)"
+            " AND lang != 'en' ORDER BY lang", (kind, f"{kind}:%"))]
+
+    def check(self):
+        """Every translated page against REQUIRED_FIELDS. Returns messages."""
+        problems = []
+        for kind, fields in REQUIRED_FIELDS.items():
+            for page_id in self.page_ids(kind):
+                for lang in self.langs(page_id):
+                    if lang == "en":
+                        continue
+                    try:
+                        self.page(page_id, lang, required=fields)
+                    except MissingTranslation as e:
+                        problems.append(str(e))
+        return problems
+
+
+def _where(page_id):
+    kind = page_id.split(":", 1)[0]
+    return {
+        "legacy": "backbone_pages_<lang>.json",
+        "update": "updates_faq_contact_<lang>.json",
+        "faq": "updates_faq_contact_<lang>.json",
+        "contact": "updates_faq_contact_<lang>.json",
+    }.get(kind, "tools/translations/")
+
+
+def _stale(path):
+    try:
+        db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            row = db.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        finally:
+            db.close()
+    except sqlite3.Error:
+        return True
+    return row is None or row[0] != fingerprint()
+
+
+@functools.lru_cache(maxsize=None)
+def store():
+    """The process-wide store, compiled first if any source changed."""
+    if _stale(STORE_FILE):
+        compile_store(STORE_FILE)
+    return TranslationStore(STORE_FILE)
+
+
+def draft_warnings():
+    """Pages that exist only in a _*_part*.json draft, not the final file."""
+    warnings = []
+    drafts = {"_pt_part": "pt", "_fr_part": "fr", "_part": "de"}
+    for path in sorted(TRANSLATIONS_DIR.glob("_*.json")):
+        lang = next((l for p, l in drafts.items() if path.name.startswith(p)), None)
+        if lang is None:
+            continue
+        data = _load_json(path)
+        updates = data.get("updates") or data.get("updates_part1") or {
+            k: v for k, v in data.items() if k not in ("faq", "contact")}
+        for page_id in updates:
+            if not store().has(f"update:{page_id}", lang):
+                warnings.append(f"{path.name}: update:{page_id} [{lang}] not in updates_faq_contact_{lang}.json")
+    return warnings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile and check the translation store")
+    parser.add_argument("--force", action="store_true", help="Recompile even if the store is fresh")
+    args = parser.parse_args()
+
+    if args.force or _stale(STORE_FILE):
+        rows = compile_store(STORE_FILE)
+        print(f"Compiled {rows} fields → {STORE_FILE.relative_to(PROJECT_DIR)}")
+    else:
+        print(f"{STORE_FILE.relative_to(PROJECT_DIR)} is up to date")
+
+    s = store()
+    for kind in REQUIRED_FIELDS:
+        ids = s.page_ids(kind)
+        print(f"  {kind:<8} {len(ids):>3} page(s)  langs: {', '.join(s.languages(kind)) or '-'}")
+
+    for w in draft_warnings():
+        print(f"  ! {w}")
+    problems = s.check()
+    for p in problems:
+        print(f"  ✗ {p}")
+    if problems:
+        sys.exit(1)
+    print("All translated pages have their required fields.")
+
+
+if __name__ == "__main__":
+    main()
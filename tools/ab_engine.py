@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+A/B test analysis over the GA warehouse — all active tests in one pass.
+
+The A/B framework (analytics_monitor.AB_TEST_JS) sends one GA event per
+exposure and per conversion:
+
+    ab_view_<test id>       event_label = variant
+    ab_convert_<test id>    event_label = variant
+
+ga_ingest.py stores those counts per day in the warehouse's "events" report
+exactly once, so the per-variant running aggregates (exposures,
+conversions, per-day counts) are one grouped query over stored days —
+nothing is re-derived from raw GA rows, and each daily ingest only adds the
+new day.
+
+For every active test in data/ab-tests.json, each variant is compared with
+the control (the test's first variant):
+
+    p_value      two-sided two-proportion z-test
+    prob_best    Bayesian probability of being the best variant — Beta(1 + c,
+                 1 + n − c) posteriors (uniform prior), in their normal
+                 approximation, integrated on a grid
+    bound        sequential-testing stopping bound for |z|: O'Brien–Fleming
+                 shape, z(α/4) / √t, where t = exposures so far / the test's
+                 planned exposures per variant ("max_exposures", default
+                 DEFAULT_MAX_EXPOSURES). On the score scale z·√t this is a
+                 flat line, and by the reflection principle a Brownian path
+                 leaves ±z(α/4) before t = 1 with probability at most
+                 4·(1 − Φ(z(α/4))) = α — so the false-positive rate stays at
+                 ALPHA even when the results are looked at continuously. (The
+                 z(α/2) constant of the fixed-look design would give ~2α.)
+    decision     "winner" (crossed the bound upward and is most likely best),
+                 "loser" (crossed it downward — control beats this variant),
+                 "no difference" (planned exposures reached without crossing)
+                 or "running"
+
+and the test gets a decision from its variants': "winner" when one won (the
+likeliest best of those that did), "loser" only when every variant lost to
+control, "no difference" once every variant is settled, else "running".
+
+The statistics are computed column-wise over flat lists of every (test,
+variant) pair rather than test by test, so the cost does not grow with the
+number of concurrent tests beyond one pass.
+
+Usage:
+    python3 tools/ab_engine.py                   # analyse all active tests
+    python3 tools/ab_engine.py --test cta-color  # one test, with its daily counts
+    python3 tools/ab_engine.py --save            # also store the results in data/ab-tests.json
+"""
+
+import sys
+import json
+import math
+import pathlib
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+import _ga_store as ga_store
+
+PROJECT_DIR = pathlib.Path(__file__).parent.parent
+AB_TESTS_FILE = PROJECT_DIR / "data" / "ab-tests.json"
+
+VIEW_PREFIX = "ab_view_"
+CONVERT_PREFIX = "ab_convert_"
+ALPHA = 0.05
+DEFAULT_MAX_EXPOSURES = 10000   # planned exposures per variant
+WIN_PROBABILITY = 0.95          # prob_best a "winner" also needs
+GRID_POINTS = 400
+
+
+def load_tests():
+    if AB_TESTS_FILE.exists():
+        return json.loads(AB_TESTS_FILE.read_text())
+    return {"tests": [], "results": []}
+
+
+# ── Aggregates ────────────────────────────────────────────────────────────────
+
+def aggregates(store, start=None, end=None):
+    """{test id: {variant: {"exposures", "conversions", "days": {date: [exposures,
+    conversions]}}}} for every A/B event in the warehouse."""
+    dims, _ = ga_store.REPORTS["events"]
+    name_col, label_col = f"d{dims.index('eventName')}", f"d{dims.index('customEvent:event_label')}"
+    sql, args = [f"report = 'events'", f"({name_col} LIKE ? OR {name_col} LIKE ?)"], \
+        [VIEW_PREFIX + "%", CONVERT_PREFIX + "%"]
+    if start:
+        sql.append("date >= ?")
+        args.append(start)
+    if end:
+        sql.append("date <= ?")
+        args.append(end)
+    out = {}
+    for day, name, variant, count in store.db.execute(
+            f"SELECT date, {name_col}, {label_col}, SUM(m0) FROM rows WHERE {' AND '.join(sql)} "
+            f"GROUP BY date, {name_col}, {label_col} ORDER BY date", args):
+        is_view = name.startswith(VIEW_PREFIX)
+        test_id = name[len(VIEW_PREFIX if is_view else CONVERT_PREFIX):]
+        v = out.setdefault(test_id, {}).setdefault(
+            variant, {"exposures": 0, "conversions": 0, "days": {}})
+        count = int(count or 0)
+        v["exposures" if is_view else "conversions"] += count
+        v["days"].setdefault(day, [0, 0])[0 if is_view else 1] += count
+    return out
+
+
+# ── Statistics ────────────────────────────────────────────────────────────────
+
+def norm_cdf(x):
+    return 0.5 * math.erfc(-x / math.sqrt(2))
+
+
+def norm_ppf(p):
+    """Inverse normal CDF (Acklam's rational approximation, |error| < 1.2e-9
+    after one Newton step)."""
+    a = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+         1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+    b = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+         6.680131188771972e+01, -1.328068155288572e+01)
+    c = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+         -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+    d = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+         3.754408661907416e+00)
+    if p < 0.02425:
+        q = math.sqrt(-2 * math.log(p))
+        x = (((((c[0]*q + c[1])*q + c[2])*q + c[3])*q + c[4])*q + c[5]) / \
+            ((((d[0]*q + d[1])*q + d[2])*q + d[3])*q + 1)
+    elif p > 1 - 0.02425:
+        return -norm_ppf(1 - p)
+    else:
+        q = p - 0.5
+        r = q * q
+        x = (((((a[0]*r + a[1])*r + a[2])*r + a[3])*r + a[4])*r + a[5]) * q / \
+            (((((b[0]*r + b[1])*r + b[2])*r + b[3])*r + b[4])*r + 1)
+    e = norm_cdf(x) - p
+    return x - e * math.sqrt(2 * math.pi) * math.exp(x * x / 2)
+
+
+def posterior(n, c):
+    """Mean and sd of Beta(1 + c, 1 + n − c)."""
+    a, b = 1 + c, 1 + n - c
+    return a / (a + b), math.sqrt(a * b / ((a + b) ** 2 * (a + b + 1)))
+
+
+def prob_best(means, sds):
+    """P(each variant has the highest rate), normal posteriors, on a grid."""
+    lo = max(0.0, min(m - 6 * s for m, s in zip(means, sds)))
+    hi = min(1.0, max(m + 6 * s for m, s in zip(means, sds)))
+    step = (hi - lo) / GRID_POINTS or 1.0
+    grid = [lo + (i + 0.5) * step for i in range(GRID_POINTS)]
+    cdfs = [[norm_cdf((x - m) / s) for x in grid] for m, s in zip(means, sds)]
+    out = []
+    for i, (m, s) in enumerate(zip(means, sds)):
+        total = 0.0
+        for k, x in enumerate(grid):
+            density = math.exp(-0.5 * ((x - m) / s) ** 2) / (s * math.sqrt(2 * math.pi))
+            others = 1.0
+            for j in range(len(means)):
+                if j != i:
+                    others *= cdfs[j][k]
+            total += density * others * step
+        out.append(total)
+    norm = sum(out) or 1.0
+    return [p / norm for p in out]
+
+
+def analyze(tests, counts, alpha=ALPHA):
+    """Results for every active test: per-variant stats and a decision."""
+    z_edge = norm_ppf(1 - alpha / 4)
+    # Flat columns over every (test, variant) pair
+    rows = []
+    for test in tests:
+        if test.get("status") != "active":
+            continue
+        seen = counts.get(test["id"], {})
+        variants = list(test.get("variants", [])) + sorted(set(seen) - set(test.get("variants", [])))
+        for variant in variants:
+            v = seen.get(variant, {"exposures": 0, "conversions": 0})
+            rows.append((test, variant, v["exposures"], min(v["conversions"], v["exposures"])))
+    n = [r[2] for r in rows]
+    c = [r[3] for r in rows]
+    rate = [ci / ni if ni else 0.0 for ni, ci in zip(n, c)]
+    post = [posterior(ni, ci) for ni, ci in zip(n, c)]
+
+    results = []
+    start = 0
+    while start < len(rows):
+        test = rows[start][0]
+        end = start
+        while end < len(rows) and rows[end][0] is test:
+            end += 1
+        idx = range(start, end)
+        best = prob_best([post[i][0] for i in idx], [post[i][1] for i in idx])
+        max_n = test.get("max_exposures", DEFAULT_MAX_EXPOSURES)
+        control = start
+        variants = []
+        for k, i in enumerate(idx):
+            entry = {"variant": rows[i][1], "exposures": n[i], "conversions": c[i],
+                     "rate": round(rate[i], 4), "prob_best": round(best[k], 4)}
+            if i != control and n[i] and n[control]:
+                pooled = (c[i] + c[control]) / (n[i] + n[control])
+                se = math.sqrt(pooled * (1 - pooled) * (1 / n[i] + 1 / n[control]))
+                z = (rate[i] - rate[control]) / se if se else 0.0
+                t = min(1.0, min(n[i], n[control]) / max_n)
+                bound = z_edge / math.sqrt(t) if t else float("inf")
+                entry.update(lift=round(rate[i] / rate[control] - 1, 4) if rate[control] else None,
+                             z=round(z, 3), p_value=round(2 * (1 - norm_cdf(abs(z))), 5),
+                             bound=round(bound, 3), information=round(t, 3),
+                             decision="winner" if z >= bound and best[k] >= WIN_PROBABILITY else
+                                      "loser" if z <= -bound else
+                                      "no difference" if t >= 1 else "running")
+            elif i != control:
+                entry["decision"] = "running"
+            variants.append(entry)
+        challengers = [e["decision"] for e in variants[1:]]
+        winners = [e for e in variants[1:] if e["decision"] == "winner"]
+        decision = ("winner" if winners else
+                    "loser" if challengers and all(d == "loser" for d in challengers) else
+                    "no difference" if challengers and "running" not in challengers else
+                    "running")
+        leader = max(variants, key=lambda e: e["prob_best"]) if variants else None
+        results.append({
+            "test_id": test["id"], "element": test.get("element"), "decision": decision,
+            "winner": max(winners, key=lambda e: e["prob_best"])["variant"] if winners else
+                      variants[0]["variant"] if decision == "loser" else None,
+            "leader": leader["variant"] if leader and leader["exposures"] else None,
+            "variants": variants,
+        })
+        start = end
+    return results
+
+
+def run(store=None, tests=None, start=None, end=None):
+    """Analyse every active test from the warehouse's stored event counts."""
+    tests = tests if tests is not None else load_tests().get("tests", [])
+    return analyze(tests, aggregates(store or ga_store.store(), start, end))
+
+
+def save_results(results):
+    data = load_tests()
+    data["results"] = results
+    data["analyzed"] = datetime.now().isoformat(timespec="seconds")
+    AB_TESTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    AB_TESTS_FILE.write_text(json.dumps(data, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse A/B tests from the GA warehouse")
+    parser.add_argument("--test", help="Only this test id (prints its daily counts)")
+    parser.add_argument("--start", help="YYYY-MM-DD (default: all stored days)")
+    parser.add_argument("--end", help="YYYY-MM-DD")
+    parser.add_argument("--save", action="store_true", help="Store results in data/ab-tests.json")
+    args = parser.parse_args()
+
+    tests = load_tests().get("tests", [])
+    if args.test:
+        tests = [t for t in tests if t["id"] == args.test]
+    store = ga_store.store()
+    if not args.end and not store.is_fresh("events"):
+        print(f"WARNING: warehouse events end {store.last_date('events') or 'nowhere'} — ingestion has stopped")
+    counts = aggregates(store, args.start, args.end)
+    results = analyze(tests, counts)
+    print(f"A/B tests — {len(results)} active — {datetime.now():%Y-%m-%d %H:%M}")
+    for r in results:
+        print(f"\n  {r['test_id']} ({r['element']}) — {r['decision']}"
+              + (f": {r['winner']}" if r["winner"] else ""))
+        for v in r["variants"]:
+            extra = (f"  lift {v['lift']:+.1%}  z {v['z']:+.2f} (bound ±{v['bound']:.2f}, "
+                     f"t {v['information']:.2f})  p {v['p_value']:.4f}  {v['decision']}"
+                     if "z" in v and v["lift"] is not None else "")
+            print(f"    {v['variant']:<14} {v['conversions']:>6}/{v['exposures']:<7} "
+                  f"{v['rate']:>7.2%}  P(best) {v['prob_best']:>6.1%}{extra}")
+        if args.test:
+            for variant, v in counts.get(r["test_id"], {}).items():
+                print(f"\n    {variant} per day:")
+                for day, (views, conversions) in sorted(v["days"].items()):
+                    print(f"      {day}  {views:>6} views {conversions:>5} conversions")
+    if args.save:
+        save_results(results)
+        print(f"\n  Results → {AB_TESTS_FILE.relative_to(PROJECT_DIR)}")
+
+
+if __name__ == "__main__":
+    main()
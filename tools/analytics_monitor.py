@@ -5,6 +5,11 @@ Analytics Monitor — Weekly GA analysis + A/B testing + optimization suggestion
 Pulls Google Analytics data, analyzes tool popularity, CTA performance,
 and runs simple A/B tests. Reports findings in weekly digest.
 
+GA data comes from the local warehouse (tools/_ga_store.py): each run first
+ingests the completed days not stored yet (tools/ga_ingest.py, batched),
+then every analysis is a local query. The Data API is only asked directly
+when the warehouse does not cover a request.
+
 Usage:
     python3 tools/analytics_monitor.py --report weekly     # Full weekly report
     python3 tools/analytics_monitor.py --report ab-results # Check A/B test results
@@ -23,6 +28,10 @@ import urllib.request
 import urllib.error
 from datetime import datetime, timedelta
 
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+import _ga_store as ga_store
+import _google
+
 PROJECT_DIR = pathlib.Path(__file__).parent.parent
 DATA_DIR = PROJECT_DIR / "data"
 SECRETS_DIR = pathlib.Path.home() / ".config" / "stv-secrets"
@@ -42,24 +51,44 @@ def get_ga_credentials():
     return json.loads(cred_file.read_text())
 
 
+def update_warehouse():
+    """Ingest any completed days the local GA warehouse is missing. Best
+    effort: without credentials the warehouse is used as it is. Returns
+    False (and says so) when the warehouse is stale afterwards — reads then
+    go to the API, and A/B results are flagged."""
+    try:
+        from ga_ingest import ingest
+        stored = ingest()
+        if stored:
+            print(f"  GA warehouse: {sum(stored.values())} report-day(s) ingested")
+    except ImportError:
+        print("  google-analytics-data not installed — GA warehouse not updated.")
+    except Exception as e:
+        print(f"  GA warehouse not updated: {type(e).__name__}: {e}")
+    store = ga_store.store()
+    if store.is_fresh("overview"):
+        return True
+    print(f"  WARNING: GA warehouse is stale (newest day {store.last_date('overview') or 'none'}) "
+          "— ingestion has stopped; falling back to the Data API.")
+    return False
+
+
 def fetch_ga_data(metrics, dimensions, date_range_days=7):
-    """Fetch data from GA4 Data API using service account."""
+    """Fetch GA rows: from the local warehouse when it holds the last
+    `date_range_days` completed days, else from the GA4 Data API."""
+    rows = ga_store.store().fetch(metrics, dimensions, days=date_range_days)
+    if rows is not None:
+        return rows
     try:
-        from google.analytics.data_v1beta import BetaAnalyticsDataClient
         from google.analytics.data_v1beta.types import (
             RunReportRequest, DateRange, Metric, Dimension,
         )
-        from google.oauth2 import service_account
 
         cred_file = SECRETS_DIR / "ga-service-account.json"
         if not cred_file.exists():
             return None
 
-        credentials = service_account.Credentials.from_service_account_file(
-            str(cred_file),
-            scopes=["https://www.googleapis.com/auth/analytics.readonly"],
-        )
-        client = BetaAnalyticsDataClient(credentials=credentials)
+        client = _google.analytics_data()
 
         end_date = datetime.now().strftime("%Y-%m-%d")
         start_date = (datetime.now() - timedelta(days=date_range_days)).strftime("%Y-%m-%d")
@@ -193,33 +222,28 @@ def create_ab_test(test_id, element, variants, page):
 
 
 def analyze_ab_results(ga_data):
-    """Analyze A/B test results from GA events."""
-    tests = get_active_tests()
-    results = []
-
-    for test in tests.get("tests", []):
-        if test["status"] != "active":
-            continue
-
-        # Look for events matching this test
-        test_events = [e for e in (ga_data or [])
-                       if test["id"] in str(e.get("eventName", ""))]
-
-        if test_events:
-            variant_data = {}
-            for e in test_events:
-                variant = e.get("customEvent:variant", "unknown")
-                variant_data.setdefault(variant, 0)
-                variant_data[variant] += int(e.get("eventCount", 0))
-
-            results.append({
-                "test_id": test["id"],
-                "element": test["element"],
-                "variants": variant_data,
-                "winner": max(variant_data, key=variant_data.get) if variant_data else None,
-            })
-
-    return results
+    """Analyze all active A/B tests (significance, win probability, stopping
+    bounds — see tools/ab_engine.py) from the warehouse's daily event counts.
+    `ga_data` rows (eventName, customEvent:event_label, eventCount) are only
+    used when the warehouse holds no A/B events."""
+    import ab_engine
+    tests = get_active_tests().get("tests", [])
+    store = ga_store.store()
+    if not store.is_fresh("events"):
+        print(f"  WARNING: A/B counts are stale — warehouse events end "
+              f"{store.last_date('events') or 'nowhere'}.")
+    counts = ab_engine.aggregates(store)
+    if not counts:
+        for e in ga_data or []:
+            name = str(e.get("eventName", ""))
+            for prefix, key in ((ab_engine.VIEW_PREFIX, "exposures"),
+                                (ab_engine.CONVERT_PREFIX, "conversions")):
+                if name.startswith(prefix):
+                    variant = e.get("customEvent:event_label", "unknown")
+                    v = counts.setdefault(name[len(prefix):], {}).setdefault(
+                        variant, {"exposures": 0, "conversions": 0, "days": {}})
+                    v[key] += int(float(e.get("eventCount", 0)))
+    return ab_engine.analyze(tests, counts)
 
 
 # ─── AB Test JavaScript Injector ──────────────────────────────────────────
@@ -334,7 +358,10 @@ def generate_weekly_report():
     report["ab_tests"] = ab_results
     if ab_results:
         for r in ab_results:
-            print(f"  Test '{r['test_id']}': {r['variants']}")
+            print(f"  Test '{r['test_id']}': {r['decision']}")
+            for v in r["variants"]:
+                print(f"    {v['variant']}: {v['conversions']}/{v['exposures']} "
+                      f"P(best) {v['prob_best']:.0%}")
             if r["winner"]:
                 print(f"    Winner: {r['winner']}")
 
@@ -383,7 +410,7 @@ def send_analytics_digest(report):
         if report.get("ab_tests"):
             msg += "*A/B Tests:*\n"
             for t in report["ab_tests"]:
-                msg += f"  {t['test_id']}: {t.get('winner', 'no winner yet')}\n"
+                msg += f"  {t['test_id']}: {t['winner'] or t['decision']}\n"
 
         send_telegram(msg, "info")
 
@@ -406,6 +433,8 @@ def main():
     args = parser.parse_args()
 
     print(f"STV Analytics Monitor — {args.report} — {datetime.now().isoformat()}\n")
+    if args.report != "ab-inject":
+        update_warehouse()
 
     if args.report == "weekly":
         generate_weekly_report()
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+Build-time static search index — per language, prefix-sharded, fetched lazily.
+
+The site has no server-side search, and one monolithic JSON of every page
+and transcript would cost every visitor hundreds of KB before the first
+result. This stage runs after the generators and writes, per language:
+
+    search/<lang>/meta.json    doc count, shard keys, the language's
+                               normalisation/stemming rules (~2 KB)
+    search/<lang>/docs.json    [url, title, description] per doc id
+    search/<lang>/<key>.json   {term: [doc, tf, doc, tf, ...]} for every
+                               term starting with <key>
+
+js/search.js fetches meta.json when the search box is first focused, then
+only the shard(s) a query's terms fall into — a few KB per query.
+
+Documents are every page the sitemap lists (same exclusions), indexed from
+the page's main content (generate_sitemap.main_content); the title counts
+TITLE_WEIGHT times and the meta description DESC_WEIGHT times. Video pages also get their transcript:
+transcriptions/<id>/transcript.txt for the English page and
+subtitles.<lang>.srt for a translated page, when those exist locally.
+
+Stemming is a light suffix stripper per language (plus Arabic article /
+conjunction prefixes), after diacritic folding. The rules are written into
+meta.json and js/search.js applies the SAME rules to queries, so index and
+query terms always agree — edit STEM_RULES here, never in the JS.
+
+Shards start as one per first character and are split by a further
+character while larger than SHARD_BUDGET bytes, so common letters get
+finer shards and rare ones stay together. Unchanged files are not
+rewritten.
+
+Every language with an index also gets the search box on its video hub —
+the pages videos.html lists as its hreflang alternates. The box, its
+styles and the script tag go in between <!-- site-search --> markers
+(labels from _templates.search_box), so re-runs replace them in place.
+
+Usage:
+    python3 tools/build_search_index.py              # build search/
+    python3 tools/build_search_index.py --report     # sizes only, write nothing
+"""
+
+import re
+import sys
+import html
+import json
+import shutil
+import pathlib
+import argparse
+import unicodedata
+from datetime import datetime
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+import generate_sitemap as sitemap
+import _hreflang as hreflang
+import _templates as tpl
+
+PROJECT_DIR = pathlib.Path(__file__).parent.parent
+INDEX_DIR = PROJECT_DIR / "search"
+TRANS_DIR = PROJECT_DIR / "transcriptions"
+
+INDEX_VERSION = 1
+TITLE_WEIGHT = 5
+DESC_WEIGHT = 2
+SHARD_BUDGET = 24 * 1024   # bytes of JSON before a shard is split further
+MAX_PREFIX = 3
+MIN_TERM = 2
+
+TITLE_RE = re.compile(r"<title>(.*?)</title>", re.S | re.I)
+DESC_RE = re.compile(r'<meta name="description" content="([^"]*)"', re.I)
+TAG_RE = re.compile(r"<[^>]+>")
+HUB_PAGE = "videos.html"
+ALTERNATE_RE = re.compile(r'hreflang="([a-z]{2})" href="([^"]+)"')
+HERO_RE = re.compile(r'<div class="article-hero">.*?</h1>(?:\s*<p\b[^>]*>.*?</p>)?', re.S)
+BOX_BLOCK_RE = re.compile(r"\n\s*<!-- site-search -->.*?<!-- /site-search -->", re.S)
+CSS_BLOCK_RE = re.compile(r"\n\s*<!-- site-search-css -->.*?<!-- /site-search-css -->", re.S)
+TOKEN_RE = re.compile(r"[^\W_]+")
+SRT_SKIP_RE = re.compile(r"^\d+$|-->")
+
+# Per-language normalisation + light stemming. Shipped in meta.json and run
+# verbatim by js/search.js. Suffixes are tried in order (longest first); the
+# first one that leaves at least min_stem characters is replaced.
+STEM_RULES = {
+    "en": {
+        "min_stem": 3,
+        "charmap": {},
+        "prefixes": [],
+        "suffixes": [["ational", "ate"], ["ization", "ize"], ["fulness", "ful"],
+                     ["iveness", "ive"], ["ations", "ate"], ["ation", "ate"],
+                     ["ments", ""], ["ment", ""], ["ness", ""], ["ings", ""],
+                     ["ing", ""], ["ies", "y"], ["ied", "y"], ["ers", ""],
+                     ["er", ""], ["ed", ""], ["ly", ""], ["es", ""], ["s", ""]],
+        "stopwords": ["a", "an", "and", "are", "as", "at", "be", "but", "by", "for",
+                      "from", "has", "have", "i", "if", "in", "into", "is", "it",
+                      "its", "me", "my", "of", "on", "or", "so", "that", "the",
+                      "their", "them", "they", "this", "to", "was", "we", "what",
+                      "when", "which", "will", "with", "you", "your"],
+    },
+    "es": {
+        "min_stem": 3,
+        "charmap": {},
+        "prefixes": [],
+        "suffixes": [["amientos", ""], ["imientos", ""], ["amiento", ""],
+                     ["imiento", ""], ["aciones", ""], ["adoras", ""],
+                     ["adores", ""], ["idades", ""], ["mente", ""], ["acion", ""],
+                     ["ancias", ""], ["ancia", ""], ["idad", ""], ["adora", ""],
+                     ["ador", ""], ["ables", ""], ["ibles", ""], ["able", ""],
+                     ["ible", ""], ["istas", ""], ["ista", ""], ["ando", ""],
+                     ["iendo", ""], ["ados", ""], ["idos", ""], ["adas", ""],
+                     ["idas", ""], ["ado", ""], ["ido", ""], ["ada", ""], ["ida", ""],
+                     ["es", ""], ["os", ""], ["as", ""], ["ar", ""], ["er", ""],
+                     ["ir", ""], ["s", ""], ["a", ""], ["o", ""], ["e", ""]],
+        "stopwords": ["a", "al", "como", "con", "de", "del", "el", "en", "es", "esta",
+                      "este", "la", "las", "lo", "los", "mas", "me", "mi", "no", "o",
+                      "para", "pero", "por", "que", "se", "si", "sin", "su", "sus",
+                      "te", "tu", "un", "una", "y", "yo"],
+    },
+    "pt": {
+        "min_stem": 3,
+        "charmap": {},
+        "prefixes": [],
+        "suffixes": [["amentos", ""], ["imentos", ""], ["amento", ""],
+                     ["imento", ""], ["adores", ""], ["adoras", ""], ["idades", ""],
+                     ["acoes", ""], ["mente", ""], ["idade", ""], ["acao", ""],
+                     ["ador", ""], ["ancia", ""], ["avel", ""], ["ivel", ""],
+                     ["istas", ""], ["ista", ""], ["ando", ""], ["endo", ""],
+                     ["indo", ""], ["ados", ""], ["idos", ""], ["adas", ""],
+                     ["idas", ""], ["ado", ""], ["ido", ""], ["ada", ""], ["ida", ""],
+                     ["es", ""], ["os", ""], ["as", ""], ["ar", ""], ["er", ""],
+                     ["ir", ""], ["s", ""], ["a", ""], ["o", ""], ["e", ""]],
+        "stopwords": ["a", "ao", "as", "com", "como", "da", "das", "de", "do", "dos",
+                      "e", "em", "eu", "for", "mais", "mas", "me", "meu", "na", "nao",
+                      "no", "nos", "o", "os", "ou", "para", "por", "que", "se", "sem",
+                      "seu", "sua", "um", "uma", "voce"],
+    },
+    "fr": {
+        "min_stem": 3,
+        "charmap": {},
+        "prefixes": [],
+        "suffixes": [["issements", ""], ["issement", ""], ["atrices", ""],
+                     ["ateurs", ""], ["ations", ""], ["atrice", ""], ["ateur", ""],
+                     ["ation", ""], ["ements", ""], ["ement", ""], ["ments", ""],
+                     ["ment", ""], ["ances", ""], ["ance", ""], ["ables", ""],
+                     ["able", ""], ["istes", ""], ["iste", ""], ["euses", ""],
+                     ["euse", ""], ["eux", ""], ["ites", ""], ["ite", ""],
+                     ["ees", ""], ["ee", ""], ["es", ""], ["er", ""], ["ez", ""],
+                     ["e", ""], ["s", ""], ["x", ""]],
+        "stopwords": ["a", "au", "aux", "avec", "ce", "ces", "dans", "de", "des", "du",
+                      "elle", "en", "est", "et", "il", "je", "la", "le", "les", "leur",
+                      "mais", "me", "mon", "ne", "nous", "on", "ou", "par", "pas",
+                      "pour", "qu", "que", "qui", "sa", "se", "son", "sur", "un",
+                      "une", "vous", "d", "l", "j", "c", "n", "s"],
+    },
+    "de": {
+        "min_stem": 3,
+        "charmap": {"ß": "ss"},
+        "prefixes": [],
+        "suffixes": [["ungen", ""], ["heiten", ""], ["keiten", ""], ["heit", ""],
+                     ["keit", ""], ["ung", ""], ["lich", ""], ["isch", ""],
+                     ["ern", ""], ["em", ""], ["en", ""], ["er", ""], ["es", ""],
+                     ["e", ""], ["s", ""], ["n", ""]],
+        "stopwords": ["aber", "als", "am", "an", "auch", "auf", "aus", "bei", "bin",
+                      "das", "dass", "dem", "den", "der", "des", "die", "du", "ein",
+                      "eine", "einen", "er", "es", "fur", "hat", "ich", "im", "in",
+                      "ist", "mit", "nicht", "noch", "nur", "oder", "sie", "sind",
+                      "so", "und", "von", "wenn", "wie", "wir", "zu"],
+    },
+    "ar": {
+        "min_stem": 3,
+        # Hamza-carrying alefs fold to ا via diacritic stripping; these don't.
+        "charmap": {"ة": "ه", "ى": "ي", "ـ": ""},
+        "prefixes": ["وال", "بال", "كال", "فال", "لل", "ال", "و"],
+        "suffixes": [["ها", ""], ["ان", ""], ["ات", ""], ["ون", ""], ["ين", ""],
+                     ["يه", ""], ["ه", ""], ["ي", ""]],
+        "stopwords": ["في", "من", "على", "الى", "عن", "مع", "هذا", "هذه", "ان", "او",
+                      "ما", "لا", "هو", "هي", "كان", "التي", "الذي", "ذلك", "قد",
+                      "كل", "لم", "لك", "انا", "انت"],
+    },
+}
+
+
+# ---------------------------------------------------------------------------
+# Text processing (mirrored in js/search.js)
+# ---------------------------------------------------------------------------
+
+def fold(text, rules):
+    """Lowercase, strip diacritics (NFKD minus combining marks), apply charmap."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if unicodedata.category(c) != "Mn")
+    for src, dst in rules["charmap"].items():
+        text = text.replace(src, dst)
+    return text
+
+
+def stem(term, rules):
+    n = rules["min_stem"]
+    for prefix in rules["prefixes"]:
+        if term.startswith(prefix) and len(term) - len(prefix) >= n:
+            term = term[len(prefix):]
+            break
+    for suffix, repl in rules["suffixes"]:
+        if term.endswith(suffix) and len(term) - len(suffix) >= n:
+            return term[:-len(suffix)] + repl
+    return term
+
+
+def terms(text, rules):
+    """Index terms of `text`: folded, stop-worded, stemmed."""
+    stop = set(rules["stopwords"])
+    out = []
+    for tok in TOKEN_RE.findall(fold(text, rules)):
+        if len(tok) < MIN_TERM or tok in stop:
+            continue
+        out.append(stem(tok, rules))
+    return out
+
+
+def shard_file(key):
+    """File name for a shard key — ASCII alphanumerics kept, others _<hex>."""
+    return "".join(c if c.isascii() and c.isalnum() else f"_{ord(c):x}"
+                   for c in key) + ".json"
+
+
+# ---------------------------------------------------------------------------
+# Documents
+# ---------------------------------------------------------------------------
+
+def page_lang(rel_path):
+    return sitemap.sitemap_group(rel_path)[0]
+
+
+def strip_tags(fragment):
+    return " ".join(TAG_RE.sub(" ", fragment).split())
+
+
+def page_doc(rel_path, path):
+    text = path.read_text(encoding="utf-8", errors="ignore")
+    m = TITLE_RE.search(text)
+    title = strip_tags(m.group(1)) if m else rel_path
+    title = re.split(r"\s+\|\s+", html.unescape(title))[0]
+    m = DESC_RE.search(text)
+    desc = html.unescape(m.group(1)) if m else ""
+    body = html.unescape(strip_tags(sitemap.main_content(text)))
+    url = sitemap.rel_to_url(rel_path)[len(sitemap.BASE_URL) + 1:]
+    return {"url": url, "title": title, "desc": desc, "body": body}
+
+
+def srt_text(path):
+    lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
+    return " ".join(l.strip() for l in lines if l.strip() and not SRT_SKIP_RE.search(l))
+
+
+def transcripts():
+    """{absolute page URL: transcript text} for every video with one locally."""
+    if not TRANS_DIR.exists():
+        return {}
+    from generate_video_pages import KEYWORD_MAP
+    found = {}
+    for video_id, meta in KEYWORD_MAP.items():
+        folder = TRANS_DIR / video_id
+        if not folder.is_dir():
+            continue
+        en = folder / "transcript.txt"
+        if en.exists() and meta.get("slug"):
+            url = f"{sitemap.BASE_URL}/video/{meta['slug']}/"
+            found[url] = en.read_text(encoding="utf-8", errors="ignore")
+        for lang, url in hreflang.cluster(f"video:{video_id}").items():
+            srt = folder / f"subtitles.{lang}.srt"
+            if lang != "en" and srt.exists():
+                found[url] = srt_text(srt)
+    return found
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+def build_language(lang, docs):
+    """(meta, docs_list, {key: shard}) for one language."""
+    rules = STEM_RULES.get(lang, STEM_RULES["en"])
+    postings = {}
+    for doc_id, doc in enumerate(docs):
+        tf = {}
+        for t in terms(doc["title"], rules):
+            tf[t] = tf.get(t, 0) + TITLE_WEIGHT
+        for t in terms(doc["desc"], rules):
+            tf[t] = tf.get(t, 0) + DESC_WEIGHT
+        for t in terms(doc["body"], rules):
+            tf[t] = tf.get(t, 0) + 1
+        for t, n in tf.items():
+            postings.setdefault(t, []).extend((doc_id, n))
+
+    shards = {}
+
+    def place(key, group):
+        size = len(json.dumps(group, ensure_ascii=False, separators=(",", ":")))
+        if size <= SHARD_BUDGET or len(key) >= MAX_PREFIX:
+            shards[key] = group
+            return
+        own = {t: p for t, p in group.items() if len(t) == len(key)}
+        if own:
+            shards[key] = own
+        children = {}
+        for t, p in group.items():
+            if len(t) > len(key):
+                children.setdefault(t[:len(key) + 1], {})[t] = p
+        for child, sub in sorted(children.items()):
+            place(child, sub)
+
+    by_first = {}
+    for t in sorted(postings):
+        by_first.setdefault(t[0], {})[t] = postings[t]
+    for key, group in by_first.items():
+        place(key, group)
+
+    meta = {
+        "v": INDEX_VERSION,
+        "lang": lang,
+        "docs": len(docs),
+        "min_term": MIN_TERM,
+        "title_weight": TITLE_WEIGHT,
+        "rules": rules,
+        "shards": {key: shard_file(key) for key in sorted(shards)},
+    }
+    doc_rows = [[d["url"], d["title"], d["desc"]] for d in docs]
+    return meta, doc_rows, shards
+
+
+def _dump(obj):
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def write_language(lang, meta, doc_rows, shards):
+    """Write one language's files; returns (files written, bytes total)."""
+    out = INDEX_DIR / lang
+    out.mkdir(parents=True, exist_ok=True)
+    files = {"meta.json": _dump(meta), "docs.json": _dump(doc_rows)}
+    for key, shard in shards.items():
+        files[meta["shards"][key]] = _dump(shard)
+    written = 0
+    for name, data in files.items():
+        written += sitemap.write_if_changed(out / name, data)
+    for stale in out.glob("*.json"):
+        if stale.name not in files:
+            stale.unlink()
+    return written, sum(len(d) for d in files.values())
+
+
+# ---------------------------------------------------------------------------
+# Search box on the language hubs
+# ---------------------------------------------------------------------------
+
+def hub_pages():
+    """{lang: rel_path} of the video hub in every language."""
+    text = (PROJECT_DIR / HUB_PAGE).read_text(encoding="utf-8")
+    hubs = {"en": HUB_PAGE}
+    for lang, url in ALTERNATE_RE.findall(text):
+        if lang != "en" and url.startswith(sitemap.BASE_URL + "/"):
+            rel = url[len(sitemap.BASE_URL) + 1:]
+            hubs[lang] = rel + "index.html" if rel.endswith("/") else rel
+    return hubs
+
+
+def with_search_box(page_html, lang, prefix):
+    """`page_html` with the search box (re)installed; None when the page has
+    no hero to put it under. A hand-placed box (no markers) is left alone."""
+    page_html = BOX_BLOCK_RE.sub("", CSS_BLOCK_RE.sub("", page_html))
+    if "data-site-search" in page_html:
+        return page_html
+    hero = HERO_RE.search(page_html)
+    if not hero or "</head>" not in page_html:
+        return None
+    box = f"\n      <!-- site-search -->{tpl.search_box(lang)}<!-- /site-search -->"
+    page_html = page_html[:hero.end()] + box + page_html[hero.end():]
+    css = f"\n  <!-- site-search-css -->\n{tpl.SEARCH_CSS}\n  <!-- /site-search-css -->"
+    page_html = page_html.replace("</head>", css + "\n</head>", 1)
+    script = f'<script src="{prefix}js/search.js" defer></script>'
+    if script not in page_html:
+        page_html = page_html.replace(
+            "</body>", f"  <!-- site-search -->{script}<!-- /site-search -->\n</body>", 1)
+    return page_html
+
+
+def install_search_boxes(langs):
+    """Put the search box on the hub of every language in `langs`; returns
+    (updated, [hubs it could not be placed on])."""
+    updated, failed = 0, []
+    for lang, rel in sorted(hub_pages().items()):
+        path = PROJECT_DIR / rel
+        if lang not in langs or not path.exists():
+            continue
+        text = path.read_text(encoding="utf-8")
+        new = with_search_box(text, lang, "../" * rel.count("/"))
+        if new is None:
+            failed.append(rel)
+        elif new != text:
+            path.write_text(new, encoding="utf-8")
+            updated += 1
+    return updated, failed
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Build the static per-language search index")
+    ap.add_argument("--report", action="store_true", help="Print sizes; write nothing")
+    args = ap.parse_args()
+
+    print(f"Search index — {datetime.now():%Y-%m-%d %H:%M}")
+    print("=" * 60)
+
+    extra = transcripts()
+    by_lang = {}
+    for rel_path, path in sorted(sitemap.find_all_pages(PROJECT_DIR)):
+        doc = page_doc(rel_path, path)
+        text = extra.pop(sitemap.rel_to_url(rel_path), None)
+        if text:
+            doc["body"] += " " + text
+        by_lang.setdefault(page_lang(rel_path), []).append(doc)
+
+    print(f"\n  {'Lang':<5} {'Docs':>5} {'Terms':>7} {'Shards':>7} {'Largest':>9} {'Total':>9}")
+    for lang in sorted(by_lang):
+        meta, doc_rows, shards = build_language(lang, by_lang[lang])
+        sizes = [len(_dump(s)) for s in shards.values()]
+        n_terms = sum(len(s) for s in shards.values())
+        if args.report:
+            total = sum(sizes) + len(_dump(meta)) + len(_dump(doc_rows))
+            written = 0
+        else:
+            written, total = write_language(lang, meta, doc_rows, shards)
+        print(f"  {lang:<5} {len(doc_rows):>5} {n_terms:>7} {len(shards):>7} "
+              f"{max(sizes, default=0) / 1024:>8.1f}K {total / 1024:>8.1f}K"
+              + (f"  ({written} file(s) updated)" if written else ""))
+
+    if not args.report:
+        for stale in INDEX_DIR.iterdir():
+            if stale.is_dir() and stale.name not in by_lang:
+                shutil.rmtree(stale)
+        updated, failed = install_search_boxes(set(by_lang))
+        print(f"\n  Search box: {updated} hub page(s) updated"
+              + (f"; no hero to place it on: {', '.join(failed)}" if failed else ""))
+    if not extra:
+        print("\n  Transcripts: none found locally" if not TRANS_DIR.exists()
+              else "\n  Transcripts: all matched a page")
+    else:
+        print(f"\n  Transcripts without a published page: {len(extra)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Build-time service worker — precache list derived from the build outputs.
+
+Writes /sw.js (site root, so its scope is the whole site). js/nav.js
+registers it on every page. Caching:
+
+    CSS / JS         precached at install, served cache-first
+    home pages       every language's home page, precached at install
+    shell pages      per language: the nav targets (tools/_templates.NAV_LINKS)
+                     in that language, found through each page's hreflang
+                     alternates. Fetched in the background the first time the
+                     reader visits a page in that language, not for every
+                     language up front.
+    other HTML       stale-while-revalidate: cached copy at once, refreshed
+                     from the network behind it (offline: the cached copy,
+                     else the language's home page)
+    images           runtime cache-first, trimmed to MAX_IMAGES entries
+
+Asset URLs are not fingerprinted, so the cache version is instead a hash of
+every precached file's bytes: any changed asset or shell page yields a new
+sw.js, the browser installs it, and activation deletes every stv-* cache
+that is not current (the image cache is versioned separately, so a
+rebuild does not throw away images).
+
+Nothing here is hand-maintained: rerun after the generators and the list
+follows the nav, the languages and the files on disk. sw.js is only
+rewritten when its content changes.
+
+Usage:
+    python3 tools/build_service_worker.py            # write sw.js
+    python3 tools/build_service_worker.py --report   # print the lists only
+"""
+
+import sys
+import json
+import hashlib
+import pathlib
+import argparse
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+import generate_sitemap as sitemap
+import _templates as tpl
+
+PROJECT_DIR = pathlib.Path(__file__).parent.parent
+SW_FILE = PROJECT_DIR / "sw.js"
+
+ASSET_GLOBS = ["css/*.css", "js/*.js", "favicon.ico"]
+MAX_IMAGES = 80
+IMAGE_CACHE = "stv-images-v1"   # bump only if the image caching rules change
+
+
+def url_path(url):
+    """Site-absolute path ("/es/") for an absolute site URL."""
+    return url[len(sitemap.BASE_URL):] or "/"
+
+
+def rel_for_path(path):
+    """Project file behind a site path ("/es/" → es/index.html)."""
+    rel = path.lstrip("/")
+    if not rel or rel.endswith("/"):
+        rel += "index.html"
+    return rel
+
+
+def assets(root=PROJECT_DIR):
+    found = []
+    for pattern in ASSET_GLOBS:
+        found += sorted(root.glob(pattern))
+    return ["/" + p.relative_to(root).as_posix() for p in found]
+
+
+def home_pages(root=PROJECT_DIR):
+    homes = {"en": "/"}
+    for lang in sorted(sitemap.LANG_PREFIXES):
+        if (root / lang / "index.html").exists():
+            homes[lang] = f"/{lang}/"
+    return homes
+
+
+def shell_pages(root=PROJECT_DIR):
+    """{lang: [site paths]} of the nav pages in each language."""
+    shells = {}
+    for href, _ in tpl.NAV_LINKS:
+        path = root / href
+        if not path.exists():
+            continue  # nav entry without a page yet (faq.html)
+        alternates = sitemap.page_alternates(f"{sitemap.BASE_URL}/{href}", path)
+        alternates.setdefault("en", f"{sitemap.BASE_URL}/{href}")
+        for lang, url in alternates.items():
+            if lang == "x-default" or not url.startswith(sitemap.BASE_URL):
+                continue
+            site_path = url_path(url)
+            if (root / rel_for_path(site_path)).exists():
+                shells.setdefault(lang, []).append(site_path)
+    return {lang: sorted(set(paths)) for lang, paths in sorted(shells.items())}
+
+
+def version(paths, root=PROJECT_DIR):
+    """Hash of every precached file's bytes (and the paths themselves)."""
+    h = hashlib.sha256()
+    for p in sorted(set(paths)):
+        h.update(p.encode() + b"\0")
+        h.update((root / rel_for_path(p)).read_bytes())
+    h.update(SW_TEMPLATE.encode())
+    return h.hexdigest()[:12]
+
+
+def render(root=PROJECT_DIR):
+    """(sw.js source, summary dict)."""
+    asset_paths = assets(root)
+    homes = home_pages(root)
+    shells = shell_pages(root)
+    all_paths = asset_paths + list(homes.values()) + [p for ps in shells.values() for p in ps]
+    v = version(all_paths, root)
+    config = {
+        "version": v,
+        "precache": asset_paths + list(homes.values()),
+        "homes": homes,
+        "shells": shells,
+        "imageCache": IMAGE_CACHE,
+        "maxImages": MAX_IMAGES,
+    }
+    source = SW_TEMPLATE.replace(
+        "__CONFIG__", json.dumps(config, indent=2, ensure_ascii=False))
+    return source, config
+
+
+SW_TEMPLATE = r"""/* Service worker — GENERATED by tools/build_service_worker.py, do not edit.
+   Precache: CSS/JS + home pages at install; each language's shell pages on
+   the first visit in that language. HTML: stale-while-revalidate.
+   Images: cache-first, trimmed to maxImages. */
+var CONFIG = __CONFIG__;
+
+var PRECACHE = 'stv-precache-' + CONFIG.version;
+var PAGES = 'stv-pages-' + CONFIG.version;
+var CURRENT = [PRECACHE, PAGES, CONFIG.imageCache];
+var warmed = {};
+
+self.addEventListener('install', function (event) {
+  event.waitUntil(
+    caches.open(PRECACHE).then(function (cache) {
+      return cache.addAll(CONFIG.precache.map(function (url) {
+        return new Request(url, { cache: 'reload' });
+      }));
+    }).then(function () { return self.skipWaiting(); })
+  );
+});
+
+self.addEventListener('activate', function (event) {
+  event.waitUntil(
+    caches.keys().then(function (keys) {
+      return Promise.all(keys.filter(function (key) {
+        return key.indexOf('stv-') === 0 && CURRENT.indexOf(key) === -1;
+      }).map(function (key) { return caches.delete(key); }));
+    }).then(function () { return self.clients.claim(); })
+  );
+});
+
+function langOf(path) {
+  var first = path.split('/')[1];
+  return CONFIG.homes[first] ? first : 'en';
+}
+
+// First page seen in a language: fetch that language's nav pages behind it.
+function warmShell(lang) {
+  if (warmed[lang] || !CONFIG.shells[lang]) return Promise.resolve();
+  warmed[lang] = true;
+  return caches.open(PAGES).then(function (cache) {
+    return Promise.all(CONFIG.shells[lang].map(function (url) {
+      return cache.match(url).then(function (hit) {
+        return hit || cache.add(url).catch(function () {});
+      });
+    }));
+  });
+}
+
+function trim(cacheName, max) {
+  return caches.open(cacheName).then(function (cache) {
+    return cache.keys().then(function (keys) {
+      if (keys.length <= max) return;
+      // Oldest entries first (insertion order)
+      return Promise.all(keys.slice(0, keys.length - max).map(function (key) {
+        return cache.delete(key);
+      }));
+    });
+  });
+}
+
+function staleWhileRevalidate(event, url) {
+  var request = event.request;
+  var network = fetch(request).then(function (response) {
+    if (response.ok && response.type === 'basic') {
+      var copy = response.clone();
+      caches.open(PAGES).then(function (cache) { cache.put(request, copy); });
+    }
+    return response;
+  });
+  event.waitUntil(network.catch(function () {}).then(function () {
+    return warmShell(langOf(url.pathname));
+  }));
+  return caches.match(request).then(function (hit) {
+    if (hit) return hit;
+    return network.catch(function () {
+      return caches.match(CONFIG.homes[langOf(url.pathname)]);
+    });
+  });
+}
+
+function cacheFirst(request, cacheName, max) {
+  return caches.match(request).then(function (hit) {
+    if (hit) return hit;
+    return fetch(request).then(function (response) {
+      if (response.ok && cacheName) {
+        var copy = response.clone();
+        caches.open(cacheName).then(function (cache) {
+          return cache.put(request, copy);
+        }).then(function () { return trim(cacheName, max); });
+      }
+      return response;
+    });
+  });
+}
+
+self.addEventListener('fetch', function (event) {
+  var request = event.request;
+  if (request.method !== 'GET') return;
+  var url = new URL(request.url);
+  if (url.origin !== self.location.origin) return;
+
+  if (request.mode === 'navigate' ||
+      (request.headers.get('Accept') || '').indexOf('text/html') !== -1) {
+    event.respondWith(staleWhileRevalidate(event, url));
+  } else if (CONFIG.precache.indexOf(url.pathname) !== -1) {
+    event.respondWith(cacheFirst(request, null));
+  } else if (request.destination === 'image') {
+    event.respondWith(cacheFirst(request, CONFIG.imageCache, CONFIG.maxImages));
+  }
+});
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the precaching service worker")
+    parser.add_argument("--report", action="store_true", help="Print the lists; write nothing")
+    args = parser.parse_args()
+
+    source, config = render()
+    precache_bytes = sum((PROJECT_DIR / rel_for_path(p)).stat().st_size
+                         for p in config["precache"])
+    print(f"Service worker {config['version']}: {len(config['precache'])} precached "
+          f"({precache_bytes / 1024:.0f} KB)")
+    for lang, paths in config["shells"].items():
+        size = sum((PROJECT_DIR / rel_for_path(p)).stat().st_size for p in paths)
+        print(f"  shell {lang:<3} {len(paths)} page(s), {size / 1024:.0f} KB: {' '.join(paths)}")
+    if args.report:
+        return
+    changed = sitemap.write_if_changed(SW_FILE, source.encode("utf-8"))
+    print(f"  {'Wrote' if changed else 'Unchanged'} {SW_FILE.relative_to(PROJECT_DIR)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Critical CSS — per-template above-the-fold inlining + unused-rule pruning.
+
+Every page used to block first paint on the whole of css/style.css (~45 KB),
+whether it was an update post, a translated FAQ or a video article. This
+post-processing stage runs after the generators and:
+
+  1. Works out which selectors each page actually uses (tags, classes, ids in
+     the markup, plus anything js/*.js or an inline <script> can add at
+     runtime — theme toggle, consent banner, lightbox, lang switcher).
+  2. Groups pages by template (article, video, update, faq, contact, legacy,
+     page) and takes the rules that style the above-the-fold markup of that
+     template (nav, risk banner, hero) as its CRITICAL subset.
+  3. Writes css/style.min.css — style.css minus every rule no page uses.
+  4. Rewrites each page's blocking <link rel="stylesheet" .../css/style.css>
+     into an inline <style> with the template's critical CSS, plus a
+     non-blocking preload of style.min.css (with a <noscript> fallback).
+
+css/style.css stays the file you edit; style.min.css is a build artifact.
+Re-running is idempotent: an already-processed page has its critical block
+replaced in place, so run this after every generator/CSS change.
+
+Matching is deliberately conservative: combinators, attribute selectors
+([data-theme="dark"]) and pseudo-classes are ignored, so a rule is only
+dropped when one of its tags/classes/ids appears NOWHERE on the page or in
+the site's JS. A false "keep" costs a few bytes; a false "drop" would break
+the layout — we never risk the latter.
+
+Usage:
+    python3 tools/critical_css.py              # prune + inline into every page
+    python3 tools/critical_css.py --report     # per-template byte report only, write nothing
+"""
+
+import os
+import re
+import json
+import pathlib
+import argparse
+from datetime import datetime
+
+PROJECT_DIR = pathlib.Path(__file__).parent.parent
+TRANSLATIONS_DIR = pathlib.Path(__file__).parent / "translations"
+CSS_FILE = PROJECT_DIR / "css" / "style.css"
+PRUNED_CSS_FILE = PROJECT_DIR / "css" / "style.min.css"
+JS_DIR = PROJECT_DIR / "js"
+
+LANG_PREFIXES = {"es", "de", "fr", "pt", "ar", "it", "ko", "nl", "pl", "us"}
+SKIP_DIRS = {"node_modules", "venv", ".git", "backups", "tools", "review-staging",
+             "workers", "reports", "transcriptions", "outreach", "data"}
+
+# English pages that have a translated "legacy" (backbone) counterpart.
+# Mirrors generate_translated_legacy_pages.LEGACY_PAGES.
+LEGACY_EN_FILES = {"social-trading.html", "copy-trading.html", "about.html",
+                   "copy-trading-returns.html", "taking-profits.html"}
+
+# Above the fold = <body> markup up to the first main-content marker, capped.
+FOLD_MARKERS = ('<article', 'class="article-body"', '<main', 'class="article-content"')
+FOLD_CHARS = 8000
+
+# The blocking stylesheet link every generator emits, and the block we replace
+# it with. The markers make re-runs idempotent.
+STYLE_LINK_RE = re.compile(r'<link rel="stylesheet" href="([^"]*?)css/style\.css"\s*/?>')
+CRITICAL_BLOCK_RE = re.compile(
+    r'<!-- critical-css -->.*?href="([^"]*?)css/style\.min\.css".*?<!-- /critical-css -->',
+    re.S,
+)
+
+# Stylesheets that still block rendering after inlining (<noscript> fallbacks don't)
+NOSCRIPT_RE = re.compile(r"<noscript\b.*?</noscript>", re.S | re.I)
+STYLESHEET_LINK_RE = re.compile(
+    r"""<link\b(?=[^>]*\brel=["']stylesheet["'])[^>]*\bhref=["']([^"']+)["'][^>]*>""", re.I)
+
+COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+PSEUDO_RE = re.compile(r"::?[\w-]+(?:\((?:[^()]|\([^()]*\))*\))?")
+ATTR_RE = re.compile(r"\[[^\]]*\]")
+TAG_RE = re.compile(r"<([a-zA-Z][\w-]*)")
+CLASS_ATTR_RE = re.compile(r'\bclass\s*=\s*["\']([^"\']*)["\']')
+ID_ATTR_RE = re.compile(r'\bid\s*=\s*["\']([^"\']*)["\']')
+SCRIPT_RE = re.compile(r"<script\b[^>]*>(.*?)</script>", re.S | re.I)
+QUOTED_RE = re.compile(r"""['"]([\w\s-]+)['"]""")
+
+
+# ---------------------------------------------------------------------------
+# CSS parsing
+# ---------------------------------------------------------------------------
+
+def _match_brace(text, open_idx):
+    """Index of the '}' closing the '{' at open_idx (quote-aware)."""
+    depth = 0
+    quote = None
+    for i in range(open_idx, len(text)):
+        c = text[i]
+        if quote:
+            if c == quote and text[i - 1] != "\\":
+                quote = None
+        elif c in "\"'":
+            quote = c
+        elif c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(text) - 1
+
+
+def parse_css(text):
+    """Split a stylesheet into nodes.
+
+    ("rule", selector_text, declarations)  — an ordinary style rule
+    ("group", "@media ...", [nodes])       — @media / @supports (recursed)
+    ("raw", text)                          — any other at-rule, kept verbatim
+    """
+    text = COMMENT_RE.sub("", text)
+    nodes = []
+    i, n = 0, len(text)
+    while i < n:
+        brace = text.find("{", i)
+        if brace == -1:
+            break
+        semi = text.find(";", i, brace)
+        if semi != -1 and text[i:semi].strip().startswith("@"):
+            nodes.append(("raw", text[i:semi + 1].strip()))
+            i = semi + 1
+            continue
+        prelude = text[i:brace].strip()
+        end = _match_brace(text, brace)
+        body = text[brace + 1:end]
+        if prelude.startswith(("@media", "@supports")):
+            nodes.append(("group", prelude, parse_css(body)))
+        elif prelude.startswith("@"):
+            nodes.append(("raw", f"{prelude}{{{body}}}"))
+        else:
+            nodes.append(("rule", prelude, body.strip()))
+        i = end + 1
+    return nodes
+
+
+def _minify(text):
+    text = re.sub(r"\s+", " ", text)
+    return re.sub(r"\s*([{};,>])\s*", r"\1", text).strip()
+
+
+def serialize(nodes):
+    out = []
+    for node in nodes:
+        if node[0] == "rule":
+            out.append(_minify(f"{node[1]}{{{node[2]}}}"))
+        elif node[0] == "group":
+            out.append(f"{_minify(node[1])}{{{serialize(node[2])}}}")
+        else:
+            out.append(_minify(node[1]))
+    return "\n".join(out)
+
+
+def split_selectors(prelude):
+    """Split a selector list on top-level commas (not inside :is()/:not())."""
+    parts, depth, start = [], 0, 0
+    for i, c in enumerate(prelude):
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "," and depth == 0:
+            parts.append(prelude[start:i].strip())
+            start = i + 1
+    parts.append(prelude[start:].strip())
+    return [p for p in parts if p]
+
+
+_REQ_CACHE = {}
+
+
+def selector_requirements(selector):
+    """frozenset of ("tag"|"class"|"id", name) a page must contain for
+    `selector` to possibly match. Empty ⇒ always matches (*, :root, html)."""
+    cached = _REQ_CACHE.get(selector)
+    if cached is not None:
+        return cached
+    s = PSEUDO_RE.sub("", ATTR_RE.sub("", selector))
+    reqs = set()
+    for compound in re.split(r"[\s>+~]+", s):
+        if not compound:
+            continue
+        tag = re.match(r"[a-zA-Z][\w-]*", compound)
+        if tag and tag.group(0).lower() not in ("html", "body"):
+            reqs.add(("tag", tag.group(0).lower()))
+        reqs.update(("class", c) for c in re.findall(r"\.([\w-]+)", compound))
+        reqs.update(("id", c) for c in re.findall(r"#([\w-]+)", compound))
+    result = frozenset(reqs)
+    _REQ_CACHE[selector] = result
+    return result
+
+
+def prune(nodes, tokens):
+    """Return `nodes` with every selector `tokens` can't satisfy removed.
+
+    Selector lists are trimmed per selector; rules and @media groups left
+    empty are dropped. Raw at-rules (@keyframes, @font-face) are kept.
+    """
+    kept = []
+    for node in nodes:
+        if node[0] == "rule":
+            used = [s for s in split_selectors(node[1])
+                    if selector_requirements(s) <= tokens]
+            if used:
+                kept.append(("rule", ", ".join(used), node[2]))
+        elif node[0] == "group":
+            inner = prune(node[2], tokens)
+            if inner:
+                kept.append(("group", node[1], inner))
+        else:
+            kept.append(node)
+    return kept
+
+
+def strip_raw(nodes):
+    """Drop raw at-rules (keyframes etc.) — not needed for first paint."""
+    out = []
+    for node in nodes:
+        if node[0] == "group":
+            inner = strip_raw(node[2])
+            if inner:
+                out.append(("group", node[1], inner))
+        elif node[0] == "rule":
+            out.append(node)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Page analysis
+# ---------------------------------------------------------------------------
+
+def _script_words(text):
+    words = set()
+    for m in QUOTED_RE.finditer(text):
+        words.update(m.group(1).split())
+    return words
+
+
+def markup_tokens(markup):
+    """Every tag, class and id `markup` can put into the DOM."""
+    tokens = {("tag", t.lower()) for t in TAG_RE.findall(markup)}
+    for value in CLASS_ATTR_RE.findall(markup):
+        tokens.update(("class", c) for c in value.split())
+    for value in ID_ATTR_RE.findall(markup):
+        tokens.update(("id", i) for i in value.split())
+    for script in SCRIPT_RE.findall(markup):
+        for w in _script_words(script):
+            tokens.update((("class", w), ("id", w), ("tag", w.lower())))
+    return tokens
+
+
+def js_tokens():
+    """Classes/ids/tags the shared scripts in js/ can create at runtime."""
+    tokens = set()
+    if JS_DIR.exists():
+        for js in JS_DIR.glob("*.js"):
+            text = js.read_text(encoding="utf-8", errors="ignore")
+            for w in _script_words(text):
+                tokens.update((("class", w), ("id", w), ("tag", w.lower())))
+            tokens |= markup_tokens(text)
+    return tokens
+
+
+def fold_markup(page_html):
+    """The above-the-fold slice of <body>: up to the first content marker."""
+    start = page_html.find("<body")
+    if start == -1:
+        start = 0
+    end = start + FOLD_CHARS
+    for marker in FOLD_MARKERS:
+        idx = page_html.find(marker, start)
+        if idx != -1:
+            end = min(end, idx)
+    return page_html[start:end]
+
+
+def _translated_slugs():
+    """{slug: template} for translated faq/contact/legacy/article pages."""
+    slugs = {}
+    for f in TRANSLATIONS_DIR.glob("updates_faq_contact_*.json"):
+        data = json.loads(f.read_text(encoding="utf-8"))
+        for kind in ("faq", "contact"):
+            if isinstance(data.get(kind), dict) and "slug" in data[kind]:
+                slugs[data[kind]["slug"]] = kind
+    for f in TRANSLATIONS_DIR.glob("backbone_pages_*.json"):
+        for page in json.loads(f.read_text(encoding="utf-8")).values():
+            if isinstance(page, dict) and "slug" in page:
+                slugs[page["slug"]] = "legacy"
+    for f in TRANSLATIONS_DIR.glob("etoro-review_*.json"):
+        data = json.loads(f.read_text(encoding="utf-8"))
+        if "slug" in data:
+            slugs[data["slug"]] = "article"
+    return slugs
+
+
+def classify_template(rel_path, translated_slugs):
+    """Which generator template a page comes from (path-based)."""
+    parts = pathlib.PurePosixPath(rel_path).parts
+    if parts and parts[0] in LANG_PREFIXES:
+        inner = parts[1:]
+    else:
+        inner = parts
+    if not inner:
+        return "page"
+    if inner[0] == "video":
+        return "video"
+    if inner[0] == "updates":
+        return "update"
+    if inner == ("faq.html",):
+        return "faq"
+    if inner == ("contact.html",):
+        return "contact"
+    if inner[0] in LEGACY_EN_FILES:
+        return "legacy"
+    if len(inner) == 2 and inner[1] == "index.html":
+        if inner[0] in translated_slugs:
+            return translated_slugs[inner[0]]
+        if parts[0] not in LANG_PREFIXES:
+            return "article"
+    return "page"
+
+
+def find_pages():
+    """(rel_path, path) for every HTML page that links css/style.css or
+    already carries a critical-css block."""
+    pages = []
+    for root, dirs, names in os.walk(str(PROJECT_DIR)):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for n in names:
+            if not n.endswith(".html"):
+                continue
+            path = pathlib.Path(root) / n
+            text = path.read_text(encoding="utf-8", errors="ignore")
+            if STYLE_LINK_RE.search(text) or CRITICAL_BLOCK_RE.search(text):
+                pages.append((path.relative_to(PROJECT_DIR).as_posix(), path))
+    return sorted(pages)
+
+
+def critical_block(prefix, critical_css):
+    href = f"{prefix}css/style.min.css"
+    return (
+        '<!-- critical-css -->\n'
+        f'  <style id="critical-css">{critical_css}</style>\n'
+        f'  <link rel="preload" href="{href}" as="style" '
+        'onload="this.onload=null;this.rel=\'stylesheet\'" />\n'
+        f'  <noscript><link rel="stylesheet" href="{href}" /></noscript>\n'
+        '  <!-- /critical-css -->'
+    )
+
+
+def inline_critical(page_html, critical_css):
+    """Swap the blocking link (or a previous critical block) for a fresh one.
+    Returns the page unchanged if it has neither."""
+    m = CRITICAL_BLOCK_RE.search(page_html) or STYLE_LINK_RE.search(page_html)
+    if not m:
+        return page_html
+    block = critical_block(m.group(1), critical_css)
+    return page_html[:m.start()] + block + page_html[m.end():]
+
+
+def blocking_bytes(rel, page_html):
+    """Bytes of local stylesheets a page still loads render-blocking (remote
+    stylesheets are not counted)."""
+    total = 0
+    for href in STYLESHEET_LINK_RE.findall(NOSCRIPT_RE.sub("", page_html)):
+        if "//" in href or href.startswith("data:"):
+            continue
+        href = href.split("?")[0].split("#")[0]
+        path = (PROJECT_DIR / href.lstrip("/")) if href.startswith("/") else \
+            (PROJECT_DIR / rel).parent / href
+        if path.is_file():
+            total += path.stat().st_size
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def fmt_kb(n):
+    return f"{n / 1024:.1f} KB"
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Inline per-template critical CSS and prune unused rules")
+    ap.add_argument("--report", action="store_true", help="Print the byte report; write nothing")
+    args = ap.parse_args()
+
+    print(f"Critical CSS — {datetime.now():%Y-%m-%d %H:%M}")
+    print("=" * 60)
+
+    source = CSS_FILE.read_text(encoding="utf-8")
+    nodes = parse_css(source)
+    shared = js_tokens()
+    slugs = _translated_slugs()
+
+    pages = find_pages()
+    if not pages:
+        print("  No pages link css/style.css — nothing to do.")
+        return
+
+    page_html = {}
+    site_tokens = set(shared)
+    by_template = {}
+    for rel, path in pages:
+        text = path.read_text(encoding="utf-8")
+        page_html[rel] = text
+        tpl = by_template.setdefault(classify_template(rel, slugs),
+                                     {"pages": [], "tokens": set(shared), "fold": set(shared)})
+        tpl["pages"].append(rel)
+        tokens = markup_tokens(text)
+        tpl["tokens"] |= tokens
+        tpl["fold"] |= markup_tokens(fold_markup(text))
+        site_tokens |= tokens
+
+    pruned_css = serialize(prune(nodes, site_tokens))
+    before = len(source.encode("utf-8"))
+
+    print(f"\n  {'Template':<10} {'Pages':>5}  {'Blocking before':>15}  "
+          f"{'Used by tpl':>11}  {'Inline critical':>15}  {'Blocking after':>14}")
+    print(f"  {'':<10} {'':>5}  {'':>15}  {'':>11}  {'':>15}  {'(worst page)':>14}")
+    critical_by_template = {}
+    for name in sorted(by_template):
+        tpl = by_template[name]
+        used = serialize(prune(nodes, tpl["tokens"]))
+        critical = serialize(strip_raw(prune(nodes, tpl["fold"])))
+        critical_by_template[name] = critical
+        after = max(blocking_bytes(rel, inline_critical(page_html[rel], critical))
+                    for rel in tpl["pages"])
+        print(f"  {name:<10} {len(tpl['pages']):>5}  {fmt_kb(before):>15}  "
+              f"{fmt_kb(len(used.encode('utf-8'))):>11}  "
+              f"{fmt_kb(len(critical.encode('utf-8'))):>15}  {fmt_kb(after):>14}")
+
+    print(f"\n  style.css: {fmt_kb(before)}  ->  style.min.css (deferred): "
+          f"{fmt_kb(len(pruned_css.encode('utf-8')))}")
+
+    if args.report:
+        print("  Report only — nothing written.")
+        return
+
+    PRUNED_CSS_FILE.write_text(pruned_css + "\n", encoding="utf-8")
+    changed = 0
+    for name, tpl in by_template.items():
+        for rel in tpl["pages"]:
+            new_html = inline_critical(page_html[rel], critical_by_template[name])
+            if new_html != page_html[rel]:
+                (PROJECT_DIR / rel).write_text(new_html, encoding="utf-8")
+                changed += 1
+    print(f"  Wrote {PRUNED_CSS_FILE.relative_to(PROJECT_DIR)}; "
+          f"critical CSS refreshed in {changed}/{len(pages)} pages.")
+
+
+if __name__ == "__main__":
+    main()
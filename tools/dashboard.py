@@ -2,6 +2,22 @@
 """
 STV Rank Tracker — slim dashboard for GSC data.
 
+Threaded server: slow work (the live GSC refresh) runs as a background job
+the page polls (/api/jobs/<id>), so it never holds up other requests. JSON
+responses carry an ETag (304 on If-None-Match) and are gzipped when the
+client accepts it; the page itself is served at a content-versioned URL
+("/" redirects to "/?v=<hash>") with a year-long cache.
+
+Transcript search: /api/transcripts?q= — phrase search over every
+transcript and subtitle cue (tools/_transcript_index.py), with language,
+timestamp and a highlighted snippet per hit.
+
+Live ops: /api/events is a server-sent event stream of the shared event log
+(logs/events.jsonl, tools/_events.py) — pipeline stage progress, per-language
+throughput, quota, autopilot and security checks. One follower thread reads
+only what was appended; every connected page is pushed the folded state and
+each new event, and resumes from Last-Event-ID after a reconnect.
+
 Usage:
     python3 tools/dashboard.py              # localhost:8080, no auth
     python3 tools/dashboard.py --auth       # localhost:8080, password required
@@ -15,23 +31,38 @@ import pathlib
 import argparse
 import hashlib
 import secrets
+import gzip
+import html
 import time
+import threading
 import urllib.parse
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from http.cookies import SimpleCookie
 
 if sys.platform == "darwin":
     sys.path.insert(0, os.path.expanduser("~/Library/Python/3.9/lib/python/site-packages"))
 
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+import _gsc_store as gsc_store
+import _events as events
+import _transcript_index as transcript_index
+
 # ─── Paths ───
 PROJECT_DIR = pathlib.Path(__file__).resolve().parent.parent
 AUTH_FILE = pathlib.Path.home() / ".config" / "stv-secrets" / "dashboard-auth.json"
 SESSIONS_FILE = PROJECT_DIR / "data" / "sessions.json"
 GSC_CACHE = PROJECT_DIR / "reports" / "gsc-cache.json"
+LINK_GRAPH_REPORT = PROJECT_DIR / "reports" / "link-graph.json"
+
+GZIP_MIN_BYTES = 1024   # smaller responses aren't worth compressing
+SSE_HEARTBEAT = 15      # seconds between keep-alive comments on /api/events
 
 # ─── State ───
 ACTIVE_SESSIONS = {}  # token -> expiry_timestamp
 LOGIN_ATTEMPTS = {}   # ip -> [timestamps]
+SESSIONS_LOCK = threading.Lock()  # requests are served on concurrent threads
+JOBS = {}             # job id -> status dict (see start_job)
+JOBS_LOCK = threading.Lock()
 
 
 # ─── Session persistence ───
@@ -49,8 +80,9 @@ def _load_sessions():
 
 
 def _save_sessions():
-    SESSIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    SESSIONS_FILE.write_text(json.dumps(ACTIVE_SESSIONS, indent=2))
+    with SESSIONS_LOCK:
+        SESSIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        SESSIONS_FILE.write_text(json.dumps(dict(ACTIVE_SESSIONS), indent=2))
 
 
 # ─── Auth helpers ───
@@ -116,17 +148,85 @@ def record_login_attempt(ip):
     LOGIN_ATTEMPTS.setdefault(ip, []).append(time.time())
 
 
+# ─── Cached file reads ───
+
+_JSON_CACHE = {}  # path -> ((mtime_ns, size), parsed)
+
+
+def read_json(path):
+    """Parsed JSON file, re-read only when its mtime/size changed."""
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    hit = _JSON_CACHE.get(path)
+    if hit and hit[0] == key:
+        return hit[1]
+    data = json.loads(path.read_text())
+    _JSON_CACHE[path] = (key, data)
+    return data
+
+
+# ─── Background jobs ───
+
+def start_job(kind, fn):
+    """Run fn() on a worker thread; returns the job's status dict. A job of
+    the same kind that is still queued/running is returned instead of
+    starting a second one."""
+    with JOBS_LOCK:
+        for job in JOBS.values():
+            if job["kind"] == kind and job["status"] in ("queued", "running"):
+                return dict(job)
+        # Keep the last few finished jobs for polling, drop the rest
+        for old in sorted(JOBS, key=lambda j: JOBS[j]["created"])[:-20]:
+            if JOBS[old]["status"] in ("done", "error"):
+                del JOBS[old]
+        job = {"id": secrets.token_hex(8), "kind": kind, "status": "queued",
+               "created": time.time(), "started": None, "finished": None,
+               "result": None, "error": None}
+        JOBS[job["id"]] = job
+
+    def run():
+        job.update(status="running", started=time.time())
+        try:
+            job["result"] = fn()
+            job["status"] = "done"
+        except Exception as e:
+            job.update(status="error", error=str(e))
+        job["finished"] = time.time()
+
+    threading.Thread(target=run, name=f"job-{kind}", daemon=True).start()
+    return dict(job)
+
+
+def get_job(job_id):
+    with JOBS_LOCK:
+        job = JOBS.get(job_id)
+        return dict(job) if job else None
+
+
+# ─── Live events ───
+
+_FOLLOWER = []
+
+
+def event_follower():
+    """The process-wide follower of logs/events.jsonl, started on first use."""
+    with JOBS_LOCK:
+        if not _FOLLOWER:
+            _FOLLOWER.append(events.EventFollower().start())
+    return _FOLLOWER[0]
+
+
 # ─── GSC functions ───
 
 def get_gsc_data():
     """Return cached GSC data (1h TTL) or latest snapshot."""
     if GSC_CACHE.exists():
-        data = json.loads(GSC_CACHE.read_text())
+        data = read_json(GSC_CACHE)
         if time.time() - data.get("timestamp", 0) < 3600:
             return data
     snapshots = sorted(PROJECT_DIR.glob("reports/gsc-*.json"))
     if snapshots:
-        return json.loads(snapshots[-1].read_text())
+        return read_json(snapshots[-1])
     return {"error": "No GSC data. Click Refresh to fetch."}
 
 
@@ -185,27 +285,54 @@ def fetch_gsc_data():
     return result
 
 
-def get_gsc_history():
-    """Read all GSC snapshots and build position history per query."""
-    snapshots = sorted(PROJECT_DIR.glob("reports/gsc-*.json"))
-    history = {}
-    for snap_path in snapshots:
-        try:
-            data = json.loads(snap_path.read_text())
-            date = data.get("date", snap_path.stem.replace("gsc-", ""))
-            for q in data.get("queries", []):
-                query = q["query"]
-                if query not in history:
-                    history[query] = []
-                history[query].append({
-                    "date": date,
-                    "position": q["position"],
-                    "clicks": q.get("clicks", 0),
-                    "impressions": q.get("impressions", 0),
-                })
-        except Exception:
-            continue
-    return history
+def get_gsc_history(start=None, end=None):
+    """Position history per query across daily snapshots (from the GSC store,
+    which imports any reports/gsc-*.json it has not seen yet)."""
+    return gsc_store.store().history(start=start, end=end)
+
+
+def get_gsc_series(params):
+    """One query's / page's / the site's metrics over time, from ?query= or
+    ?page=, &source=snapshot|daily, &start=, &end=, &bucket=day|week|month."""
+    one = lambda key: (params.get(key) or [None])[0]
+    bucket = one("bucket") or "day"
+    source = one("source") or gsc_store.SNAPSHOT
+    if bucket not in gsc_store.BUCKETS or source not in (gsc_store.SNAPSHOT, gsc_store.DAILY):
+        return {"error": "bad bucket or source"}
+    return {"points": gsc_store.store().series(
+        query=one("query"), page=one("page"), source=source,
+        start=one("start"), end=one("end"), bucket=bucket)}
+
+
+# ─── Transcript search ───
+
+def get_transcript_hits(params):
+    """Transcript / subtitle segments matching ?q= (a phrase), optionally
+    &lang= and &video=, from the FTS index (tools/_transcript_index.py)."""
+    one = lambda key: (params.get(key) or [None])[0]
+    q = (one("q") or "").strip()
+    if not q:
+        return {"hits": []}
+    idx = transcript_index.index()
+    idx.refresh()
+    started = time.perf_counter()
+    limit = one("limit") or ""
+    hits = idx.search(q, lang=one("lang"), video=one("video"),
+                      limit=min(int(limit), 200) if limit.isdigit() else 50)
+    for h in hits:
+        h["snippet_html"] = transcript_index.mark(h.pop("snippet"), escape=html.escape)
+        h["url"] = (f"https://www.youtube.com/watch?v={urllib.parse.quote(h['video'])}"
+                    + (f"&t={h['start']}s" if h["start"] is not None else ""))
+    return {"q": q, "hits": hits, "ms": round((time.perf_counter() - started) * 1000, 1)}
+
+
+# ─── Link graph ───
+
+def get_link_graph():
+    """Latest internal link graph report (written by tools/link_graph.py)."""
+    if not LINK_GRAPH_REPORT.exists():
+        return {"error": "No link graph report. Run tools/link_graph.py."}
+    return read_json(LINK_GRAPH_REPORT)
 
 
 # ─── HTML UI ───
@@ -398,6 +525,113 @@ input[type=checkbox]{width:14px;height:14px;accent-color:#0969da;cursor:pointer}
       </table>
     </div>
   </div>
+
+  <!-- Live Ops (server-sent events) -->
+  <div class="section" id="opsSection" style="display:none">
+    <div class="section-header">
+      <h2>Live Ops</h2>
+      <span class="meta" id="opsMeta" style="margin:0"></span>
+    </div>
+    <div class="cards" id="opsCards"></div>
+    <div class="table-wrap" style="margin-bottom:1rem">
+      <table id="opsStagesTable">
+        <thead><tr>
+          <th>Pipeline stage</th>
+          <th class="num">Done</th>
+          <th class="num">Errors</th>
+          <th class="num">Avg seconds</th>
+        </tr></thead>
+        <tbody></tbody>
+      </table>
+    </div>
+    <div class="table-wrap" style="margin-bottom:1rem">
+      <table id="opsLangTable">
+        <thead><tr>
+          <th>Language</th>
+          <th class="num">Translated</th>
+          <th class="num">Last hour</th>
+        </tr></thead>
+        <tbody></tbody>
+      </table>
+    </div>
+    <div class="table-wrap" style="margin-bottom:1rem">
+      <table id="opsJobsTable">
+        <thead><tr>
+          <th>Scheduled job</th>
+          <th>Last run</th>
+          <th class="num">Runs</th>
+          <th class="num">Failed</th>
+          <th class="num">Skipped</th>
+          <th class="num">Avg seconds</th>
+          <th class="num">Max seconds</th>
+        </tr></thead>
+        <tbody></tbody>
+      </table>
+    </div>
+    <div class="table-wrap">
+      <table id="opsFeedTable">
+        <thead><tr>
+          <th>Event</th>
+          <th class="num">Time</th>
+        </tr></thead>
+        <tbody></tbody>
+      </table>
+    </div>
+  </div>
+
+  <!-- Transcript Search -->
+  <div class="section">
+    <div class="section-header">
+      <h2>Transcript Search</h2>
+      <input class="filter-input" id="txQuery" placeholder="Phrase, e.g. stop loss…" oninput="searchTranscripts()">
+    </div>
+    <div class="meta" id="txMeta"></div>
+    <div class="table-wrap">
+      <table id="txTable">
+        <thead><tr>
+          <th>Video</th>
+          <th>Lang</th>
+          <th class="num">Time</th>
+          <th>Snippet</th>
+        </tr></thead>
+        <tbody></tbody>
+      </table>
+    </div>
+  </div>
+
+  <!-- Internal Link Graph -->
+  <div class="section" id="linkSection" style="display:none">
+    <div class="section-header">
+      <h2>Internal Links</h2>
+      <span class="meta" id="linkMeta" style="margin:0"></span>
+    </div>
+    <div class="table-wrap" style="margin-bottom:1rem">
+      <table id="linkLangTable">
+        <thead><tr>
+          <th data-key="lang">Language</th>
+          <th data-key="pages" class="num">Pages</th>
+          <th data-key="links" class="num">Links</th>
+          <th data-key="orphans" class="num">Orphans</th>
+          <th data-key="near_orphans" class="num">Near-orphans</th>
+          <th data-key="unreachable" class="num">Unreachable</th>
+          <th data-key="too_deep" class="num">Too deep</th>
+        </tr></thead>
+        <tbody></tbody>
+      </table>
+    </div>
+    <div class="table-wrap">
+      <table id="linkPagesTable">
+        <thead><tr>
+          <th data-key="url">Page needing links</th>
+          <th data-key="issue" class="num">Issue</th>
+          <th data-key="depth" class="num">Depth</th>
+          <th data-key="in_links" class="num">In-links</th>
+          <th data-key="pagerank" class="num">PageRank</th>
+        </tr></thead>
+        <tbody></tbody>
+      </table>
+    </div>
+  </div>
 </div>
 
 <script>
@@ -460,19 +694,141 @@ function loadData() {
       }
       return r.json();
     }),
-    fetch('/api/gsc-history').then(r => r.ok ? r.json() : {})
-  ]).then(([data, history]) => {
+    fetch('/api/gsc-history').then(r => r.ok ? r.json() : {}),
+    fetch('/api/link-graph').then(r => r.ok ? r.json() : null)
+  ]).then(([data, history, links]) => {
     gscHistory = history || {};
-    if (data) { showDashboard(data); renderChart(); }
+    if (data) { showDashboard(data); renderChart(); startEvents(); }
+    if (links) showLinkGraph(links);
   });
 }
 
+let txTimer = null;
+
+function searchTranscripts() {
+  clearTimeout(txTimer);
+  txTimer = setTimeout(() => {
+    const q = $('#txQuery').value.trim();
+    if (!q) { $('#txTable tbody').innerHTML = ''; $('#txMeta').textContent = ''; return; }
+    fetch('/api/transcripts?q=' + encodeURIComponent(q)).then(r => r.json()).then(data => {
+      if (data.q !== $('#txQuery').value.trim()) return;  // a newer query is on its way
+      $('#txMeta').textContent = data.hits.length + ' segment(s) in ' + data.ms + ' ms';
+      $('#txTable tbody').innerHTML = data.hits.map(h =>
+        '<tr><td><a href="' + esc(h.url) + '" target="_blank" rel="noopener">' + esc(h.video) + '</a></td>' +
+        '<td>' + esc(h.lang) + '</td><td class="num">' + esc(h.timestamp || '-') + '</td>' +
+        '<td>' + h.snippet_html + '</td></tr>'
+      ).join('');
+    });
+  }, 200);
+}
+
+let opsStream = null;
+const opsFeed = [];
+
+function startEvents() {
+  // Pushed by the server as the ops event log grows — no polling.
+  if (opsStream || !window.EventSource) return;
+  opsStream = new EventSource('/api/events');
+  opsStream.addEventListener('state', e => showOps(JSON.parse(e.data)));
+  opsStream.addEventListener('event', e => {
+    opsFeed.unshift(JSON.parse(e.data));
+    opsFeed.length = Math.min(opsFeed.length, 30);
+    fillTable('opsFeedTable', opsFeed.map(ev => ({event: describeEvent(ev), time: ev.ts.slice(11)})),
+              ['event', 'time']);
+  });
+}
+
+function describeEvent(ev) {
+  const bits = [ev.source, ev.type];
+  ['stage', 'status', 'name', 'video', 'api'].forEach(k => { if (ev[k] != null) bits.push(ev[k]); });
+  if (ev.ok === false || ev.issues) bits.push('⚠ ' + (ev.issues || 'failed'));
+  if (ev.langs) bits.push(ev.langs.join(' '));
+  return bits.join(' · ');
+}
+
+function showOps(state) {
+  if (!state.updated) return;
+  $('#opsSection').style.display = 'block';
+  $('#opsMeta').textContent = 'Last event: ' + state.updated.replace('T', ' ');
+  const p = state.pipeline, run = p.run || {}, prog = p.progress || {};
+  const cards = [
+    card('Pipeline', run.status ? esc(run.status) + (run.mode ? ' (' + esc(run.mode) + ')' : '') : '-'),
+    card('Progress', prog.total ? fmt(prog.index) + ' / ' + fmt(prog.total) : '-'),
+    card('Current', p.current ? esc(p.current.stage) + ' ' + esc(p.current.video) : '-')
+  ];
+  Object.values(p.quota).forEach(q => cards.push(card(esc(q.api) + ' quota left',
+    q.exhausted ? 'exhausted' : fmt(Math.max(0, q.limit - q.used)))));
+  ['autopilot', 'security'].forEach(src => {
+    const r = state[src].run;
+    const failed = Object.values(state[src].checks).filter(c => c.ok === false || c.issues).length;
+    cards.push(card(src, r ? esc(r.status) + (failed ? ' · ' + failed + ' failing' : ' · ok') : '-'));
+  });
+  const sched = state.scheduler, jobs = Object.entries(sched.jobs);
+  const runningJobs = jobs.filter(([, j]) => j.running).map(([name]) => name);
+  cards.push(card('Scheduler', sched.run ? esc(sched.run.status) +
+    (runningJobs.length ? ' · ' + esc(runningJobs.join(', ')) : ' · idle') : '-'));
+  $('#opsCards').innerHTML = cards.join('');
+  fillTable('opsStagesTable', Object.entries(p.stages).map(([stage, st]) => ({
+    stage, done: st.done, errors: st.errors,
+    avg: st.done + st.errors ? Math.round(st.seconds / (st.done + st.errors)) : 0
+  })), ['stage', 'done', 'errors', 'avg']);
+  fillTable('opsLangTable', Object.entries(p.languages).map(([lang, l]) => ({
+    lang, total: l.total, per_hour: l.per_hour || 0
+  })), ['lang', 'total', 'per_hour']);
+  fillTable('opsJobsTable', jobs.sort().map(([name, j]) => ({
+    name, last: j.running ? 'running since ' + j.running.slice(11) :
+      j.last ? j.last.status + ' ' + j.last.ts.replace('T', ' ') : '-',
+    runs: j.runs, failed: j.failed, skipped: j.skipped,
+    avg: j.runs ? Math.round(j.seconds / j.runs) : 0, max: Math.round(j.max)
+  })), ['name', 'last', 'runs', 'failed', 'skipped', 'avg', 'max']);
+}
+
+function showLinkGraph(report) {
+  if (report.error || !report.languages) return;
+  $('#linkSection').style.display = 'block';
+  $('#linkMeta').textContent = 'Report: ' + new Date(report.generated).toLocaleString();
+  const langKeys = ['lang','pages','links','orphans','near_orphans','unreachable','too_deep'];
+  const langRows = [];
+  const pageRows = [];
+  Object.keys(report.languages).forEach(lang => {
+    const d = report.languages[lang];
+    langRows.push({lang, pages: d.pages, links: d.links, orphans: d.orphans.length,
+      near_orphans: d.near_orphans.length, unreachable: d.unreachable.length,
+      too_deep: d.too_deep.length});
+    const issues = {};
+    [['unreachable','unreachable'],['orphans','orphan'],['too_deep','too deep'],
+     ['near_orphans','near-orphan']].forEach(([key, label]) => {
+      d[key].forEach(url => { if (!issues[url]) issues[url] = label; });
+    });
+    d.page_metrics.forEach(m => {
+      if (issues[m.url]) pageRows.push({url: m.url, issue: issues[m.url],
+        depth: m.depth == null ? '-' : m.depth, in_links: m.in_links, pagerank: m.pagerank});
+    });
+  });
+  pageRows.sort((a, b) => a.pagerank - b.pagerank);
+  const pageKeys = ['url','issue','depth','in_links','pagerank'];
+  fillTable('linkLangTable', langRows, langKeys);
+  setupSort('linkLangTable', langRows, langKeys);
+  fillTable('linkPagesTable', pageRows, pageKeys);
+  setupSort('linkPagesTable', pageRows, pageKeys);
+}
+
 function doRefresh() {
   $('#spinner').style.display = 'block';
-  fetch('/api/gsc-refresh', {method: 'POST'}).then(r => r.json()).then(d => {
-    $('#spinner').style.display = 'none';
-    if (d) showDashboard(d);
-  }).catch(() => { $('#spinner').style.display = 'none'; });
+  const done = () => { $('#spinner').style.display = 'none'; };
+  // The refresh runs as a background job on the server; poll until it ends.
+  const poll = id => fetch('/api/jobs/' + id).then(r => r.json()).then(job => {
+    if (job.status === 'queued' || job.status === 'running') {
+      setTimeout(() => poll(id), 1000);
+      return;
+    }
+    done();
+    if (job.status === 'done' && job.result) showDashboard(job.result);
+    else $('#meta').textContent = 'Refresh failed: ' + (job.error || 'unknown error');
+  }).catch(done);
+  fetch('/api/gsc-refresh', {method: 'POST'}).then(r => r.json()).then(job => {
+    if (job.id) poll(job.id); else done();
+  }).catch(done);
 }
 
 function showDashboard(data) {
@@ -693,6 +1049,11 @@ function esc(s) {
 </html>"""
 
 
+DASHBOARD_BYTES = DASHBOARD_HTML.encode()
+DASHBOARD_GZ = gzip.compress(DASHBOARD_BYTES, 9)
+DASHBOARD_VERSION = hashlib.sha1(DASHBOARD_BYTES).hexdigest()[:12]
+
+
 # ─── Request handler ───
 
 class DashboardHandler(BaseHTTPRequestHandler):
@@ -701,17 +1062,38 @@ class DashboardHandler(BaseHTTPRequestHandler):
     def log_message(self, fmt, *args):
         pass  # Silence default logging
 
-    def _send(self, code, body, content_type="application/json"):
+    def _send(self, code, body, content_type="application/json", cache="no-store",
+              etag=None, gzipped=None):
+        """Send a response. With `etag`, a matching If-None-Match gets a 304;
+        bodies over GZIP_MIN_BYTES are gzipped for clients that accept it
+        (`gzipped` = pre-compressed bytes to use instead)."""
+        if isinstance(body, str):
+            body = body.encode()
+        if etag and code == 200 and etag in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", cache)
+            self.end_headers()
+            return
         self.send_response(code)
         self.send_header("Content-Type", content_type)
         self.send_header("X-Content-Type-Options", "nosniff")
+        self.send_header("Cache-Control", cache)
+        self.send_header("Vary", "Accept-Encoding, Cookie")
+        if etag:
+            self.send_header("ETag", etag)
+        if len(body) >= GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzipped or gzip.compress(body, 6)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
         self.end_headers()
-        if isinstance(body, str):
-            body = body.encode()
         self.wfile.write(body)
 
     def _send_json(self, code, obj):
-        self._send(code, json.dumps(obj))
+        """JSON with an ETag over the content, revalidated on every use."""
+        body = json.dumps(obj).encode()
+        etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"' if code == 200 else None
+        self._send(code, body, cache="private, no-cache", etag=etag)
 
     def _get_cookie(self, name):
         cookie_header = self.headers.get("Cookie", "")
@@ -753,7 +1135,32 @@ class DashboardHandler(BaseHTTPRequestHandler):
         path = parsed.path.rstrip("/") or "/"
 
         if path == "/":
-            self._send(200, DASHBOARD_HTML, "text/html; charset=utf-8")
+            if parsed.query != f"v={DASHBOARD_VERSION}":
+                # Unversioned (or stale) URL: point at the current build,
+                # which the browser may then cache for a year.
+                self.send_response(302)
+                self.send_header("Location", f"/?v={DASHBOARD_VERSION}")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self._send(200, DASHBOARD_BYTES, "text/html; charset=utf-8",
+                       cache="private, max-age=31536000, immutable",
+                       etag=f'"{DASHBOARD_VERSION}"', gzipped=DASHBOARD_GZ)
+        elif path == "/api/events":
+            if not self._is_authed():
+                self._send_json(401, {"error": "Unauthorized"})
+                return
+            self._stream_events()
+        elif path.startswith("/api/jobs/"):
+            if not self._is_authed():
+                self._send_json(401, {"error": "Unauthorized"})
+                return
+            job = get_job(path[len("/api/jobs/"):])
+            if job is None:
+                self._send_json(404, {"error": "No such job"})
+            else:
+                self._send_json(200, job)
         elif path == "/api/gsc-data":
             if not self._is_authed():
                 self._send_json(401, {"error": "Unauthorized"})
@@ -763,10 +1170,74 @@ class DashboardHandler(BaseHTTPRequestHandler):
             if not self._is_authed():
                 self._send_json(401, {"error": "Unauthorized"})
                 return
-            self._send_json(200, get_gsc_history())
+            params = urllib.parse.parse_qs(parsed.query)
+            self._send_json(200, get_gsc_history(start=(params.get("start") or [None])[0],
+                                                 end=(params.get("end") or [None])[0]))
+        elif path == "/api/gsc-series":
+            if not self._is_authed():
+                self._send_json(401, {"error": "Unauthorized"})
+                return
+            self._send_json(200, get_gsc_series(urllib.parse.parse_qs(parsed.query)))
+        elif path == "/api/transcripts":
+            if not self._is_authed():
+                self._send_json(401, {"error": "Unauthorized"})
+                return
+            self._send_json(200, get_transcript_hits(urllib.parse.parse_qs(parsed.query)))
+        elif path == "/api/link-graph":
+            if not self._is_authed():
+                self._send_json(401, {"error": "Unauthorized"})
+                return
+            self._send_json(200, get_link_graph())
         else:
             self._send_json(404, {"error": "Not found"})
 
+    def _sse(self, event, data, event_id=None):
+        msg = f"event: {event}\n"
+        if event_id:
+            msg += f"id: {event_id}\n"
+        msg += f"data: {json.dumps(data)}\n\n"
+        self.wfile.write(msg.encode())
+
+    def _stream_events(self):
+        """Server-sent events: the current state, then every new event
+        (followed by the updated state) as it is appended to the log."""
+        follower = event_follower()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("X-Accel-Buffering", "no")  # nginx: don't buffer the stream
+        self.end_headers()
+        last = self.headers.get("Last-Event-ID")
+        try:
+            self.wfile.write(b"retry: 3000\n\n")
+            backlog = follower.since(last) if last else None
+            if backlog is None:
+                last, state = follower.snapshot()
+                self._sse("state", state, last)
+            else:
+                for event_id, event in backlog:
+                    self._sse("event", event, event_id)
+                    last = event_id
+                self._sse("state", follower.snapshot()[1], last)
+            self.wfile.flush()
+            while True:
+                follower.wait(last, SSE_HEARTBEAT)
+                fresh = follower.since(last) if last else follower.events[:]
+                if fresh is None:
+                    # Fell out of the buffer (log rotated): start over from the state
+                    last, state = follower.snapshot()
+                    self._sse("state", state, last)
+                elif not fresh:
+                    self.wfile.write(b": ping\n\n")
+                else:
+                    for event_id, event in fresh:
+                        self._sse("event", event, event_id)
+                    last = fresh[-1][0]
+                    self._sse("state", follower.snapshot()[1], last)
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # browser went away
+
     def do_POST(self):
         parsed = urllib.parse.urlparse(self.path)
         path = parsed.path.rstrip("/") or "/"
@@ -779,11 +1250,7 @@ class DashboardHandler(BaseHTTPRequestHandler):
             if not self._is_authed():
                 self._send_json(401, {"error": "Unauthorized"})
                 return
-            try:
-                data = fetch_gsc_data()
-                self._send_json(200, data)
-            except Exception as e:
-                self._send_json(500, {"error": str(e)})
+            self._send_json(202, start_job("gsc-refresh", fetch_gsc_data))
         else:
             self._send_json(404, {"error": "Not found"})
 
@@ -844,7 +1311,8 @@ def main():
         init_auth()
         DashboardHandler.require_auth = True
 
-    server = HTTPServer((bind, args.port), DashboardHandler)
+    server = ThreadingHTTPServer((bind, args.port), DashboardHandler)
+    server.daemon_threads = True
     print(f"STV Rank Tracker running at http://{bind}:{args.port}")
     try:
         server.serve_forever()
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Delta deploy into immutable release directories with an atomic switch.
+
+deploy_to_vps.sh used to rsync --delete the whole tree into the live
+directory, so a deploy that died halfway left the server running a mix of
+old and new files. This tool:
+
+  1. hashes the publishable tree into a manifest {path: [sha256, size, mode]}
+  2. reads the manifest of the release currently live on the target
+  3. stops if they are identical — an unchanged deploy is a no-op
+  4. builds releases/.partial-<id>/ on the target: every unchanged file is
+     taken from the live release, only changed files are sent (one tar
+     stream), removed files are simply not carried over
+  5. renames it to releases/<id>/ and swaps the `current` symlink with a
+     rename(2), which is atomic — requests see the old release or the new
+     one, never a half-copied tree
+  6. keeps the newest KEEP_RELEASES releases, deletes the rest
+
+Target layout (ROOT is a local directory or user@host:path over ssh):
+
+    ROOT/current -> releases/<id>
+    ROOT/releases/<id>/...              one immutable release
+    ROOT/shared/{data,logs,reports,transcriptions,venv,backups,outreach}
+
+The shared directories hold server-side state the deploy never sends; each
+release gets symlinks to them, so they survive every switch. backups/ (the
+weekly encrypted backups) and outreach/ (sent log, drafts) are written on
+the server, so they are shared too.
+
+Server-side jobs rewrite published pages in place (update_risk_warnings,
+schema_generator, rss_generator, the analytics injection). Unchanged
+.html/.xml files (MUTABLE_SUFFIXES) are therefore copied from the live
+release rather than hard-linked — an in-place edit must not reach into
+older releases kept for rollback. Everything else is hard-linked. The
+target also checks the live release against its manifest before each
+deploy (size, plus a re-hash of those mutable files); a file edited on
+the server counts as changed and is sent again, as rsync used to.
+
+The VPS serves /home/stv/socialtradingvlog-website, which every cron job,
+systemd unit and script refers to. One-time migration: move that
+directory's data/, logs/, reports/, transcriptions/, venv/, backups/
+and outreach/ into
+~/stv-releases/shared/, run the first deploy, then replace the old
+directory with a symlink:
+
+    ln -sfn ~/stv-releases/current ~/socialtradingvlog-website
+
+The target side is a small Python helper sent with each ssh command
+(python3 must exist on the target), so a local directory exercises exactly
+the same code path:
+
+Usage:
+    python3 tools/deploy_release.py --target stv@89.167.73.64:stv-releases
+    python3 tools/deploy_release.py --target /tmp/stv-target          # local stand-in
+    python3 tools/deploy_release.py --target /tmp/stv-target --dry-run
+    python3 tools/deploy_release.py --target HOST:PATH --on-change "sudo systemctl restart stv-dashboard"
+"""
+
+import io
+import os
+import sys
+import json
+import shlex
+import stat
+import tarfile
+import hashlib
+import pathlib
+import argparse
+import subprocess
+from datetime import datetime, timezone
+
+PROJECT_DIR = pathlib.Path(__file__).parent.parent
+
+MANIFEST_NAME = ".deploy-manifest.json"
+KEEP_RELEASES = 5
+SHARED_DIRS = ["data", "logs", "reports", "transcriptions", "venv", "backups", "outreach"]
+# Copied, not hard-linked, between releases — server-side jobs edit them in
+# place. Keep in sync with MUTABLE in HELPER.
+MUTABLE_SUFFIXES = (".html", ".xml")
+
+# Never part of a release. Same set deploy_to_vps.sh excluded from rsync;
+# SHARED_DIRS live on the server only.
+EXCLUDE_DIRS = {".git", "docs", "__pycache__", "node_modules", ".venv", *SHARED_DIRS}
+EXCLUDE_FILES = {".DS_Store", MANIFEST_NAME}
+EXCLUDE_SUFFIXES = (".pyc", ".swp")
+
+SSH_OPTS = ["-o", "ConnectTimeout=10", "-o", "BatchMode=yes"]
+
+
+# ── Local side ────────────────────────────────────────────────────────────────
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def build_manifest(root=PROJECT_DIR):
+    """{relative path: [sha256, size, mode]} for every file to deploy."""
+    manifest = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root)
+        dirnames[:] = sorted(d for d in dirnames if d not in EXCLUDE_DIRS)
+        for name in sorted(filenames):
+            if name in EXCLUDE_FILES or name.endswith(EXCLUDE_SUFFIXES):
+                continue
+            path = os.path.join(dirpath, name)
+            st = os.lstat(path)
+            if not stat.S_ISREG(st.st_mode):
+                continue  # symlinks/sockets are not part of a release
+            rel = name if rel_dir == "." else f"{rel_dir}/{name}".replace(os.sep, "/")
+            manifest[rel] = [_sha256(path), st.st_size, stat.S_IMODE(st.st_mode) & 0o755]
+    return manifest
+
+
+def diff_manifests(old, new):
+    """(changed or added, removed) paths. A mode change counts as a change."""
+    changed = sorted(p for p, entry in new.items() if old.get(p) != entry)
+    removed = sorted(p for p in old if p not in new)
+    return changed, removed
+
+
+def release_id(manifest, live):
+    """Timestamp + digest of the release and of what it replaces — re-sending
+    the same tree over server-side edits within a second still gets its own id."""
+    digest = hashlib.sha256(json.dumps([manifest, live], sort_keys=True).encode()).hexdigest()
+    return f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}-{digest[:10]}"
+
+
+def build_payload(manifest, changed, root=PROJECT_DIR):
+    """gzip'd tar: the manifest first, then every changed file."""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        data = json.dumps(manifest, sort_keys=True).encode()
+        info = tarfile.TarInfo(MANIFEST_NAME)
+        info.size = len(data)
+        info.mode = 0o644
+        tar.addfile(info, io.BytesIO(data))
+        for rel in changed:
+            tar.add(root / rel, arcname=rel, recursive=False)
+    return buf.getvalue()
+
+
+# ── Target side ───────────────────────────────────────────────────────────────
+# Runs on the target as `python3 -c HELPER <op> <root> ...`. Standard library
+# only, no dependency on this checkout (on a first deploy the target has none).
+
+HELPER = r'''
+import os, sys, json, shutil, hashlib, tarfile
+
+op, root = sys.argv[1], os.path.expanduser(sys.argv[2])
+releases = os.path.join(root, "releases")
+current = os.path.join(root, "current")
+MANIFEST = ".deploy-manifest.json"
+MUTABLE = (".html", ".xml")
+
+def sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def live_manifest():
+    """The live release's manifest, with every file that no longer matches
+    it (edited in place on the server) marked as modified."""
+    try:
+        with open(os.path.join(current, MANIFEST)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    for rel, entry in manifest.items():
+        path = os.path.join(current, rel)
+        try:
+            ok = os.path.getsize(path) == entry[1] and \
+                (not rel.endswith(MUTABLE) or sha256(path) == entry[0])
+        except OSError:
+            ok = False
+        if not ok:
+            manifest[rel] = ["modified"] + entry[1:]
+    return manifest
+
+if op == "manifest":
+    json.dump(live_manifest(), sys.stdout)
+
+elif op == "stage":
+    rid, shared = sys.argv[3], sys.argv[4].split(",")
+    partial = os.path.join(releases, ".partial-" + rid)
+    shutil.rmtree(partial, ignore_errors=True)
+    os.makedirs(partial)
+    old = live_manifest()
+    tar = tarfile.open(fileobj=sys.stdin.buffer, mode="r|gz")
+    first = next(iter(tar))
+    new = json.load(tar.extractfile(first))
+    reused = 0
+    for rel, entry in new.items():
+        if old.get(rel) == entry:
+            dst = os.path.join(partial, rel)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            if rel.endswith(MUTABLE):
+                shutil.copy2(os.path.join(current, rel), dst)
+            else:
+                os.link(os.path.join(current, rel), dst)
+            reused += 1
+    kw = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+    sent = 0
+    for member in tar:
+        if member.isfile() and member.name != MANIFEST:
+            tar.extract(member, partial, **kw)
+            sent += 1
+    tar.close()
+    missing = [rel for rel in new if not os.path.isfile(os.path.join(partial, rel))]
+    if missing:
+        shutil.rmtree(partial)
+        sys.exit("incomplete release, missing: " + ", ".join(missing[:10]))
+    for name in shared:
+        os.makedirs(os.path.join(root, "shared", name), exist_ok=True)
+        os.symlink(os.path.join("..", "..", "shared", name), os.path.join(partial, name))
+    with open(os.path.join(partial, MANIFEST), "w") as f:
+        json.dump(new, f)
+        f.flush()
+        os.fsync(f.fileno())
+    print(json.dumps({"reused": reused, "sent": sent}))
+
+elif op == "publish":
+    rid, keep = sys.argv[3], int(sys.argv[4])
+    final = os.path.join(releases, rid)
+    os.rename(os.path.join(releases, ".partial-" + rid), final)
+    tmp = current + ".tmp"
+    if os.path.lexists(tmp):
+        os.unlink(tmp)
+    os.symlink(os.path.join("releases", rid), tmp)
+    os.replace(tmp, current)
+    done = sorted(d for d in os.listdir(releases) if not d.startswith("."))
+    for old in done[:-keep]:
+        if old != rid:
+            shutil.rmtree(os.path.join(releases, old))
+    for d in os.listdir(releases):
+        if d.startswith(".partial-") and d != ".partial-" + rid:
+            shutil.rmtree(os.path.join(releases, d), ignore_errors=True)
+    print(json.dumps({"current": rid, "kept": min(len(done), keep)}))
+'''
+
+
+class Target:
+    """A deploy target: a local directory or `host:path` reached over ssh."""
+
+    def __init__(self, spec):
+        host, sep, path = spec.partition(":")
+        if sep and "/" not in host and not os.path.exists(spec):
+            self.host, self.root = host, path or "."
+        else:
+            self.host, self.root = None, str(pathlib.Path(spec).expanduser().resolve())
+
+    def __str__(self):
+        return f"{self.host}:{self.root}" if self.host else self.root
+
+    def run(self, op, *args, data=None):
+        argv = ["python3", "-c", HELPER, op, self.root, *map(str, args)]
+        if self.host:
+            cmd = ["ssh", *SSH_OPTS, self.host, " ".join(shlex.quote(a) for a in argv)]
+        else:
+            cmd = [sys.executable, *argv[1:]]
+        r = subprocess.run(cmd, input=data, capture_output=True)
+        if r.returncode != 0:
+            raise RuntimeError(f"{op} on {self} failed: "
+                               f"{r.stderr.decode(errors='replace').strip()}")
+        return json.loads(r.stdout or b"{}")
+
+    def shell(self, command):
+        """Run a post-deploy command inside the live release."""
+        live = f"{self.root}/current"
+        if self.host:
+            remote = f"cd {shlex.quote(live)} && {command}"
+            return subprocess.run(["ssh", *SSH_OPTS, self.host, remote]).returncode
+        return subprocess.run(command, shell=True, cwd=live).returncode
+
+
+def deploy(target, dry_run=False, keep=KEEP_RELEASES, root=PROJECT_DIR):
+    """Deploy `root` to `target`. Returns (changed, removed, added) paths —
+    all empty for a no-op; `changed` includes `added`."""
+    manifest = build_manifest(root)
+    live = target.run("manifest")
+    changed, removed = diff_manifests(live, manifest)
+    print(f"  {len(manifest)} files, {len(changed)} changed/new, {len(removed)} removed "
+          f"(live release has {len(live)})")
+    if not changed and not removed:
+        print("  Nothing to deploy — the live release is identical.")
+        return [], [], []
+    for rel in changed[:20]:
+        print(f"    + {rel}")
+    for rel in removed[:20]:
+        print(f"    - {rel}")
+    if len(changed) > 20 or len(removed) > 20:
+        print("    …")
+    added = [rel for rel in changed if rel not in live]
+    if dry_run:
+        return changed, removed, added
+
+    rid = release_id(manifest, live)
+    payload = build_payload(manifest, changed, root)
+    stats = target.run("stage", rid, ",".join(SHARED_DIRS), data=payload)
+    print(f"  Staged {rid}: {stats['reused']} reused, {stats['sent']} sent "
+          f"({len(payload) / 1024:.0f} KB)")
+    stats = target.run("publish", rid, keep)
+    print(f"  current → releases/{stats['current']} ({stats['kept']} release(s) kept)")
+    return changed, removed, added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delta deploy with an atomic release switch")
+    parser.add_argument("--target", required=True,
+                        help="user@host:path (ssh) or a local directory")
+    parser.add_argument("--dry-run", action="store_true", help="Show the diff; change nothing")
+    parser.add_argument("--keep", type=int, default=KEEP_RELEASES,
+                        help=f"Releases to keep (default {KEEP_RELEASES})")
+    parser.add_argument("--on-change", action="append", default=[], metavar="CMD",
+                        help="Run on the target after a deploy that changed something "
+                             "(repeatable; skipped for no-op deploys)")
+    parser.add_argument("--purge-cdn", action="store_true",
+                        help="Purge the changed URLs from Cloudflare (see purge_cdn.py); "
+                             "with --dry-run, print the purge batches")
+    args = parser.parse_args()
+
+    target = Target(args.target)
+    print(f"Deploy → {target}")
+    try:
+        changed, removed, added = deploy(target, dry_run=args.dry_run, keep=args.keep)
+    except RuntimeError as e:
+        sys.exit(f"  ✗ {e}")
+    if not changed and not removed:
+        return
+    if args.purge_cdn:
+        import purge_cdn
+        urls = purge_cdn.urls_for_changes(changed, removed, added=added)
+        print(f"  CDN purge: {len(urls)} URL(s)")
+        purge_cdn.purge(urls, dry_run=args.dry_run)
+    if args.dry_run:
+        return
+    for command in args.on_change:
+        print(f"  $ {command}")
+        if target.shell(command) != 0:
+            sys.exit(f"  ✗ post-deploy command failed: {command}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,27 @@
 #!/bin/bash
-# Deploy tool scripts and dashboard to VPS.
-# Runs rsync, restarts the dashboard service, then silently updates the
-# security baseline so the integrity monitor doesn't alert on legitimate changes.
+# Deploy the site, tool scripts and dashboard to the VPS.
+#
+# Delta deploy via tools/deploy_release.py: only changed files are sent, into
+# a fresh release directory that goes live with an atomic `current` symlink
+# switch (see that file for the layout and the one-time VPS migration).
+# When something changed, restarts the dashboard and silently updates the
+# security baseline so the integrity monitor doesn't alert on legitimate
+# changes. An unchanged tree is a no-op: no restart, no baseline update.
+# Refuses to deploy when a page breaks its performance budget
+# (tools/perf_budget.py, budgets in data/perf-budgets.json).
+#
+# Usage:
+#   tools/deploy_to_vps.sh             # deploy
+#   tools/deploy_to_vps.sh --dry-run   # show what would change
 
 set -e
 
 VPS="stv@89.167.73.64"
 LOCAL="$HOME/socialtradingvlog-website"
-REMOTE="~/socialtradingvlog-website"
+RELEASES="stv-releases"   # ~/socialtradingvlog-website -> ~/stv-releases/current
 
-echo "=== Syncing to VPS ==="
-rsync -avz --delete \
-  --exclude='.git' \
-  --exclude='reports/' \
-  --exclude='data/' \
-  --exclude='venv/' \
-  --exclude='docs/' \
-  --exclude='transcriptions/' \
-  --exclude='logs/' \
-  --exclude='tools/__pycache__/' \
-  "$LOCAL/" "$VPS:$REMOTE/"
-
-echo ""
-echo "=== Restarting dashboard ==="
-ssh "$VPS" "sudo systemctl restart stv-dashboard"
-
-echo ""
-echo "=== Updating security baseline ==="
-ssh "$VPS" "cd $REMOTE && source venv/bin/activate && python3 tools/security_monitor.py --update-baseline"
-
-echo ""
-echo "Done. Dashboard restarted, security baseline updated."
+cd "$LOCAL"
+python3 tools/perf_budget.py
+python3 tools/deploy_release.py --target "$VPS:$RELEASES" "$@" \
+  --on-change "sudo systemctl restart stv-dashboard" \
+  --on-change "source venv/bin/activate && python3 tools/security_monitor.py --update-baseline"
@@ -5,6 +5,12 @@ STV Full System Check — comprehensive operational health check.
 Runs from the Mac; SSHes into VPS for server-side checks.
 No external dependencies beyond stdlib.
 
+The server side is one round-trip: every read-only probe the sections need
+(REMOTE_PROBES) is sent to the VPS in a single SSH call, run there by a
+small Python runner and returned as one JSON object; the sections then read
+their answers from it. Any other ssh() call reuses the same connection
+(ControlMaster), which is closed when the run ends.
+
 Sections:
   A. Live Site & Network
   B. Cloudflare Layer
@@ -24,6 +30,7 @@ import argparse
 import json
 import pathlib
 import re
+import shlex
 import socket
 import ssl
 import subprocess
@@ -33,6 +40,9 @@ import urllib.error
 import urllib.request
 from datetime import datetime, timezone
 
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+import _checks as checks
+
 # ─── Config ────────────────────────────────────────────────────────────────
 
 PROJECT = pathlib.Path(__file__).parent.parent
@@ -60,7 +70,8 @@ KEY_PAGES = [
     "/ar/",
 ]
 
-EXPECTED_CRON_JOBS = 26  # active entries in setup_cron.sh (excl. 2 DISABLED scrapers)
+EXPECTED_CRON_JOBS = 5   # active entries in setup_cron.sh (scheduler, log rotation, 2 backups, dead man's switch)
+EXPECTED_SCHEDULER_JOBS = 23  # JOBS in tools/scheduler.py
 
 # Age thresholds (seconds)
 MAX_UPTIME_AGE    = 600     # 10 min  — uptime cron (runs every 5 min)
@@ -68,10 +79,12 @@ MAX_SECURITY_AGE  = 10800   # 3h      — security monitor (every 2h)
 MAX_DOCTOR_AGE    = 18000   # 5h      — system doctor (every 4h)
 MAX_DAILY_AGE     = 90000   # 25h     — daily jobs (pipeline, threat scanner, GSC)
 MAX_WEEKLY_AGE    = 691200  # 8 days  — weekly jobs (RSS, schema, backup)
+MAX_SCHEDULER_AGE = 300     # 5 min   — scheduler heartbeat (written every minute)
 
 passes   = []
 failures = []
 warnings = []
+section_failures = {}   # section check name → failed check count
 
 
 def check(name, passed, detail="", warn=False):
@@ -84,18 +97,118 @@ def check(name, passed, detail="", warn=False):
     else:
         marker = "FAIL "
         failures.append((name, detail))
+        section = checks.current()
+        section_failures[section] = section_failures.get(section, 0) + 1
     print(f"  {marker} {name}" + (f"  —  {detail}" if detail else ""))
 
 
-def ssh(cmd, timeout=60):
+# One multiplexed connection per run — %C keeps the socket path short
+# enough for macOS's 104-byte limit
+SSH_OPTS = ["-o", "StrictHostKeyChecking=no", "-o", "ConnectTimeout=10", "-o", "BatchMode=yes",
+            "-o", "ControlMaster=auto", "-o", "ControlPath=/tmp/stv-check-%C",
+            "-o", "ControlPersist=120"]
+
+
+def ssh(cmd, timeout=60, input=None):
     r = subprocess.run(
-        ["ssh", "-o", "StrictHostKeyChecking=no", "-o", "ConnectTimeout=10",
-         "-o", "BatchMode=yes", VPS, cmd],
-        capture_output=True, text=True, timeout=timeout,
+        ["ssh", *SSH_OPTS, VPS, cmd],
+        capture_output=True, text=True, timeout=timeout, input=input,
     )
     return r.stdout, r.stderr, r.returncode
 
 
+def ssh_close():
+    """Close the shared connection (no-op when none is open)."""
+    try:
+        subprocess.run(["ssh", *SSH_OPTS, "-O", "exit", VPS],
+                       capture_output=True, timeout=10)
+    except Exception:
+        pass
+
+
+# ─── Batched remote probes ─────────────────────────────────────────────────
+
+def _stat(path):
+    return f"stat -c %Y {VPS_PROJECT}/{path} 2>/dev/null || echo 0"
+
+
+def _cat_json(path):
+    return f"cat {VPS_PROJECT}/{path} 2>/dev/null || echo '{{}}'"
+
+
+def _tail(path, n):
+    return f"tail -{n} {VPS_PROJECT}/{path} 2>/dev/null || echo ''"
+
+
+# name → read-only shell command; all run in one SSH round-trip
+REMOTE_PROBES = {
+    "caddy":            "systemctl is-active caddy 2>/dev/null",
+    "fail2ban":         "systemctl is-active fail2ban 2>/dev/null",
+    "ufw_active":       "systemctl is-active ufw 2>/dev/null",
+    "listeners":        "ss -tnl 2>/dev/null",
+    "disk":             "df -h / | tail -1",
+    "memory":           "free -m | grep '^Mem:'",
+    "loadavg":          "cat /proc/loadavg",
+    "zombies":          "ps aux | awk '$8==\"Z\"' | wc -l",
+    "cron_count":       "crontab -l 2>/dev/null | grep -v '^#' | grep '#STV' | wc -l",
+    "security_state":   _cat_json("data/security-state.json"),
+    "scheduler_state":  _cat_json("data/scheduler-state.json"),
+    "doctor_heartbeat": _cat_json("data/doctor-heartbeat.json"),
+    "integrity_mtime":  _stat("data/security-integrity.json"),
+    "backup":           f"find {VPS_PROJECT}/backups/ -name 'data-*.gpg' -mtime -8 2>/dev/null | sort | tail -1",
+    "secret_perms": (
+        "python3 -c \""
+        "import pathlib; s=pathlib.Path.home()/'.config/stv-secrets';"
+        "bad=[f.name for f in s.iterdir() if not f.name.startswith('.') and oct(f.stat().st_mode)[-3:]!='600'];"
+        "print('BAD:'+','.join(bad) if bad else 'OK')\""
+    ),
+    "ufw_status":       "ufw status 2>/dev/null",
+    "big_logs":         f"find {VPS_PROJECT}/logs/ -name '*.log' -size +50M 2>/dev/null | head -5",
+    "gsc_latest": (
+        f"f=$(ls -t {VPS_PROJECT}/reports/gsc-*.json 2>/dev/null | head -1); "
+        "[ -n \"$f\" ] && echo \"$f $(stat -c %Y \"$f\" 2>/dev/null || echo 0)\""
+    ),
+    **{f"mtime:{log}": _stat(f"logs/{log}") for log in
+       ("security.log", "doctor.log", "pipeline.log", "uptime.log", "rss.log", "schema.log")},
+    "tail:selftest.log":    _tail("logs/selftest.log", 40),
+    "tail:security.log":    _tail("logs/security.log", 200),
+    "tail:pipeline.log":    _tail("logs/pipeline.log", 50),
+    "tail:threat-scan.log": _tail("logs/threat-scan.log", 100),
+    "tail:uptime.log":      _tail("logs/uptime.log", 20),
+}
+
+# Runs on the VPS: reads {name: command} on stdin, prints {name: stdout}
+REMOTE_RUNNER = """
+import json, subprocess, sys
+out = {}
+for name, cmd in json.load(sys.stdin).items():
+    try:
+        out[name] = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=30).stdout
+    except subprocess.TimeoutExpired:
+        out[name] = ""
+print(json.dumps(out))
+"""
+
+remote_results = {}
+
+
+def fetch_remote(timeout=120):
+    """Run every REMOTE_PROBES command on the VPS in one SSH call; fills
+    remote_results. Returns (ok, error)."""
+    out, err, rc = ssh(f"python3 -c {shlex.quote(REMOTE_RUNNER)}", timeout=timeout,
+                       input=json.dumps(REMOTE_PROBES))
+    try:
+        remote_results.update(json.loads(out))
+    except ValueError:
+        return False, (err.strip() or out.strip() or f"exit {rc}")[:80]
+    return True, ""
+
+
+def remote(name):
+    """Output of one batched probe ("" when it did not run)."""
+    return remote_results.get(name, "")
+
+
 def http_get(url, timeout=15):
     """GET url; returns (status_code, body_snippet). None on connection error."""
     try:
@@ -160,13 +273,13 @@ def check_live_site(args):
 
     # A2: SSL certificate valid with 14+ days remaining
     try:
-        ctx = ssl.create_default_context()
-        with socket.create_connection(("socialtradingvlog.com", 443), timeout=10) as sock:
-            with ctx.wrap_socket(sock, server_hostname="socialtradingvlog.com") as ssock:
-                cert = ssock.getpeercert()
-                expiry = datetime.strptime(cert["notAfter"], "%b %d %H:%M:%S %Y %Z")
-                days = (expiry - datetime.utcnow()).days
-                check("A2. SSL cert valid", days >= 14, f"{days} days remaining (expires {expiry.date()})")
+        cert = checks.ssl_certificate()
+        if not cert["verified"]:
+            check("A2. SSL cert valid", False, cert["error"])
+        else:
+            expiry = datetime.strptime(cert["not_after"], "%b %d %H:%M:%S %Y %Z")
+            check("A2. SSL cert valid", cert["days_left"] >= 14,
+                  f"{cert['days_left']} days remaining (expires {expiry.date()})")
     except Exception as e:
         check("A2. SSL cert valid", False, str(e))
 
@@ -293,31 +406,35 @@ def check_cloudflare(args):
 # C. VPS Services & System Health
 # ═══════════════════════════════════════════════════════════════════════════
 
-def check_vps_services(args):
+def check_vps_ssh(args):
+    """C1 — every VPS section (C2–F) depends on this one."""
     print("\nC. VPS Services & System Health\n")
 
-    # C1: SSH reachable
-    out, err, rc = ssh("echo OK")
-    if "OK" not in out:
-        check("C1. VPS SSH reachable", False, err.strip()[:80])
-        for label in ("C2–C8",):
-            check(f"{label}. VPS checks", False, "skipped — SSH not reachable")
-        return
-    check("C1. VPS SSH reachable", True, "connected")
+    # C1: SSH reachable — and every remote probe fetched in the same call
+    started = time.time()
+    ok, err = fetch_remote()
+    if not ok:
+        check("C1. VPS SSH reachable", False, err)
+        return False
+    check("C1. VPS SSH reachable", True,
+          f"connected, {len(remote_results)} probes in {time.time() - started:.1f}s")
+    return True
+
 
+def check_vps_services(args):
     # C2: Caddy active
-    out, _, _ = ssh("systemctl is-active caddy 2>/dev/null")
+    out = remote("caddy")
     check("C2. Caddy active", out.strip() == "active", out.strip())
 
     # C3: fail2ban active
-    out, _, _ = ssh("systemctl is-active fail2ban 2>/dev/null")
+    out = remote("fail2ban")
     check("C3. fail2ban active", out.strip() == "active", out.strip())
 
     # C4: UFW active; 8080 closed
     # Site is served by GitHub Pages (not VPS directly), so 80/443 are not expected on VPS
-    ufw_active_out, _, _ = ssh("systemctl is-active ufw 2>/dev/null")
+    ufw_active_out = remote("ufw_active")
     ufw_active = ufw_active_out.strip() == "active"
-    ss_out, _, _ = ssh("ss -tnl 2>/dev/null")
+    ss_out = remote("listeners")
     has_8080 = ":8080 " in ss_out or ":8080\n" in ss_out
     detail = []
     if not ufw_active: detail.append("UFW service inactive")
@@ -327,7 +444,7 @@ def check_vps_services(args):
           "; ".join(detail) if detail else "UFW active, 8080 closed")
 
     # C5: Disk usage < 80%
-    out, _, _ = ssh("df -h / | tail -1")
+    out = remote("disk")
     m = re.search(r"(\d+)%", out)
     if m:
         pct = int(m.group(1))
@@ -336,7 +453,7 @@ def check_vps_services(args):
         check("C5. Disk usage", False, f"could not parse: {out.strip()}")
 
     # C6: Memory < 90%
-    out, _, _ = ssh("free -m | grep '^Mem:'")
+    out = remote("memory")
     parts = out.strip().split()
     if len(parts) >= 3:
         total, used = int(parts[1]), int(parts[2])
@@ -346,7 +463,7 @@ def check_vps_services(args):
         check("C6. Memory", False, "could not parse free output")
 
     # C7: CPU 15-min load < 4.0
-    out, _, _ = ssh("cat /proc/loadavg")
+    out = remote("loadavg")
     parts = out.strip().split()
     if len(parts) >= 3:
         load = float(parts[2])
@@ -355,7 +472,7 @@ def check_vps_services(args):
         check("C7. CPU load", False, "could not parse /proc/loadavg")
 
     # C8: No zombie processes
-    out, _, _ = ssh("ps aux | awk '$8==\"Z\"' | wc -l")
+    out = remote("zombies")
     try:
         n = int(out.strip())
         check("C8. No zombie processes", n == 0, f"{n} zombie(s)" if n else "clean")
@@ -371,17 +488,17 @@ def check_cron(args):
     print("\nD. Cron Job Coverage\n")
 
     # D1: Active #STV job count
-    out, _, _ = ssh("crontab -l 2>/dev/null | grep -v '^#' | grep '#STV' | wc -l")
+    out = remote("cron_count")
     try:
         count = int(out.strip())
-        ok = count >= EXPECTED_CRON_JOBS - 3
+        ok = count >= EXPECTED_CRON_JOBS
         check(f"D1. Cron jobs installed (~{EXPECTED_CRON_JOBS} expected)", ok,
               f"{count} active #STV jobs")
     except Exception:
         check("D1. Cron jobs installed", False, f"could not parse: {out.strip()}")
 
     # D2: Key tool last-run times (from security-state.json)
-    state_out, _, _ = ssh(f"cat {VPS_PROJECT}/data/security-state.json 2>/dev/null || echo '{{}}'")
+    state_out = remote("security_state")
     try:
         state = json.loads(state_out)
     except Exception:
@@ -394,7 +511,7 @@ def check_cron(args):
         ("doctor.log",       MAX_DOCTOR_AGE,   "D3. system_doctor (every 4h)"),
     ]
     for logfile, max_age, label in log_windows:
-        out, _, _ = ssh(f"stat -c %Y {VPS_PROJECT}/logs/{logfile} 2>/dev/null || echo 0")
+        out = remote(f"mtime:{logfile}")
         try:
             a = now() - int(out.strip())
             check(label, a < max_age, f"{int(a//3600)}h ago")
@@ -416,7 +533,7 @@ def check_cron(args):
             check(label, False, "no timestamp in state file")
 
     # D6: Pipeline log updated < 25h
-    out, _, _ = ssh(f"stat -c %Y {VPS_PROJECT}/logs/pipeline.log 2>/dev/null || echo 0")
+    out = remote("mtime:pipeline.log")
     try:
         a = now() - int(out.strip())
         check("D6. Pipeline cron ran < 25h", a < MAX_DAILY_AGE, f"{int(a//3600)}h ago")
@@ -424,7 +541,7 @@ def check_cron(args):
         check("D6. Pipeline cron ran < 25h", False, "log not found")
 
     # D7: Uptime log updated < 10 min (every-5-min cron)
-    out, _, _ = ssh(f"stat -c %Y {VPS_PROJECT}/logs/uptime.log 2>/dev/null || echo 0")
+    out = remote("mtime:uptime.log")
     try:
         a = now() - int(out.strip())
         check("D7. Uptime cron active (log < 10min old)", a < MAX_UPTIME_AGE,
@@ -434,13 +551,31 @@ def check_cron(args):
 
     # D8: Weekly jobs (RSS, schema) ran < 8 days
     for label, logfile in [("RSS generator", "rss.log"), ("Schema generator", "schema.log")]:
-        out, _, _ = ssh(f"stat -c %Y {VPS_PROJECT}/logs/{logfile} 2>/dev/null || echo 0")
+        out = remote(f"mtime:{logfile}")
         try:
             a = now() - int(out.strip())
             check(f"D8. {label} < 8 days", a < MAX_WEEKLY_AGE, f"{int(a//86400)}d ago")
         except Exception:
             check(f"D8. {label}", False, "log not found")
 
+    # D9: Scheduler heartbeat — every tool above runs inside tools/scheduler.py
+    out = remote("scheduler_state")
+    try:
+        sched = json.loads(out)
+    except Exception:
+        sched = {}
+    if sched.get("ts"):
+        a = now() - float(sched["ts"])
+        jobs = sched.get("jobs", {})
+        failed = sorted(n for n, j in jobs.items() if (j.get("last") or {}).get("status") in ("failed", "timeout"))
+        check("D9. Scheduler running (heartbeat < 5 min)", a < MAX_SCHEDULER_AGE,
+              f"{int(a)}s ago, {len(jobs)}/{EXPECTED_SCHEDULER_JOBS} jobs, "
+              f"{len(sched.get('running', {}))} running")
+        check("D9. Scheduler jobs' last runs succeeded", not failed, ", ".join(failed) or "all ok",
+              warn=True)
+    else:
+        check("D9. Scheduler running", False, "no data/scheduler-state.json")
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # E. Security Stack
@@ -451,7 +586,7 @@ def check_security(args):
 
     # E1: Selftest result — only count lines in the LAST run
     # Find the last "Self-test: X/16 passed" separator, count [PASS]/[FAIL] after it
-    out, _, _ = ssh(f"tail -40 {VPS_PROJECT}/logs/selftest.log 2>/dev/null || echo ''")
+    out = remote("tail:selftest.log")
     lines = out.splitlines()
     last_sep = -1
     for i, line in enumerate(lines):
@@ -467,7 +602,7 @@ def check_security(args):
         check("E1. Security selftest", False, "could not parse selftest.log")
 
     # E2: No unexpected security alerts in last 2h
-    state_out, _, _ = ssh(f"cat {VPS_PROJECT}/data/security-state.json 2>/dev/null || echo '{{}}'")
+    state_out = remote("security_state")
     try:
         state = json.loads(state_out)
         cutoff = now() - 7200  # 2h
@@ -486,7 +621,7 @@ def check_security(args):
         check("E2. Security alerts", False, str(e))
 
     # E3: System doctor heartbeat < 5h
-    out, _, _ = ssh(f"cat {VPS_PROJECT}/data/doctor-heartbeat.json 2>/dev/null || echo '{{}}'")
+    out = remote("doctor_heartbeat")
     try:
         hb = json.loads(out)
         a = now() - hb.get("ts", 0)
@@ -495,34 +630,25 @@ def check_security(args):
         check("E3. System doctor heartbeat", False, str(e))
 
     # E4: Encrypted backup < 8 days old
-    out, _, _ = ssh(
-        f"find {VPS_PROJECT}/backups/ -name 'data-*.gpg' -mtime -8 2>/dev/null | sort | tail -1"
-    )
+    out = remote("backup")
     recent = out.strip()
     check("E4. Encrypted backup < 8 days", bool(recent),
           recent.split("/")[-1] if recent else "no recent backup")
 
     # E5: Secret file permissions all 600
-    out, _, _ = ssh(
-        "python3 -c \""
-        "import pathlib; s=pathlib.Path.home()/'.config/stv-secrets';"
-        "bad=[f.name for f in s.iterdir() if not f.name.startswith('.') and oct(f.stat().st_mode)[-3:]!='600'];"
-        "print('BAD:'+','.join(bad) if bad else 'OK')\""
-    )
+    out = remote("secret_perms")
     ok = "OK" in out
     check("E5. Secret file permissions 600", ok,
           out.strip().replace("BAD:", "bad perms: ") if not ok else "all 600")
 
     # E6: No 8080 in UFW allow rules
-    out, _, _ = ssh("ufw status 2>/dev/null")
+    out = remote("ufw_status")
     has_8080 = "8080" in out and "ALLOW" in out
     check("E6. Port 8080 not in UFW allow rules", not has_8080,
           "8080 still open — remove with: ufw delete allow 8080/tcp" if has_8080 else "8080 closed")
 
     # E7: file integrity baseline fresh — use file mtime (no internal timestamp key)
-    out, _, _ = ssh(
-        f"stat -c %Y {VPS_PROJECT}/data/security-integrity.json 2>/dev/null || echo 0"
-    )
+    out = remote("integrity_mtime")
     try:
         a = now() - int(out.strip())
         check("E7. File integrity baseline < 25h", a < MAX_DAILY_AGE, f"{int(a//3600)}h ago")
@@ -538,13 +664,13 @@ def check_logs(args):
     print("\nF. Log Health\n")
 
     # F1: No CRITICAL in security.log (last 200 lines)
-    out, _, _ = ssh(f"tail -200 {VPS_PROJECT}/logs/security.log 2>/dev/null || echo ''")
+    out = remote("tail:security.log")
     crits = [l.strip() for l in out.splitlines() if "[CRITICAL]" in l]
     check("F1. No CRITICAL in security.log (last 200 lines)", not crits,
           f"{len(crits)}: {crits[0][:70]}" if crits else "clean")
 
     # F2: No ERROR in pipeline.log (last 50 lines)
-    out, _, _ = ssh(f"tail -50 {VPS_PROJECT}/logs/pipeline.log 2>/dev/null || echo ''")
+    out = remote("tail:pipeline.log")
     errs = [l.strip() for l in out.splitlines()
             if "ERROR" in l and "Errors: 0" not in l and "errors: 0" not in l.lower()]
     check("F2. No ERROR in pipeline.log (last 50 lines)", not errs,
@@ -554,7 +680,7 @@ def check_logs(args):
     # Exclude transient external service errors (CISA KEV geo-blocked from VPS)
     from datetime import timezone as _tz
     cutoff_ts = datetime.now(_tz.utc).timestamp() - 28800  # 8h
-    out, _, _ = ssh(f"tail -100 {VPS_PROJECT}/logs/threat-scan.log 2>/dev/null || echo ''")
+    out = remote("tail:threat-scan.log")
     threats = []
     for line in out.splitlines():
         if "[ALERT]" not in line and "[WARN]" not in line:
@@ -575,13 +701,13 @@ def check_logs(args):
           f"{len(threats)}: {threats[0][:70]}" if threats else "clean")
 
     # F4: Uptime log clean (last 20 lines)
-    out, _, _ = ssh(f"tail -20 {VPS_PROJECT}/logs/uptime.log 2>/dev/null || echo ''")
+    out = remote("tail:uptime.log")
     issues = [l.strip() for l in out.splitlines() if "CRITICAL" in l or "[WARN]" in l]
     check("F4. Uptime log clean (last 20 lines)", not issues,
           f"{len(issues)}: {issues[0][:70]}" if issues else "clean")
 
     # F5: No runaway log files (> 50MB)
-    out, _, _ = ssh(f"find {VPS_PROJECT}/logs/ -name '*.log' -size +50M 2>/dev/null | head -5")
+    out = remote("big_logs")
     big = [l.strip().split("/")[-1] for l in out.splitlines() if l.strip()]
     check("F5. No log file > 50MB", not big,
           f"large: {', '.join(big)}" if big else "all logs within size")
@@ -601,7 +727,7 @@ def check_content(args):
           f"status {code}" + (", has <url> entries" if has_urls else ", no <url> found"))
 
     # G2: RSS feeds regenerated < 8 days
-    out, _, _ = ssh(f"stat -c %Y {VPS_PROJECT}/logs/rss.log 2>/dev/null || echo 0")
+    out = remote("mtime:rss.log")
     try:
         a = now() - int(out.strip())
         check("G2. RSS feeds < 8 days old", a < MAX_WEEKLY_AGE, f"{int(a//86400)}d ago")
@@ -609,7 +735,7 @@ def check_content(args):
         check("G2. RSS feeds", False, "rss.log not found")
 
     # G3: Schema markup regenerated < 8 days
-    out, _, _ = ssh(f"stat -c %Y {VPS_PROJECT}/logs/schema.log 2>/dev/null || echo 0")
+    out = remote("mtime:schema.log")
     try:
         a = now() - int(out.strip())
         check("G3. Schema markup < 8 days old", a < MAX_WEEKLY_AGE, f"{int(a//86400)}d ago")
@@ -617,12 +743,10 @@ def check_content(args):
         check("G3. Schema markup", False, "schema.log not found")
 
     # G4: GSC snapshot current — saved to reports/gsc-YYYY-MM-DD.json (not data/gsc-snapshots/)
-    out, _, _ = ssh(f"ls -t {VPS_PROJECT}/reports/gsc-*.json 2>/dev/null | head -1")
-    latest = out.strip()
+    latest, _, mtime = remote("gsc_latest").strip().rpartition(" ")
     if latest:
-        out2, _, _ = ssh(f"stat -c %Y {latest} 2>/dev/null || echo 0")
         try:
-            a = now() - int(out2.strip())
+            a = now() - int(mtime)
             name = latest.split("/")[-1]
             check("G4. GSC snapshot < 49h old", a < 176400,
                   f"{name} — {int(a//3600)}h ago")
@@ -657,13 +781,35 @@ def main():
     print(f"  {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("══════════════════════════════════════════════════════════")
 
-    check_live_site(args)
-    check_cloudflare(args)
-    check_vps_services(args)
-    check_cron(args)
-    check_security(args)
-    check_logs(args)
-    check_content(args)
+    # The sections are independent apart from needing SSH; they run
+    # concurrently and their output is printed in section order.
+    def section(fn):
+        def run():
+            result = fn(args)
+            return result if result is not None else not section_failures.get(checks.current())
+        return run
+
+    report = checks.run("full_system_check", [
+        checks.Check("A. Live Site & Network", section(check_live_site), timeout=300),
+        checks.Check("B. Cloudflare Layer", section(check_cloudflare), timeout=120),
+        checks.Check("C1. VPS SSH", section(check_vps_ssh), timeout=30),
+        checks.Check("C. VPS Services", section(check_vps_services), deps=["C1. VPS SSH"], timeout=300),
+        checks.Check("D. Cron Job Coverage", section(check_cron), deps=["C1. VPS SSH"], timeout=300),
+        checks.Check("E. Security Stack", section(check_security), deps=["C1. VPS SSH"], timeout=900),
+        checks.Check("F. Log Health", section(check_logs), deps=["C1. VPS SSH"], timeout=300),
+        checks.Check("G. Content Freshness", section(check_content), after=["C1. VPS SSH"],
+                     timeout=300),
+    ])
+    ssh_close()
+    for r in report["results"]:
+        if r["status"] == checks.SKIPPED:
+            check(f"{r['name']}", False, "skipped — SSH not reachable")
+        elif r["status"] in (checks.ERROR, checks.TIMEOUT):
+            check(f"{r['name']}", False, f"{r['status']}: {r['detail']}")
+    checks.save_report(report)
+    # Sections finish in any order — list problems by section letter
+    failures.sort(key=lambda f: f[0][:1])
+    warnings.sort(key=lambda w: w[0][:1])
 
     total = len(passes) + len(failures) + len(warnings)
     print(f"\n══════════════════════════════════════════════════════════")
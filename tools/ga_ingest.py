@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Incremental GA4 ingestion into the local warehouse (tools/_ga_store.py).
+
+Every report in _ga_store.REPORTS is requested with an extra "date"
+dimension, so one request covers a whole span of days. Only days not yet
+stored (under the report's current definition) are asked for, up to
+DATA_LAG_DAYS ago — GA keeps processing the most recent days, so they are
+left until they are complete and then fetched exactly once.
+
+Missing days are cut into contiguous spans of at most SPAN_DAYS, and the
+reports missing each span go out together through batchRunReports (up to
+BATCH_SIZE reports per call — the API maximum). Reports with more rows than
+ROW_LIMIT are paged with offset in follow-up batches. When a report's span
+is complete its rows are stored day by day, each day in one transaction,
+so an interrupted run just continues where it stopped.
+
+--record DIR / --replay DIR work as in gsc_export.py: every batch response
+is saved as DIR/<hash of the request>.json, and replay answers from those
+files without credentials or the Google libraries.
+
+Usage:
+    python3 tools/ga_ingest.py                       # last 90 days, missing days only
+    python3 tools/ga_ingest.py --days 400            # backfill
+    python3 tools/ga_ingest.py --dry-run             # show what would be fetched
+    python3 tools/ga_ingest.py --days 14 --replay /tmp/ga-fixture --store /tmp/ga.sqlite3
+
+Scheduled daily by tools/scheduler.py (job "ga-ingest", 6:15 — before the
+reports that read the warehouse).
+"""
+
+import sys
+import json
+import time
+import hashlib
+import pathlib
+import argparse
+from datetime import date, timedelta
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+import _ga_store as ga_store
+import _google
+
+PROPERTY_ID = "525085627"
+
+DATA_LAG_DAYS = ga_store.DATA_LAG_DAYS
+DEFAULT_DAYS = 90
+SPAN_DAYS = 31          # days per request
+BATCH_SIZE = 5          # batchRunReports maximum
+ROW_LIMIT = 100000      # rows per request (API maximum 250,000)
+
+
+# ── Clients ───────────────────────────────────────────────────────────────────
+
+def request_key(body):
+    return hashlib.sha256(json.dumps(body, sort_keys=True).encode()).hexdigest()[:20]
+
+
+class LiveClient:
+    """batchRunReports through the GA Data API client. Takes and returns
+    plain dicts, so responses can be recorded and replayed."""
+
+    def __init__(self):
+        self.client = _google.analytics_data()
+
+    def batch(self, body):
+        from google.analytics.data_v1beta.types import (
+            BatchRunReportsRequest, RunReportRequest, DateRange, Dimension, Metric,
+        )
+        response = self.client.batch_run_reports(BatchRunReportsRequest(
+            property=f"properties/{PROPERTY_ID}",
+            requests=[RunReportRequest(
+                date_ranges=[DateRange(start_date=r["start"], end_date=r["end"])],
+                dimensions=[Dimension(name=d) for d in r["dimensions"]],
+                metrics=[Metric(name=m) for m in r["metrics"]],
+                offset=r["offset"], limit=r["limit"],
+            ) for r in body["reports"]],
+        ))
+        return {"reports": [
+            {"row_count": report.row_count,
+             "rows": [[[v.value for v in row.dimension_values],
+                       [v.value for v in row.metric_values]] for row in report.rows]}
+            for report in response.reports]}
+
+
+class RecordingClient(LiveClient):
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+        directory.mkdir(parents=True, exist_ok=True)
+
+    def batch(self, body):
+        response = super().batch(body)
+        (self.directory / f"{request_key(body)}.json").write_text(
+            json.dumps({"request": body, "response": response}, indent=1), encoding="utf-8")
+        return response
+
+
+class ReplayClient:
+    """Answers from responses saved by --record."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def batch(self, body):
+        path = self.directory / f"{request_key(body)}.json"
+        if not path.exists():
+            raise RuntimeError(f"no recorded response for {json.dumps(body, sort_keys=True)}")
+        return json.loads(path.read_text(encoding="utf-8"))["response"]
+
+
+# ── Planning ──────────────────────────────────────────────────────────────────
+
+def wanted_days(days, end):
+    return [(end - timedelta(days=i)).isoformat() for i in range(days)][::-1]
+
+
+def spans(day_list):
+    """Contiguous runs of ISO dates, each at most SPAN_DAYS long."""
+    out = []
+    for day in sorted(day_list):
+        if out and len(out[-1]) < SPAN_DAYS and \
+                date.fromisoformat(day) - date.fromisoformat(out[-1][-1]) == timedelta(days=1):
+            out[-1].append(day)
+        else:
+            out.append([day])
+    return out
+
+
+def plan(store, days, end):
+    """[(report, [days])] — every report's missing days, split into spans."""
+    wanted = wanted_days(days, end)
+    work = []
+    for report in ga_store.REPORTS:
+        have = store.dates(report)
+        for span in spans(d for d in wanted if d not in have):
+            work.append((report, span))
+    return work
+
+
+# ── Ingestion ─────────────────────────────────────────────────────────────────
+
+class Ingester:
+    def __init__(self, client, store):
+        self.client = client
+        self.store = store
+        self.calls = 0
+
+    def request(self, report, span, offset=0):
+        dimensions, metrics = ga_store.REPORTS[report]
+        return {"dimensions": ["date"] + dimensions, "metrics": metrics,
+                "start": span[0], "end": span[-1], "offset": offset, "limit": ROW_LIMIT}
+
+    def run(self, work):
+        """Fetch and store every (report, span). Returns {report: days stored}."""
+        queue = [(report, span, 0) for report, span in work]
+        collected = {}
+        stored = {}
+        while queue:
+            chunk, queue = queue[:BATCH_SIZE], queue[BATCH_SIZE:]
+            response = self.client.batch({"reports": [self.request(*item) for item in chunk]})
+            self.calls += 1
+            for (report, span, offset), result in zip(chunk, response["reports"]):
+                rows = collected.setdefault((report, span[0]), [])
+                rows += result.get("rows", [])
+                fetched = offset + len(result.get("rows", []))
+                if result.get("rows") and fetched < int(result.get("row_count", 0)):
+                    queue.append((report, span, fetched))  # next page in a later batch
+                    continue
+                by_day = {day: [] for day in span}
+                for dims, mets in collected.pop((report, span[0])):
+                    day = f"{dims[0][:4]}-{dims[0][4:6]}-{dims[0][6:]}"  # GA dates are YYYYMMDD
+                    if day in by_day:
+                        by_day[day].append((dims[1:], mets))
+                for day, day_rows in by_day.items():
+                    self.store.replace_day(report, day, day_rows)
+                stored[report] = stored.get(report, 0) + len(span)
+                print(f"  {report:<12} {span[0]} → {span[-1]}: "
+                      f"{sum(len(r) for r in by_day.values()):,} rows")
+        return stored
+
+
+def ingest(days=DEFAULT_DAYS, store=None, client=None):
+    """Bring the warehouse up to date. Returns {report: days stored}."""
+    store = store or ga_store.store()
+    end = date.today() - timedelta(days=DATA_LAG_DAYS)
+    work = plan(store, days, end)
+    if not work:
+        return {}
+    return Ingester(client or LiveClient(), store).run(work)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest GA4 reports into the local warehouse")
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help="How many days back")
+    parser.add_argument("--end", help=f"Last day (default: today - {DATA_LAG_DAYS})")
+    parser.add_argument("--dry-run", action="store_true", help="List the requests to make")
+    parser.add_argument("--store", type=pathlib.Path, help="Store file (default data/ga.sqlite3)")
+    clients = parser.add_mutually_exclusive_group()
+    clients.add_argument("--record", type=pathlib.Path, metavar="DIR", help="Save every response")
+    clients.add_argument("--replay", type=pathlib.Path, metavar="DIR", help="Answer from saved responses")
+    args = parser.parse_args()
+
+    store = ga_store.GaStore(args.store) if args.store else ga_store.store()
+    end = date.fromisoformat(args.end) if args.end else date.today() - timedelta(days=DATA_LAG_DAYS)
+    work = plan(store, args.days, end)
+    calls = -(-len(work) // BATCH_SIZE)
+    print(f"GA ingest — {args.days} day(s) to {end}, {len(work)} report span(s), "
+          f"~{calls} batch call(s)")
+    if not work or args.dry_run:
+        for report, span in work:
+            print(f"  {report:<12} {span[0]} → {span[-1]} ({len(span)} day(s))")
+        return
+
+    started = time.monotonic()
+    try:
+        if args.replay:
+            client = ReplayClient(args.replay)
+        elif args.record:
+            client = RecordingClient(args.record)
+        else:
+            client = LiveClient()
+        ingester = Ingester(client, store)
+        stored = ingester.run(work)
+    except ImportError:
+        sys.exit("  ✗ google-analytics-data not installed (pip install google-analytics-data)")
+    except RuntimeError as e:
+        sys.exit(f"  ✗ {e}")
+    print(f"  {sum(stored.values())} report-day(s) in {ingester.calls} call(s), "
+          f"{time.monotonic() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
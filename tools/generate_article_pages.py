@@ -36,8 +36,18 @@ import re
 sys.path.insert(0, str(pathlib.Path(__file__).parent))
 import _risk_disclaimer as rd
 
+# Shared nav/footer/consent/risk-warning partials, cached per (lang, prefix).
+import _templates as tpl
+import _related as related
+
 BASE_DIR = pathlib.Path(__file__).parent.parent
 
+# Sidebar "More guides" links (root-relative); the Related block skips these.
+MORE_GUIDES = (
+    "etoro-review/", "copy-trading.html", "copy-trading-returns.html",
+    "etoro-scam.html", "videos.html",
+)
+
 # ── CTA presets (mirrors generate_video_pages.py) ────────────────────────────
 CTA_PRESETS = {
     "main": {
@@ -942,49 +952,11 @@ def generate_page(article: dict) -> str:
   {faq_schema}  </script>
   <script type="application/ld+json">
   {breadcrumb}  </script>
-  <!-- Google tag (gtag.js) -->
-  <script async src="https://www.googletagmanager.com/gtag/js?id=G-PBGDJ951LL"></script>
-  <script>
-    window.dataLayer = window.dataLayer || [];
-    function gtag(){{dataLayer.push(arguments);}}
-    gtag('js', new Date());
-    gtag('config', 'G-PBGDJ951LL');
-  </script>
+{tpl.analytics_head()}
 </head>
 <body>
 
-  <nav>
-    <div class="container nav-inner">
-      <a href="{P}/index.html" class="nav-logo">Social<span>Trading</span>Vlog</a>
-      <ul class="nav-links">
-        <li><a href="{P}/social-trading.html">Social Trading</a></li>
-        <li><a href="{P}/copy-trading.html">Copy Trading</a></li>
-        <li><a href="{P}/updates.html">Updates</a></li>
-        <li><a href="{P}/videos.html">Videos</a></li>
-        <li><a href="{P}/about.html">About</a></li>
-        <li><a href="{P}/faq.html">FAQ</a></li>
-        <li><a href="#etoro-cta" class="nav-cta">Try eToro</a></li>
-      </ul>
-      <button class="nav-hamburger" id="nav-hamburger" aria-label="Open navigation" aria-expanded="false" aria-controls="nav-drawer">
-        <span></span><span></span><span></span>
-      </button>
-    </div>
-  </nav>
-  <div class="nav-drawer" id="nav-drawer" role="navigation" aria-label="Mobile navigation">
-    <ul>
-      <li><a href="{P}/social-trading.html">Social Trading</a></li>
-      <li><a href="{P}/copy-trading.html">Copy Trading</a></li>
-      <li><a href="{P}/updates.html">Updates</a></li>
-      <li><a href="{P}/videos.html">Videos</a></li>
-      <li><a href="{P}/about.html">About</a></li>
-      <li><a href="{P}/faq.html">FAQ</a></li>
-      <li><a href="#etoro-cta" class="nav-cta">Try eToro</a></li>
-    </ul>
-  </div>
-
-  <div class="risk-warning-banner">
-    <span>Risk warning:</span> 51% of retail investor accounts lose money when trading CFDs with eToro. Your capital is at risk.
-  </div>
+{tpl.site_header('en', '../')}
 
   <div class="article-hero">
     <div class="container">
@@ -1003,10 +975,7 @@ def generate_page(article: dict) -> str:
 
         {toc}
 
-        <div class="risk-warning">
-          <strong>Risk Warning</strong>
-          eToro is a multi-asset investment platform. The value of your investments may go up or down. 51% of retail investor accounts lose money when trading CFDs with eToro. You should consider whether you can afford to take the high risk of losing your money. This content is for educational and informational purposes only — it is not investment advice.
-        </div>
+{tpl.risk_warning_box('en')}
 
         <div class="inline-cta">
           <p class="inline-cta-text">{cta_headline} — Tom&#x27;s honest affiliate link.</p>
@@ -1017,10 +986,7 @@ def generate_page(article: dict) -> str:
 
 {faq_section_html}
 
-        <div class="risk-warning">
-          <strong>Important Reminder</strong>
-          51% of retail investor accounts lose money when trading CFDs with eToro. You should consider whether you can afford to take the high risk of losing your money. Past performance is not an indication of future results. This content is for educational purposes only and is not investment advice.
-        </div>
+{tpl.important_reminder_box('en')}
 
       </article>
 
@@ -1029,12 +995,9 @@ def generate_page(article: dict) -> str:
           <h3>{cta_headline}</h3>
           <p>{cta_body}</p>
           <a href="{cta_url}" class="btn btn-primary" target="_blank" rel="noopener sponsored">{cta_label} &#x2192;</a>
-          <div class="risk-warning">
-            <strong>51% of retail investor accounts lose money when trading CFDs with eToro.</strong>
-            You should consider whether you can afford to take the high risk of losing your money. This is an affiliate link — Tom may earn a commission at no cost to you.
-          </div>
+{tpl.sidebar_risk_warning('en')}
         </div>
-        <div class="sidebar-nav">
+{related.sidebar_block(f"{slug}/", "en", f"{P}/", exclude=MORE_GUIDES)}        <div class="sidebar-nav">
           <h4>More guides</h4>
           <ul>
             <li><a href="{P}/etoro-review/">eToro Review 2026</a></li>
@@ -1049,54 +1012,9 @@ def generate_page(article: dict) -> str:
     </div>
   </div>
 
-  <footer>
-    <div class="container">
-      <div class="footer-inner">
-        <div class="footer-brand">
-          <div class="nav-logo">Social<span style="color:var(--accent)">Trading</span>Vlog</div>
-          <p>Documenting the copy trading journey since 2017. Independent, honest, and always learning.</p>
-        </div>
-        <div class="footer-col">
-          <h4>Guides</h4>
-          <ul>
-            <li><a href="{P}/social-trading.html">What is Social Trading?</a></li>
-            <li><a href="{P}/copy-trading.html">What is Copy Trading?</a></li>
-            <li><a href="{P}/etoro-scam.html">Is eToro a Scam?</a></li>
-            <li><a href="{P}/copy-trading-returns.html">How Much Can You Make?</a></li>
-          </ul>
-        </div>
-        <div class="footer-col">
-          <h4>Site</h4>
-          <ul>
-            <li><a href="{P}/updates.html">Trading Updates</a></li>
-            <li><a href="{P}/about.html">About</a></li>
-            <li><a href="{P}/faq.html">FAQ</a></li>
-            <li><a href="{P}/contact.html">Contact</a></li>
-          </ul>
-        </div>
-      </div>
-      <div class="footer-bottom">
-        <p>&copy; 2026 SocialTradingVlog.com</p>
-        <p class="footer-disclaimer">Your capital is at risk. 51% of retail investor accounts lose money when trading CFDs with eToro. This website is for educational and informational purposes only and does not constitute investment advice. Copy Trading does not amount to investment advice.</p>
-      </div>
-    </div>
-  </footer>
-
-  <script src="{P}/js/nav.js"></script>
-  <script>
-  document.addEventListener('click', function(e) {{
-    var link = e.target.closest('a.btn-primary');
-    if (!link) return;
-    if (typeof gtag === 'function') {{
-      gtag('event', 'cta_click', {{
-        'event_category': 'affiliate',
-        'event_label': link.textContent.trim(),
-        'link_url': link.href || '',
-        'page_path': location.pathname
-      }});
-    }}
-  }});
-  </script>
+{tpl.site_footer('en', '../')}
+
+{tpl.page_scripts('en', '../', lightbox=False)}
 </body>
 </html>"""
 
@@ -1140,6 +1058,7 @@ def main():
         # it. Editorial "76%" prose is preserved. See _risk_disclaimer.py.
         html_content = rd.normalize_html(html_content)
         out_file.write_text(html_content, encoding="utf-8")
+        rd.record_page(out_file, html_content)
         print(f"  wrote {slug}/index.html  ({len(html_content):,} chars)")
         generated += 1
 
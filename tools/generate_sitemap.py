@@ -2,9 +2,15 @@
 """
 Sitemap Generator for socialtradingvlog.com
 
-Scans the project directory for all index.html files, generates a proper
-sitemap.xml with priorities, changefreq, lastmod dates, and hreflang
-alternate links for multilingual pages.
+Scans the project directory for all index.html files and generates a
+sitemap index (sitemap.xml) pointing at gzipped per-language, per-type child
+sitemaps (sitemap-en-pages.xml.gz, sitemap-de-video.xml.gz, ...) with
+priorities, changefreq, lastmod dates, and hreflang alternate links for
+multilingual pages.
+
+lastmod is NOT the file mtime — checkouts, rsyncs and --force rebuilds touch
+every file. It is the date a hash of the page's main content last changed,
+kept in data/sitemap-lastmod.json (commit it alongside the sitemaps).
 
 Also generates robots.txt if one doesn't already exist.
 
@@ -14,10 +20,18 @@ Usage:
 
 import os
 import re
+import sys
+import gzip
+import json
+import hashlib
 import datetime
 from pathlib import Path
 from xml.etree.ElementTree import Element, SubElement, ElementTree, indent
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import _hreflang as hreflang
+import _risk_disclaimer as rd
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
@@ -25,6 +39,15 @@ from xml.etree.ElementTree import Element, SubElement, ElementTree, indent
 BASE_URL = "https://socialtradingvlog.com"
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 LANGUAGES = ["en", "es", "de", "fr", "pt", "ar", "it", "ko", "nl", "pl", "us"]
+LANG_PREFIXES = set(LANGUAGES) - {"en"}
+CALCULATOR_DIRS = {"calculators", "calculadoras", "rechner", "calculateurs",
+                   "calcolatori", "계산기", "kalkulatory"}
+
+# Per-page content hash + the date it last changed
+LASTMOD_FILE = PROJECT_ROOT / "data" / "sitemap-lastmod.json"
+
+# Protocol limit per child sitemap
+MAX_URLS_PER_SITEMAP = 50000
 
 # Directories to exclude entirely (relative to project root)
 EXCLUDED_DIRS = {
@@ -79,10 +102,93 @@ def rel_to_url(rel_path: str) -> str:
     return BASE_URL + "/" + rel_path
 
 
-def get_lastmod(filepath: Path) -> str:
-    """Return the file modification time as a YYYY-MM-DD string."""
-    mtime = filepath.stat().st_mtime
-    return datetime.datetime.fromtimestamp(mtime).strftime("%Y-%m-%d")
+# Chrome that is not page content: scripts, comments, the mobile nav drawer
+# and the sticky risk banner.
+_NOISE_RE = re.compile(
+    r"<script\b.*?</script>|<!--.*?-->|<style\b.*?</style>"
+    r'|<div class="nav-drawer".*?</ul>\s*</div>'
+    r'|<div class="risk-warning-banner">.*?</div>',
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def main_content(html: str) -> str:
+    """The part of a page whose changes should move its lastmod.
+
+    The <article> when there is one; otherwise everything between the nav
+    and the footer. Whitespace is collapsed and the eToro disclaimer figure
+    masked, so re-indenting or a site-wide risk-% update is not "new content".
+    """
+    start = html.find("<article")
+    end = html.rfind("</article>")
+    if start != -1 and end > start:
+        body = html[start:end]
+    else:
+        end = html.find("<footer")
+        end = end if end != -1 else len(html)
+        start = html.rfind("</nav>", 0, end)
+        start = start if start != -1 else html.find("<body")
+        body = html[max(start, 0):end]
+    body = _NOISE_RE.sub("", body)
+    body, _changed, _skipped = rd.normalize(body, 0)
+    return " ".join(body.split())
+
+
+def content_hash(filepath: Path) -> str:
+    html = filepath.read_text(encoding="utf-8", errors="ignore")
+    return hashlib.sha256(main_content(html).encode("utf-8")).hexdigest()[:16]
+
+
+class LastmodStore:
+    """url → (content hash, lastmod), persisted in LASTMOD_FILE.
+
+    A page keeps its stored lastmod until its content hash changes; then it
+    gets today's date. Pages seen for the first time are seeded from the old
+    monolithic sitemap.xml when it lists them (so the switch to hashing does
+    not reset every date), else today.
+    """
+
+    def __init__(self, root: Path):
+        self.path = root / LASTMOD_FILE.relative_to(PROJECT_ROOT)
+        self.today = datetime.date.today().isoformat()
+        self.changed = 0
+        try:
+            self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.entries = {}
+        self.seed = {} if self.entries else self._legacy_lastmods(root / "sitemap.xml")
+        self.seen = set()
+
+    @staticmethod
+    def _legacy_lastmods(sitemap_path: Path) -> dict:
+        try:
+            xml = sitemap_path.read_text(encoding="utf-8")
+        except OSError:
+            return {}
+        if "<urlset" not in xml:
+            return {}
+        return dict(re.findall(
+            r"<loc>([^<]+)</loc>\s*<lastmod>([^<]+)</lastmod>", xml))
+
+    def lastmod(self, url: str, filepath: Path) -> str:
+        digest = content_hash(filepath)
+        self.seen.add(url)
+        entry = self.entries.get(url)
+        if entry and entry["hash"] == digest:
+            return entry["lastmod"]
+        if entry:
+            self.changed += 1
+            date = self.today
+        else:
+            date = self.seed.get(url, self.today)
+        self.entries[url] = {"hash": digest, "lastmod": date}
+        return date
+
+    def save(self):
+        """Persist, dropping pages that no longer exist."""
+        entries = {url: self.entries[url] for url in sorted(self.seen)}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(entries, indent=1) + "\n", encoding="utf-8")
 
 
 def classify_page(rel_path: str):
@@ -103,14 +209,13 @@ def classify_page(rel_path: str):
         others = monthly
     """
     parts = Path(rel_path).parts
-    lang_prefixes = {"es", "de", "fr", "pt", "ar", "it", "ko", "nl", "pl", "us"}
 
     # Homepage
     if rel_path == "index.html":
         return 1.0, "daily"
 
     # Check if it's a translated page
-    is_translated = len(parts) > 0 and parts[0] in lang_prefixes
+    is_translated = len(parts) > 0 and parts[0] in LANG_PREFIXES
 
     # Strip language prefix for classification
     if is_translated:
@@ -124,9 +229,7 @@ def classify_page(rel_path: str):
     # Not present in the current structure, but handle just in case
 
     # Calculators (English or translated)
-    calculator_dirs = {"calculators", "calculadoras", "rechner", "calculateurs",
-                       "calcolatori", "계산기", "kalkulatory"}
-    if len(inner_parts) > 0 and inner_parts[0] in calculator_dirs:
+    if len(inner_parts) > 0 and inner_parts[0] in CALCULATOR_DIRS:
         return (0.5 if is_translated else 0.8), "monthly"
 
     # Video pages
@@ -153,6 +256,18 @@ def classify_page(rel_path: str):
     return 0.5, "monthly"
 
 
+def page_alternates(url: str, filepath: Path) -> dict:
+    """hreflang alternates for a page.
+
+    Generated translation clusters come straight from the shared hreflang
+    graph (see _hreflang.py); only hand-written pages outside it are parsed.
+    """
+    alternates = hreflang.alternates_for_url(url)
+    if alternates is not None:
+        return alternates
+    return extract_hreflang_alternates(filepath)
+
+
 def extract_hreflang_alternates(filepath: Path) -> dict:
     """Parse an HTML file and extract hreflang alternate links.
 
@@ -254,10 +369,71 @@ def find_all_pages(root: Path) -> list:
     return pages
 
 
+def sitemap_group(rel_path: str):
+    """(lang, type) child sitemap a page belongs to, e.g. ("de", "video")."""
+    parts = Path(rel_path).parts
+    lang = parts[0] if parts and parts[0] in LANG_PREFIXES else "en"
+    inner = parts[1:] if lang != "en" else parts
+    if inner and inner[0] in CALCULATOR_DIRS:
+        return lang, "calculators"
+    if inner and inner[0] == "video":
+        return lang, "video"
+    if inner and inner[0] == "updates":
+        return lang, "updates"
+    return lang, "pages"
+
+
+def render_urlset(entries) -> str:
+    """<urlset> XML for a list of (url, lastmod, changefreq, priority, alternates)."""
+    lines = []
+    lines.append('<?xml version="1.0" encoding="UTF-8"?>')
+    lines.append('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"')
+    lines.append('        xmlns:xhtml="http://www.w3.org/1999/xhtml">')
+    for url, lastmod, changefreq, priority, alternates in entries:
+        lines.append("  <url>")
+        lines.append(f"    <loc>{url}</loc>")
+        lines.append(f"    <lastmod>{lastmod}</lastmod>")
+        lines.append(f"    <changefreq>{changefreq}</changefreq>")
+        lines.append(f"    <priority>{priority}</priority>")
+        for lang, href in sorted(alternates.items()):
+            lines.append(
+                f'    <xhtml:link rel="alternate" hreflang="{lang}" href="{href}" />'
+            )
+        lines.append("  </url>")
+    lines.append("</urlset>")
+    lines.append("")  # trailing newline
+    return "\n".join(lines)
+
+
+def render_index(children) -> str:
+    """<sitemapindex> XML for a list of (filename, lastmod)."""
+    lines = []
+    lines.append('<?xml version="1.0" encoding="UTF-8"?>')
+    lines.append('<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">')
+    for filename, lastmod in children:
+        lines.append("  <sitemap>")
+        lines.append(f"    <loc>{BASE_URL}/{filename}</loc>")
+        lines.append(f"    <lastmod>{lastmod}</lastmod>")
+        lines.append("  </sitemap>")
+    lines.append("</sitemapindex>")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Write `data` unless the file already holds exactly these bytes."""
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.write_bytes(data)
+    return True
+
+
 def generate_sitemap(root: Path) -> str:
-    """Generate sitemap.xml content and write it to the project root.
+    """Generate the sitemap index and its per-language, per-type children.
 
-    Returns a summary string.
+    sitemap.xml (the URL robots.txt and Search Console already point at) is
+    a <sitemapindex>; each child is sitemap-<lang>-<type>.xml.gz at the site
+    root. Returns a summary string.
     """
     pages = find_all_pages(root)
 
@@ -270,17 +446,8 @@ def generate_sitemap(root: Path) -> str:
 
     pages.sort(key=sort_key)
 
-    # XML namespaces
-    nsmap = {
-        "xmlns": "http://www.sitemaps.org/schemas/sitemap/0.9",
-        "xmlns:xhtml": "http://www.w3.org/1999/xhtml",
-    }
-
-    # Build XML manually for cleaner output with xhtml namespace
-    lines = []
-    lines.append('<?xml version="1.0" encoding="UTF-8"?>')
-    lines.append('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"')
-    lines.append('        xmlns:xhtml="http://www.w3.org/1999/xhtml">')
+    lastmods = LastmodStore(root)
+    groups = {}
 
     # Counters for summary
     count_total = 0
@@ -298,33 +465,19 @@ def generate_sitemap(root: Path) -> str:
     for rel_path, abs_path in pages:
         url = rel_to_url(rel_path)
         priority, changefreq = classify_page(rel_path)
-        lastmod = get_lastmod(abs_path)
+        lastmod = lastmods.lastmod(url, abs_path)
 
-        # Extract hreflang alternates from the HTML file
-        alternates = extract_hreflang_alternates(abs_path)
-
-        # Build the <url> block
-        lines.append("  <url>")
-        lines.append(f"    <loc>{url}</loc>")
-        lines.append(f"    <lastmod>{lastmod}</lastmod>")
-        lines.append(f"    <changefreq>{changefreq}</changefreq>")
-        lines.append(f"    <priority>{priority}</priority>")
-
-        # Add hreflang alternate links if present
+        alternates = page_alternates(url, abs_path)
         if alternates:
             count_with_alternates += 1
-            for lang, href in sorted(alternates.items()):
-                lines.append(
-                    f'    <xhtml:link rel="alternate" hreflang="{lang}" href="{href}" />'
-                )
 
-        lines.append("  </url>")
+        groups.setdefault(sitemap_group(rel_path), []).append(
+            (url, lastmod, changefreq, priority, alternates))
 
         # Categorize for summary
         count_total += 1
         parts = Path(rel_path).parts
-        lang_prefixes = {"es", "de", "fr", "pt", "ar", "it", "ko", "nl", "pl", "us"}
-        is_translated = len(parts) > 0 and parts[0] in lang_prefixes
+        is_translated = len(parts) > 0 and parts[0] in LANG_PREFIXES
 
         if rel_path == "index.html":
             count_by_type["homepage"] += 1
@@ -341,14 +494,29 @@ def generate_sitemap(root: Path) -> str:
         else:
             count_by_type["other"] += 1
 
-    lines.append("</urlset>")
-    lines.append("")  # trailing newline
-
-    xml_content = "\n".join(lines)
+    # Child sitemaps, gzipped. mtime=0 keeps the bytes identical when the
+    # content is, so an unchanged child is neither rewritten nor redeployed.
+    children = []
+    written = 0
+    for (lang, kind), entries in sorted(groups.items(),
+                                        key=lambda g: (g[0][0] != "en", g[0])):
+        for n, start in enumerate(range(0, len(entries), MAX_URLS_PER_SITEMAP)):
+            chunk = entries[start:start + MAX_URLS_PER_SITEMAP]
+            suffix = f"-{n + 1}" if n else ""
+            filename = f"sitemap-{lang}-{kind}{suffix}.xml.gz"
+            data = gzip.compress(render_urlset(chunk).encode("utf-8"), mtime=0)
+            written += write_if_changed(root / filename, data)
+            children.append((filename, max(e[1] for e in chunk)))
+
+    # Drop children from groups that no longer exist
+    current = {name for name, _ in children}
+    for stale in root.glob("sitemap-*.xml.gz"):
+        if stale.name not in current:
+            stale.unlink()
 
-    # Write sitemap.xml
     sitemap_path = root / "sitemap.xml"
-    sitemap_path.write_text(xml_content, encoding="utf-8")
+    write_if_changed(sitemap_path, render_index(children).encode("utf-8"))
+    lastmods.save()
 
     # Build summary
     summary_lines = [
@@ -356,8 +524,10 @@ def generate_sitemap(root: Path) -> str:
         "=" * 60,
         "  SITEMAP GENERATION COMPLETE",
         "=" * 60,
-        f"  Output: {sitemap_path}",
+        f"  Index:  {sitemap_path}",
+        f"  Child sitemaps: {len(children)} ({written} changed)",
         f"  Total URLs: {count_total}",
+        f"  Content changed since last run: {lastmods.changed}",
         "",
         "  Breakdown:",
         f"    Homepage:          {count_by_type['homepage']}",
@@ -31,12 +31,13 @@ ASSET_PREFIX = "../../"
 # ── Base URL ──────────────────────────────────────────────────────────────────
 BASE_URL = "https://socialtradingvlog.com"
 
-# ── Translations directory ───────────────────────────────────────────────────
-TRANSLATIONS_DIR = pathlib.Path(__file__).parent / "translations"
-
 # ── Import UI_STRINGS from the video page generator ──────────────────────────
 sys.path.insert(0, str(pathlib.Path(__file__).parent))
 from generate_translated_pages import UI_STRINGS
+import _templates as tpl
+import _hreflang as hreflang
+import _translation_store as ts
+import _related as related
 
 # ── Article definitions ──────────────────────────────────────────────────────
 # Each article: id → { en_slug, cta_url, translation_prefix }
@@ -60,42 +61,16 @@ SIDEBAR_GUIDES = [
 
 
 def load_translation(article_id, lang):
-    """Load a translation JSON file for an article+language."""
-    article = ARTICLES[article_id]
-    json_file = TRANSLATIONS_DIR / f"{article['translation_prefix']}_{lang}.json"
-    if not json_file.exists():
+    """Translated content for an article+language, or None if there is none."""
+    store = ts.store()
+    if not store.has(f"article:{article_id}", lang):
         return None
-    with open(json_file, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return store.page(f"article:{article_id}", lang, required=ts.ARTICLE_FIELDS)
 
 
 def get_available_languages(article_id):
     """Find all available translation languages for an article."""
-    article = ARTICLES[article_id]
-    prefix = article["translation_prefix"]
-    langs = []
-    if TRANSLATIONS_DIR.exists():
-        for json_file in TRANSLATIONS_DIR.glob(f"{prefix}_*.json"):
-            lang = json_file.stem.split("_")[-1]
-            langs.append(lang)
-    return sorted(langs)
-
-
-def build_hreflang_tags(article_id, available_langs, translations_cache):
-    """Build hreflang link tags for all language variants."""
-    article = ARTICLES[article_id]
-    en_slug = article["en_slug"]
-    lines = []
-    # English (default + en)
-    en_url = f"{BASE_URL}/{en_slug}/"
-    lines.append(f'  <link rel="alternate" hreflang="en" href="{en_url}" />')
-    lines.append(f'  <link rel="alternate" hreflang="x-default" href="{en_url}" />')
-    # Each translation
-    for lang in available_langs:
-        trans = translations_cache[lang]
-        url = f"{BASE_URL}/{lang}/{trans['slug']}/"
-        lines.append(f'  <link rel="alternate" hreflang="{lang}" href="{url}" />')
-    return "\n".join(lines)
+    return [lang for lang in ts.store().langs(f"article:{article_id}") if lang != "en"]
 
 
 def build_toc(sections, ui):
@@ -246,49 +221,11 @@ def generate_article_page(lang, article_id, trans, hreflang_tags):
   <script type="application/ld+json">
     {breadcrumb_schema}
   </script>
-  <!-- Google tag (gtag.js) -->
-  <script async src="https://www.googletagmanager.com/gtag/js?id=G-PBGDJ951LL"></script>
-  <script>
-    window.dataLayer = window.dataLayer || [];
-    function gtag(){{dataLayer.push(arguments);}}
-    gtag('js', new Date());
-    gtag('config', 'G-PBGDJ951LL');
-  </script>
+{tpl.analytics_head()}
 </head>
 <body>
 
-  <nav>
-    <div class="container nav-inner">
-      <a href="{p}index.html" class="nav-logo">Social<span>Trading</span>Vlog</a>
-      <ul class="nav-links">
-        <li><a href="{p}social-trading.html">{html.escape(ui["social_trading"])}</a></li>
-        <li><a href="{p}copy-trading.html">{html.escape(ui["copy_trading"])}</a></li>
-        <li><a href="{p}updates.html">{html.escape(ui["updates"])}</a></li>
-        <li><a href="{p}videos.html">{html.escape(ui["videos"])}</a></li>
-        <li><a href="{p}about.html">{html.escape(ui["about"])}</a></li>
-        <li><a href="{p}faq.html">{html.escape(ui["faq"])}</a></li>
-        <li><a href="#etoro-cta" class="nav-cta">{html.escape(ui["try_etoro"])}</a></li>
-      </ul>
-      <button class="nav-hamburger" id="nav-hamburger" aria-label="Open navigation" aria-expanded="false" aria-controls="nav-drawer">
-        <span></span><span></span><span></span>
-      </button>
-    </div>
-  </nav>
-  <div class="nav-drawer" id="nav-drawer" role="navigation" aria-label="Mobile navigation">
-    <ul>
-      <li><a href="{p}social-trading.html">{html.escape(ui["social_trading"])}</a></li>
-      <li><a href="{p}copy-trading.html">{html.escape(ui["copy_trading"])}</a></li>
-      <li><a href="{p}updates.html">{html.escape(ui["updates"])}</a></li>
-      <li><a href="{p}videos.html">{html.escape(ui["videos"])}</a></li>
-      <li><a href="{p}about.html">{html.escape(ui["about"])}</a></li>
-      <li><a href="{p}faq.html">{html.escape(ui["faq"])}</a></li>
-      <li><a href="#etoro-cta" class="nav-cta">{html.escape(ui["try_etoro"])}</a></li>
-    </ul>
-  </div>
-
-  <div class="risk-warning-banner">
-    <span>{html.escape(ui["risk_warning_label"])}:</span> {ui["risk_warning_banner"].split(": ", 1)[-1] if ": " in ui["risk_warning_banner"] else ui["risk_warning_banner"]}
-  </div>
+{tpl.site_header(lang, p)}
 
   <div class="article-hero">
     <div class="container">
@@ -309,10 +246,7 @@ def generate_article_page(lang, article_id, trans, hreflang_tags):
 {toc_items}
 </ul></nav>
 
-        <div class="risk-warning">
-          <strong>{html.escape(ui["risk_warning_label"])}</strong>
-          {html.escape(ui["risk_warning_full"])}
-        </div>
+{tpl.risk_warning_box(lang)}
 
         <div class="inline-cta">
           <p class="inline-cta-text">{html.escape(ui["ready_cta_inline"])}</p>
@@ -326,10 +260,7 @@ def generate_article_page(lang, article_id, trans, hreflang_tags):
 {faq_items_html}
 </section>
 
-        <div class="risk-warning">
-          <strong>{html.escape(ui["important_reminder"])}</strong>
-          {html.escape(ui["important_reminder_text"])}
-        </div>
+{tpl.important_reminder_box(lang)}
 
       </article>
 
@@ -338,12 +269,9 @@ def generate_article_page(lang, article_id, trans, hreflang_tags):
           <h3>{html.escape(ui["ready_to_try"])}</h3>
           <p>{html.escape(ui["toms_affiliate"])}</p>
           <a href="{cta_url}" class="btn btn-primary" target="_blank" rel="noopener sponsored">{html.escape(ui["explore_etoro"])}</a>
-          <div class="risk-warning">
-            <strong>{ui["risk_warning_sidebar"].split(".")[0]}.</strong>
-            {".".join(ui["risk_warning_sidebar"].split(".")[1:])}
-          </div>
+{tpl.sidebar_risk_warning(lang)}
         </div>
-        <div class="sidebar-nav">
+{related.sidebar_block(f"{lang}/{slug}/", lang, p)}        <div class="sidebar-nav">
           <h4>{html.escape(ui["more_guides"])}</h4>
           <ul>
 {sidebar_html}
@@ -354,54 +282,9 @@ def generate_article_page(lang, article_id, trans, hreflang_tags):
     </div>
   </div>
 
-  <footer>
-    <div class="container">
-      <div class="footer-inner">
-        <div class="footer-brand">
-          <div class="nav-logo">Social<span style="color:var(--accent)">Trading</span>Vlog</div>
-          <p>{html.escape(ui["footer_brand"])}</p>
-        </div>
-        <div class="footer-col">
-          <h4>{html.escape(ui["footer_guides"])}</h4>
-          <ul>
-            <li><a href="{p}social-trading.html">{html.escape(ui["guide_social"])}</a></li>
-            <li><a href="{p}copy-trading.html">{html.escape(ui["guide_copy"])}</a></li>
-            <li><a href="{p}etoro-scam.html">{html.escape(ui["guide_scam"])}</a></li>
-            <li><a href="{p}copy-trading-returns.html">{html.escape(ui["guide_returns"])}</a></li>
-          </ul>
-        </div>
-        <div class="footer-col">
-          <h4>{html.escape(ui["footer_site"])}</h4>
-          <ul>
-            <li><a href="{p}updates.html">{html.escape(ui["footer_updates"])}</a></li>
-            <li><a href="{p}about.html">{html.escape(ui["footer_about"])}</a></li>
-            <li><a href="{p}faq.html">{html.escape(ui["footer_faq"])}</a></li>
-            <li><a href="{p}contact.html">{html.escape(ui["footer_contact"])}</a></li>
-          </ul>
-        </div>
-      </div>
-      <div class="footer-bottom">
-        <p>&copy; 2026 SocialTradingVlog.com</p>
-        <p class="footer-disclaimer">{html.escape(ui["risk_warning_footer"])}</p>
-      </div>
-    </div>
-  </footer>
-
-  <script src="{p}js/nav.js"></script>
-  <script>
-  document.addEventListener('click', function(e) {{
-    var link = e.target.closest('a.btn-primary');
-    if (!link) return;
-    if (typeof gtag === 'function') {{
-      gtag('event', 'cta_click', {{
-        'event_category': 'affiliate',
-        'event_label': link.textContent.trim(),
-        'link_url': link.href || '',
-        'page_path': location.pathname
-      }});
-    }}
-  }});
-  </script>
+{tpl.site_footer(lang, p)}
+
+{tpl.page_scripts(lang, p, lightbox=False)}
 </body>
 </html>'''
 
@@ -425,21 +308,14 @@ def main():
             print(f"  No translations found for {article_id}")
             continue
 
-        # Pre-load all translations for hreflang building
-        translations_cache = {}
-        for lang in available_langs:
-            trans = load_translation(article_id, lang)
-            if trans:
-                translations_cache[lang] = trans
-
-        # Build hreflang tags (shared across all languages for this article)
-        hreflang_tags = build_hreflang_tags(article_id, available_langs, translations_cache)
+        # Shared hreflang block for every language of this article
+        hreflang_tags = hreflang.tags(f"article:{article_id}")
 
         for lang in available_langs:
             if args.lang and lang != args.lang:
                 continue
 
-            trans = translations_cache[lang]
+            trans = load_translation(article_id, lang)
             slug = trans["slug"]
             out_dir = BASE_DIR / lang / slug
             out_file = out_dir / "index.html"
@@ -32,12 +32,13 @@ ASSET_PREFIX = "../../"
 # ── Base URL ──────────────────────────────────────────────────────────────────
 BASE_URL = "https://socialtradingvlog.com"
 
-# ── Translations directory ───────────────────────────────────────────────────
-TRANSLATIONS_DIR = pathlib.Path(__file__).parent / "translations"
-
 # ── Import UI_STRINGS from the video page generator ──────────────────────────
 sys.path.insert(0, str(pathlib.Path(__file__).parent))
 from generate_translated_pages import UI_STRINGS
+import _templates as tpl
+import _hreflang as hreflang
+import _translation_store as ts
+import _related as related
 
 # ── Legacy page definitions ──────────────────────────────────────────────────
 # Maps page_id → English filename (for hreflang)
@@ -53,39 +54,18 @@ LEGACY_PAGES = {
 CTA_URL = "https://etoro.tw/4tEsDF4"
 
 
-def load_backbone_translations(lang):
-    """Load backbone pages translations for a language."""
-    json_file = TRANSLATIONS_DIR / f"backbone_pages_{lang}.json"
-    if not json_file.exists():
+def load_backbone_page(page_id, lang):
+    """Translated content for one legacy page (from backbone_pages_<lang>.json,
+    via the translation store), or None if it isn't translated."""
+    store = ts.store()
+    if not store.has(f"legacy:{page_id}", lang):
         return None
-    with open(json_file, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return store.page(f"legacy:{page_id}", lang, required=ts.LEGACY_FIELDS)
 
 
 def get_available_languages():
     """Find all languages with backbone translations."""
-    langs = []
-    if TRANSLATIONS_DIR.exists():
-        for json_file in TRANSLATIONS_DIR.glob("backbone_pages_*.json"):
-            lang = json_file.stem.replace("backbone_pages_", "")
-            langs.append(lang)
-    return sorted(langs)
-
-
-def build_hreflang_tags(page_id, available_langs, all_translations):
-    """Build hreflang link tags for all language variants of a page."""
-    en_file = LEGACY_PAGES[page_id]["en_file"]
-    lines = []
-    en_url = f"{BASE_URL}/{en_file}"
-    lines.append(f'  <link rel="alternate" hreflang="en" href="{en_url}" />')
-    lines.append(f'  <link rel="alternate" hreflang="x-default" href="{en_url}" />')
-    for lang in available_langs:
-        trans = all_translations[lang]
-        if page_id in trans:
-            slug = trans[page_id]["slug"]
-            url = f"{BASE_URL}/{lang}/{slug}/"
-            lines.append(f'  <link rel="alternate" hreflang="{lang}" href="{url}" />')
-    return "\n".join(lines)
+    return ts.store().languages("legacy")
 
 
 def render_content_block(block, p):
@@ -248,49 +228,11 @@ def generate_legacy_page(lang, page_id, page_data, hreflang_tags):
   <title>{html.escape(title)}</title>
   <link rel="stylesheet" href="{p}css/style.css" />
 {schema_block}
-  <!-- Google tag (gtag.js) -->
-  <script async src="https://www.googletagmanager.com/gtag/js?id=G-PBGDJ951LL"></script>
-  <script>
-    window.dataLayer = window.dataLayer || [];
-    function gtag(){{dataLayer.push(arguments);}}
-    gtag('js', new Date());
-    gtag('config', 'G-PBGDJ951LL');
-  </script>
+{tpl.analytics_head()}
 </head>
 <body>
 
-  <nav>
-    <div class="container nav-inner">
-      <a href="{p}index.html" class="nav-logo">Social<span>Trading</span>Vlog</a>
-      <ul class="nav-links">
-        <li><a href="{p}social-trading.html">{html.escape(ui["social_trading"])}</a></li>
-        <li><a href="{p}copy-trading.html">{html.escape(ui["copy_trading"])}</a></li>
-        <li><a href="{p}updates.html">{html.escape(ui["updates"])}</a></li>
-        <li><a href="{p}videos.html">{html.escape(ui["videos"])}</a></li>
-        <li><a href="{p}about.html">{html.escape(ui["about"])}</a></li>
-        <li><a href="{p}faq.html">{html.escape(ui["faq"])}</a></li>
-        <li><a href="#etoro-cta" class="nav-cta">{html.escape(ui["try_etoro"])}</a></li>
-      </ul>
-      <button class="nav-hamburger" id="nav-hamburger" aria-label="Open navigation" aria-expanded="false" aria-controls="nav-drawer">
-        <span></span><span></span><span></span>
-      </button>
-    </div>
-  </nav>
-  <div class="nav-drawer" id="nav-drawer" role="navigation" aria-label="Mobile navigation">
-    <ul>
-      <li><a href="{p}social-trading.html">{html.escape(ui["social_trading"])}</a></li>
-      <li><a href="{p}copy-trading.html">{html.escape(ui["copy_trading"])}</a></li>
-      <li><a href="{p}updates.html">{html.escape(ui["updates"])}</a></li>
-      <li><a href="{p}videos.html">{html.escape(ui["videos"])}</a></li>
-      <li><a href="{p}about.html">{html.escape(ui["about"])}</a></li>
-      <li><a href="{p}faq.html">{html.escape(ui["faq"])}</a></li>
-      <li><a href="#etoro-cta" class="nav-cta">{html.escape(ui["try_etoro"])}</a></li>
-    </ul>
-  </div>
-
-  <div class="risk-warning-banner">
-    <span>{html.escape(ui["risk_warning_label"])}:</span> {ui["risk_warning_banner"].split(": ", 1)[-1] if ": " in ui["risk_warning_banner"] else ui["risk_warning_banner"]}
-  </div>
+{tpl.site_header(lang, p)}
 
   <div class="article-hero">
     <div class="container">
@@ -314,12 +256,9 @@ def generate_legacy_page(lang, page_id, page_data, hreflang_tags):
           <h3>{html.escape(sidebar_cta.get("h3", ui["ready_to_try"]))}</h3>
           <p>{html.escape(sidebar_cta.get("p", ui["toms_affiliate"]))}</p>
           <a href="{CTA_URL}" class="btn btn-primary" target="_blank" rel="noopener sponsored">{html.escape(sidebar_cta.get("btn", ui["explore_etoro"]))}</a>
-          <div class="risk-warning">
-            <strong>{ui["risk_warning_sidebar"].split(".")[0]}.</strong>
-            {".".join(ui["risk_warning_sidebar"].split(".")[1:])}
-          </div>
+{tpl.sidebar_risk_warning(lang)}
         </div>
-        <div class="sidebar-nav">
+{related.sidebar_block(f"{lang}/{slug}/", lang, p)}        <div class="sidebar-nav">
           <h4>{html.escape(sidebar_nav_heading)}</h4>
           <ul>
 {sidebar_items}
@@ -330,55 +269,9 @@ def generate_legacy_page(lang, page_id, page_data, hreflang_tags):
     </div>
   </div>
 
-  <footer>
-    <div class="container">
-      <div class="footer-inner">
-        <div class="footer-brand">
-          <div class="nav-logo">Social<span style="color:var(--accent)">Trading</span>Vlog</div>
-          <p>{html.escape(ui["footer_brand"])}</p>
-        </div>
-        <div class="footer-col">
-          <h4>{html.escape(ui["footer_guides"])}</h4>
-          <ul>
-            <li><a href="{p}social-trading.html">{html.escape(ui["guide_social"])}</a></li>
-            <li><a href="{p}copy-trading.html">{html.escape(ui["guide_copy"])}</a></li>
-            <li><a href="{p}etoro-scam.html">{html.escape(ui["guide_scam"])}</a></li>
-            <li><a href="{p}copy-trading-returns.html">{html.escape(ui["guide_returns"])}</a></li>
-          </ul>
-        </div>
-        <div class="footer-col">
-          <h4>{html.escape(ui["footer_site"])}</h4>
-          <ul>
-            <li><a href="{p}updates.html">{html.escape(ui["footer_updates"])}</a></li>
-            <li><a href="{p}about.html">{html.escape(ui["footer_about"])}</a></li>
-            <li><a href="{p}faq.html">{html.escape(ui["footer_faq"])}</a></li>
-            <li><a href="{p}contact.html">{html.escape(ui["footer_contact"])}</a></li>
-          </ul>
-        </div>
-      </div>
-      <div class="footer-bottom">
-        <p>&copy; 2026 SocialTradingVlog.com</p>
-        <p class="footer-disclaimer">{html.escape(ui["risk_warning_footer"])}</p>
-      </div>
-    </div>
-  </footer>
-
-  <script src="{p}js/lightbox.js"></script>
-  <script src="{p}js/nav.js"></script>
-  <script>
-  document.addEventListener('click', function(e) {{
-    var link = e.target.closest('a.btn-primary');
-    if (!link) return;
-    if (typeof gtag === 'function') {{
-      gtag('event', 'cta_click', {{
-        'event_category': 'affiliate',
-        'event_label': link.textContent.trim(),
-        'link_url': link.href || '',
-        'page_path': location.pathname
-      }});
-    }}
-  }});
-  </script>
+{tpl.site_footer(lang, p)}
+
+{tpl.page_scripts(lang, p)}
 </body>
 </html>'''
 
@@ -397,30 +290,23 @@ def main():
         print("No backbone translation files found.")
         return
 
-    # Load all translations for hreflang building
-    all_translations = {}
-    for lang in available_langs:
-        data = load_backbone_translations(lang)
-        if data:
-            all_translations[lang] = data
-
     count = 0
     for page_id in LEGACY_PAGES:
         if args.page and page_id != args.page:
             continue
 
-        # Build hreflang tags for this page
-        hreflang_tags = build_hreflang_tags(page_id, available_langs, all_translations)
+        # Shared hreflang block for every language of this page
+        hreflang_tags = hreflang.tags(f"legacy:{page_id}")
 
         for lang in available_langs:
             if args.lang and lang != args.lang:
                 continue
 
-            if page_id not in all_translations.get(lang, {}):
+            page_data = load_backbone_page(page_id, lang)
+            if page_data is None:
                 print(f"  SKIP {lang}/{page_id} (no translation)")
                 continue
 
-            page_data = all_translations[lang][page_id]
             slug = page_data["slug"]
             out_dir = BASE_DIR / lang / slug
             out_file = out_dir / "index.html"
@@ -35,6 +35,12 @@ import argparse
 sys.path.insert(0, str(pathlib.Path(__file__).parent))
 import _risk_disclaimer as rd
 
+# Shared nav/footer/consent/risk-warning partials, cached per (lang, prefix).
+import _templates as tpl
+import _hreflang as hreflang
+import _translation_store as ts
+import _related as related
+
 BASE_DIR = pathlib.Path(__file__).parent.parent
 
 # ── Asset prefix for translated pages (3 levels deep: /es/video/slug/) ────────
@@ -82,6 +88,10 @@ UI_STRINGS = {
         "footer_about": "Sobre nosotros",
         "footer_faq": "Preguntas frecuentes",
         "footer_contact": "Contacto",
+        "footer_privacy": "Política de privacidad",
+        "footer_cookies": "Gestionar cookies",
+        "search_placeholder": "Buscar vídeos y guías…",
+        "search_empty": "Sin resultados",
         "home": "Inicio",
         "faq_heading": "Preguntas frecuentes",
         "by_tom": "Por Tom",
@@ -125,6 +135,10 @@ UI_STRINGS = {
         "footer_about": "Über uns",
         "footer_faq": "FAQ",
         "footer_contact": "Kontakt",
+        "footer_privacy": "Datenschutz",
+        "footer_cookies": "Cookies verwalten",
+        "search_placeholder": "Videos und Ratgeber durchsuchen…",
+        "search_empty": "Keine Ergebnisse",
         "home": "Startseite",
         "faq_heading": "Häufig gestellte Fragen",
         "by_tom": "Von Tom",
@@ -168,6 +182,10 @@ UI_STRINGS = {
         "footer_about": "À propos",
         "footer_faq": "FAQ",
         "footer_contact": "Contact",
+        "footer_privacy": "Politique de confidentialité",
+        "footer_cookies": "Gérer les cookies",
+        "search_placeholder": "Rechercher des vidéos et des guides…",
+        "search_empty": "Aucun résultat",
         "home": "Accueil",
         "faq_heading": "Questions fréquentes",
         "by_tom": "Par Tom",
@@ -211,6 +229,10 @@ UI_STRINGS = {
         "footer_about": "Sobre",
         "footer_faq": "Perguntas frequentes",
         "footer_contact": "Contato",
+        "footer_privacy": "Política de Privacidade",
+        "footer_cookies": "Gerenciar cookies",
+        "search_placeholder": "Pesquisar vídeos e guias…",
+        "search_empty": "Nenhum resultado",
         "home": "Início",
         "faq_heading": "Perguntas frequentes",
         "by_tom": "Por Tom",
@@ -254,6 +276,10 @@ UI_STRINGS = {
         "footer_about": "عن الموقع",
         "footer_faq": "أسئلة شائعة",
         "footer_contact": "اتصل بنا",
+        "footer_privacy": "سياسة الخصوصية",
+        "footer_cookies": "إدارة ملفات تعريف الارتباط",
+        "search_placeholder": "ابحث في الفيديوهات والأدلة…",
+        "search_empty": "لا توجد نتائج",
         "home": "الرئيسية",
         "faq_heading": "أسئلة شائعة",
         "by_tom": "بقلم توم",
@@ -297,6 +323,10 @@ UI_STRINGS = {
         "footer_about": "เกี่ยวกับ",
         "footer_faq": "คำถามที่พบบ่อย",
         "footer_contact": "ติดต่อ",
+        "footer_privacy": "นโยบายความเป็นส่วนตัว",
+        "footer_cookies": "จัดการคุกกี้",
+        "search_placeholder": "ค้นหาวิดีโอและคู่มือ…",
+        "search_empty": "ไม่พบผลลัพธ์",
         "home": "หน้าแรก",
         "faq_heading": "คำถามที่พบบ่อย",
         "by_tom": "โดย Tom",
@@ -340,6 +370,10 @@ UI_STRINGS = {
         "footer_about": "Tentang",
         "footer_faq": "FAQ",
         "footer_contact": "Kontak",
+        "footer_privacy": "Kebijakan Privasi",
+        "footer_cookies": "Kelola cookie",
+        "search_placeholder": "Cari video dan panduan…",
+        "search_empty": "Tidak ada hasil",
         "home": "Beranda",
         "faq_heading": "Pertanyaan yang Sering Diajukan",
         "by_tom": "Oleh Tom",
@@ -383,6 +417,10 @@ UI_STRINGS = {
         "footer_about": "Tentang",
         "footer_faq": "Soalan Lazim",
         "footer_contact": "Hubungi",
+        "footer_privacy": "Dasar Privasi",
+        "footer_cookies": "Urus kuki",
+        "search_placeholder": "Cari video dan panduan…",
+        "search_empty": "Tiada hasil",
         "home": "Laman Utama",
         "faq_heading": "Soalan Lazim",
         "by_tom": "Oleh Tom",
@@ -426,6 +464,10 @@ UI_STRINGS = {
         "footer_about": "Giới thiệu",
         "footer_faq": "Câu hỏi thường gặp",
         "footer_contact": "Liên hệ",
+        "footer_privacy": "Chính sách bảo mật",
+        "footer_cookies": "Quản lý cookie",
+        "search_placeholder": "Tìm video và hướng dẫn…",
+        "search_empty": "Không có kết quả",
         "home": "Trang chủ",
         "faq_heading": "Câu hỏi thường gặp",
         "by_tom": "Bởi Tom",
@@ -469,6 +511,10 @@ UI_STRINGS = {
         "footer_about": "Om oss",
         "footer_faq": "Vanliga frågor",
         "footer_contact": "Kontakt",
+        "footer_privacy": "Integritetspolicy",
+        "footer_cookies": "Hantera cookies",
+        "search_placeholder": "Sök videor och guider…",
+        "search_empty": "Inga resultat",
         "home": "Hem",
         "faq_heading": "Vanliga frågor",
         "by_tom": "Av Tom",
@@ -512,6 +558,10 @@ UI_STRINGS = {
         "footer_about": "Om os",
         "footer_faq": "Ofte stillede spørgsmål",
         "footer_contact": "Kontakt",
+        "footer_privacy": "Privatlivspolitik",
+        "footer_cookies": "Administrer cookies",
+        "search_placeholder": "Søg i videoer og guides…",
+        "search_empty": "Ingen resultater",
         "home": "Hjem",
         "faq_heading": "Ofte stillede spørgsmål",
         "by_tom": "Af Tom",
@@ -555,6 +605,10 @@ UI_STRINGS = {
         "footer_about": "Σχετικά",
         "footer_faq": "Συχνές ερωτήσεις",
         "footer_contact": "Επικοινωνία",
+        "footer_privacy": "Πολιτική απορρήτου",
+        "footer_cookies": "Διαχείριση cookies",
+        "search_placeholder": "Αναζήτηση βίντεο και οδηγών…",
+        "search_empty": "Δεν βρέθηκαν αποτελέσματα",
         "home": "Αρχική",
         "faq_heading": "Συχνές ερωτήσεις",
         "by_tom": "Από τον Tom",
@@ -598,6 +652,10 @@ UI_STRINGS = {
         "footer_about": "O nás",
         "footer_faq": "Časté dotazy",
         "footer_contact": "Kontakt",
+        "footer_privacy": "Zásady ochrany osobních údajů",
+        "footer_cookies": "Spravovat cookies",
+        "search_placeholder": "Hledat videa a průvodce…",
+        "search_empty": "Žádné výsledky",
         "home": "Domů",
         "faq_heading": "Časté dotazy",
         "by_tom": "Od Toma",
@@ -641,6 +699,10 @@ UI_STRINGS = {
         "footer_about": "Chi siamo",
         "footer_faq": "Domande frequenti",
         "footer_contact": "Contatti",
+        "footer_privacy": "Informativa sulla privacy",
+        "footer_cookies": "Gestisci i cookie",
+        "search_placeholder": "Cerca video e guide…",
+        "search_empty": "Nessun risultato",
         "home": "Home",
         "faq_heading": "Domande frequenti",
         "by_tom": "Di Tom",
@@ -684,6 +746,10 @@ UI_STRINGS = {
         "footer_about": "Over ons",
         "footer_faq": "Veelgestelde vragen",
         "footer_contact": "Contact",
+        "footer_privacy": "Privacybeleid",
+        "footer_cookies": "Cookies beheren",
+        "search_placeholder": "Zoek video's en gidsen…",
+        "search_empty": "Geen resultaten",
         "home": "Home",
         "faq_heading": "Veelgestelde vragen",
         "by_tom": "Door Tom",
@@ -727,6 +793,10 @@ UI_STRINGS = {
         "footer_about": "O nas",
         "footer_faq": "FAQ",
         "footer_contact": "Kontakt",
+        "footer_privacy": "Polityka prywatności",
+        "footer_cookies": "Zarządzaj plikami cookie",
+        "search_placeholder": "Szukaj filmów i poradników…",
+        "search_empty": "Brak wyników",
         "home": "Strona główna",
         "faq_heading": "Najczęściej zadawane pytania",
         "by_tom": "Autor: Tom",
@@ -735,19 +805,17 @@ UI_STRINGS = {
     },
 }
 
-# ── Translation data directory ────────────────────────────────────────────────
-TRANSLATIONS_DIR = pathlib.Path(__file__).parent / "translations"
-
+# ── JSON translations (compiled into the translation store) ──────────────────
 def load_translations_from_json(video_id, translations_dict):
-    """Load any JSON translation files for a video and merge into translations_dict."""
-    if not TRANSLATIONS_DIR.exists():
-        return
-    for json_file in TRANSLATIONS_DIR.glob(f"{video_id}_*.json"):
-        lang = json_file.stem.split("_")[-1]  # e.g. "daMK1Y54M-E_de" → "de"
+    """Merge the compiled JSON translations for a video (daMK1Y54M-E_de.json
+    etc., via the translation store) into translations_dict. Inline
+    translations above take precedence."""
+    store = ts.store()
+    for lang in store.langs(f"video:{video_id}"):
         if lang not in translations_dict["translations"]:
-            with open(json_file, "r", encoding="utf-8") as f:
-                translations_dict["translations"][lang] = json.load(f)
-            print(f"  Loaded {lang} translation from {json_file.name}")
+            translations_dict["translations"][lang] = store.page(
+                f"video:{video_id}", lang, required=ts.VIDEO_FIELDS)
+            print(f"  Loaded {lang} translation from {video_id}_{lang}.json")
 
 
 # ── Translation data ──────────────────────────────────────────────────────────
@@ -918,21 +986,6 @@ def slugify(text):
     return s.strip('-')
 
 
-def build_hreflang_tags(video_id, translation_data):
-    """Build hreflang link tags for all language variants."""
-    en_slug = translation_data["en_slug"]
-    lines = []
-    # English (default + en)
-    en_url = f"{BASE_URL}/video/{en_slug}/"
-    lines.append(f'  <link rel="alternate" hreflang="en" href="{en_url}" />')
-    lines.append(f'  <link rel="alternate" hreflang="x-default" href="{en_url}" />')
-    # Each translation
-    for lang, t in sorted(translation_data["translations"].items()):
-        url = f"{BASE_URL}/{lang}/video/{t['slug']}/"
-        lines.append(f'  <link rel="alternate" hreflang="{lang}" href="{url}" />')
-    return "\n".join(lines)
-
-
 def build_toc(sections):
     """Build table of contents from H2 headings."""
     items = []
@@ -1005,7 +1058,7 @@ def generate_page(lang, video_id, translation_data, trans):
     en_slug = translation_data["en_slug"]
 
     canonical = f"{BASE_URL}/{lang}/video/{slug}/"
-    hreflang_tags = build_hreflang_tags(video_id, translation_data)
+    hreflang_tags = hreflang.tags(f"video:{video_id}")
     toc_items = build_toc(sections)
     article_body = render_article_body(sections)
     faq_html = render_faq_html(faqs)
@@ -1067,49 +1120,11 @@ def generate_page(lang, video_id, translation_data, trans):
   <script type="application/ld+json">
   {breadcrumb_schema}
   </script>
-  <!-- Google tag (gtag.js) -->
-  <script async src="https://www.googletagmanager.com/gtag/js?id=G-PBGDJ951LL"></script>
-  <script>
-    window.dataLayer = window.dataLayer || [];
-    function gtag(){{dataLayer.push(arguments);}}
-    gtag('js', new Date());
-    gtag('config', 'G-PBGDJ951LL');
-  </script>
+{tpl.analytics_head()}
 </head>
 <body>
 
-  <nav>
-    <div class="container nav-inner">
-      <a href="{p}index.html" class="nav-logo">Social<span>Trading</span>Vlog</a>
-      <ul class="nav-links">
-        <li><a href="{p}social-trading.html">{html.escape(ui["social_trading"])}</a></li>
-        <li><a href="{p}copy-trading.html">{html.escape(ui["copy_trading"])}</a></li>
-        <li><a href="{p}updates.html">{html.escape(ui["updates"])}</a></li>
-        <li><a href="{p}videos.html">{html.escape(ui["videos"])}</a></li>
-        <li><a href="{p}about.html">{html.escape(ui["about"])}</a></li>
-        <li><a href="{p}faq.html">{html.escape(ui["faq"])}</a></li>
-        <li><a href="#etoro-cta" class="nav-cta">{html.escape(ui["try_etoro"])}</a></li>
-      </ul>
-      <button class="nav-hamburger" id="nav-hamburger" aria-label="Open navigation" aria-expanded="false" aria-controls="nav-drawer">
-        <span></span><span></span><span></span>
-      </button>
-    </div>
-  </nav>
-  <div class="nav-drawer" id="nav-drawer" role="navigation" aria-label="Mobile navigation">
-    <ul>
-      <li><a href="{p}social-trading.html">{html.escape(ui["social_trading"])}</a></li>
-      <li><a href="{p}copy-trading.html">{html.escape(ui["copy_trading"])}</a></li>
-      <li><a href="{p}updates.html">{html.escape(ui["updates"])}</a></li>
-      <li><a href="{p}videos.html">{html.escape(ui["videos"])}</a></li>
-      <li><a href="{p}about.html">{html.escape(ui["about"])}</a></li>
-      <li><a href="{p}faq.html">{html.escape(ui["faq"])}</a></li>
-      <li><a href="#etoro-cta" class="nav-cta">{html.escape(ui["try_etoro"])}</a></li>
-    </ul>
-  </div>
-
-  <div class="risk-warning-banner">
-    <span>{html.escape(ui["risk_warning_label"])}:</span> {ui["risk_warning_banner"].split(": ", 1)[-1] if ": " in ui["risk_warning_banner"] else ui["risk_warning_banner"]}
-  </div>
+{tpl.site_header(lang, p)}
 
   <div class="article-hero">
     <div class="container">
@@ -1152,10 +1167,7 @@ def generate_page(lang, video_id, translation_data, trans):
           <a href="https://www.youtube.com/watch?v={video_id}" target="_blank" rel="noopener">{html.escape(ui["watch_on_youtube"])}</a>
         </p>
 
-        <div class="risk-warning">
-          <strong>{html.escape(ui["risk_warning_label"])}</strong>
-          {html.escape(ui["risk_warning_full"])}
-        </div>
+{tpl.risk_warning_box(lang)}
 
         <div class="inline-cta">
           <p class="inline-cta-text">{html.escape(ui["ready_cta_inline"])}</p>
@@ -1169,10 +1181,7 @@ def generate_page(lang, video_id, translation_data, trans):
 {faq_html.replace('<section class="faq-section">', '').replace('</section>', '')}
 </section>
 
-        <div class="risk-warning">
-          <strong>{html.escape(ui["important_reminder"])}</strong>
-          {html.escape(ui["important_reminder_text"])}
-        </div>
+{tpl.important_reminder_box(lang)}
 
       </article>
 
@@ -1181,12 +1190,9 @@ def generate_page(lang, video_id, translation_data, trans):
           <h3>{html.escape(ui["ready_to_try"])}</h3>
           <p>{html.escape(ui["toms_affiliate"])}</p>
           <a href="{cta_url}" class="btn btn-primary" target="_blank" rel="noopener sponsored">{html.escape(ui["explore_etoro"])}</a>
-          <div class="risk-warning">
-            <strong>{ui["risk_warning_sidebar"].split('.')[0]}.</strong>
-            {'.'.join(ui["risk_warning_sidebar"].split('.')[1:])}
-          </div>
+{tpl.sidebar_risk_warning(lang)}
         </div>
-        <div class="sidebar-nav">
+{related.sidebar_block(f"{lang}/video/{slug}/", lang, p)}        <div class="sidebar-nav">
           <h4>{html.escape(ui["more_guides"])}</h4>
           <ul>
             <li><a href="{p}social-trading.html">{html.escape(ui["guide_social"])}</a></li>
@@ -1203,55 +1209,9 @@ def generate_page(lang, video_id, translation_data, trans):
     </div>
   </div>
 
-  <footer>
-    <div class="container">
-      <div class="footer-inner">
-        <div class="footer-brand">
-          <div class="nav-logo">Social<span style="color:var(--accent)">Trading</span>Vlog</div>
-          <p>{html.escape(ui["footer_brand"])}</p>
-        </div>
-        <div class="footer-col">
-          <h4>{html.escape(ui["footer_guides"])}</h4>
-          <ul>
-            <li><a href="{p}social-trading.html">{html.escape(ui["guide_social"])}</a></li>
-            <li><a href="{p}copy-trading.html">{html.escape(ui["guide_copy"])}</a></li>
-            <li><a href="{p}etoro-scam.html">{html.escape(ui["guide_scam"])}</a></li>
-            <li><a href="{p}copy-trading-returns.html">{html.escape(ui["guide_returns"])}</a></li>
-          </ul>
-        </div>
-        <div class="footer-col">
-          <h4>{html.escape(ui["footer_site"])}</h4>
-          <ul>
-            <li><a href="{p}updates.html">{html.escape(ui["footer_updates"])}</a></li>
-            <li><a href="{p}about.html">{html.escape(ui["footer_about"])}</a></li>
-            <li><a href="{p}faq.html">{html.escape(ui["footer_faq"])}</a></li>
-            <li><a href="{p}contact.html">{html.escape(ui["footer_contact"])}</a></li>
-          </ul>
-        </div>
-      </div>
-      <div class="footer-bottom">
-        <p>&copy; 2026 SocialTradingVlog.com</p>
-        <p class="footer-disclaimer">{html.escape(ui["risk_warning_footer"])}</p>
-      </div>
-    </div>
-  </footer>
+{tpl.site_footer(lang, p)}
 
-  <script src="{p}js/lightbox.js"></script>
-  <script src="{p}js/nav.js"></script>
-  <script>
-  document.addEventListener('click', function(e) {{
-    var link = e.target.closest('a.btn-primary');
-    if (!link) return;
-    if (typeof gtag === 'function') {{
-      gtag('event', 'cta_click', {{
-        'event_category': 'affiliate',
-        'event_label': link.textContent.trim(),
-        'link_url': link.href || '',
-        'page_path': location.pathname
-      }});
-    }}
-  }});
-  </script>
+{tpl.page_scripts(lang, p)}
 </body>
 </html>'''
 
@@ -1290,6 +1250,7 @@ def main():
             # them. Editorial "76%" prose is preserved. See _risk_disclaimer.py.
             page_html = rd.normalize_html(page_html)
             out_file.write_text(page_html, encoding="utf-8")
+            rd.record_page(out_file, page_html)
             count += 1
             print(f"  WROTE {lang}/video/{slug}/index.html")
 
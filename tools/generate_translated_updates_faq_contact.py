@@ -22,42 +22,48 @@ import argparse
 
 BASE_DIR = pathlib.Path(__file__).parent.parent
 BASE_URL = "https://socialtradingvlog.com"
-TRANSLATIONS_DIR = pathlib.Path(__file__).parent / "translations"
 CTA_URL = "https://etoro.tw/4tEsDF4"
 
 # Import UI_STRINGS from the video page generator
 sys.path.insert(0, str(pathlib.Path(__file__).parent))
 from generate_translated_pages import UI_STRINGS
+import _templates as tpl
+import _hreflang as hreflang
+import _translation_store as ts
+import _related as related
 
-# Load the English update posts content for reference (video embeds, images, sidebar links)
-ENGLISH_CONTENT_FILE = TRANSLATIONS_DIR / "update_posts_content.json"
 
 
-def load_translations(lang):
-    """Load the combined translation file for a language."""
-    json_file = TRANSLATIONS_DIR / f"updates_faq_contact_{lang}.json"
-    if not json_file.exists():
-        return None
-    with open(json_file, "r", encoding="utf-8") as f:
-        return json.load(f)
+def load_updates(lang):
+    """{page_id: update} for every update post translated into `lang`
+    (updates_faq_contact_<lang>.json, via the translation store)."""
+    store = ts.store()
+    return {pid.split(":", 1)[1]: store.page(pid, lang, required=ts.UPDATE_FIELDS)
+            for pid in store.page_ids("update", lang)}
 
 
-def load_english_content():
-    """Load the extracted English update post content."""
-    if not ENGLISH_CONTENT_FILE.exists():
+def load_page(page_type, lang):
+    """The translated FAQ or contact page for `lang`, or {} if there is none."""
+    store = ts.store()
+    if not store.has(page_type, lang):
         return {}
-    with open(ENGLISH_CONTENT_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return store.page(page_type, lang, required=ts.PAGE_FIELDS)
+
+
+def load_english_post(page_id):
+    """The extracted English update post (video embeds, images, sidebar
+    links) from update_posts_content.json, or {} if there is none."""
+    store = ts.store()
+    if not store.has(f"update:{page_id}", "en"):
+        return {}
+    return store.page(f"update:{page_id}", "en")
 
 
 def get_available_languages():
     """Find all languages with translations."""
-    langs = []
-    if TRANSLATIONS_DIR.exists():
-        for json_file in TRANSLATIONS_DIR.glob("updates_faq_contact_*.json"):
-            lang = json_file.stem.replace("updates_faq_contact_", "")
-            langs.append(lang)
-    return sorted(langs)
+    store = ts.store()
+    return sorted(set(store.languages("update"))
+                  | set(store.languages("faq")) | set(store.languages("contact")))
 
 
 def render_content_block(block, asset_prefix):
@@ -101,39 +107,6 @@ def render_content_block(block, asset_prefix):
         return f'        <!-- unknown block type: {t} -->'
 
 
-def build_update_hreflang(page_id, available_langs, all_translations, english_content):
-    """Build hreflang tags for an update post."""
-    en_filename = english_content.get(page_id, {}).get("filename", f"{page_id}.html")
-    en_url = f"{BASE_URL}/updates/{en_filename}"
-    lines = []
-    lines.append(f'  <link rel="alternate" hreflang="en" href="{en_url}" />')
-    lines.append(f'  <link rel="alternate" hreflang="x-default" href="{en_url}" />')
-    for lang in available_langs:
-        trans = all_translations.get(lang, {})
-        updates = trans.get("updates", {})
-        if page_id in updates:
-            slug = updates[page_id]["slug"]
-            url = f"{BASE_URL}/{lang}/updates/{slug}/"
-            lines.append(f'  <link rel="alternate" hreflang="{lang}" href="{url}" />')
-    return "\n".join(lines)
-
-
-def build_page_hreflang(page_type, available_langs, all_translations, en_filename):
-    """Build hreflang tags for FAQ or contact page."""
-    en_url = f"{BASE_URL}/{en_filename}"
-    lines = []
-    lines.append(f'  <link rel="alternate" hreflang="en" href="{en_url}" />')
-    lines.append(f'  <link rel="alternate" hreflang="x-default" href="{en_url}" />')
-    for lang in available_langs:
-        trans = all_translations.get(lang, {})
-        page = trans.get(page_type, {})
-        if "slug" in page:
-            slug = page["slug"]
-            url = f"{BASE_URL}/{lang}/{slug}/"
-            lines.append(f'  <link rel="alternate" hreflang="{lang}" href="{url}" />')
-    return "\n".join(lines)
-
-
 def generate_update_page(lang, page_id, update_data, english_post, hreflang_tags):
     """Generate a translated update post page."""
     ui = UI_STRINGS[lang]
@@ -176,49 +149,11 @@ def generate_update_page(lang, page_id, update_data, english_post, hreflang_tags
 {hreflang_tags}
   <title>{html.escape(title)}</title>
   <link rel="stylesheet" href="{p}css/style.css" />
-  <!-- Google tag (gtag.js) -->
-  <script async src="https://www.googletagmanager.com/gtag/js?id=G-PBGDJ951LL"></script>
-  <script>
-    window.dataLayer = window.dataLayer || [];
-    function gtag(){{dataLayer.push(arguments);}}
-    gtag('js', new Date());
-    gtag('config', 'G-PBGDJ951LL');
-  </script>
+{tpl.analytics_head()}
 </head>
 <body>
 
-  <nav>
-    <div class="container nav-inner">
-      <a href="{p}index.html" class="nav-logo">Social<span>Trading</span>Vlog</a>
-      <ul class="nav-links">
-        <li><a href="{p}social-trading.html">{html.escape(ui["social_trading"])}</a></li>
-        <li><a href="{p}copy-trading.html">{html.escape(ui["copy_trading"])}</a></li>
-        <li><a href="{p}updates.html">{html.escape(ui["updates"])}</a></li>
-        <li><a href="{p}videos.html">{html.escape(ui["videos"])}</a></li>
-        <li><a href="{p}about.html">{html.escape(ui["about"])}</a></li>
-        <li><a href="{p}faq.html">{html.escape(ui["faq"])}</a></li>
-        <li><a href="#etoro-cta" class="nav-cta">{html.escape(ui["try_etoro"])}</a></li>
-      </ul>
-      <button class="nav-hamburger" id="nav-hamburger" aria-label="Open navigation" aria-expanded="false" aria-controls="nav-drawer">
-        <span></span><span></span><span></span>
-      </button>
-    </div>
-  </nav>
-  <div class="nav-drawer" id="nav-drawer" role="navigation" aria-label="Mobile navigation">
-    <ul>
-      <li><a href="{p}social-trading.html">{html.escape(ui["social_trading"])}</a></li>
-      <li><a href="{p}copy-trading.html">{html.escape(ui["copy_trading"])}</a></li>
-      <li><a href="{p}updates.html">{html.escape(ui["updates"])}</a></li>
-      <li><a href="{p}videos.html">{html.escape(ui["videos"])}</a></li>
-      <li><a href="{p}about.html">{html.escape(ui["about"])}</a></li>
-      <li><a href="{p}faq.html">{html.escape(ui["faq"])}</a></li>
-      <li><a href="#etoro-cta" class="nav-cta">{html.escape(ui["try_etoro"])}</a></li>
-    </ul>
-  </div>
-
-  <div class="risk-warning-banner">
-    <span>{html.escape(ui["risk_warning_label"])}:</span> {ui["risk_warning_banner"].split(": ", 1)[-1] if ": " in ui["risk_warning_banner"] else ui["risk_warning_banner"]}
-  </div>
+{tpl.site_header(lang, p)}
 
   <div class="article-hero">
     <div class="container">
@@ -232,10 +167,7 @@ def generate_update_page(lang, page_id, update_data, english_post, hreflang_tags
     <div class="article-body">
       <article class="article-content">
 
-        <div class="risk-warning">
-          <strong>{html.escape(ui["risk_warning_label"])}</strong>
-          {ui["risk_warning_full"]}
-        </div>
+{tpl.risk_warning_box(lang)}
         <div class="video-embed">
           <iframe src="{video_src}" title="{html.escape(video_title)}" allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture" allowfullscreen loading="lazy"></iframe>
         </div>
@@ -251,12 +183,9 @@ def generate_update_page(lang, page_id, update_data, english_post, hreflang_tags
           <h3>{html.escape(ui["ready_to_try"])}</h3>
           <p>{html.escape(ui["toms_affiliate"])}</p>
           <a href="{CTA_URL}" class="btn btn-primary" target="_blank" rel="noopener sponsored">{html.escape(ui["explore_etoro"])}</a>
-          <div class="risk-warning">
-            <strong>{ui["risk_warning_sidebar"].split(".")[0]}.</strong>
-            {".".join(ui["risk_warning_sidebar"].split(".")[1:])}
-          </div>
+{tpl.sidebar_risk_warning(lang)}
         </div>
-        <div class="sidebar-nav">
+{related.sidebar_block(f"{lang}/updates/{slug}/", lang, p)}        <div class="sidebar-nav">
           <h4>{html.escape(ui.get("more_updates", "More updates"))}</h4>
           <ul>
 {sidebar_items}            <li><a href="{p}updates.html">{html.escape(back_text)} &rarr;</a></li>
@@ -266,55 +195,9 @@ def generate_update_page(lang, page_id, update_data, english_post, hreflang_tags
     </div>
   </div>
 
-  <footer>
-    <div class="container">
-      <div class="footer-inner">
-        <div class="footer-brand">
-          <div class="nav-logo">Social<span style="color:var(--accent)">Trading</span>Vlog</div>
-          <p>{html.escape(ui["footer_brand"])}</p>
-        </div>
-        <div class="footer-col">
-          <h4>{html.escape(ui["footer_guides"])}</h4>
-          <ul>
-            <li><a href="{p}copy-trading.html">{html.escape(ui["guide_copy"])}</a></li>
-            <li><a href="{p}etoro-scam.html">{html.escape(ui["guide_scam"])}</a></li>
-            <li><a href="{p}copy-trading-returns.html">{html.escape(ui["guide_returns"])}</a></li>
-          </ul>
-        </div>
-        <div class="footer-col">
-          <h4>{html.escape(ui["footer_site"])}</h4>
-          <ul>
-            <li><a href="{p}updates.html">{html.escape(ui["footer_updates"])}</a></li>
-            <li><a href="{p}about.html">{html.escape(ui["footer_about"])}</a></li>
-            <li><a href="{p}faq.html">{html.escape(ui["footer_faq"])}</a></li>
-            <li><a href="{p}contact.html">{html.escape(ui["footer_contact"])}</a></li>
-          </ul>
-        </div>
-      </div>
-      <div class="footer-bottom">
-        <p>&copy; 2026 SocialTradingVlog.com</p>
-        <p class="footer-disclaimer">{html.escape(ui["risk_warning_footer"])}</p>
-      </div>
-    </div>
-  </footer>
-
-  <script src="{p}js/lightbox.js"></script>
-  <script src="{p}js/nav.js"></script>
-  <script src="{p}js/lang-switcher.js"></script>
-  <script>
-  document.addEventListener('click', function(e) {{
-    var link = e.target.closest('a.btn-primary');
-    if (!link) return;
-    if (typeof gtag === 'function') {{
-      gtag('event', 'cta_click', {{
-        'event_category': 'affiliate',
-        'event_label': link.textContent.trim(),
-        'link_url': link.href || '',
-        'page_path': location.pathname
-      }});
-    }}
-  }});
-  </script>
+{tpl.site_footer(lang, p)}
+
+{tpl.page_scripts(lang, p)}
 </body>
 </html>'''
 
@@ -387,49 +270,11 @@ def generate_faq_page(lang, faq_data, hreflang_tags):
   <script type="application/ld+json">
   {faq_schema}
   </script>
-  <!-- Google tag (gtag.js) -->
-  <script async src="https://www.googletagmanager.com/gtag/js?id=G-PBGDJ951LL"></script>
-  <script>
-    window.dataLayer = window.dataLayer || [];
-    function gtag(){{dataLayer.push(arguments);}}
-    gtag('js', new Date());
-    gtag('config', 'G-PBGDJ951LL');
-  </script>
+{tpl.analytics_head()}
 </head>
 <body>
 
-  <nav>
-    <div class="container nav-inner">
-      <a href="{p}index.html" class="nav-logo">Social<span>Trading</span>Vlog</a>
-      <ul class="nav-links">
-        <li><a href="{p}social-trading.html">{html.escape(ui["social_trading"])}</a></li>
-        <li><a href="{p}copy-trading.html">{html.escape(ui["copy_trading"])}</a></li>
-        <li><a href="{p}updates.html">{html.escape(ui["updates"])}</a></li>
-        <li><a href="{p}videos.html">{html.escape(ui["videos"])}</a></li>
-        <li><a href="{p}about.html">{html.escape(ui["about"])}</a></li>
-        <li><a href="{p}faq.html">{html.escape(ui["faq"])}</a></li>
-        <li><a href="#etoro-cta" class="nav-cta">{html.escape(ui["try_etoro"])}</a></li>
-      </ul>
-      <button class="nav-hamburger" id="nav-hamburger" aria-label="Open navigation" aria-expanded="false" aria-controls="nav-drawer">
-        <span></span><span></span><span></span>
-      </button>
-    </div>
-  </nav>
-  <div class="nav-drawer" id="nav-drawer" role="navigation" aria-label="Mobile navigation">
-    <ul>
-      <li><a href="{p}social-trading.html">{html.escape(ui["social_trading"])}</a></li>
-      <li><a href="{p}copy-trading.html">{html.escape(ui["copy_trading"])}</a></li>
-      <li><a href="{p}updates.html">{html.escape(ui["updates"])}</a></li>
-      <li><a href="{p}videos.html">{html.escape(ui["videos"])}</a></li>
-      <li><a href="{p}about.html">{html.escape(ui["about"])}</a></li>
-      <li><a href="{p}faq.html">{html.escape(ui["faq"])}</a></li>
-      <li><a href="#etoro-cta" class="nav-cta">{html.escape(ui["try_etoro"])}</a></li>
-    </ul>
-  </div>
-
-  <div class="risk-warning-banner">
-    <span>{html.escape(ui["risk_warning_label"])}:</span> {ui["risk_warning_banner"].split(": ", 1)[-1] if ": " in ui["risk_warning_banner"] else ui["risk_warning_banner"]}
-  </div>
+{tpl.site_header(lang, p)}
 
   <div class="article-hero">
     <div class="container">
@@ -444,10 +289,7 @@ def generate_faq_page(lang, faq_data, hreflang_tags):
 
       <article class="article-content">
 
-        <div class="risk-warning">
-          <strong>{html.escape(ui["risk_warning_label"])}</strong>
-          {ui["risk_warning_full"]}
-        </div>
+{tpl.risk_warning_box(lang)}
 {qa_html}
         <div class="risk-warning">
           <strong>{html.escape(ui.get("important_reminder", "Important Reminder"))}</strong>
@@ -461,10 +303,7 @@ def generate_faq_page(lang, faq_data, hreflang_tags):
           <h3>{html.escape(sidebar_h3)}</h3>
           <p>{html.escape(sidebar_p)}</p>
           <a href="{CTA_URL}" class="btn btn-primary" target="_blank" rel="noopener sponsored">{html.escape(ui["explore_etoro"])}</a>
-          <div class="risk-warning">
-            <strong>{ui["risk_warning_sidebar"].split(".")[0]}.</strong>
-            {".".join(ui["risk_warning_sidebar"].split(".")[1:])}
-          </div>
+{tpl.sidebar_risk_warning(lang)}
         </div>
         <div class="sidebar-nav">
           <h4>{html.escape(sidebar_nav_h4)}</h4>
@@ -477,56 +316,9 @@ def generate_faq_page(lang, faq_data, hreflang_tags):
     </div>
   </div>
 
-  <footer>
-    <div class="container">
-      <div class="footer-inner">
-        <div class="footer-brand">
-          <div class="nav-logo">Social<span style="color:var(--accent)">Trading</span>Vlog</div>
-          <p>{html.escape(ui["footer_brand"])}</p>
-        </div>
-        <div class="footer-col">
-          <h4>{html.escape(ui["footer_guides"])}</h4>
-          <ul>
-            <li><a href="{p}social-trading.html">{html.escape(ui["guide_social"])}</a></li>
-            <li><a href="{p}copy-trading.html">{html.escape(ui["guide_copy"])}</a></li>
-            <li><a href="{p}etoro-scam.html">{html.escape(ui["guide_scam"])}</a></li>
-            <li><a href="{p}copy-trading-returns.html">{html.escape(ui["guide_returns"])}</a></li>
-          </ul>
-        </div>
-        <div class="footer-col">
-          <h4>{html.escape(ui["footer_site"])}</h4>
-          <ul>
-            <li><a href="{p}updates.html">{html.escape(ui["footer_updates"])}</a></li>
-            <li><a href="{p}about.html">{html.escape(ui["footer_about"])}</a></li>
-            <li><a href="{p}faq.html">{html.escape(ui["footer_faq"])}</a></li>
-            <li><a href="{p}contact.html">{html.escape(ui["footer_contact"])}</a></li>
-          </ul>
-        </div>
-      </div>
-      <div class="footer-bottom">
-        <p>&copy; 2026 SocialTradingVlog.com</p>
-        <p class="footer-disclaimer">{html.escape(ui["risk_warning_footer"])}</p>
-      </div>
-    </div>
-  </footer>
-
-  <script src="{p}js/lightbox.js"></script>
-  <script src="{p}js/nav.js"></script>
-  <script src="{p}js/lang-switcher.js"></script>
-  <script>
-  document.addEventListener('click', function(e) {{
-    var link = e.target.closest('a.btn-primary');
-    if (!link) return;
-    if (typeof gtag === 'function') {{
-      gtag('event', 'cta_click', {{
-        'event_category': 'affiliate',
-        'event_label': link.textContent.trim(),
-        'link_url': link.href || '',
-        'page_path': location.pathname
-      }});
-    }}
-  }});
-  </script>
+{tpl.site_footer(lang, p)}
+
+{tpl.page_scripts(lang, p)}
 </body>
 </html>'''
 
@@ -592,49 +384,11 @@ def generate_contact_page(lang, contact_data, hreflang_tags):
     }}
     .form-group textarea {{ min-height: 140px; resize: vertical; }}
   </style>
-  <!-- Google tag (gtag.js) -->
-  <script async src="https://www.googletagmanager.com/gtag/js?id=G-PBGDJ951LL"></script>
-  <script>
-    window.dataLayer = window.dataLayer || [];
-    function gtag(){{dataLayer.push(arguments);}}
-    gtag('js', new Date());
-    gtag('config', 'G-PBGDJ951LL');
-  </script>
+{tpl.analytics_head()}
 </head>
 <body>
 
-  <nav>
-    <div class="container nav-inner">
-      <a href="{p}index.html" class="nav-logo">Social<span>Trading</span>Vlog</a>
-      <ul class="nav-links">
-        <li><a href="{p}social-trading.html">{html.escape(ui["social_trading"])}</a></li>
-        <li><a href="{p}copy-trading.html">{html.escape(ui["copy_trading"])}</a></li>
-        <li><a href="{p}updates.html">{html.escape(ui["updates"])}</a></li>
-        <li><a href="{p}videos.html">{html.escape(ui["videos"])}</a></li>
-        <li><a href="{p}about.html">{html.escape(ui["about"])}</a></li>
-        <li><a href="{p}faq.html">{html.escape(ui["faq"])}</a></li>
-        <li><a href="#etoro-cta" class="nav-cta">{html.escape(ui["try_etoro"])}</a></li>
-      </ul>
-      <button class="nav-hamburger" id="nav-hamburger" aria-label="Open navigation" aria-expanded="false" aria-controls="nav-drawer">
-        <span></span><span></span><span></span>
-      </button>
-    </div>
-  </nav>
-  <div class="nav-drawer" id="nav-drawer" role="navigation" aria-label="Mobile navigation">
-    <ul>
-      <li><a href="{p}social-trading.html">{html.escape(ui["social_trading"])}</a></li>
-      <li><a href="{p}copy-trading.html">{html.escape(ui["copy_trading"])}</a></li>
-      <li><a href="{p}updates.html">{html.escape(ui["updates"])}</a></li>
-      <li><a href="{p}videos.html">{html.escape(ui["videos"])}</a></li>
-      <li><a href="{p}about.html">{html.escape(ui["about"])}</a></li>
-      <li><a href="{p}faq.html">{html.escape(ui["faq"])}</a></li>
-      <li><a href="#etoro-cta" class="nav-cta">{html.escape(ui["try_etoro"])}</a></li>
-    </ul>
-  </div>
-
-  <div class="risk-warning-banner">
-    <span>{html.escape(ui["risk_warning_label"])}:</span> {ui["risk_warning_banner"].split(": ", 1)[-1] if ": " in ui["risk_warning_banner"] else ui["risk_warning_banner"]}
-  </div>
+{tpl.site_header(lang, p)}
 
   <div class="article-hero">
     <div class="container">
@@ -673,56 +427,9 @@ def generate_contact_page(lang, contact_data, hreflang_tags):
     </div>
   </section>
 
-  <footer>
-    <div class="container">
-      <div class="footer-inner">
-        <div class="footer-brand">
-          <div class="nav-logo">Social<span style="color:var(--accent)">Trading</span>Vlog</div>
-          <p>{html.escape(ui["footer_brand"])}</p>
-        </div>
-        <div class="footer-col">
-          <h4>{html.escape(ui["footer_guides"])}</h4>
-          <ul>
-            <li><a href="{p}social-trading.html">{html.escape(ui["guide_social"])}</a></li>
-            <li><a href="{p}copy-trading.html">{html.escape(ui["guide_copy"])}</a></li>
-            <li><a href="{p}etoro-scam.html">{html.escape(ui["guide_scam"])}</a></li>
-            <li><a href="{p}copy-trading-returns.html">{html.escape(ui["guide_returns"])}</a></li>
-          </ul>
-        </div>
-        <div class="footer-col">
-          <h4>{html.escape(ui["footer_site"])}</h4>
-          <ul>
-            <li><a href="{p}updates.html">{html.escape(ui["footer_updates"])}</a></li>
-            <li><a href="{p}about.html">{html.escape(ui["footer_about"])}</a></li>
-            <li><a href="{p}faq.html">{html.escape(ui["footer_faq"])}</a></li>
-            <li><a href="{p}contact.html">{html.escape(ui["footer_contact"])}</a></li>
-          </ul>
-        </div>
-      </div>
-      <div class="footer-bottom">
-        <p>&copy; 2026 SocialTradingVlog.com</p>
-        <p class="footer-disclaimer">{html.escape(ui["risk_warning_footer"])}</p>
-      </div>
-    </div>
-  </footer>
-
-  <script src="{p}js/lightbox.js"></script>
-  <script src="{p}js/nav.js"></script>
-  <script src="{p}js/lang-switcher.js"></script>
-  <script>
-  document.addEventListener('click', function(e) {{
-    var link = e.target.closest('a.btn-primary');
-    if (!link) return;
-    if (typeof gtag === 'function') {{
-      gtag('event', 'cta_click', {{
-        'event_category': 'affiliate',
-        'event_label': link.textContent.trim(),
-        'link_url': link.href || '',
-        'page_path': location.pathname
-      }});
-    }}
-  }});
-  </script>
+{tpl.site_footer(lang, p)}
+
+{tpl.page_scripts(lang, p)}
 </body>
 </html>'''
 
@@ -739,31 +446,21 @@ def main():
         print("No translation files found (updates_faq_contact_*.json)")
         return
 
-    # Load all translations for hreflang building
-    all_translations = {}
-    for lang in available_langs:
-        data = load_translations(lang)
-        if data:
-            all_translations[lang] = data
-
-    english_content = load_english_content()
-
+    # Pages are fetched one at a time from the translation store; sibling
+    # URLs come from the shared hreflang graph.
     count = 0
 
     for lang in available_langs:
         if args.lang and lang != args.lang:
             continue
 
-        trans = all_translations.get(lang, {})
-
         # Generate update posts
         if not args.type or args.type == "updates":
-            updates = trans.get("updates", {})
-            for page_id, update_data in updates.items():
-                slug = update_data.get("slug", page_id)
-                en_post = english_content.get(page_id, {})
+            for page_id, update_data in load_updates(lang).items():
+                slug = update_data["slug"]
+                en_post = load_english_post(page_id)
 
-                hreflang = build_update_hreflang(page_id, available_langs, all_translations, english_content)
+                hreflang_tags = hreflang.tags(f"update:{page_id}")
 
                 out_dir = BASE_DIR / lang / "updates" / slug
                 out_file = out_dir / "index.html"
@@ -773,17 +470,17 @@ def main():
                     continue
 
                 out_dir.mkdir(parents=True, exist_ok=True)
-                page_html = generate_update_page(lang, page_id, update_data, en_post, hreflang)
+                page_html = generate_update_page(lang, page_id, update_data, en_post, hreflang_tags)
                 out_file.write_text(page_html, encoding="utf-8")
                 count += 1
                 print(f"  WROTE {lang}/updates/{slug}/index.html")
 
         # Generate FAQ page
         if not args.type or args.type == "faq":
-            faq_data = trans.get("faq", {})
+            faq_data = load_page("faq", lang)
             if faq_data and "slug" in faq_data:
                 slug = faq_data["slug"]
-                hreflang = build_page_hreflang("faq", available_langs, all_translations, "faq.html")
+                hreflang_tags = hreflang.tags("faq")
                 out_dir = BASE_DIR / lang / slug
                 out_file = out_dir / "index.html"
 
@@ -791,17 +488,17 @@ def main():
                     print(f"  SKIP {lang}/{slug}/ (exists)")
                 else:
                     out_dir.mkdir(parents=True, exist_ok=True)
-                    page_html = generate_faq_page(lang, faq_data, hreflang)
+                    page_html = generate_faq_page(lang, faq_data, hreflang_tags)
                     out_file.write_text(page_html, encoding="utf-8")
                     count += 1
                     print(f"  WROTE {lang}/{slug}/index.html")
 
         # Generate contact page
         if not args.type or args.type == "contact":
-            contact_data = trans.get("contact", {})
+            contact_data = load_page("contact", lang)
             if contact_data and "slug" in contact_data:
                 slug = contact_data["slug"]
-                hreflang = build_page_hreflang("contact", available_langs, all_translations, "contact.html")
+                hreflang_tags = hreflang.tags("contact")
                 out_dir = BASE_DIR / lang / slug
                 out_file = out_dir / "index.html"
 
@@ -809,7 +506,7 @@ def main():
                     print(f"  SKIP {lang}/{slug}/ (exists)")
                 else:
                     out_dir.mkdir(parents=True, exist_ok=True)
-                    page_html = generate_contact_page(lang, contact_data, hreflang)
+                    page_html = generate_contact_page(lang, contact_data, hreflang_tags)
                     out_file.write_text(page_html, encoding="utf-8")
                     count += 1
                     print(f"  WROTE {lang}/{slug}/index.html")
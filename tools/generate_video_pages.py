@@ -48,27 +48,39 @@ import argparse
 sys.path.insert(0, str(pathlib.Path(__file__).parent))
 import _risk_disclaimer as rd
 
+# Shared nav/footer/consent/risk-warning partials, cached per (lang, prefix).
+import _templates as tpl
+from _internal_links import link_injector
+import _related as related
+
 BASE_DIR = pathlib.Path(__file__).parent.parent
 TRANS_DIR = BASE_DIR / "transcriptions"
 VIDEO_DIR = BASE_DIR / "video"
 
+# ── Sidebar "More guides" (root-relative; the Related block skips these) ─────
+MORE_GUIDES = (
+    "social-trading.html", "copy-trading.html", "copy-trading-returns.html",
+    "etoro-scam.html", "taking-profits.html", "popular-investor.html", "videos.html",
+)
+
 # ── Internal link targets (applied once per page in transcript) ───────────────
-# Pattern → relative URL from /video/SLUG/
+# Pattern → site-root-relative URL. Compiled once into a single-pass injector
+# (see _internal_links.py); the ../../ prefix is added at injection time.
 INTERNAL_LINKS = [
-    (r'\bcopy trading\b',               '../../copy-trading.html'),
-    (r'\bsocial trading\b',             '../../social-trading.html'),
-    (r'\bpopular investor\b',           '../../popular-investor.html'),
-    (r'\bspread fee[s]?\b',             '../../video/etoro-spread-fees-explained/'),
-    (r'\bovernight fee[s]?\b',          '../../video/etoro-rollover-overnight-fees/'),
-    (r'\brollover fee[s]?\b',           '../../video/etoro-rollover-overnight-fees/'),
-    (r'\bwithdrawal fee[s]?\b',         '../../video/etoro-withdrawal-fees/'),
-    (r'\bnegative balance protection\b','../../video/etoro-negative-balance-protection-most-you-can-lose/'),
-    (r'\bcopy open trades\b',           '../../video/should-i-copy-open-trades-etoro/'),
-    (r'\bstop loss\b',                  '../../video/etoro-copy-trading-stop-loss-risk/'),
-    (r'\btake profit\b',                '../../video/etoro-take-profit-can-i-change-it/'),
-    (r'\bdrawdown[s]?\b',               '../../video/etoro-drawdowns-copy-trading-risk/'),
-    (r'\bleverage trading\b',           '../../video/etoro-leverage-trading-beginners/'),
-    (r'\bvirtual.{0,10}account\b',      '../../video/etoro-virtual-practice-account/'),
+    (r'\bcopy trading\b',               'copy-trading.html'),
+    (r'\bsocial trading\b',             'social-trading.html'),
+    (r'\bpopular investor\b',           'popular-investor.html'),
+    (r'\bspread fee[s]?\b',             'video/etoro-spread-fees-explained/'),
+    (r'\bovernight fee[s]?\b',          'video/etoro-rollover-overnight-fees/'),
+    (r'\brollover fee[s]?\b',           'video/etoro-rollover-overnight-fees/'),
+    (r'\bwithdrawal fee[s]?\b',         'video/etoro-withdrawal-fees/'),
+    (r'\bnegative balance protection\b','video/etoro-negative-balance-protection-most-you-can-lose/'),
+    (r'\bcopy open trades\b',           'video/should-i-copy-open-trades-etoro/'),
+    (r'\bstop loss\b',                  'video/etoro-copy-trading-stop-loss-risk/'),
+    (r'\btake profit\b',                'video/etoro-take-profit-can-i-change-it/'),
+    (r'\bdrawdown[s]?\b',               'video/etoro-drawdowns-copy-trading-risk/'),
+    (r'\bleverage trading\b',           'video/etoro-leverage-trading-beginners/'),
+    (r'\bvirtual.{0,10}account\b',      'video/etoro-virtual-practice-account/'),
 ]
 
 # ── CTA presets ───────────────────────────────────────────────────────────────
@@ -793,23 +805,13 @@ def get_video_id_title_map():
     return {vid_id: html.unescape(title).strip() for vid_id, title in cards}
 
 
-def apply_internal_links(text, current_slug):
-    """Replace first occurrence of key terms with internal links (skip self-links)."""
-    linked = set()
-    def replacer(pattern, url, text):
-        if url.rstrip('/').endswith(current_slug):
-            return text  # don't self-link
-        match = re.search(pattern, text, re.IGNORECASE)
-        if not match or pattern in linked:
-            return text
-        linked.add(pattern)
-        term = match.group(0)
-        linked_text = f'<a href="{url}">{term}</a>'
-        return text[:match.start()] + linked_text + text[match.end():]
+def apply_internal_links(text, current_slug, seen=None):
+    """Link the first occurrence of each key term (skip self-links).
 
-    for pattern, url in INTERNAL_LINKS:
-        text = replacer(pattern, url, text)
-    return text
+    Pass the same `seen` set for every paragraph of a page so each term is
+    linked once per page rather than once per paragraph.
+    """
+    return link_injector(INTERNAL_LINKS)(text, current_slug, prefix="../../", seen=seen)
 
 
 def format_transcript(text, headings=None):
@@ -923,6 +925,7 @@ def generate_page(video_id, title, meta, transcript_text):
 
     # Check for hand-written article content (overrides raw transcript)
     article_sections = meta.get("article_sections", None)
+    linked_terms = set()  # each key term is linked once per page
 
     if article_sections:
         # Build article HTML from structured sections
@@ -939,7 +942,7 @@ def generate_page(video_id, title, meta, transcript_text):
                 elif isinstance(para, dict) and para.get("type") == "h3":
                     transcript_html_parts.append(f'<h3>{html.escape(para["text"])}</h3>')
                 else:
-                    linked = apply_internal_links(html.escape(para), slug)
+                    linked = apply_internal_links(html.escape(para), slug, linked_terms)
                     transcript_html_parts.append(f'<p>{linked}</p>')
                     blocks.append(('p', para))
         transcript_html = '\n        '.join(transcript_html_parts)
@@ -958,7 +961,7 @@ def generate_page(video_id, title, meta, transcript_text):
                 anchor = re.sub(r'[^a-z0-9]+', '-', content.lower()).strip('-')
                 transcript_html_parts.append(f'<h2 id="{anchor}">{html.escape(content)}</h2>')
             else:
-                linked = apply_internal_links(html.escape(content), slug)
+                linked = apply_internal_links(html.escape(content), slug, linked_terms)
                 transcript_html_parts.append(f'<p>{linked}</p>')
         transcript_html = '\n        '.join(transcript_html_parts)
 
@@ -1011,49 +1014,11 @@ def generate_page(video_id, title, meta, transcript_text):
   <script type="application/ld+json">
   {json.dumps(breadcrumb_schema, ensure_ascii=False, indent=2)}
   </script>
-  <!-- Google tag (gtag.js) -->
-  <script async src="https://www.googletagmanager.com/gtag/js?id=G-PBGDJ951LL"></script>
-  <script>
-    window.dataLayer = window.dataLayer || [];
-    function gtag(){{dataLayer.push(arguments);}}
-    gtag('js', new Date());
-    gtag('config', 'G-PBGDJ951LL');
-  </script>
+{tpl.analytics_head()}
 </head>
 <body>
 
-  <nav>
-    <div class="container nav-inner">
-      <a href="../../index.html" class="nav-logo">Social<span>Trading</span>Vlog</a>
-      <ul class="nav-links">
-        <li><a href="../../social-trading.html">Social Trading</a></li>
-        <li><a href="../../copy-trading.html">Copy Trading</a></li>
-        <li><a href="../../updates.html">Updates</a></li>
-        <li><a href="../../videos.html">Videos</a></li>
-        <li><a href="../../about.html">About</a></li>
-        <li><a href="../../faq.html">FAQ</a></li>
-        <li><a href="#etoro-cta" class="nav-cta">Try eToro</a></li>
-      </ul>
-      <button class="nav-hamburger" id="nav-hamburger" aria-label="Open navigation" aria-expanded="false" aria-controls="nav-drawer">
-        <span></span><span></span><span></span>
-      </button>
-    </div>
-  </nav>
-  <div class="nav-drawer" id="nav-drawer" role="navigation" aria-label="Mobile navigation">
-    <ul>
-      <li><a href="../../social-trading.html">Social Trading</a></li>
-      <li><a href="../../copy-trading.html">Copy Trading</a></li>
-      <li><a href="../../updates.html">Updates</a></li>
-      <li><a href="../../videos.html">Videos</a></li>
-      <li><a href="../../about.html">About</a></li>
-      <li><a href="../../faq.html">FAQ</a></li>
-      <li><a href="#etoro-cta" class="nav-cta">Try eToro</a></li>
-    </ul>
-  </div>
-
-  <div class="risk-warning-banner">
-    <span>Risk warning:</span> 51% of retail investor accounts lose money when trading CFDs with eToro. Your capital is at risk.
-  </div>
+{tpl.site_header("en", "../../")}
 
   <div class="article-hero">
     <div class="container">
@@ -1094,10 +1059,7 @@ def generate_page(video_id, title, meta, transcript_text):
           <a href="https://www.youtube.com/watch?v={video_id}" target="_blank" rel="noopener">Watch on YouTube with captions</a>
         </p>
 
-        <div class="risk-warning">
-          <strong>Risk Warning</strong>
-          eToro is a multi-asset investment platform. The value of your investments may go up or down. 51% of retail investor accounts lose money when trading CFDs with eToro. You should consider whether you can afford to take the high risk of losing your money.
-        </div>
+{tpl.risk_warning_box("en")}
 
         <div class="inline-cta">
           <p class="inline-cta-text">{cta_headline} — Tom's affiliate link.</p>
@@ -1108,10 +1070,7 @@ def generate_page(video_id, title, meta, transcript_text):
 
         {faq_html}
 
-        <div class="risk-warning">
-          <strong>Important Reminder</strong>
-          51% of retail investor accounts lose money when trading CFDs with eToro. You should consider whether you can afford to take the high risk of losing your money. Past performance is not an indication of future results. This content is for educational purposes only and is not investment advice.
-        </div>
+{tpl.important_reminder_box("en")}
 
       </article>
 
@@ -1120,12 +1079,9 @@ def generate_page(video_id, title, meta, transcript_text):
           <h3>{cta_headline}</h3>
           <p>{cta_body}</p>
           <a href="{cta_url}" class="btn btn-primary" target="_blank" rel="noopener sponsored">{cta_label} →</a>
-          <div class="risk-warning">
-            <strong>51% of retail investor accounts lose money when trading CFDs with eToro.</strong>
-            You should consider whether you can afford to take the high risk of losing your money. This is an affiliate link — Tom may earn a commission at no cost to you.
-          </div>
+{tpl.sidebar_risk_warning("en")}
         </div>
-        <div class="sidebar-nav">
+{related.sidebar_block(f"video/{slug}/", "en", "../../", exclude=MORE_GUIDES)}        <div class="sidebar-nav">
           <h4>More guides</h4>
           <ul>
             <li><a href="../../social-trading.html">What is Social Trading?</a></li>
@@ -1142,55 +1098,9 @@ def generate_page(video_id, title, meta, transcript_text):
     </div>
   </div>
 
-  <footer>
-    <div class="container">
-      <div class="footer-inner">
-        <div class="footer-brand">
-          <div class="nav-logo">Social<span style="color:var(--accent)">Trading</span>Vlog</div>
-          <p>Documenting the copy trading journey since 2017. Independent, honest, and always learning.</p>
-        </div>
-        <div class="footer-col">
-          <h4>Guides</h4>
-          <ul>
-            <li><a href="../../social-trading.html">What is Social Trading?</a></li>
-            <li><a href="../../copy-trading.html">What is Copy Trading?</a></li>
-            <li><a href="../../etoro-scam.html">Is eToro a Scam?</a></li>
-            <li><a href="../../copy-trading-returns.html">How Much Can You Make?</a></li>
-          </ul>
-        </div>
-        <div class="footer-col">
-          <h4>Site</h4>
-          <ul>
-            <li><a href="../../updates.html">Trading Updates</a></li>
-            <li><a href="../../about.html">About</a></li>
-            <li><a href="../../faq.html">FAQ</a></li>
-            <li><a href="../../contact.html">Contact</a></li>
-          </ul>
-        </div>
-      </div>
-      <div class="footer-bottom">
-        <p>&copy; 2026 SocialTradingVlog.com</p>
-        <p class="footer-disclaimer">Your capital is at risk. 51% of retail investor accounts lose money when trading CFDs with eToro. This website is for educational and informational purposes only and does not constitute investment advice. Copy Trading does not amount to investment advice.</p>
-      </div>
-    </div>
-  </footer>
-
-  <script src="../../js/lightbox.js"></script>
-  <script src="../../js/nav.js"></script>
-  <script>
-  document.addEventListener('click', function(e) {{
-    var link = e.target.closest('a.btn-primary');
-    if (!link) return;
-    if (typeof gtag === 'function') {{
-      gtag('event', 'cta_click', {{
-        'event_category': 'affiliate',
-        'event_label': link.textContent.trim(),
-        'link_url': link.href || '',
-        'page_path': location.pathname
-      }});
-    }}
-  }});
-  </script>
+{tpl.site_footer("en", "../../")}
+
+{tpl.page_scripts("en", "../../")}
 </body>
 </html>'''
 
@@ -1263,6 +1173,7 @@ def main():
         # it. Editorial "76%" prose is preserved. See _risk_disclaimer.py.
         page_html = rd.normalize_html(generate_page(video_id, title, meta, transcript_text))
         out_path.write_text(page_html, encoding="utf-8")
+        rd.record_page(out_path, page_html)
         print(f"  [{video_id}] → /video/{meta['slug']}/")
         generated += 1
 
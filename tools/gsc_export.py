@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Full-depth Search Console export into the GSC store, one day at a time.
+
+The dashboard asks Search Console for 20 queries / 15 pages and
+gsc_snapshot.py for 100 / 50 — the long tail, where most of the multilingual
+traffic is, never shows up. This pages through searchanalytics().query for
+every day with all four dimensions
+
+    query × page × country × device        dataState "final"
+
+and appends the rows to data/gsc.sqlite3 (tools/_gsc_store.py, source
+"daily"), together with the day's site totals (no dimensions — these include
+the anonymised queries the per-query rows leave out).
+
+Work is sliced by date and device: each (day, device) slice pages with
+startRow in ROW_LIMIT steps until a short page or MAX_ROWS_PER_SLICE, and
+slices run concurrently on WORKERS threads (one API client per thread — the
+Google client is not thread-safe) under a shared rate limiter. A day is
+written in one transaction as soon as all its slices are in, so an
+interrupted run loses at most the days in flight; only days not yet stored
+are fetched. A day that came back empty is fetched again until it was
+stored EMPTY_RECHECK_DAYS after the fact — Search Console can report a
+recent day as empty before its data lands.
+
+--record DIR saves every response as DIR/<hash of the request>.json, and
+--replay DIR answers from those files instead of the API (no credentials or
+Google libraries needed), so the exporter can be exercised offline against
+a recorded stand-in.
+
+Usage:
+    python3 tools/gsc_export.py                      # last 90 days, missing days only
+    python3 tools/gsc_export.py --days 480           # backfill (API keeps ~16 months)
+    python3 tools/gsc_export.py --dry-run            # list the days that would be fetched
+    python3 tools/gsc_export.py --days 7 --record /tmp/gsc-fixture
+    python3 tools/gsc_export.py --days 7 --replay /tmp/gsc-fixture --store /tmp/gsc.sqlite3
+"""
+
+import sys
+import json
+import time
+import hashlib
+import pathlib
+import argparse
+import threading
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+import _gsc_store as gsc_store
+import _google
+
+DIMENSIONS = ["query", "page", "country", "device"]
+DEVICES = ["DESKTOP", "MOBILE", "TABLET"]
+ROW_LIMIT = 25000            # API maximum per request
+MAX_ROWS_PER_SLICE = 50000   # API maximum per day and search type
+DATA_LAG_DAYS = 3            # the newest days are not final yet
+EMPTY_RECHECK_DAYS = 2 * DATA_LAG_DAYS   # an empty day is trusted once fetched this late
+DEFAULT_DAYS = 90
+WORKERS = 4
+REQUESTS_PER_MINUTE = 600    # half the per-site quota (1,200/min)
+RETRIES = 4
+
+
+class RateLimiter:
+    """At most `per_minute` acquire()s per minute, across threads; `count`
+    is the number of acquire()s so far."""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute
+        self.lock = threading.Lock()
+        self.next_at = 0.0
+        self.count = 0
+
+    def acquire(self):
+        with self.lock:
+            self.count += 1
+            now = time.monotonic()
+            wait = self.next_at - now
+            self.next_at = max(now, self.next_at) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+# ── Clients ───────────────────────────────────────────────────────────────────
+
+def request_key(body):
+    return hashlib.sha256(json.dumps(body, sort_keys=True).encode()).hexdigest()[:20]
+
+
+class LiveClient:
+    """searchanalytics().query through the Google API client. Each instance
+    has its own service — one per worker thread."""
+
+    def __init__(self, site_url=None):
+        from gsc_snapshot import find_site_url
+        self.service = _google.new_searchconsole()
+        self.site_url = site_url or find_site_url(self.service)
+        if not self.site_url:
+            raise RuntimeError("socialtradingvlog.com not found in Search Console")
+
+    def query(self, body):
+        return self.service.searchanalytics().query(siteUrl=self.site_url, body=body).execute()
+
+
+class RecordingClient(LiveClient):
+    def __init__(self, directory, site_url=None):
+        super().__init__(site_url)
+        self.directory = directory
+        directory.mkdir(parents=True, exist_ok=True)
+
+    def query(self, body):
+        response = super().query(body)
+        (self.directory / f"{request_key(body)}.json").write_text(
+            json.dumps({"request": body, "response": response}, indent=1), encoding="utf-8")
+        return response
+
+
+class ReplayClient:
+    """Answers from responses saved by --record."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def query(self, body):
+        path = self.directory / f"{request_key(body)}.json"
+        if not path.exists():
+            raise RuntimeError(f"no recorded response for {json.dumps(body, sort_keys=True)}")
+        return json.loads(path.read_text(encoding="utf-8"))["response"]
+
+
+def _retryable(error):
+    status = getattr(getattr(error, "resp", None), "status", None)
+    return status in (429, 500, 503) or isinstance(error, (TimeoutError, ConnectionError))
+
+
+# ── Export ────────────────────────────────────────────────────────────────────
+
+class Exporter:
+    def __init__(self, make_client, limiter):
+        self.make_client = make_client
+        self.limiter = limiter
+        self._local = threading.local()
+
+    @property
+    def requests(self):
+        return self.limiter.count
+
+    def client(self):
+        if getattr(self._local, "client", None) is None:
+            self._local.client = self.make_client()
+        return self._local.client
+
+    def call(self, body):
+        for attempt in range(RETRIES + 1):
+            self.limiter.acquire()
+            try:
+                return self.client().query(body)
+            except Exception as e:
+                if attempt == RETRIES or not _retryable(e):
+                    raise
+                time.sleep(2 ** attempt)
+
+    def fetch_slice(self, day, device):
+        """All rows of one (day, device) slice, as store row dicts.
+        device None = the day's totals (no dimensions)."""
+        body = {"startDate": day, "endDate": day, "dataState": "final", "type": "web"}
+        if device is None:
+            response = self.call({**body, "dimensions": []})
+            return [{"clicks": r["clicks"], "impressions": r["impressions"],
+                     "ctr": r["ctr"], "position": r["position"]}
+                    for r in response.get("rows", [])], False
+        body.update(dimensions=DIMENSIONS, rowLimit=ROW_LIMIT, dimensionFilterGroups=[
+            {"filters": [{"dimension": "device", "operator": "equals", "expression": device}]}])
+        rows = []
+        start_row = 0
+        while start_row < MAX_ROWS_PER_SLICE:
+            page = self.call({**body, "startRow": start_row}).get("rows", [])
+            for r in page:
+                rows.append({**dict(zip(DIMENSIONS, r["keys"])), "clicks": r["clicks"],
+                             "impressions": r["impressions"], "ctr": r["ctr"],
+                             "position": r["position"]})
+            if len(page) < ROW_LIMIT:
+                return rows, False
+            start_row += ROW_LIMIT
+        return rows, True  # hit the API's per-day cap — the tail beyond it is not available
+
+    def export(self, days, store, workers=WORKERS):
+        """Fetch and append `days` (ISO dates). Returns {day: rows stored}."""
+        slices = [(day, device) for day in days for device in [None] + DEVICES]
+        pending = {day: len(DEVICES) + 1 for day in days}
+        collected = {day: {"rows": [], "truncated": []} for day in days}
+        stored = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self.fetch_slice, day, device): (day, device)
+                       for day, device in slices}
+            for future in as_completed(futures):
+                day, device = futures[future]
+                rows, truncated = future.result()
+                collected[day]["rows"] += rows
+                if truncated:
+                    collected[day]["truncated"].append(device)
+                pending[day] -= 1
+                if pending[day] == 0:
+                    data = collected.pop(day)
+                    store.append(gsc_store.DAILY, day, data["rows"],
+                                 extra={"truncated": data["truncated"]})
+                    stored[day] = len(data["rows"])
+                    note = f" (capped: {', '.join(data['truncated'])})" if data["truncated"] else ""
+                    print(f"  {day}: {len(data['rows']):,} rows{note}")
+        return stored
+
+
+def missing_days(store, days, end):
+    """Days of the window not stored yet, plus stored-empty days that were
+    fetched too soon to trust."""
+    have = {}
+    for day, (rows, stored_at) in store.day_log(gsc_store.DAILY).items():
+        settled = date.fromisoformat(stored_at[:10]) >= \
+            date.fromisoformat(day) + timedelta(days=EMPTY_RECHECK_DAYS)
+        if rows or settled:
+            have[day] = rows
+    wanted = [(end - timedelta(days=i)).isoformat() for i in range(days)]
+    return sorted(d for d in wanted if d not in have)
+
+
+def api_errors():
+    """Exceptions that end a run with a message rather than a traceback."""
+    errors = (RuntimeError, TimeoutError, ConnectionError)
+    try:
+        from googleapiclient.errors import HttpError
+    except ImportError:   # --replay runs without the Google libraries
+        return errors
+    return errors + (HttpError,)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export full-depth Search Console data")
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help="How many days back")
+    parser.add_argument("--end", help=f"Last day (default: today - {DATA_LAG_DAYS})")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--rate", type=int, default=REQUESTS_PER_MINUTE, help="Requests per minute")
+    parser.add_argument("--dry-run", action="store_true", help="List the days to fetch")
+    parser.add_argument("--store", type=pathlib.Path, help="Store file (default data/gsc.sqlite3)")
+    clients = parser.add_mutually_exclusive_group()
+    clients.add_argument("--record", type=pathlib.Path, metavar="DIR", help="Save every response")
+    clients.add_argument("--replay", type=pathlib.Path, metavar="DIR", help="Answer from saved responses")
+    args = parser.parse_args()
+
+    store = gsc_store.GscStore(args.store) if args.store else gsc_store.store()
+    end = date.fromisoformat(args.end) if args.end else date.today() - timedelta(days=DATA_LAG_DAYS)
+    days = missing_days(store, args.days, end)
+    print(f"GSC export — {args.days} day(s) to {end}, {len(days)} not stored yet")
+    if not days or args.dry_run:
+        for day in days:
+            print(f"  {day}")
+        return
+
+    if args.replay:
+        make_client = lambda: ReplayClient(args.replay)
+    elif args.record:
+        make_client = lambda: RecordingClient(args.record)
+    else:
+        make_client = LiveClient
+    exporter = Exporter(make_client, RateLimiter(args.rate))
+    started = time.monotonic()
+    try:
+        stored = exporter.export(days, store, workers=args.workers)
+    except api_errors() as e:
+        sys.exit(f"  ✗ {type(e).__name__}: {e}")
+    print(f"  {len(stored)} day(s), {sum(stored.values()):,} rows, {exporter.requests} request(s) "
+          f"in {time.monotonic() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,9 @@ Save daily GSC snapshot + track SEO changes over time.
 
 Saves to:
   reports/gsc-YYYY-MM-DD.json  — daily snapshot of all GSC metrics
+  data/gsc.sqlite3             — the same numbers appended to the GSC
+                                 time-series store (tools/_gsc_store.py),
+                                 which --compare and the dashboard read
   reports/seo-changes.json     — log of title/meta changes with before/after
 
 Can be added to launchd daily report or run on demand.
@@ -26,19 +29,17 @@ if sys.platform == "darwin":
 import warnings
 warnings.filterwarnings("ignore", category=FutureWarning)
 
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+import _gsc_store as gsc_store
+import _google
 
-KEY_FILE = pathlib.Path.home() / ".config" / "stv-secrets" / "ga-service-account.json"
 BASE_DIR = pathlib.Path(__file__).parent.parent
 REPORTS_DIR = BASE_DIR / "reports"
 CHANGES_FILE = REPORTS_DIR / "seo-changes.json"
-SCOPES = ["https://www.googleapis.com/auth/webmasters"]
 
 
 def get_service():
-    creds = service_account.Credentials.from_service_account_file(str(KEY_FILE), scopes=SCOPES)
-    return build("searchconsole", "v1", credentials=creds)
+    return _google.searchconsole()
 
 
 def find_site_url(service):
@@ -97,6 +98,7 @@ def save_snapshot(days=28):
 
     out_path = REPORTS_DIR / f"gsc-{snapshot['date']}.json"
     out_path.write_text(json.dumps(snapshot, indent=2))
+    gsc_store.store().append_snapshot(snapshot)
     print(f"Snapshot saved: {out_path}")
     print(f"  Queries: {len(snapshot['queries'])}")
     print(f"  Pages: {len(snapshot['pages'])}")
@@ -130,22 +132,17 @@ def log_seo_change(page, field, old_value, new_value, notes=""):
 
 def compare_snapshots(days_back=7):
     """Compare recent snapshot with older one to show trends."""
-    snapshots = sorted(REPORTS_DIR.glob("gsc-*.json"))
-    if len(snapshots) < 2:
+    store = gsc_store.store()
+    dates = sorted(store.dates(gsc_store.SNAPSHOT))
+    if len(dates) < 2:
         print("Need at least 2 snapshots to compare. Run daily snapshots first.")
         return
 
-    latest = json.loads(snapshots[-1].read_text())
-    # Find snapshot closest to days_back ago
-    target_date = datetime.now() - timedelta(days=days_back)
-    older = None
-    for s in snapshots:
-        d = datetime.strptime(s.stem.replace("gsc-", ""), "%Y-%m-%d")
-        if d <= target_date:
-            older = json.loads(s.read_text())
-
-    if not older:
-        older = json.loads(snapshots[0].read_text())
+    latest = store.snapshot(dates[-1])
+    # Snapshot closest to days_back ago (else the oldest)
+    target_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
+    older_dates = [d for d in dates if d <= target_date]
+    older = store.snapshot(older_dates[-1] if older_dates else dates[0])
 
     print(f"\n{'='*60}")
     print(f"  GSC COMPARISON: {older['date']} vs {latest['date']}")
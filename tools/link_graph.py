@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Internal link graph — click depth, orphans, in-links and internal PageRank.
+
+check_internal_links.py answers "does this href resolve". This answers how
+the site's internal links spread crawl attention: every <a href> between
+published pages (the sitemap's page set) becomes an edge, and per language:
+
+    click depth    shortest number of clicks from that language's home page
+                   (unreachable pages have none)
+    in-links       distinct same-language pages linking to the page
+    orphans        pages no other same-language page links to
+    near-orphans   pages linked from fewer than NEAR_ORPHAN_LINKS pages
+    PageRank       power iteration over the adjacency lists (damping 0.85,
+                   dangling pages spread evenly), scaled so the average page
+                   scores 1.0
+
+Links into another language (the language switcher, hreflang-style footer
+links) are counted separately as cross-language in-links and do not affect
+depth or PageRank — every language is crawled from its own home page.
+
+The report goes to reports/link-graph.json, which the dashboard shows under
+"Internal Links".
+
+--opportunities lists video pages whose transcript mentions one of
+generate_video_pages.INTERNAL_LINKS' terms (found through the transcript
+index, tools/_transcript_index.py) but that do not link to the term's
+target yet.
+
+Usage:
+    python3 tools/link_graph.py                 # build report + summary
+    python3 tools/link_graph.py --lang de       # print one language's pages
+    python3 tools/link_graph.py --top 30        # longer PageRank listing
+    python3 tools/link_graph.py --opportunities # unlinked term mentions in transcripts
+"""
+
+import re
+import sys
+import json
+import html
+import posixpath
+import pathlib
+import argparse
+from datetime import datetime
+from urllib.parse import unquote, urlparse
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+import generate_sitemap as sitemap
+
+PROJECT_DIR = pathlib.Path(__file__).parent.parent
+REPORT_FILE = PROJECT_DIR / "reports" / "link-graph.json"
+
+DAMPING = 0.85
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-9
+NEAR_ORPHAN_LINKS = 3    # linked from fewer pages than this → near-orphan
+MAX_DEPTH = 3            # deeper than this is flagged as hard to reach
+
+A_HREF_RE = re.compile(r'<a\s[^>]*?href\s*=\s*["\']([^"\']+)["\']', re.I)
+SITE_HOSTS = {"socialtradingvlog.com", "www.socialtradingvlog.com"}
+
+
+# ── Graph ─────────────────────────────────────────────────────────────────────
+
+def resolve_href(source_rel, href):
+    """Project-relative page path an href points to, or None if external."""
+    parsed = urlparse(html.unescape(href.strip()))
+    if parsed.scheme in ("http", "https"):
+        if parsed.netloc not in SITE_HOSTS:
+            return None
+        path = parsed.path or "/"
+    elif parsed.scheme or parsed.netloc:
+        return None  # mailto:, tel:, javascript:, protocol-relative
+    else:
+        path = parsed.path
+    if not path:
+        return None  # fragment-only link to the same page
+    path = unquote(path)
+    if path.startswith("/"):
+        target = path.lstrip("/")
+    else:
+        target = posixpath.join(posixpath.dirname(source_rel), path)
+    if path.endswith("/") or not posixpath.splitext(path)[1]:
+        target = posixpath.join(target, "index.html")
+    target = posixpath.normpath(target)
+    return None if target.startswith("..") else target
+
+
+def build_graph(root=PROJECT_DIR):
+    """(pages, edges): pages {rel_path: lang}, edges {source: set(targets)}
+    between published pages only, self-links dropped."""
+    pages = {rel: sitemap.sitemap_group(rel)[0] for rel, _ in sitemap.find_all_pages(root)}
+    edges = {}
+    for rel in pages:
+        text = (root / rel).read_text(encoding="utf-8", errors="ignore")
+        targets = set()
+        for href in A_HREF_RE.findall(text):
+            target = resolve_href(rel, href)
+            if target in pages and target != rel:
+                targets.add(target)
+        edges[rel] = targets
+    return pages, edges
+
+
+def home_page(lang):
+    return "index.html" if lang == "en" else f"{lang}/index.html"
+
+
+def click_depths(nodes, out_links, start):
+    """Breadth-first clicks from `start` ({node: depth}, reachable only)."""
+    if start not in nodes:
+        return {}
+    depth = {start: 0}
+    frontier = [start]
+    while frontier:
+        nxt = []
+        for node in frontier:
+            for target in out_links[node]:
+                if target not in depth:
+                    depth[target] = depth[node] + 1
+                    nxt.append(target)
+        frontier = nxt
+    return depth
+
+
+def pagerank(nodes, out_links):
+    """{node: score} with mean 1.0.
+
+    The adjacency is held as index lists (a sparse row per page), so each
+    iteration is one pass over the edges rather than an N×N matrix.
+    """
+    n = len(nodes)
+    if not n:
+        return {}
+    index = {node: i for i, node in enumerate(nodes)}
+    rows = [[index[t] for t in out_links[node]] for node in nodes]
+    dangling = [i for i, row in enumerate(rows) if not row]
+    rank = [1.0 / n] * n
+    for _ in range(MAX_ITERATIONS):
+        leak = DAMPING * sum(rank[i] for i in dangling) / n
+        nxt = [(1.0 - DAMPING) / n + leak] * n
+        for i, row in enumerate(rows):
+            if row:
+                share = DAMPING * rank[i] / len(row)
+                for j in row:
+                    nxt[j] += share
+        delta = sum(abs(a - b) for a, b in zip(nxt, rank))
+        rank = nxt
+        if delta < TOLERANCE:
+            break
+    return {node: rank[index[node]] * n for node in nodes}
+
+
+def analyse(pages, edges):
+    """Per-language metrics for the report."""
+    languages = {}
+    for lang in sorted(set(pages.values())):
+        nodes = sorted(p for p, l in pages.items() if l == lang)
+        out_links = {p: sorted(t for t in edges[p] if pages[t] == lang) for p in nodes}
+        in_links = {p: 0 for p in nodes}
+        cross_in = {p: 0 for p in nodes}
+        for source, targets in edges.items():
+            for t in targets:
+                if pages[t] != lang:
+                    continue
+                if pages[source] == lang:
+                    in_links[t] += 1
+                else:
+                    cross_in[t] += 1
+
+        home = home_page(lang)
+        depth = click_depths(nodes, out_links, home)
+        rank = pagerank(nodes, out_links)
+
+        rows = []
+        for p in nodes:
+            rows.append({
+                "url": sitemap.rel_to_url(p)[len(sitemap.BASE_URL):],
+                "depth": depth.get(p),
+                "in_links": in_links[p],
+                "cross_lang_in_links": cross_in[p],
+                "out_links": len(out_links[p]),
+                "pagerank": round(rank[p], 4),
+            })
+        rows.sort(key=lambda r: (-r["pagerank"], r["url"]))
+
+        not_home = [r for r in rows if r["url"] != sitemap.rel_to_url(home)[len(sitemap.BASE_URL):]]
+        histogram = {}
+        for r in rows:
+            key = "unreachable" if r["depth"] is None else str(r["depth"])
+            histogram[key] = histogram.get(key, 0) + 1
+        languages[lang] = {
+            "pages": len(nodes),
+            "links": sum(len(v) for v in out_links.values()),
+            "home": home if home in pages else None,
+            "depth_histogram": dict(sorted(histogram.items())),
+            "unreachable": [r["url"] for r in rows if r["depth"] is None],
+            "too_deep": [r["url"] for r in rows if r["depth"] is not None and r["depth"] > MAX_DEPTH],
+            "orphans": [r["url"] for r in not_home if r["in_links"] == 0],
+            "near_orphans": [r["url"] for r in not_home
+                             if 0 < r["in_links"] < NEAR_ORPHAN_LINKS],
+            "page_metrics": rows,
+        }
+    return languages
+
+
+def link_opportunities(pages, edges, links=None, lang="en"):
+    """{target: [(source, term, mentions)]} — video pages whose transcript in
+    `lang` mentions a link term but which don't link to its target."""
+    import _hreflang as hreflang
+    import _transcript_index as transcript_index
+    if links is None:
+        from generate_video_pages import INTERNAL_LINKS as links
+    idx = transcript_index.index()
+    found = {}
+    for pattern, target_url in links:
+        target = resolve_href("index.html", "/" + target_url)
+        query = transcript_index.fts_phrase(pattern)
+        if target not in pages or not query:
+            continue
+        for video, mentions in idx.mentions(query, lang).items():
+            url = hreflang.cluster(f"video:{video}").get(lang)
+            source = resolve_href("index.html", url) if url else None
+            if source in pages and source != target and target not in edges.get(source, ()):
+                found.setdefault(target, []).append((source, query, mentions))
+    return found
+
+
+def build_report(root=PROJECT_DIR):
+    pages, edges = build_graph(root)
+    return {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "settings": {"damping": DAMPING, "near_orphan_links": NEAR_ORPHAN_LINKS,
+                     "max_depth": MAX_DEPTH},
+        "languages": analyse(pages, edges),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Internal link graph analytics")
+    parser.add_argument("--lang", help="Print every page of this language")
+    parser.add_argument("--top", type=int, default=10, help="PageRank entries to list per language")
+    parser.add_argument("--opportunities", action="store_true",
+                        help="Video pages mentioning a link term without linking to it")
+    args = parser.parse_args()
+
+    if args.opportunities:
+        pages, edges = build_graph()
+        found = link_opportunities(pages, edges)
+        print(f"Link opportunities — {sum(map(len, found.values()))} unlinked mention(s)")
+        for target, sources in sorted(found.items(), key=lambda kv: -len(kv[1])):
+            print(f"\n  → {target}  ({sources[0][1]})")
+            for source, _query, mentions in sorted(sources, key=lambda s: -s[2]):
+                print(f"    {mentions:>3}×  {source}")
+        return
+
+    report = build_report()
+    REPORT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_FILE.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n",
+                           encoding="utf-8")
+
+    print(f"Internal link graph — {report['generated']}")
+    print("=" * 60)
+    print(f"\n  {'Lang':<5} {'Pages':>5} {'Links':>6} {'Orphans':>8} {'Near':>5} "
+          f"{'Unreach.':>9} {'>D' + str(MAX_DEPTH):>5}  Depths")
+    for lang, data in report["languages"].items():
+        depths = " ".join(f"{k}:{v}" for k, v in data["depth_histogram"].items())
+        print(f"  {lang:<5} {data['pages']:>5} {data['links']:>6} {len(data['orphans']):>8} "
+              f"{len(data['near_orphans']):>5} {len(data['unreachable']):>9} "
+              f"{len(data['too_deep']):>5}  {depths}")
+
+    for lang, data in report["languages"].items():
+        if args.lang and lang != args.lang:
+            continue
+        rows = data["page_metrics"] if args.lang else data["page_metrics"][:args.top]
+        print(f"\n  [{lang}] {'PageRank':>8} {'In':>4} {'Depth':>5}  Page")
+        for r in rows:
+            d = "-" if r["depth"] is None else r["depth"]
+            print(f"        {r['pagerank']:>8.3f} {r['in_links']:>4} {d:>5}  {r['url']}")
+        for label in ("orphans", "unreachable"):
+            if data[label]:
+                print(f"    {label}: {', '.join(data[label])}")
+
+    print(f"\n  Report → {REPORT_FILE.relative_to(PROJECT_DIR)}")
+
+
+if __name__ == "__main__":
+    main()
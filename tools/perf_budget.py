@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Performance budgets — per-page weight checks that fail the build on regressions.
+
+Nothing used to stop a generator change from doubling page weight. This
+measures every published page (the sitemap's page set):
+
+    html_kb          transferred HTML: the page gzipped (level 6, what the CDN
+                     serves to a browser without brotli)
+    blocking         render-blocking requests: stylesheets (not preload, not
+                     media="print", not inside <noscript>) and <script src>
+                     in <head> without async/defer/type="module"
+    blocking_kb      their size on disk (third-party ones count 0 bytes but
+                     still count as a request)
+    image_kb         distinct local images the page references (<img src>,
+                     srcset, <source>, og:image excluded), sized from images/
+    third_party      distinct origins the page loads anything from (scripts,
+                     stylesheets, images, iframes, preconnects) — links don't
+                     count
+    dom_nodes        element count
+
+and checks each against its template's budget in data/perf-budgets.json
+(templates as in critical_css.classify_template; "default" fills gaps,
+"pages" overrides single pages). A failing run prints each over-budget
+page next to its numbers in the last passing run (reports/perf-baseline.json)
+and exits 1. A passing run becomes the new baseline.
+
+Usage:
+    python3 tools/perf_budget.py                   # check; exit 1 on any breach
+    python3 tools/perf_budget.py --report          # per-template summary, never fails
+    python3 tools/perf_budget.py --update-baseline # accept the current numbers as the baseline
+    python3 tools/perf_budget.py --suggest         # print budgets = current max + headroom
+
+deploy_to_vps.sh runs the check before every deploy.
+"""
+
+import sys
+import gzip
+import json
+import pathlib
+import argparse
+import posixpath
+from datetime import datetime
+from html.parser import HTMLParser
+from urllib.parse import urlparse, unquote
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+import generate_sitemap as sitemap
+import critical_css
+from link_graph import SITE_HOSTS
+
+PROJECT_DIR = pathlib.Path(__file__).parent.parent
+BUDGETS_FILE = PROJECT_DIR / "data" / "perf-budgets.json"
+BASELINE_FILE = PROJECT_DIR / "reports" / "perf-baseline.json"
+
+METRICS = ("html_kb", "blocking", "blocking_kb", "image_kb", "third_party", "dom_nodes")
+HEADROOM = 1.2   # --suggest: budget = current worst page × this
+
+
+# ── Measurement ───────────────────────────────────────────────────────────────
+
+class PageScan(HTMLParser):
+    """One pass over a page collecting everything the metrics need."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.nodes = 0
+        self.in_head = False
+        self.noscript = 0
+        self.blocking = []     # src/href of render-blocking resources
+        self.images = set()
+        self.loads = set()     # every URL a resource element fetches
+
+    def handle_starttag(self, tag, attrs):
+        self.nodes += 1
+        a = {k: (v or "") for k, v in attrs}
+        if tag == "head":
+            self.in_head = True
+        elif tag == "body":
+            self.in_head = False
+        elif tag == "noscript":
+            self.noscript += 1
+        elif tag == "link":
+            rels = a.get("rel", "").lower().split()
+            href = a.get("href", "")
+            if "stylesheet" in rels and href:
+                self.loads.add(href)
+                if not self.noscript and a.get("media", "all") != "print":
+                    self.blocking.append(href)
+            elif {"preload", "preconnect", "dns-prefetch", "modulepreload"} & set(rels) and href:
+                self.loads.add(href)
+        elif tag == "script" and a.get("src"):
+            self.loads.add(a["src"])
+            if (self.in_head and "async" not in a and "defer" not in a
+                    and a.get("type", "") != "module"):
+                self.blocking.append(a["src"])
+        elif tag in ("img", "source"):
+            for url in [a.get("src", "")] + [c.strip().split(" ")[0]
+                                             for c in a.get("srcset", "").split(",")]:
+                if url:
+                    self.images.add(url)
+                    self.loads.add(url)
+        elif tag in ("iframe", "video", "audio") and a.get("src"):
+            self.loads.add(a["src"])
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self.in_head = False
+        elif tag == "noscript" and self.noscript:
+            self.noscript -= 1
+
+
+def local_file(rel_path, url, root=PROJECT_DIR):
+    """Project file a page-relative or root-relative URL points to, or None
+    when the URL is third-party / data: / missing."""
+    parsed = urlparse(url)
+    if parsed.scheme in ("http", "https") or url.startswith("//"):
+        if parsed.netloc not in SITE_HOSTS:
+            return None
+    elif parsed.scheme:
+        return None
+    path = unquote(parsed.path)
+    if not path:
+        return None
+    target = path.lstrip("/") if path.startswith("/") else posixpath.join(posixpath.dirname(rel_path), path)
+    target = posixpath.normpath(target)
+    if target.startswith(".."):
+        return None
+    f = root / target
+    return f if f.is_file() else None
+
+
+def third_party(url):
+    parsed = urlparse(url if not url.startswith("//") else "https:" + url)
+    if parsed.scheme in ("http", "https") and parsed.netloc not in SITE_HOSTS:
+        return f"{parsed.scheme}://{parsed.netloc}"
+    return None
+
+
+def measure(rel_path, text, root=PROJECT_DIR):
+    scan = PageScan()
+    scan.feed(text)
+    scan.close()
+    blocking_bytes = 0
+    for url in scan.blocking:
+        f = local_file(rel_path, url, root)
+        blocking_bytes += f.stat().st_size if f else 0
+    image_files = {f for f in (local_file(rel_path, u, root) for u in scan.images) if f}
+    origins = {o for o in map(third_party, scan.loads) if o}
+    return {
+        "html_kb": round(len(gzip.compress(text.encode("utf-8"), 6, mtime=0)) / 1024, 1),
+        "blocking": len(scan.blocking),
+        "blocking_kb": round(blocking_bytes / 1024, 1),
+        "image_kb": round(sum(f.stat().st_size for f in image_files) / 1024, 1),
+        "third_party": len(origins),
+        "dom_nodes": scan.nodes,
+    }
+
+
+def measure_site(root=PROJECT_DIR):
+    """{rel: {"template": name, metric: value, ...}} for every published page."""
+    slugs = critical_css._translated_slugs()
+    results = {}
+    for rel, path in sitemap.find_all_pages(root):
+        text = path.read_text(encoding="utf-8", errors="ignore")
+        results[rel] = {"template": critical_css.classify_template(rel, slugs),
+                        **measure(rel, text, root)}
+    return dict(sorted(results.items()))
+
+
+# ── Budgets ───────────────────────────────────────────────────────────────────
+
+def load_budgets():
+    try:
+        return json.loads(BUDGETS_FILE.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        raise RuntimeError(f"{BUDGETS_FILE.relative_to(PROJECT_DIR)} missing — "
+                           "create it from --suggest")
+
+
+def budget_for(rel, template, budgets):
+    limits = dict(budgets.get("default", {}))
+    limits.update(budgets.get("templates", {}).get(template, {}))
+    limits.update(budgets.get("pages", {}).get(rel, {}))
+    return limits
+
+
+def check(results, budgets):
+    """[(rel, metric, value, limit)] for every breach."""
+    breaches = []
+    for rel, m in results.items():
+        for metric, limit in budget_for(rel, m["template"], budgets).items():
+            if metric in m and m[metric] > limit:
+                breaches.append((rel, metric, m[metric], limit))
+    return breaches
+
+
+def suggest(results):
+    worst = {}
+    for m in results.values():
+        tpl = worst.setdefault(m["template"], {k: 0 for k in METRICS})
+        for k in METRICS:
+            tpl[k] = max(tpl[k], m[k])
+    out = {}
+    for name, tpl in sorted(worst.items()):
+        out[name] = {k: (round(v * HEADROOM, 1) if k.endswith("_kb")
+                         else int(v * HEADROOM) + 1 if k == "dom_nodes" else v)
+                     for k, v in tpl.items()}
+    return out
+
+
+def load_baseline():
+    try:
+        return json.loads(BASELINE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def save_baseline(results):
+    BASELINE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    BASELINE_FILE.write_text(json.dumps(
+        {"generated": datetime.now().isoformat(timespec="seconds"), "pages": results},
+        indent=1) + "\n", encoding="utf-8")
+
+
+def fmt_delta(now, before):
+    if before is None:
+        return "new page"
+    d = now - before
+    return f"was {before}, {'+' if d >= 0 else ''}{round(d, 1)}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check per-page performance budgets")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--report", action="store_true", help="Summary only; never fail")
+    mode.add_argument("--update-baseline", action="store_true",
+                      help="Accept the current numbers as the baseline")
+    mode.add_argument("--suggest", action="store_true",
+                      help="Print per-template budgets from the current pages")
+    args = parser.parse_args()
+
+    results = measure_site()
+    if args.suggest:
+        print(json.dumps({"default": {}, "templates": suggest(results), "pages": {}}, indent=2))
+        return
+
+    print(f"Performance budgets — {len(results)} pages — {datetime.now():%Y-%m-%d %H:%M}")
+    print("=" * 60)
+    by_tpl = {}
+    for m in results.values():
+        by_tpl.setdefault(m["template"], []).append(m)
+    print(f"\n  {'Template':<9} {'Pages':>5}  " + "  ".join(f"{k:>11}" for k in METRICS) + "   (max)")
+    for name, rows in sorted(by_tpl.items()):
+        print(f"  {name:<9} {len(rows):>5}  "
+              + "  ".join(f"{max(r[k] for r in rows):>11}" for k in METRICS))
+
+    if args.update_baseline:
+        save_baseline(results)
+        print(f"\n  Baseline → {BASELINE_FILE.relative_to(PROJECT_DIR)}")
+        return
+
+    try:
+        breaches = check(results, load_budgets())
+    except RuntimeError as e:
+        sys.exit(f"  ✗ {e}")
+    if args.report:
+        print(f"\n  {len(breaches)} budget breach(es). Report only.")
+        return
+    if not breaches:
+        save_baseline(results)
+        print(f"\n  ✓ All pages within budget. Baseline → {BASELINE_FILE.relative_to(PROJECT_DIR)}")
+        return
+
+    baseline = (load_baseline() or {}).get("pages", {})
+    print(f"\n  ✗ {len(breaches)} budget breach(es) on "
+          f"{len({b[0] for b in breaches})} page(s)"
+          + ("" if baseline else " (no baseline to compare against)") + ":")
+    for rel, metric, value, limit in breaches:
+        before = baseline.get(rel, {}).get(metric) if baseline else None
+        print(f"    {rel}  {metric} {value} > {limit}  ({fmt_delta(value, before)})")
+    if baseline:
+        print("\n  Template max vs baseline:")
+        for name, rows in sorted(by_tpl.items()):
+            old = [m for rel, m in baseline.items() if m.get("template") == name]
+            if not old:
+                continue
+            diffs = []
+            for k in METRICS:
+                now, was = max(r[k] for r in rows), max(r[k] for r in old)
+                if now != was:
+                    diffs.append(f"{k} {was}→{now}")
+            if diffs:
+                print(f"    {name:<9} {', '.join(diffs)}")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Analytics-driven prefetch hints — load the likely next page before the click.
+
+analytics_monitor.py and ga_report.py only report on GA data. This feeds it
+back into the site: for every page, the pages readers most often open next
+get a speculation-rules hint, so the common journeys (home → eToro review →
+copy-trading guide) navigate instantly.
+
+GA4 has no "previous page path" dimension, so transitions are approximated
+from pageReferrer × pagePath page views: a view of B with an internal
+referrer A counts as one A → B step. Reloads (A → A), external referrers and
+URLs that are not published pages are dropped.
+
+    data/page-transitions.json   the stored GA rows (refreshed with --fetch,
+                                 reused as-is when GA is unreachable)
+
+For each page, up to MAX_HINTS next pages that got at least MIN_VIEWS views
+and MIN_SHARE of the page's outgoing steps are hinted:
+
+    <!-- prefetch-hints -->
+    <script type="speculationrules">  prefetch all, prerender the top one on
+                                      hover when it takes PRERENDER_SHARE
+    <script>                          <link rel="prefetch"> for the top one in
+                                      browsers without speculation rules
+    <!-- /prefetch-hints -->
+
+inserted before </head>. Like critical_css.py this is a post-processing
+stage: run it after the generators; re-runs replace the block in place and
+remove it from pages that no longer have candidates.
+
+Usage:
+    python3 tools/prefetch_hints.py --fetch          # pull 28 days of GA, then inject
+    python3 tools/prefetch_hints.py                  # inject from the stored rows
+    python3 tools/prefetch_hints.py --report         # print the journeys; write nothing
+    python3 tools/prefetch_hints.py --fetch --days 90
+"""
+
+import re
+import sys
+import json
+import pathlib
+import argparse
+from datetime import datetime
+from urllib.parse import urlparse, unquote
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+import generate_sitemap as sitemap
+from link_graph import SITE_HOSTS
+
+PROJECT_DIR = pathlib.Path(__file__).parent.parent
+TRANSITIONS_FILE = PROJECT_DIR / "data" / "page-transitions.json"
+
+DEFAULT_DAYS = 28
+MAX_HINTS = 3
+MIN_VIEWS = 5           # fewer steps than this is noise, not a journey
+MIN_SHARE = 0.10        # of the page's outgoing steps
+PRERENDER_SHARE = 0.30  # the top candidate is prerendered (on hover) above this
+
+HINT_BLOCK_RE = re.compile(r'\n?[ \t]*<!-- prefetch-hints -->.*?<!-- /prefetch-hints -->', re.S)
+
+PREFETCH_FALLBACK_JS = (
+    "(function(){if(HTMLScriptElement.supports&&HTMLScriptElement.supports('speculationrules'))return;"
+    "var l=document.createElement('link');l.rel='prefetch';l.href=%s;"
+    "document.head.appendChild(l);}());"
+)
+
+
+# ── Transitions ───────────────────────────────────────────────────────────────
+
+def fetch_transitions(days=DEFAULT_DAYS):
+    """Pull referrer → page views from GA and store them. None if GA is unavailable."""
+    from analytics_monitor import fetch_ga_data, update_warehouse
+    update_warehouse()
+    rows = fetch_ga_data(metrics=["screenPageViews"],
+                         dimensions=["pageReferrer", "pagePath"],
+                         date_range_days=days)
+    if rows is None:
+        return None
+    data = {"fetched": datetime.now().isoformat(timespec="seconds"), "days": days, "rows": rows}
+    TRANSITIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    TRANSITIONS_FILE.write_text(json.dumps(data, indent=1) + "\n", encoding="utf-8")
+    return data
+
+
+def load_transitions():
+    try:
+        return json.loads(TRANSITIONS_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def page_index(root=PROJECT_DIR):
+    """{site path: rel} for every published page, under each URL form it is
+    reachable by ("/es/x/", "/es/x", "/es/x/index.html")."""
+    index = {}
+    for rel, _ in sitemap.find_all_pages(root):
+        path = sitemap.rel_to_url(rel)[len(sitemap.BASE_URL):] or "/"
+        index[path] = rel
+        if path.endswith("/"):
+            index[path + "index.html"] = rel
+            if path != "/":
+                index[path.rstrip("/")] = rel
+    return index
+
+
+def resolve(url, index):
+    """Published page (rel) for a GA pagePath or referrer, None if external/unknown."""
+    parsed = urlparse(url.strip())
+    if parsed.netloc and parsed.netloc not in SITE_HOSTS:
+        return None
+    return index.get(unquote(parsed.path) or "/")
+
+
+def transition_counts(rows, index):
+    """{source rel: {target rel: views}} from GA rows."""
+    counts = {}
+    for row in rows:
+        source = resolve(row.get("pageReferrer", ""), index) if row.get("pageReferrer") else None
+        target = resolve(row.get("pagePath", ""), index)
+        if not source or not target or source == target:
+            continue
+        views = int(float(row.get("screenPageViews", 0) or 0))
+        nxt = counts.setdefault(source, {})
+        nxt[target] = nxt.get(target, 0) + views
+    return counts
+
+
+def next_pages(counts):
+    """{source rel: [(target rel, views, share)]} — the hinted candidates."""
+    hints = {}
+    for source, targets in counts.items():
+        total = sum(targets.values())
+        ranked = sorted(targets.items(), key=lambda kv: (-kv[1], kv[0]))
+        picked = [(t, v, v / total) for t, v in ranked
+                  if v >= MIN_VIEWS and v / total >= MIN_SHARE][:MAX_HINTS]
+        if picked:
+            hints[source] = picked
+    return hints
+
+
+# ── Injection ─────────────────────────────────────────────────────────────────
+
+def site_path(rel):
+    return sitemap.rel_to_url(rel)[len(sitemap.BASE_URL):] or "/"
+
+
+def hint_block(candidates):
+    urls = [site_path(t) for t, _, _ in candidates]
+    rules = {"prefetch": [{"source": "list", "urls": urls}]}
+    top, _, share = candidates[0]
+    if share >= PRERENDER_SHARE:
+        rules["prerender"] = [{"source": "list", "urls": [urls[0]], "eagerness": "moderate"}]
+    return (
+        '  <!-- prefetch-hints -->\n'
+        f'  <script type="speculationrules">{json.dumps(rules, separators=(",", ":"))}</script>\n'
+        f'  <script>{PREFETCH_FALLBACK_JS % json.dumps(urls[0])}</script>\n'
+        '  <!-- /prefetch-hints -->'
+    )
+
+
+def apply_hints(page_html, candidates):
+    """Page with its hint block replaced (or removed when there are no
+    candidates). Pages without </head> are returned unchanged."""
+    stripped = HINT_BLOCK_RE.sub("", page_html)
+    if not candidates:
+        return stripped
+    head_end = stripped.find("</head>")
+    if head_end == -1:
+        return page_html
+    return stripped[:head_end].rstrip(" \t") + hint_block(candidates) + "\n" + stripped[head_end:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inject analytics-driven prefetch hints")
+    parser.add_argument("--fetch", action="store_true", help="Pull fresh transitions from GA first")
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help="GA look-back for --fetch")
+    parser.add_argument("--report", action="store_true", help="Print the journeys; write nothing")
+    args = parser.parse_args()
+
+    print(f"Prefetch hints — {datetime.now():%Y-%m-%d %H:%M}")
+    print("=" * 60)
+
+    data = None
+    if args.fetch:
+        data = fetch_transitions(args.days)
+        if data is None:
+            print("  GA unavailable — using the stored transitions.")
+    data = data or load_transitions()
+    if not data:
+        sys.exit(f"  No transitions stored in {TRANSITIONS_FILE.relative_to(PROJECT_DIR)} "
+                 "— run with --fetch on a host with GA credentials.")
+    print(f"  {len(data['rows'])} GA row(s), {data['days']} days, fetched {data['fetched']}")
+
+    index = page_index()
+    hints = next_pages(transition_counts(data["rows"], index))
+    for source in sorted(hints, key=lambda s: -sum(v for _, v, _ in hints[s]))[:20]:
+        print(f"\n  {site_path(source)}")
+        for target, views, share in hints[source]:
+            print(f"    {views:>6} {share:>5.0%}  → {site_path(target)}")
+
+    if args.report:
+        print(f"\n  {len(hints)} page(s) with hints. Report only — nothing written.")
+        return
+
+    changed = 0
+    for rel in sorted(set(index.values())):
+        path = PROJECT_DIR / rel
+        text = path.read_text(encoding="utf-8")
+        new = apply_hints(text, hints.get(rel))
+        if new != text:
+            path.write_text(new, encoding="utf-8")
+            changed += 1
+    print(f"\n  {len(hints)} page(s) with hints; {changed} page(s) rewritten.")
+
+
+if __name__ == "__main__":
+    main()
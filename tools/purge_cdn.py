@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Targeted Cloudflare cache purge for the files a build or deploy changed.
+
+Purging everything after update_risk_warnings.py or a language rebuild
+empties the whole edge cache (origin spike, slow first visits); purging
+nothing leaves stale compliance text cached. This maps the changed files to
+exactly the public URLs that can be cached for them:
+
+    about.html                  → /about.html
+    es/sobre-nosotros/index.html → /es/sobre-nosotros/ and …/index.html
+    index.html                  → / and /index.html
+    css/style.css, feed.xml     → the file's own URL
+    tools/, data/, docs/ …      → nothing (not served)
+
+and, for HTML pages whose hreflang alternates changed (page added, removed
+or its <link rel="alternate"> set differs from before), every sibling in
+the old and new alternates — their annotations point at the changed page.
+
+URLs are sent in batches of PURGE_BATCH (Cloudflare's per-request limit for
+purge-by-URL) through setup_cloudflare_redirects.cf_request().
+
+Usage:
+    python3 tools/purge_cdn.py --git HEAD            # working tree vs HEAD
+    python3 tools/purge_cdn.py --git HEAD~3 --dry-run
+    python3 tools/purge_cdn.py --files about.html css/style.css
+    git diff --name-only A B | python3 tools/purge_cdn.py --stdin
+    python3 tools/purge_cdn.py --git HEAD --dry-run --root /tmp/stv-target/current
+
+--dry-run prints the batches instead of calling the API. --root maps the
+files against another checkout (e.g. a deploy_release.py stand-in target).
+deploy_release.py --purge-cdn runs this after every deploy that changed
+something.
+"""
+
+import re
+import sys
+import json
+import time
+import pathlib
+import argparse
+import subprocess
+import urllib.error
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+from setup_cloudflare_redirects import BASE_URL, cf_request, load_token, get_zone_and_account
+
+PROJECT_DIR = pathlib.Path(__file__).parent.parent
+
+PURGE_BATCH = 30
+NOT_SERVED_DIRS = {"tools", "docs", "data", "reports", "workers", "transcriptions",
+                   "logs", "venv", "outreach"}
+NOT_SERVED_FILES = {"CNAME"}
+NOT_SERVED_SUFFIXES = (".py", ".sh", ".md", ".jsonl", ".pyc")
+
+HREFLANG_RE = re.compile(
+    r'<link\s+rel="alternate"\s+hreflang="([^"]+)"\s+href="([^"]+)"')
+
+
+def is_served(rel):
+    parts = rel.split("/")
+    if parts[0] in NOT_SERVED_DIRS or rel in NOT_SERVED_FILES:
+        return False
+    if any(p.startswith(".") for p in parts):
+        return False
+    return not rel.endswith(NOT_SERVED_SUFFIXES)
+
+
+def urls_for_file(rel):
+    """Public URLs a file is cached under."""
+    if rel == "index.html":
+        return [f"{BASE_URL}/", f"{BASE_URL}/index.html"]
+    if rel.endswith("/index.html"):
+        directory = rel[:-len("index.html")]
+        return [f"{BASE_URL}/{directory}", f"{BASE_URL}/{rel}"]
+    return [f"{BASE_URL}/{rel}"]
+
+
+def alternates(text):
+    """{hreflang: href} declared by a page (empty if none / no text)."""
+    return dict(HREFLANG_RE.findall(text or ""))
+
+
+def urls_for_changes(changed, removed=(), added=(), old_text=None, root=PROJECT_DIR):
+    """Sorted URLs to purge for changed (incl. added) and removed files.
+
+    `old_text(rel)` returns a file's previous content (None if it did not
+    exist) so any alternates change is detected. Without it only pages in
+    `added` or `removed` count as changing their cluster, and their
+    siblings come from the page itself plus the current hreflang graph.
+    """
+    urls = set()
+    for rel in sorted(set(changed) | set(removed)):
+        if not is_served(rel):
+            continue
+        urls.update(urls_for_file(rel))
+        if not rel.endswith(".html"):
+            continue
+        path = root / rel
+        new = alternates(path.read_text(encoding="utf-8", errors="ignore")) if path.exists() else {}
+        if old_text is not None:
+            old = alternates(old_text(rel))
+            if old != new:
+                siblings = set(old.values()) | set(new.values())
+            else:
+                siblings = set()
+        elif rel in added or rel in removed:
+            siblings = set(new.values()) | set(_graph_siblings(urls_for_file(rel)[0]))
+        else:
+            siblings = set()
+        for url in siblings:
+            urls.add(url)
+            if url.endswith("/"):
+                urls.add(url + "index.html")
+    return sorted(urls)
+
+
+def _graph_siblings(url):
+    try:
+        import _hreflang as hreflang
+        return (hreflang.alternates_for_url(url) or {}).values()
+    except Exception:
+        return ()  # graph unavailable (e.g. no translation sources) — file alternates only
+
+
+def batches(urls, size=PURGE_BATCH):
+    return [urls[i:i + size] for i in range(0, len(urls), size)]
+
+
+def purge(urls, dry_run=False, token=None):
+    """Purge `urls` in API-sized batches. Returns the number of batches sent."""
+    groups = batches(list(urls))
+    if dry_run:
+        for i, group in enumerate(groups, 1):
+            print(f"  batch {i}/{len(groups)}: POST /zones/<zone>/purge_cache")
+            print("    " + json.dumps({"files": group}, indent=2).replace("\n", "\n    "))
+        return len(groups)
+    if not groups:
+        return 0
+    token = token or load_token()
+    zone_id, _ = get_zone_and_account(token)
+    for i, group in enumerate(groups, 1):
+        for attempt in range(3):
+            try:
+                resp = cf_request("POST", f"/zones/{zone_id}/purge_cache", token, {"files": group})
+                break
+            except urllib.error.HTTPError as e:
+                if e.code != 429 or attempt == 2:
+                    raise
+                time.sleep(5 * (attempt + 1))  # purge API rate limit
+        if not resp.get("success"):
+            raise RuntimeError(f"purge batch {i} failed: {resp.get('errors')}")
+        print(f"  batch {i}/{len(groups)}: {len(group)} URL(s) purged")
+    return len(groups)
+
+
+# ── Change sources ────────────────────────────────────────────────────────────
+
+def _git(*args, root=PROJECT_DIR):
+    return subprocess.run(["git", *args], cwd=root, capture_output=True,
+                          text=True, check=True).stdout
+
+
+def git_changes(rev, root=PROJECT_DIR):
+    """(changed, removed, old_text) for the working tree against `rev`."""
+    changed, removed = [], []
+    for line in _git("diff", "--name-status", "--no-renames", rev, root=root).splitlines():
+        status, _, rel = line.partition("\t")
+        (removed if status.startswith("D") else changed).append(rel)
+    changed += _git("ls-files", "--others", "--exclude-standard", root=root).splitlines()
+
+    def old_text(rel):
+        r = subprocess.run(["git", "show", f"{rev}:{rel}"], cwd=root,
+                           capture_output=True, text=True)
+        return r.stdout if r.returncode == 0 else None
+
+    return changed, removed, old_text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Purge changed URLs from the Cloudflare cache")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--git", metavar="REV", help="Files changed in the working tree since REV")
+    source.add_argument("--files", nargs="+", metavar="PATH", help="Changed files (project-relative)")
+    source.add_argument("--stdin", action="store_true", help="Read changed file paths from stdin")
+    parser.add_argument("--dry-run", action="store_true", help="Print the batches; call no API")
+    parser.add_argument("--root", type=pathlib.Path, default=PROJECT_DIR,
+                        help="Tree to read pages from (default: this checkout)")
+    args = parser.parse_args()
+
+    root = args.root.resolve()
+    old_text = None
+    removed = []
+    if args.git:
+        changed, removed, old_text = git_changes(args.git)
+    elif args.files:
+        changed = args.files
+    else:
+        changed = [l.strip() for l in sys.stdin if l.strip()]
+    if not args.git:
+        removed = [rel for rel in changed if not (root / rel).exists()]
+
+    urls = urls_for_changes(changed, removed, old_text=old_text, root=root)
+    print(f"CDN purge — {len(set(changed) | set(removed))} changed file(s) → {len(urls)} URL(s)"
+          f" in {len(batches(urls))} batch(es){' (dry run)' if args.dry_run else ''}")
+    if not urls:
+        return
+    try:
+        purge(urls, dry_run=args.dry_run)
+    except (RuntimeError, urllib.error.URLError) as e:
+        sys.exit(f"  ✗ {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -35,6 +35,9 @@ TRANS_DIR   = BASE_DIR / "transcriptions"
 DATA_DIR    = BASE_DIR / "data"
 TOOLS_DIR   = pathlib.Path(__file__).parent
 
+sys.path.insert(0, str(TOOLS_DIR))
+import _events as events
+
 # Load OpenAI API key from secrets file if not already in environment
 if not os.environ.get("OPENAI_API_KEY"):
     key_file = pathlib.Path.home() / ".config" / "stv-secrets" / "openai-api-key.txt"
@@ -56,6 +59,12 @@ MODEL = "local-large"
 # so 16 full videos per day is safe — capped at 8 to leave headroom)
 MAX_VIDEO_UPLOADS_PER_RUN = 8
 
+# YouTube Data API cost estimates for the dashboard's quota card
+# (captions.list 50 + captions.download 200; captions.insert/update 400)
+YOUTUBE_DAILY_QUOTA = 60000
+CAPTION_FETCH_UNITS = 250
+CAPTION_UPLOAD_UNITS = 400
+
 # Agreed language set — DO NOT EXPAND without explicit agreement with Tom.
 # cs, da, el, id, ms, sv, th, vi, hi, ja, ru, zh were added in error and removed.
 LANGUAGES = [
@@ -211,6 +220,18 @@ def try_upload_subtitles(vid_id):
         return 0
 
 
+def stage_event(vid_id, stage, status, t0=None, **fields):
+    """Report a pipeline stage to the ops event log (dashboard Live Ops)."""
+    if t0 is not None:
+        fields["seconds"] = round(time.time() - t0, 1)
+    events.emit("pipeline", "stage", video=vid_id, stage=stage, status=status, **fields)
+
+
+def quota_event(used, exhausted=False):
+    events.emit("pipeline", "quota", api="youtube", used=used,
+                limit=YOUTUBE_DAILY_QUOTA, exhausted=exhausted)
+
+
 def log(msg):
     ts = datetime.now().strftime("%H:%M:%S")
     line = f"[{ts}] {msg}"
@@ -302,6 +323,7 @@ def main():
 
     log(f"=== Pipeline started {datetime.now().isoformat()} ({mode}) ===")
     log(f"Videos: {total} | Model: {MODEL} | Languages: {len(LANGUAGES)}")
+    events.emit("pipeline", "run", status="start", mode=mode, total=total, languages=LANGUAGES)
 
     # Prioritize by view count
     view_counts = get_view_counts(ids)
@@ -321,6 +343,7 @@ def main():
     videos_uploaded = 0
     upload_quota_hit = False
     caption_quota_hit = False
+    quota_used = 0
 
     for i, vid_id in enumerate(ids, 1):
         if is_fully_done(vid_id):
@@ -328,6 +351,8 @@ def main():
             continue
 
         log(f"[{i}/{total}] {vid_id} —————————————————")
+        events.emit("pipeline", "progress", video=vid_id, index=i, total=total,
+                    ok=ok, errors=len(errors))
         t0 = time.time()
 
         # ── Step 1: Get English SRT ──────────────────────────────────────
@@ -343,17 +368,27 @@ def main():
             if caption_quota_hit:
                 log("  skipping — API quota already exceeded")
                 continue
+            t_stage = time.time()
+            stage_event(vid_id, "captions", "start")
             result = try_fetch_captions(vid_id)
+            quota_used += CAPTION_FETCH_UNITS
             if result == "quota":
                 caption_quota_hit = True
+                quota_event(quota_used, exhausted=True)
+                stage_event(vid_id, "captions", "error", t_stage, reason="quota")
                 errors.append(vid_id)
                 continue
-            elif result == "error":
+            quota_event(quota_used)
+            if result == "error":
+                stage_event(vid_id, "captions", "error", t_stage)
                 errors.append(vid_id)
                 continue
+            stage_event(vid_id, "captions", "done", t_stage)
         else:
             # Mac: use Whisper API transcription
             log(f"  transcribing with {MODEL} model...")
+            t_stage = time.time()
+            stage_event(vid_id, "transcribe", "start")
             r = subprocess.run(
                 [PYTHON, str(TRANSCRIBE), "--model", MODEL, "--", vid_id],
                 capture_output=True, text=True,
@@ -363,8 +398,10 @@ def main():
                 log(f"  ERROR: transcription failed (exit {r.returncode})")
                 for line in err_detail:
                     log(f"    {line.strip()}")
+                stage_event(vid_id, "transcribe", "error", t_stage)
                 errors.append(vid_id)
                 continue
+            stage_event(vid_id, "transcribe", "done", t_stage)
 
         # ── Step 2: Translate ────────────────────────────────────────────
         missing_langs = [
@@ -374,22 +411,37 @@ def main():
         if missing_langs:
             engine = "openai" if vid_id in top_30_ids else "deep-translator"
             log(f"  translating to {len(missing_langs)} languages [{engine}]: {' '.join(missing_langs)}")
+            t_stage = time.time()
+            stage_event(vid_id, "translate", "start", langs=missing_langs)
             r = subprocess.run(
                 [PYTHON, str(TRANSLATE), "--engine", engine, "--langs"] + missing_langs + ["--", vid_id],
                 capture_output=False,
             )
+            translated = [lang for lang in missing_langs
+                          if (TRANS_DIR / vid_id / f"subtitles.{lang}.srt").exists()]
             if r.returncode != 0:
                 log(f"  WARNING: translation had errors (continuing)")
+            stage_event(vid_id, "translate", "done" if r.returncode == 0 else "error", t_stage,
+                        langs=translated)
         else:
             log("  all translations already done")
 
         # ── Step 3: Upload (VPS-auto only) ───────────────────────────────
         if args.vps_auto and not upload_quota_hit and videos_uploaded < MAX_VIDEO_UPLOADS_PER_RUN:
+            t_stage = time.time()
+            stage_event(vid_id, "upload", "start")
             result = try_upload_subtitles(vid_id)
             if result == -1:
                 upload_quota_hit = True
-            elif result > 0:
-                videos_uploaded += 1
+                quota_event(quota_used, exhausted=True)
+                stage_event(vid_id, "upload", "error", t_stage, reason="quota")
+            else:
+                if result > 0:
+                    videos_uploaded += 1
+                    quota_used += result * CAPTION_UPLOAD_UNITS
+                    quota_event(quota_used)
+                stage_event(vid_id, "upload", "done" if result > 0 else "error", t_stage,
+                            tracks=result)
 
         elapsed = int(time.time() - t0)
         log(f"  done in {elapsed//60}m {elapsed%60}s")
@@ -399,6 +451,8 @@ def main():
     log(f"Completed: {ok}/{total} | Errors: {len(errors)} | Videos uploaded: {videos_uploaded}")
     if errors:
         log(f"Failed video IDs: {', '.join(errors)}")
+    events.emit("pipeline", "run", status="finish", mode=mode, total=total, ok=ok,
+                errors=len(errors), uploaded=videos_uploaded)
 
     # Send summary via Telegram
     send_summary(ok, total, errors, videos_uploaded, mode)
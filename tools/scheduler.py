@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+"""
+STV scheduler — runs every scheduled tool from one long-running process.
+
+setup_cron.sh used to install one cron entry per tool run (~26 of them):
+each started a fresh interpreter, re-imported the Google client libraries,
+re-read the service-account key and fetched a new access token, and several
+fired in the same minute. Now cron only keeps this scheduler alive, and the
+scheduler runs the tools' main() entry points on the schedules in JOBS:
+
+    - the parent imports every job module (and the Google libraries) once and
+      keeps the access tokens fresh (_google.warm()); each run is a fork()
+      of it, so a job starts with everything already loaded and
+      authenticated, and a crashing or leaking job cannot take the scheduler
+      down with it
+    - each run starts a random 0…jitter seconds after its slot, so jobs that
+      share a minute do not all start at once, and at most MAX_PARALLEL jobs
+      run at a time (the rest queue)
+    - a job still running when its next slot comes is skipped, not stacked
+    - a job over its timeout gets SIGTERM, then SIGKILL after KILL_GRACE
+    - steps of a chain run in order and stop at the first failure (like &&)
+    - every job's output still goes to its own logs/<name>.log, as before
+    - when a deploy changes any loaded tools/*.py, the scheduler lets the
+      running jobs finish and re-executes itself on the new code
+
+Job history (start, finish, status, duration, exit code) goes to the ops
+event log (tools/_events.py, source "scheduler"), which the dashboard's
+Live Ops panel follows; data/scheduler-state.json holds the heartbeat, the
+running jobs and every job's next and last run.
+
+Cron (setup_cron.sh) only restarts it if it is not running — a second
+instance exits at once, so this is safe every 5 minutes:
+    */5 * * * *  python3 /var/www/socialtradingvlog-website/tools/scheduler.py
+
+Usage:
+    python3 tools/scheduler.py                    # run the scheduler (foreground)
+    python3 tools/scheduler.py --list             # jobs, schedules, next and last runs
+    python3 tools/scheduler.py --run uptime       # run one job now and wait for it
+    python3 tools/scheduler.py --history          # runs, failures and durations per job
+"""
+
+import os
+import sys
+import json
+import time
+import fcntl
+import random
+import signal
+import pathlib
+import argparse
+import importlib
+import traceback
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+import _events as events
+import _google
+
+PROJECT_DIR = pathlib.Path(__file__).parent.parent
+TOOLS_DIR = PROJECT_DIR / "tools"
+LOG_DIR = PROJECT_DIR / "logs"
+STATE_FILE = PROJECT_DIR / "data" / "scheduler-state.json"
+LOCK_FILE = PROJECT_DIR / "data" / "scheduler.lock"
+
+MAX_PARALLEL = 2          # jobs running at once (the VPS has 2 vCPUs)
+DEFAULT_TIMEOUT = 1800    # seconds
+DEFAULT_JITTER = 90       # seconds
+KILL_GRACE = 30           # SIGTERM → SIGKILL
+TICK = 1.0                # main loop interval (seconds)
+HEARTBEAT = 60            # state file rewritten at least this often
+WARM_INTERVAL = 600       # re-check Google access tokens this often
+
+_LOCK = []                # the single-instance lock file, once held
+
+# name, cron expression, steps [(module, argv)], log file[, options]
+JOBS = [
+    # ── Health monitoring ──
+    ("uptime", "*/5 * * * *", [("site_autopilot", ["--check", "uptime"])], "uptime.log",
+     {"timeout": 240, "jitter": 20}),
+    ("weekly-digest", "0 3 * * 1", [("site_autopilot", ["--check", "weekly"])], "weekly-digest.log", {}),
+    ("daily-check", "0 8 * * *", [("site_autopilot", ["--check", "daily"])], "daily-check.log", {}),
+    ("links", "0 2 * * 2", [("site_autopilot", ["--check", "links"])], "links.log", {"timeout": 3600}),
+    ("content-dates", "0 4 1 * *", [("site_autopilot", ["--check", "content-dates"])],
+     "content-dates.log", {}),
+    # ── Platform data ── (both fail loudly; the update only runs after a good scrape)
+    ("risk-warnings", "0 2 1 * *", [("scrape_etoro_risk", []), ("update_risk_warnings", [])],
+     "scrape-risk.log", {}),
+    # ── Content & schema ──
+    ("rss", "0 1 * * 1", [("rss_generator", [])], "rss.log", {}),
+    ("schema", "0 2 * * 0", [("schema_generator", [])], "schema.log", {}),
+    # ── Analytics ──
+    ("analytics-weekly", "0 4 * * 1", [("analytics_monitor", ["--report", "weekly"])], "analytics.log", {}),
+    ("ga-ingest", "15 6 * * *", [("ga_ingest", [])], "ga-ingest.log", {}),
+    ("gsc-snapshot", "30 6 * * *", [("gsc_snapshot", [])], "gsc-snapshot.log", {}),
+    ("gsc-export", "45 6 * * *", [("gsc_export", [])], "gsc-export.log", {"timeout": 3600}),
+    # ── Security monitoring ──
+    ("security-quick", "0 */2 * * *", [("security_monitor", ["--quick"])], "security.log", {"timeout": 900}),
+    ("security-full", "0 */4 * * *", [("security_monitor", [])], "security.log", {}),
+    ("security-integrity", "0 2 * * *", [("security_monitor", ["--integrity"])], "security.log", {}),
+    ("threat-scan", "0 3 * * *", [("threat_scanner", [])], "threat-scan.log", {}),
+    ("threat-cves", "0 7,19 * * *", [("threat_scanner", ["--check-cves"])], "threat-scan.log", {}),
+    ("threat-quick", "0 */6 * * *", [("threat_scanner", ["--quick"])], "threat-scan.log", {"timeout": 900}),
+    ("selftest", "0 6 * * *", [("security_selftest", [])], "selftest.log", {}),
+    # ── Dependencies & code ──
+    ("deps-full", "0 4 * * 1", [("verify_dependencies", [])], "deps.log", {}),
+    ("deps-hashes", "0 5 * * *", [("verify_dependencies", ["--check-only"])], "deps.log", {}),
+    ("code-audit", "0 4 * * 3", [("code_audit", [])], "code-audit.log", {"timeout": 3600}),
+    # ── Self-healing ──
+    ("doctor", "0 */4 * * *", [("system_doctor", [])], "doctor.log", {}),
+]
+
+
+def jobs():
+    """{name: job dict} for JOBS."""
+    out = {}
+    for name, expr, steps, log, options in JOBS:
+        out[name] = {"name": name, "cron": expr, "fields": parse_cron(expr), "steps": steps,
+                     "log": log, "timeout": options.get("timeout", DEFAULT_TIMEOUT),
+                     "jitter": options.get("jitter", DEFAULT_JITTER)}
+    return out
+
+
+def scheduled_modules():
+    """Every tool module some job runs."""
+    return {module for _, _, steps, _, _ in JOBS for module, _ in steps}
+
+
+def scheduled_text(crontab):
+    """`crontab` plus, when it starts the scheduler, a line per tool the
+    scheduler runs — so "is X scheduled?" stays a substring check."""
+    if "scheduler.py" not in crontab:
+        return crontab
+    return crontab + "\n" + "\n".join(f"{m}.py #scheduler" for m in sorted(scheduled_modules()))
+
+
+def heartbeat_age():
+    """Seconds since the scheduler last wrote its state file, or None."""
+    try:
+        return time.time() - json.loads(STATE_FILE.read_text())["ts"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+# ── Cron expressions ──────────────────────────────────────────────────────────
+
+CRON_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+def parse_field(text, lo, hi):
+    values = set()
+    for part in text.split(","):
+        rng, _, step = part.partition("/")
+        if rng == "*":
+            start, end = lo, hi
+        elif "-" in rng:
+            start, end = (int(x) for x in rng.split("-"))
+        else:
+            start = end = int(rng)
+            if step:
+                end = hi
+        if not lo <= start <= end <= hi:
+            raise ValueError(f"cron field {text!r} out of range {lo}-{hi}")
+        values.update(range(start, end + 1, int(step) if step else 1))
+    return values
+
+
+def parse_cron(expr):
+    """Five cron fields → [minutes, hours, days, months, weekdays] value sets
+    plus whether day-of-month / day-of-week were restricted."""
+    parts = expr.split()
+    if len(parts) != 5:
+        raise ValueError(f"cron expression needs 5 fields: {expr!r}")
+    fields = [parse_field(p, lo, hi) for p, (lo, hi) in zip(parts, CRON_RANGES)]
+    if 7 in fields[4]:
+        fields[4] = (fields[4] - {7}) | {0}   # 7 is Sunday too
+    return fields + [parts[2] != "*", parts[4] != "*"]
+
+
+def day_matches(fields, day):
+    _, _, doms, months, dows, dom_set, dow_set = fields
+    if day.month not in months:
+        return False
+    dom_ok = day.day in doms
+    dow_ok = (day.weekday() + 1) % 7 in dows
+    if dom_set and dow_set:
+        return dom_ok or dow_ok   # cron: either restriction matches
+    return dom_ok and dow_ok
+
+
+def next_run(fields, after):
+    """The first minute strictly after `after` (a datetime) that matches."""
+    minutes, hours = sorted(fields[0]), sorted(fields[1])
+    start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    day = start.replace(hour=0, minute=0)
+    for _ in range(366 * 5):
+        if day_matches(fields, day):
+            for hour in hours:
+                for minute in minutes:
+                    at = day.replace(hour=hour, minute=minute)
+                    if at >= start:
+                        return at
+        day += timedelta(days=1)
+    raise ValueError("cron expression never matches")
+
+
+# ── Running a job ─────────────────────────────────────────────────────────────
+
+def run_steps(job):
+    """Run a job's steps in this process; returns the exit code of the first
+    failing step, or 0."""
+    for module_name, argv in job["steps"]:
+        sys.argv = [str(TOOLS_DIR / f"{module_name}.py"), *argv]
+        try:
+            module = importlib.import_module(module_name)
+            module.main()
+            rc = 0
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                rc = e.code or 0
+            else:
+                print(e.code, file=sys.stderr)
+                rc = 1
+        except Exception:
+            traceback.print_exc()
+            rc = 1
+        if rc:
+            return rc
+    return 0
+
+
+def spawn(job, log=True):
+    """fork() a child that runs `job` in its own process group, its output
+    appended to the job's log. Returns the child's pid."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid:
+        return pid
+    rc = 1
+    try:
+        for f in _LOCK:
+            f.close()   # the lock belongs to the scheduler, not to its jobs
+        os.setsid()
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(sig, signal.SIG_DFL)
+        if log:
+            LOG_DIR.mkdir(parents=True, exist_ok=True)
+            fd = os.open(LOG_DIR / job["log"], os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            os.dup2(fd, 1)
+            os.dup2(fd, 2)
+            os.close(fd)
+            null = os.open(os.devnull, os.O_RDONLY)
+            os.dup2(null, 0)
+            os.close(null)
+        random.seed()
+        rc = run_steps(job)
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(rc if 0 <= rc < 256 else 1)
+
+
+def exit_code(status):
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+# ── The scheduler ─────────────────────────────────────────────────────────────
+
+def preload():
+    """Import every job module (and the Google libraries) into the parent,
+    so forked jobs start warm. Returns {what: error} for anything that
+    could not be loaded — those jobs still run and fail in their own log."""
+    failed = {}
+    for module in sorted(scheduled_modules()):
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            failed[module] = str(e)[:200]
+    failed.update(_google.warm())
+    return failed
+
+
+class Scheduler:
+    def __init__(self, job_table=None, max_parallel=MAX_PARALLEL):
+        self.jobs = job_table or jobs()
+        self.max_parallel = max_parallel
+        self.running = {}    # pid → {"job", "started", "deadline", "killed"}
+        self.queue = []      # job names due, waiting for a free slot
+        self.due = {}        # name → epoch seconds of the next start (slot + jitter)
+        self.slot = {}       # name → the cron slot that start belongs to
+        self.last = {}       # name → last finished run
+        self.stopping = False
+        self.reloading = False
+        self.code = code_files()
+        self.written = 0
+        self.started = self.warmed = time.time()  # preload() has just warmed up
+        for name in self.jobs:
+            self.schedule(name, datetime.now())
+
+    def schedule(self, name, after):
+        job = self.jobs[name]
+        slot = next_run(job["fields"], after)
+        self.slot[name] = slot
+        self.due[name] = slot.timestamp() + random.uniform(0, job["jitter"])
+
+    def busy(self, name):
+        return any(r["job"]["name"] == name for r in self.running.values())
+
+    def start(self, name):
+        job = self.jobs[name]
+        if time.time() - self.warmed > WARM_INTERVAL:
+            _google.warm()  # refresh tokens before the fork, so the job inherits them
+            self.warmed = time.time()
+        pid = spawn(job)
+        now = time.time()
+        self.running[pid] = {"job": job, "started": now, "deadline": now + job["timeout"],
+                             "killed": None}
+        events.emit("scheduler", "job", name=name, status="start", pid=pid)
+
+    def reap(self):
+        while self.running:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if not pid:
+                return
+            run = self.running.pop(pid, None)
+            if run is None:
+                continue
+            rc = exit_code(status)
+            seconds = round(time.time() - run["started"], 1)
+            outcome = "timeout" if run["killed"] else "ok" if rc == 0 else "failed"
+            name = run["job"]["name"]
+            self.last[name] = {"status": outcome, "rc": rc, "seconds": seconds,
+                               "finished": datetime.now().isoformat(timespec="seconds")}
+            events.emit("scheduler", "job", name=name, status=outcome, rc=rc, seconds=seconds)
+
+    def enforce_timeouts(self):
+        now = time.time()
+        for pid, run in self.running.items():
+            if now < run["deadline"]:
+                continue
+            if run["killed"] is None:
+                run["killed"] = now
+                self.kill(pid, signal.SIGTERM)
+            elif now - run["killed"] > KILL_GRACE:
+                self.kill(pid, signal.SIGKILL)
+
+    @staticmethod
+    def kill(pid, sig):
+        try:
+            os.killpg(pid, sig)   # the job and anything it spawned
+        except ProcessLookupError:
+            pass
+
+    def tick(self):
+        self.reap()
+        self.enforce_timeouts()
+        now = time.time()
+        for name in sorted(self.jobs, key=lambda n: self.due[n]):
+            if self.due[name] > now:
+                continue
+            if self.busy(name) or name in self.queue:
+                events.emit("scheduler", "job", name=name, status="skipped",
+                            reason="still running" if self.busy(name) else "still queued")
+            else:
+                self.queue.append(name)
+            self.schedule(name, max(self.slot[name], datetime.now()))
+        while self.queue and len(self.running) < self.max_parallel and not self.reloading:
+            self.start(self.queue.pop(0))
+        if time.time() - self.written > HEARTBEAT:
+            self.write_state()
+            if not self.reloading and code_files() != self.code:
+                self.reloading = True   # new code deployed: let running jobs finish, then re-exec
+                events.emit("scheduler", "run", status="reload", running=len(self.running))
+
+    def write_state(self):
+        self.written = time.time()
+        running = {run["job"]["name"]: {"pid": pid, "since": datetime.fromtimestamp(
+            run["started"]).isoformat(timespec="seconds")} for pid, run in self.running.items()}
+        state = {
+            "ts": self.written, "pid": os.getpid(),
+            "started": datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+            "running": running, "queued": list(self.queue),
+            "jobs": {name: {"cron": job["cron"],
+                            "next": datetime.fromtimestamp(self.due[name]).isoformat(timespec="seconds"),
+                            "last": self.last.get(name)}
+                     for name, job in self.jobs.items()},
+        }
+        STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = STATE_FILE.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, indent=1))
+        os.replace(tmp, STATE_FILE)
+
+    def stop(self, *_):
+        self.stopping = True
+
+    def run(self):
+        """Run until stopped (returns False) or until new code is deployed
+        and the running jobs are done (returns True: re-exec)."""
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(sig, self.stop)
+        events.emit("scheduler", "run", status="start", pid=os.getpid(), jobs=len(self.jobs))
+        self.write_state()
+        while not self.stopping:
+            self.tick()
+            if self.reloading and not self.running:
+                return True
+            time.sleep(TICK)
+        for pid in list(self.running):
+            self.kill(pid, signal.SIGTERM)
+        deadline = time.time() + KILL_GRACE
+        while self.running and time.time() < deadline:
+            self.reap()
+            time.sleep(0.2)
+        for pid in list(self.running):
+            self.kill(pid, signal.SIGKILL)
+        self.reap()
+        self.running.clear()
+        self.write_state()
+        events.emit("scheduler", "run", status="finish", pid=os.getpid())
+        return False
+
+
+def code_files():
+    """{path: mtime} of every loaded module under tools/ — the code the
+    forked jobs would run."""
+    out = {}
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path and pathlib.Path(path).resolve().parent == TOOLS_DIR.resolve():
+            try:
+                out[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                out[path] = None
+    return out
+
+
+def acquire_lock():
+    """The single-instance lock, or None when another scheduler holds it."""
+    LOCK_FILE.parent.mkdir(parents=True, exist_ok=True)
+    f = open(LOCK_FILE, "a")
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        f.close()
+        return None
+    _LOCK.append(f)
+    return f
+
+
+def load_state():
+    try:
+        return json.loads(STATE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def history(name=None):
+    """{job: {"runs", "failed", "timeouts", "skipped", "seconds": [...], "last"}}
+    from the event log (current file and its rotated predecessor)."""
+    out = {}
+    for path in (events.EVENTS_FILE.with_name(events.EVENTS_FILE.name + ".1"), events.EVENTS_FILE):
+        if not path.exists():
+            continue
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if '"scheduler"' not in line:
+                    continue
+                try:
+                    e = json.loads(line)
+                except ValueError:
+                    continue
+                if e.get("type") != "job" or (name and e.get("name") != name):
+                    continue
+                h = out.setdefault(e["name"], {"runs": 0, "failed": 0, "timeouts": 0,
+                                               "skipped": 0, "seconds": [], "last": None})
+                status = e.get("status")
+                if status == "skipped":
+                    h["skipped"] += 1
+                elif status in ("ok", "failed", "timeout"):
+                    h["runs"] += 1
+                    h["failed"] += status == "failed"
+                    h["timeouts"] += status == "timeout"
+                    h["seconds"].append(float(e.get("seconds", 0)))
+                    h["last"] = e
+    return out
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def print_jobs(table):
+    state = load_state()
+    alive = state and time.time() - state.get("ts", 0) < HEARTBEAT * 3
+    print(f"Scheduler — {len(table)} jobs, "
+          + (f"running since {state.get('started')} (pid {state.get('pid')})" if alive else "not running"))
+    now = datetime.now()
+    for name, job in table.items():
+        info = state.get("jobs", {}).get(name, {}) if alive else {}
+        nxt = info.get("next") or next_run(job["fields"], now).isoformat(timespec="minutes")
+        last = info.get("last") or {}
+        last_text = f"{last['status']} {last['seconds']}s at {last['finished']}" if last else ""
+        steps = " && ".join(" ".join([m] + argv) for m, argv in job["steps"])
+        running = "  [running]" if name in state.get("running", {}) and alive else ""
+        print(f"  {name:<19} {job['cron']:<13} next {nxt[:16]:<16}  {steps}{running}")
+        if last_text:
+            print(f"  {'':<19} last {last_text}")
+
+
+def print_history(name=None):
+    h = history(name)
+    if not h:
+        print("No scheduler runs in the event log yet.")
+        return
+    print(f"{'job':<19} {'runs':>5} {'fail':>5} {'t/o':>4} {'skip':>5} {'avg s':>8} {'max s':>8}  last")
+    for job, info in sorted(h.items()):
+        secs = info["seconds"]
+        last = info["last"] or {}
+        print(f"{job:<19} {info['runs']:>5} {info['failed']:>5} {info['timeouts']:>4} "
+              f"{info['skipped']:>5} {sum(secs) / len(secs) if secs else 0:>8.1f} "
+              f"{max(secs, default=0):>8.1f}  {last.get('status', '')} {last.get('ts', '')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the scheduled STV tools from one process")
+    parser.add_argument("--list", action="store_true", help="Show jobs, next and last runs")
+    parser.add_argument("--run", metavar="JOB", help="Run one job now (output to the terminal)")
+    parser.add_argument("--history", nargs="?", const="", metavar="JOB",
+                        help="Runs, failures and durations per job")
+    args = parser.parse_args()
+
+    table = jobs()
+    if args.list:
+        print_jobs(table)
+        return
+    if args.history is not None:
+        print_history(args.history or None)
+        return
+    if args.run:
+        if args.run not in table:
+            sys.exit(f"Unknown job {args.run!r} — one of: {', '.join(table)}")
+        started = time.time()
+        events.emit("scheduler", "job", name=args.run, status="start", manual=True)
+        _, status = os.waitpid(spawn(table[args.run], log=False), 0)
+        rc = exit_code(status)
+        seconds = round(time.time() - started, 1)
+        events.emit("scheduler", "job", name=args.run, status="ok" if rc == 0 else "failed",
+                    rc=rc, seconds=seconds, manual=True)
+        print(f"\n{args.run}: exit {rc} in {seconds}s")
+        sys.exit(rc and 1)
+
+    lock = acquire_lock()
+    if lock is None:
+        return  # already running (the cron keep-alive fires every 5 minutes)
+    print(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] scheduler starting — {len(table)} jobs, "
+          f"max {MAX_PARALLEL} at a time")
+    for what, error in preload().items():
+        print(f"  preload: {what}: {error}")
+    sys.stdout.flush()
+    if Scheduler(table).run():
+        print(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] code changed — restarting")
+        sys.stdout.flush()
+        os.execv(sys.executable, [sys.executable, str(pathlib.Path(__file__).resolve())])
+    print(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] scheduler stopped")
+
+
+if __name__ == "__main__":
+    main()
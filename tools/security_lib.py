@@ -15,9 +15,11 @@ Provides:
 """
 
 import fcntl
+import functools
 import json
 import pathlib
 import re
+import threading
 import urllib.request
 from datetime import datetime
 
@@ -61,6 +63,18 @@ def log(msg, level="INFO", log_file=None):
 
 # ─── Telegram Alerting ───────────────────────────────────────────────
 
+# flock covers other processes; checks in one process run on threads
+# (tools/_checks.py), so read-modify-write of the state is serialized here too.
+_STATE_LOCK = threading.RLock()
+
+
+def _state_locked(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with _STATE_LOCK:
+            return fn(*args, **kwargs)
+    return wrapper
+
 
 def _load_state():
     """Load security state for dedup/rate limiting (file-locked)."""
@@ -91,6 +105,7 @@ def _save_state(state):
         pass
 
 
+@_state_locked
 def send_telegram(subject, body, emoji="🔴", dedupe_key=None, dedupe_hours=0.5):
     """Send Telegram alert with rate limiting and deduplication.
 
@@ -181,6 +196,7 @@ def _parse_ts(iso_str):
         return 0
 
 
+@_state_locked
 def record_tool_run(tool_name):
     """Record that a security tool ran successfully."""
     state = _load_state()
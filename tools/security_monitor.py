@@ -39,6 +39,8 @@ from security_lib import (
     PROJECT_DIR, SECRETS_DIR, DATA_DIR, LOGS_DIR,
     log as _lib_log, send_telegram, record_tool_run,
 )
+import _events as events
+import _checks as checks
 
 INTEGRITY_FILE = DATA_DIR / "security-integrity.json"
 SECURITY_LOG = LOGS_DIR / "security.log"
@@ -133,20 +135,16 @@ def check_open_ports():
     expected_ports = {"22", "53", "80", "443", "8080"}
 
     try:
-        result = subprocess.run(
-            ["ss", "-tlnp"],
-            capture_output=True, text=True, timeout=10,
-        )
-        for line in result.stdout.strip().split("\n")[1:]:  # Skip header
-            parts = line.split()
-            if len(parts) >= 4:
-                addr = parts[3]
-                port = addr.rsplit(":", 1)[-1] if ":" in addr else ""
-                # Skip localhost-only listeners
-                if "127.0.0.1" in addr or "::1" in addr:
-                    continue
-                if port and port not in expected_ports:
-                    issues.append(f"Unexpected port {port} listening: {line.strip()}")
+        listeners = checks.listening_ports()  # one `ss` shared with threat_scanner
+        if listeners is None:
+            raise FileNotFoundError("ss")
+        for listener in listeners:
+            addr, port = listener["addr"], listener["port"]
+            # Skip localhost-only listeners
+            if "127.0.0.1" in addr or "::1" in addr:
+                continue
+            if port and port not in expected_ports:
+                issues.append(f"Unexpected port {port} listening: {listener['line']}")
     except FileNotFoundError:
         # macOS doesn't have ss, use lsof
         # Known-safe macOS system processes (not threats)
@@ -424,9 +422,10 @@ def check_outbound_connections():
 def run_full_scan():
     """Run all security checks."""
     log("Starting full security scan...")
+    events.emit("security", "run", status="start")
     all_issues = []
 
-    checks = [
+    scan = [
         ("Secret Permissions", check_secret_permissions),
         ("Open Ports", check_open_ports),
         ("SSH Brute Force", check_ssh_brute_force),
@@ -438,24 +437,30 @@ def run_full_scan():
         ("Outbound Connections", check_outbound_connections),
     ]
 
-    for name, check_fn in checks:
-        try:
-            issues = check_fn()
-            if issues:
-                log(f"  [{name}] {len(issues)} issue(s) found", "WARN")
-                for issue in issues:
-                    log(f"    - {issue}", "WARN")
-                all_issues.extend(issues)
-            else:
-                log(f"  [{name}] OK")
-        except Exception as e:
-            log(f"  [{name}] Check failed: {e}", "ERROR")
+    # Independent checks, run concurrently; results logged in this order
+    report = checks.save_report(checks.run("security_monitor", [
+        checks.Check(name, check_fn, timeout=120) for name, check_fn in scan]))
+    for r in report["results"]:
+        name, issues = r["name"], r["value"] or []
+        if r["status"] in (checks.ERROR, checks.TIMEOUT):
+            log(f"  [{name}] Check failed: {r['detail']}", "ERROR")
+            events.emit("security", "check", name=name, ok=False, error=r["detail"])
+            continue
+        if issues:
+            log(f"  [{name}] {len(issues)} issue(s) found", "WARN")
+            for issue in issues:
+                log(f"    - {issue}", "WARN")
+            all_issues.extend(issues)
+        else:
+            log(f"  [{name}] OK")
+        events.emit("security", "check", name=name, issues=len(issues))
 
     # Auto-respond to detected threats
     _auto_respond(all_issues)
 
     # Record successful run for self-test tracking
     record_tool_run("security_monitor")
+    events.emit("security", "run", status="finish", issues=len(all_issues))
 
     if len(all_issues) >= ALERT_THRESHOLD:
         send_security_alert(
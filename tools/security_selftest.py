@@ -48,6 +48,7 @@ from security_lib import (
     PROJECT_DIR, DATA_DIR, LOGS_DIR, SECRETS_DIR,
     send_telegram, record_tool_run,
 )
+import _checks as checks
 
 PASS = "✅"
 FAIL = "❌"
@@ -59,7 +60,7 @@ results = []
 def check(name, passed, detail=""):
     """Record a check result."""
     status = PASS if passed else FAIL
-    results.append({"name": name, "passed": passed, "detail": detail})
+    results.append({"name": name, "passed": passed, "detail": detail, "test": checks.current()})
     print(f"  {status} {name}" + (f" — {detail}" if detail else ""))
     return passed
 
@@ -183,7 +184,8 @@ def test_cron_installed():
             ["crontab", "-l"],
             capture_output=True, text=True, timeout=10,
         )
-        crontab = result.stdout
+        import scheduler
+        crontab = scheduler.scheduled_text(result.stdout)
         required_crons = [
             "security_monitor.py",
             "threat_scanner.py",
@@ -193,6 +195,11 @@ def test_cron_installed():
         missing = [c for c in required_crons if c not in crontab]
         if missing:
             return check("Cron Jobs", False, f"Missing: {', '.join(missing)}")
+        if "scheduler.py" in result.stdout:
+            age = scheduler.heartbeat_age()
+            if age is None or age > scheduler.HEARTBEAT * 15:
+                return check("Cron Jobs", False, "Scheduler installed but not running "
+                             f"(heartbeat {'missing' if age is None else f'{int(age // 60)}m old'})")
         return check("Cron Jobs", True, f"All {len(required_crons)} security crons present")
     except Exception as e:
         return check("Cron Jobs", False, str(e))
@@ -282,28 +289,10 @@ def test_2fa_configured():
 def test_ssl_certificate():
     """Protocol 11: SSL certificate is valid and not expiring soon."""
     try:
-        result = subprocess.run(
-            ["openssl", "s_client", "-connect", "socialtradingvlog.com:443",
-             "-servername", "socialtradingvlog.com"],
-            input="", capture_output=True, text=True, timeout=10,
-        )
-        output = result.stdout + result.stderr
-
-        if "verify return:1" in output or "Verification: OK" in output:
-            # Check expiry with openssl x509
-            cert_result = subprocess.run(
-                ["bash", "-c",
-                 "echo | openssl s_client -servername socialtradingvlog.com "
-                 "-connect socialtradingvlog.com:443 2>/dev/null | "
-                 "openssl x509 -noout -enddate 2>/dev/null"],
-                capture_output=True, text=True, timeout=15,
-            )
-            expiry = cert_result.stdout.strip()
-            if "notAfter" in expiry:
-                return check("SSL Certificate", True, expiry)
-            return check("SSL Certificate", True, "Valid")
-        else:
-            return check("SSL Certificate", False, "Verification failed")
+        cert = checks.ssl_certificate()  # one handshake shared with autopilot / threat scanner
+        if cert["verified"]:
+            return check("SSL Certificate", True, f"notAfter={cert['not_after']}")
+        return check("SSL Certificate", False, "Verification failed")
     except Exception as e:
         return check("SSL Certificate", False, str(e))
 
@@ -434,11 +423,17 @@ def run_selftest(brief=False):
         ("16. DNS Resolution", test_dns_resolution),
     ]
 
-    for name, test_fn in tests:
-        try:
-            test_fn()
-        except Exception as e:
-            check(name, False, f"Test crashed: {e}")
+    # The protocols are independent: verify them concurrently. Each test
+    # records its own check(); crashes and hangs are recorded here.
+    report = checks.save_report(checks.run("security_selftest", [
+        checks.Check(name, test_fn, timeout=60) for name, test_fn in tests]))
+    for r in report["results"]:
+        if r["status"] in (checks.ERROR, checks.TIMEOUT):
+            check(r["name"], False, ("Test crashed: " if r["status"] == checks.ERROR
+                                     else "Test timed out: ") + r["detail"])
+            results[-1]["test"] = r["name"]
+    order = {name: i for i, (name, _) in enumerate(tests)}
+    results.sort(key=lambda rec: order.get(rec["test"], len(order)))
 
     # Summary
     passed = sum(1 for r in results if r["passed"])
@@ -39,30 +39,16 @@ CRON_ENTRIES=$(cat <<'CRONTAB'
 # Last updated: DATE_PLACEHOLDER
 # ═══════════════════════════════════════════════════════════════
 
-# ── Health Monitoring ────────────────────────────────────── #STV
+# ── Scheduled Tools ──────────────────────────────────────── #STV
 
-# Uptime check every 5 minutes
-*/5 * * * * PYTHON_PATH PROJECT_PATH/tools/site_autopilot.py --check uptime >> LOG_PATH/uptime.log 2>&1 #STV
-
-# Full weekly health digest every Monday at 3am
-0 3 * * 1 PYTHON_PATH PROJECT_PATH/tools/site_autopilot.py --check weekly >> LOG_PATH/weekly-digest.log 2>&1 #STV
-
-# Daily full system check at 8am
-0 8 * * * PYTHON_PATH PROJECT_PATH/tools/site_autopilot.py --check daily >> LOG_PATH/daily-check.log 2>&1 #STV
-
-# Broken link scan weekly on Tuesdays at 2am
-0 2 * * 2 PYTHON_PATH PROJECT_PATH/tools/site_autopilot.py --check links >> LOG_PATH/links.log 2>&1 #STV
-
-# Stale content date check monthly on the 1st at 4am
-0 4 1 * * PYTHON_PATH PROJECT_PATH/tools/site_autopilot.py --check content-dates >> LOG_PATH/content-dates.log 2>&1 #STV
-
-# ── Platform Data ───────────────────────────────────────── #STV
-
-# Monthly eToro risk-disclaimer mirror (1st of month, 2am).
-# scrape_etoro_risk.py reads eToro's official CFD figure; update_risk_warnings.py
-# mirrors it across all language pages if the live site differs. Both fail loudly
-# (Telegram + non-zero exit) — a silent no-op is never treated as success.
-0 2 1 * * PYTHON_PATH PROJECT_PATH/tools/scrape_etoro_risk.py >> LOG_PATH/scrape-risk.log 2>&1 && PYTHON_PATH PROJECT_PATH/tools/update_risk_warnings.py >> LOG_PATH/scrape-risk.log 2>&1 #STV
+# Every Python tool (uptime, daily/weekly checks, platform data, RSS/schema,
+# analytics + GA/GSC ingest, security + threat scans, self-test, dependency
+# checks, code audit, system doctor) runs inside tools/scheduler.py — one
+# long-running process with the schedules, jitter, timeouts and per-tool logs
+# that used to be ~22 separate entries here. See JOBS in tools/scheduler.py;
+# `scheduler.py --list` shows next/last runs, `--history` the durations.
+# This entry only (re)starts it: a second instance exits at once.
+*/5 * * * * PYTHON_PATH PROJECT_PATH/tools/scheduler.py >> LOG_PATH/scheduler.log 2>&1 #STV
 
 # Platform-fee scrape chain (scrape_platform_fees.py + update_fee_pages.py) was
 # retired 2026-05-17 along with the decommissioned calculators — scripts archived
@@ -73,67 +59,12 @@ CRON_ENTRIES=$(cat <<'CRONTAB'
 # permanently retired. They were left in this script by mistake and got
 # resurrected on 2026-05-17 when setup_cron.sh was re-run — removed here so
 # running this script is safe. run_pipeline.py / upload_subtitles.py still
-# work on demand but must never be scheduled again without explicit sign-off.
+# work on demand but must never be scheduled again (here or in the scheduler's
+# JOBS) without explicit sign-off.
 #
 # (was: 0 5 * * * upload_subtitles.py --skip-english)
 # (was: 0 6 * * * run_pipeline.py --vps-auto)
 
-# ── Content & Schema ─────────────────────────────────────── #STV
-
-# Regenerate RSS feeds weekly (Mondays 1am)
-0 1 * * 1 PYTHON_PATH PROJECT_PATH/tools/rss_generator.py >> LOG_PATH/rss.log 2>&1 #STV
-
-# Schema markup update weekly (Sundays 2am)
-0 2 * * 0 PYTHON_PATH PROJECT_PATH/tools/schema_generator.py >> LOG_PATH/schema.log 2>&1 #STV
-
-# ── Analytics & Optimization ─────────────────────────────── #STV
-
-# Weekly analytics report + A/B test results + optimization suggestions (Mondays 4am)
-0 4 * * 1 PYTHON_PATH PROJECT_PATH/tools/analytics_monitor.py --report weekly >> LOG_PATH/analytics.log 2>&1 #STV
-
-# Daily GSC snapshot for position tracking (6:30am)
-30 6 * * * PYTHON_PATH PROJECT_PATH/tools/gsc_snapshot.py >> LOG_PATH/gsc-snapshot.log 2>&1 #STV
-
-# ── Security Monitoring ─────────────────────────────────── #STV
-
-# Quick security scan every 2 hours (ports, processes, permissions)
-0 */2 * * * PYTHON_PATH PROJECT_PATH/tools/security_monitor.py --quick >> LOG_PATH/security.log 2>&1 #STV
-
-# Full security scan every 4 hours
-0 */4 * * * PYTHON_PATH PROJECT_PATH/tools/security_monitor.py >> LOG_PATH/security.log 2>&1 #STV
-
-# File integrity check daily at 2am
-0 2 * * * PYTHON_PATH PROJECT_PATH/tools/security_monitor.py --integrity >> LOG_PATH/security.log 2>&1 #STV
-
-# ── Threat Intelligence ──────────────────────────────────── #STV
-
-# Daily threat intelligence scan at 3am (CVEs, attack patterns, AI agent threats, DNS integrity)
-0 3 * * * PYTHON_PATH PROJECT_PATH/tools/threat_scanner.py >> LOG_PATH/threat-scan.log 2>&1 #STV
-
-# CVE advisory check twice daily (7am and 7pm) — catch critical vulns fast
-0 7,19 * * * PYTHON_PATH PROJECT_PATH/tools/threat_scanner.py --check-cves >> LOG_PATH/threat-scan.log 2>&1 #STV
-
-# Quick threat scan every 6 hours (SSH keys, listeners, AI agents)
-0 */6 * * * PYTHON_PATH PROJECT_PATH/tools/threat_scanner.py --quick >> LOG_PATH/threat-scan.log 2>&1 #STV
-
-# ── Security Self-Test ───────────────────────────────────── #STV
-
-# Daily at 6am — verify ALL security protocols are working (alerts on failure)
-0 6 * * * PYTHON_PATH PROJECT_PATH/tools/security_selftest.py >> LOG_PATH/selftest.log 2>&1 #STV
-
-# ── Dependency Verification ──────────────────────────────── #STV
-
-# Weekly full dependency verification (Mondays 4am) — hashes, CVEs, rogue packages
-0 4 * * 1 PYTHON_PATH PROJECT_PATH/tools/verify_dependencies.py >> LOG_PATH/deps.log 2>&1 #STV
-
-# Daily quick hash check (5am) — detect supply chain tampering fast
-0 5 * * * PYTHON_PATH PROJECT_PATH/tools/verify_dependencies.py --check-only >> LOG_PATH/deps.log 2>&1 #STV
-
-# ── Code Audit ───────────────────────────────────────────── #STV
-
-# Weekly security audit of own code (Wednesdays 4am)
-0 4 * * 3 PYTHON_PATH PROJECT_PATH/tools/code_audit.py >> LOG_PATH/code-audit.log 2>&1 #STV
-
 # ── Log Rotation ─────────────────────────────────────────── #STV
 
 # Rotate logs monthly (keep last 3 months)
@@ -150,10 +81,9 @@ CRON_ENTRIES=$(cat <<'CRONTAB'
 
 # ── Self-Healing (System Doctor) ──────────────────────── #STV
 
-# System doctor every 4 hours — scan logs, auto-fix known errors, monitor health
-0 */4 * * * PYTHON_PATH PROJECT_PATH/tools/system_doctor.py >> LOG_PATH/doctor.log 2>&1 #STV
+# The system doctor itself runs every 4 hours inside the scheduler (job "doctor").
 
-# Dead man's switch every 12 hours — alert if system doctor itself stopped running
+# Dead man's switch every 12 hours — alert if system doctor (or the scheduler running it) stopped
 0 */12 * * * PYTHON_PATH -c "import json,pathlib,sys,time; sys.path.insert(0,'PROJECT_PATH/tools'); f=pathlib.Path('PROJECT_PATH/data/doctor-heartbeat.json'); alive=(f.exists() and time.time()-json.loads(f.read_text()).get('ts',0)<28800); exec('from security_lib import send_telegram; send_telegram(\"Dead Man Switch\",\"System doctor not running for 8+ hours. Check VPS.\",emoji=\"💀\")') if not alive else None" 2>/dev/null #STV
 
 CRONTAB
@@ -207,5 +137,6 @@ echo ""
 echo "Logs will be written to: $LOG_DIR"
 echo ""
 echo "To check autopilot status:"
-echo "  python3 $PROJECT_DIR/tools/site_autopilot.py --check uptime"
+echo "  python3 $PROJECT_DIR/tools/scheduler.py --list"
+echo "  python3 $PROJECT_DIR/tools/scheduler.py --run uptime"
 echo "  tail -f $LOG_DIR/uptime.log"
@@ -13,10 +13,10 @@ Usage:
     python3 tools/site_autopilot.py --check content-dates  # Stale year references
     python3 tools/site_autopilot.py --check all            # Everything
 
-Cron setup (add to VPS crontab):
-    */5 * * * *  python3 /var/www/socialtradingvlog-website/tools/site_autopilot.py --check uptime
-    0 8 * * *    python3 /var/www/socialtradingvlog-website/tools/site_autopilot.py --check daily
-    0 3 * * 1    python3 /var/www/socialtradingvlog-website/tools/site_autopilot.py --check weekly
+Scheduled by tools/scheduler.py (JOBS "uptime", "daily-check", "weekly-digest", …):
+    */5 * * * *  site_autopilot.py --check uptime
+    0 8 * * *    site_autopilot.py --check daily
+    0 3 * * 1    site_autopilot.py --check weekly
 """
 
 import sys
@@ -29,6 +29,7 @@ import urllib.request
 import urllib.error
 import ssl
 import subprocess
+import threading
 import smtplib
 import glob as glob_module
 import re
@@ -40,6 +41,10 @@ from email.mime.multipart import MIMEMultipart
 
 SCRIPT_DIR = pathlib.Path(__file__).parent
 PROJECT_DIR = SCRIPT_DIR.parent
+
+sys.path.insert(0, str(SCRIPT_DIR))
+import _events as events
+import _checks as checks
 SECRETS_DIR = pathlib.Path.home() / ".config" / "stv-secrets"
 ALERT_LOG = PROJECT_DIR / "data" / "autopilot-alerts.json"
 HEALTH_LOG = PROJECT_DIR / "data" / "autopilot-health.json"
@@ -59,6 +64,10 @@ EMAIL_CONFIG_FILE = SECRETS_DIR / "email-alerts.json"
 # SSL context for HTTPS requests
 SSL_CTX = ssl.create_default_context()
 
+# The daily check runs its checks concurrently (tools/_checks.py); the JSON
+# files below are read-modify-written, one thread at a time.
+FILE_LOCK = threading.Lock()
+
 
 # ─── Alerting ──────────────────────────────────────────────────────────────
 
@@ -84,28 +93,29 @@ def send_telegram(message, level="info"):
 
 def log_to_dashboard(alert_type, message, level="info", details=None):
     """Log alert to dashboard-readable JSON file."""
-    alerts = []
-    if ALERT_LOG.exists():
-        try:
-            alerts = json.loads(ALERT_LOG.read_text())
-        except Exception:
-            alerts = []
-
-    alerts.append({
-        "type": alert_type,
-        "message": message,
-        "level": level,
-        "details": details,
-        "timestamp": datetime.now().isoformat(),
-    })
-
-    # Auto-expire alerts older than 7 days and keep max 500
-    cutoff = (datetime.now() - timedelta(days=7)).isoformat()
-    alerts = [a for a in alerts if a.get("timestamp", "") > cutoff]
-    alerts = alerts[-500:]
-
-    ALERT_LOG.parent.mkdir(parents=True, exist_ok=True)
-    ALERT_LOG.write_text(json.dumps(alerts, indent=2))
+    with FILE_LOCK:
+        alerts = []
+        if ALERT_LOG.exists():
+            try:
+                alerts = json.loads(ALERT_LOG.read_text())
+            except Exception:
+                alerts = []
+
+        alerts.append({
+            "type": alert_type,
+            "message": message,
+            "level": level,
+            "details": details,
+            "timestamp": datetime.now().isoformat(),
+        })
+
+        # Auto-expire alerts older than 7 days and keep max 500
+        cutoff = (datetime.now() - timedelta(days=7)).isoformat()
+        alerts = [a for a in alerts if a.get("timestamp", "") > cutoff]
+        alerts = alerts[-500:]
+
+        ALERT_LOG.parent.mkdir(parents=True, exist_ok=True)
+        ALERT_LOG.write_text(json.dumps(alerts, indent=2))
 
 
 def send_alert(alert_type, message, level="info", details=None):
@@ -155,20 +165,13 @@ def check_uptime():
 def check_ssl_expiry():
     """Check SSL certificate expiry date."""
     print("Checking SSL certificate...")
-    import socket
 
     try:
-        hostname = "socialtradingvlog.com"
-        ctx = ssl.create_default_context()
-        with ctx.wrap_socket(socket.socket(), server_hostname=hostname) as s:
-            s.settimeout(10)
-            s.connect((hostname, 443))
-            cert = s.getpeercert()
-
-        expiry_str = cert["notAfter"]
-        # Format: 'May 20 12:00:00 2026 GMT'
-        expiry = datetime.strptime(expiry_str, "%b %d %H:%M:%S %Y %Z")
-        days_left = (expiry - datetime.now()).days
+        cert = checks.ssl_certificate()  # shared with the self-test and threat scanner
+        if not cert["verified"]:
+            raise ValueError(cert["error"])
+        expiry_str = cert["not_after"]  # Format: 'May 20 12:00:00 2026 GMT'
+        days_left = cert["days_left"]
 
         print(f"  SSL expires: {expiry_str} ({days_left} days left)")
 
@@ -389,7 +392,8 @@ def check_cron_jobs():
     print("Checking cron jobs...")
     try:
         result = subprocess.run(["crontab", "-l"], capture_output=True, text=True)
-        cron_content = result.stdout
+        import scheduler
+        cron_content = scheduler.scheduled_text(result.stdout)
 
         # If there's no #STV cron at all, assume this isn't the VPS — skip silently.
         if "#STV" not in cron_content:
@@ -432,15 +436,22 @@ def check_cron_jobs():
 def run_daily_check():
     """Daily comprehensive system check — deep dive on errors."""
     print("\n═══ Daily System Check ═══")
+    events.emit("autopilot", "run", status="start")
+    # Independent — run concurrently, output still printed in this order
+    report = checks.save_report(checks.run("site_autopilot", [
+        checks.Check("uptime", check_uptime, timeout=60),
+        checks.Check("ssl", check_ssl_expiry, timeout=30),
+        checks.Check("disk", check_disk, timeout=30),
+        checks.Check("cron_jobs", check_cron_jobs, timeout=30),
+    ]))
     results = {}
-
-    results["uptime"] = check_uptime()
-    results["ssl"] = check_ssl_expiry()
-    results["disk"] = check_disk()
-    results["cron_jobs"] = check_cron_jobs()
+    for r in report["results"]:
+        results[r["name"]] = r["ok"]
+        events.emit("autopilot", "check", name=r["name"], ok=r["ok"])
 
     # Summary
     failed = [k for k, v in results.items() if not v]
+    events.emit("autopilot", "run", status="finish", failed=failed)
     if failed:
         summary = f"Daily check: {len(failed)} issue(s) — {', '.join(failed)}"
         send_alert("daily_check", summary, "warning")
@@ -515,13 +526,14 @@ def load_health():
 
 def save_health(check_name, data):
     """Save health check result."""
-    health = load_health()
-    health[check_name] = {
-        "data": data,
-        "last_checked": datetime.now().isoformat(),
-    }
-    HEALTH_LOG.parent.mkdir(parents=True, exist_ok=True)
-    HEALTH_LOG.write_text(json.dumps(health, indent=2))
+    with FILE_LOCK:
+        health = load_health()
+        health[check_name] = {
+            "data": data,
+            "last_checked": datetime.now().isoformat(),
+        }
+        HEALTH_LOG.parent.mkdir(parents=True, exist_ok=True)
+        HEALTH_LOG.write_text(json.dumps(health, indent=2))
 
 
 # ─── Main ──────────────────────────────────────────────────────────────────
@@ -26,6 +26,7 @@ from datetime import datetime, timedelta
 
 sys.path.insert(0, str(pathlib.Path(__file__).parent))
 from security_lib import send_telegram, log as sec_log, record_tool_run
+import _checks as checks
 
 PROJECT_DIR = pathlib.Path(__file__).parent.parent
 TOOLS_DIR = PROJECT_DIR / "tools"
@@ -362,8 +363,10 @@ def check_cron_jobs(dry_run):
         stv_count = r.stdout.count("#STV")
         log(f"Cron jobs: {stv_count} #STV entries")
 
-        if stv_count < 15:
-            log(f"Only {stv_count} STV crons — expected 20+", "WARN")
+        # The scheduled tools all run inside tools/scheduler.py; cron only
+        # keeps it alive, plus log rotation, backups and the dead man's switch.
+        if "scheduler.py" not in r.stdout or stv_count < 5:
+            log(f"Scheduler keep-alive missing ({stv_count} STV crons)", "WARN")
             if dry_run:
                 log("  Would re-run setup_cron.sh")
                 return False
@@ -653,27 +656,36 @@ def main():
     log(f"System Doctor {'(DRY RUN)' if args.dry_run else ''} — {datetime.now().isoformat()}")
     log("=" * 60)
 
+    found = {"errors": [], "fixed": 0, "unfixed": []}
+
     # 1. Scan logs for errors
-    log("Scanning logs for recent errors...")
-    errors = scan_logs()
-    log(f"Found {len(errors)} error(s) in last {SCAN_HOURS}h")
+    def scan():
+        log("Scanning logs for recent errors...")
+        found["errors"] = scan_logs()
+        log(f"Found {len(found['errors'])} error(s) in last {SCAN_HOURS}h")
 
     # 2. Diagnose and fix known errors
-    fixed = 0
-    unfixed = []
-    if errors:
-        log("Diagnosing errors...")
-        fixed, unfixed = diagnose_and_fix(errors, args.dry_run)
-        log(f"Fixed: {fixed} | Unfixed: {len(unfixed)}")
-
-    # 3. System checks
-    log("\nRunning system checks...")
-    check_disk_space(args.dry_run)
-    check_cron_jobs(args.dry_run)
-    check_services(args.dry_run)
-    check_oauth_token(args.dry_run)
-    check_pipeline_progress()
-    # check_fee_data_freshness(args.dry_run)  # calculators removed 2026-05-09
+    def diagnose():
+        if found["errors"]:
+            log("Diagnosing errors...")
+            found["fixed"], found["unfixed"] = diagnose_and_fix(found["errors"], args.dry_run)
+            log(f"Fixed: {found['fixed']} | Unfixed: {len(found['unfixed'])}")
+
+    # 3. System checks — concurrent with the scan; the ones that repair
+    # things (disk cleanup, cron reinstall) wait until the fixes are done
+    log("\nRunning log scan and system checks...")
+    checks.save_report(checks.run("system_doctor", [
+        checks.Check("scan_logs", scan, timeout=300),
+        checks.Check("diagnose", diagnose, deps=["scan_logs"], timeout=600),
+        checks.Check("disk", lambda: check_disk_space(args.dry_run), after=["diagnose"]),
+        checks.Check("cron_jobs", lambda: check_cron_jobs(args.dry_run), after=["diagnose"],
+                     timeout=120),
+        checks.Check("services", lambda: check_services(args.dry_run)),
+        checks.Check("oauth_token", lambda: check_oauth_token(args.dry_run)),
+        checks.Check("pipeline", check_pipeline_progress),
+        # check_fee_data_freshness(args.dry_run)  # calculators removed 2026-05-09
+    ]))
+    errors, fixed, unfixed = found["errors"], found["fixed"], found["unfixed"]
 
     # 4. Alert for unfixed errors (batch into one message)
     if unfixed:
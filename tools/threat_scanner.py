@@ -41,6 +41,7 @@ from security_lib import (
     PROJECT_DIR, DATA_DIR, LOGS_DIR, SECRETS_DIR,
     log as _lib_log, send_telegram, record_tool_run,
 )
+import _checks as checks
 
 THREAT_LOG = LOGS_DIR / "threat-scan.log"
 THREAT_DATA = DATA_DIR / "threat-intelligence.json"
@@ -307,22 +308,13 @@ def check_ssl_certificate():
 
     for domain in domains:
         try:
-            result = subprocess.run(
-                ["openssl", "s_client", "-connect", f"{domain}:443",
-                 "-servername", domain],
-                input="", capture_output=True, text=True, timeout=10,
-            )
-            output = result.stdout + result.stderr
-
-            if "verify return:1" not in output:
+            cert = checks.ssl_certificate(domain)  # shared with autopilot / self-test
+            if not cert["verified"]:
                 issues.append(f"SSL verification failed for {domain}")
 
-            for proto in ["TLSv1 ", "TLSv1.1 ", "SSLv3"]:
-                if proto in output:
-                    issues.append(f"Weak TLS protocol on {domain}: {proto.strip()}")
+            if cert["protocol"] in ("TLSv1", "TLSv1.1", "SSLv3"):
+                issues.append(f"Weak TLS protocol on {domain}: {cert['protocol']}")
 
-        except FileNotFoundError:
-            break  # openssl not installed
         except Exception as e:
             log(f"SSL check error for {domain}: {e}", "WARN")
 
@@ -477,24 +469,15 @@ def check_listening_services():
     expected_ports = {"22", "53", "80", "443", "8080"}
 
     try:
-        result = subprocess.run(
-            ["ss", "-tlnp"],
-            capture_output=True, text=True, timeout=10,
-        )
         current_listeners = set()
-        for line in result.stdout.strip().split("\n")[1:]:
-            parts = line.split()
-            if len(parts) >= 4:
-                addr = parts[3]
-                port = addr.rsplit(":", 1)[-1] if ":" in addr else ""
-                if "127.0.0.1" in addr or "::1" in addr:
-                    continue
-                if port:
-                    current_listeners.add(port)
-                    if port not in expected_ports:
-                        issues.append(f"Unexpected listener on port {port}: {line.strip()}")
-    except FileNotFoundError:
-        pass  # macOS
+        for listener in checks.listening_ports() or []:  # None on macOS (no ss)
+            addr, port = listener["addr"], listener["port"]
+            if "127.0.0.1" in addr or "::1" in addr:
+                continue
+            if port:
+                current_listeners.add(port)
+                if port not in expected_ports:
+                    issues.append(f"Unexpected listener on port {port}: {listener['line']}")
     except Exception as e:
         log(f"Listener check error: {e}", "WARN")
 
@@ -15,6 +15,10 @@ Design (rebuilt 2026-05-17 — see CLAUDE.md "eToro risk percentage updater"):
     its leading number to the target — UNLESS the number is hedged by an
     approximation word ("around 76% ... only 24% profitable"), which is editorial
     prose, not the compliance line, and must never be touched.
+  * Only what the occurrence index (_risk_disclaimer.py) lists is read: a
+    run where every official figure already equals the target exits after
+    stat()ing the pages; otherwise exactly the indexed positions are
+    rewritten, each file checked against its indexed hash first.
   * Loud failure: any scrape problem, stale-pattern (zero anchored matches), or
     "a change is needed but 0 were applied" sends a Telegram alert and exits 1.
     A silent no-op is never treated as success again.
@@ -87,6 +91,8 @@ def read_target(override):
 
 
 def find_html_files():
+    """Every page on disk. Only stat()ed on a run — the occurrence index in
+    _risk_disclaimer.py says which of them need reading."""
     files = []
     for root, _dirs, names in os.walk(str(PROJECT_DIR)):
         rel = os.path.relpath(root, str(PROJECT_DIR))
@@ -144,33 +150,69 @@ def main():
     print(f"  Target (eToro official): {target}%\n")
 
     apply = not args.dry_run
-    total_changes = total_skips = files_changed = matched_any = 0
-    current_values = {}
+    html_files = find_html_files()
+    index, reread = rd.refresh_index(html_files)
+    entries = index["files"]
+    print(f"  Occurrence index: {len(html_files)} files, {reread} re-read since last run")
 
-    for fp in find_html_files():
-        changes, skips = process_file(fp, target, apply)
-        matched_any += len(changes) + len(skips)
-        for ln, val, _snip in changes + skips:
+    current_values = {}
+    total_skips = 0
+    for entry in entries.values():
+        for _start, _end, val, kind in entry["occ"]:
             current_values[val] = current_values.get(val, 0) + 1
-        if changes:
-            files_changed += 1
-            total_changes += len(changes)
-            rel = fp.relative_to(PROJECT_DIR)
-            for ln, val, snip in changes:
-                print(f"  CHANGE {rel}:{ln}  {val}% -> {target}%   {snip!r}")
-        for ln, val, snip in skips:
-            total_skips += 1
-            rel = fp.relative_to(PROJECT_DIR)
-            print(f"  SKIP   {rel}:{ln}  {val}% (editorial/hedged — left as-is)   {snip!r}")
+            total_skips += kind == "editorial"
+    matched_any = sum(current_values.values())
 
     # --- Stale-pattern guard: phrasing changed, our anchors no longer match ---
     if matched_any == 0:
+        rd.save_index()
         fail("no disclaimer matches",
              "Zero regulatory-disclaimer phrases matched site-wide. The page "
              "wording or DISCLAIMER_RE is stale — NOT silently doing nothing.")
 
+    pending = sorted(rel for rel, entry in entries.items()
+                     if any(kind == "official" and val != target
+                            for _s, _e, val, kind in entry["occ"]))
+
     print(f"\n  Anchored figures found: " +
           ", ".join(f"{v}%×{c}" for v, c in sorted(current_values.items())))
+
+    # Fast path: the index says every official figure is already the target.
+    if not pending and not args.dry_run:
+        rd.save_index()
+        print(f"  Editorial skipped: {total_skips}")
+        print(f"  Site already at {target}% — nothing to do.")
+        return
+
+    # Only the listed files are read from here on.
+    total_changes = files_changed = 0
+    editorial = sorted(rel for rel, entry in entries.items()
+                       if any(kind == "editorial" for *_x, kind in entry["occ"]))
+    for rel in sorted(set(pending) | set(editorial)):
+        changes, skips = process_file(PROJECT_DIR / rel, target, apply=False)
+        for ln, val, snip in changes:
+            print(f"  CHANGE {rel}:{ln}  {val}% -> {target}%   {snip!r}")
+        for ln, val, snip in skips:
+            print(f"  SKIP   {rel}:{ln}  {val}% (editorial/hedged — left as-is)   {snip!r}")
+        if not changes or not apply:
+            total_changes += len(changes)
+            files_changed += bool(changes)
+            continue
+        rewritten = rd.rewrite_indexed(rel, target)
+        if rewritten is None:
+            # Edited since it was indexed: offsets are stale, use the full
+            # transform and let the next run re-index the file.
+            print(f"  WARN   {rel} changed since indexed — rewriting by full scan")
+            process_file(PROJECT_DIR / rel, target, apply=True)
+            del entries[rel]
+        else:
+            new_content, _n = rewritten
+            (PROJECT_DIR / rel).write_text(new_content, encoding="utf-8")
+            rd.stamp(rel)
+        total_changes += len(changes)
+        files_changed += 1
+    rd.save_index()
+
     print(f"  Changes: {total_changes} across {files_changed} files | "
           f"Editorial skipped: {total_skips}")
 